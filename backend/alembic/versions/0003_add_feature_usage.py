@@ -0,0 +1,42 @@
+"""Add feature usage table for plan limit metering
+
+Revision ID: add_feature_usage
+Revises: add_password_reset_tokens
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_feature_usage'
+down_revision: Union[str, Sequence[str], None] = 'add_password_reset_tokens'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - create feature_usage table."""
+    op.create_table('feature_usage',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('limit_key', sa.String(length=50), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'limit_key', 'day', name='uq_feature_usage_user_key_day')
+    )
+    op.create_index(op.f('ix_feature_usage_id'), 'feature_usage', ['id'], unique=False)
+    op.create_index(op.f('ix_feature_usage_user_id'), 'feature_usage', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema - drop feature_usage table."""
+    op.drop_index(op.f('ix_feature_usage_user_id'), table_name='feature_usage')
+    op.drop_index(op.f('ix_feature_usage_id'), table_name='feature_usage')
+    op.drop_table('feature_usage')
@@ -0,0 +1,33 @@
+"""Add (user_id, timestamp) indexes for the paginated health timeline
+
+Revision ID: add_timeline_indexes
+Revises: add_feature_usage
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_timeline_indexes'
+down_revision: Union[str, Sequence[str], None] = 'add_feature_usage'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Each timeline branch reads "WHERE user_id = ? ORDER BY timestamp DESC LIMIT n"
+# straight off one of these instead of sorting the user's whole history.
+TIMELINE_TABLES = ('symptom_logs', 'nutrition_logs', 'medication_logs', 'lab_reports')
+
+
+def upgrade() -> None:
+    """Upgrade schema - add composite timeline indexes."""
+    for table in TIMELINE_TABLES:
+        op.create_index(f'ix_{table}_user_id_timestamp', table, ['user_id', 'timestamp'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema - drop composite timeline indexes."""
+    for table in TIMELINE_TABLES:
+        op.drop_index(f'ix_{table}_user_id_timestamp', table_name=table)
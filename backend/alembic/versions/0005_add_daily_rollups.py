@@ -0,0 +1,55 @@
+"""Add daily rollups table for the dashboard summary
+
+Revision ID: add_daily_rollups
+Revises: add_timeline_indexes
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_daily_rollups'
+down_revision: Union[str, Sequence[str], None] = 'add_timeline_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COUNTERS = (
+    'meals', 'symptoms_emergency', 'symptoms_urgent', 'symptoms_routine', 'symptoms_self_care',
+    'symptoms_other', 'chat_sessions',
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema - create daily_rollups table.
+
+    The app fills it from the existing logs on its next start (the table is
+    empty), or by hand with:
+        python -m backend.app.services.daily_rollup backfill
+    """
+    op.create_table('daily_rollups',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('calories', sa.Float(), nullable=False, server_default='0'),
+    *[sa.Column(name, sa.Integer(), nullable=False, server_default='0') for name in COUNTERS],
+    sa.Column('lab_report_name', sa.String(length=255), nullable=True),
+    sa.Column('lab_summary', sa.Text(), nullable=True),
+    sa.Column('lab_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'day', name='uq_daily_rollups_user_day')
+    )
+    op.create_index(op.f('ix_daily_rollups_id'), 'daily_rollups', ['id'], unique=False)
+    op.create_index(op.f('ix_daily_rollups_user_id'), 'daily_rollups', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema - drop daily_rollups table."""
+    op.drop_index(op.f('ix_daily_rollups_user_id'), table_name='daily_rollups')
+    op.drop_index(op.f('ix_daily_rollups_id'), table_name='daily_rollups')
+    op.drop_table('daily_rollups')
@@ -0,0 +1,55 @@
+"""Add composite indexes for user-scoped chat and image history queries
+
+Revision ID: add_history_indexes
+Revises: add_daily_rollups
+Create Date: 2026-10-18 16:00:00.000000
+
+Completes add_timeline_indexes (symptom, nutrition, medication and lab
+logs) for the remaining "WHERE user_id = ? [AND session_id = ?] ORDER BY
+<time> DESC LIMIT n" history reads. chat_history and the image analysis
+table were first created outside these migrations, so their names are
+resolved against the live schema.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_history_indexes'
+down_revision: Union[str, Sequence[str], None] = 'add_daily_rollups'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _indexes():
+    """(index name, table, columns) for the tables present in this database."""
+    inspector = sa.inspect(op.get_bind())
+    indexes = []
+    if inspector.has_table('chat_history'):
+        columns = {c['name'] for c in inspector.get_columns('chat_history')}
+        at = 'created_at' if 'created_at' in columns else 'timestamp'
+        indexes += [
+            (f'ix_chat_history_user_id_{at}', 'chat_history', ['user_id', at]),
+            (f'ix_chat_history_user_id_session_id_{at}', 'chat_history', ['user_id', 'session_id', at]),
+        ]
+    for table in ('image_analyses', 'image_analysis'):
+        if inspector.has_table(table):
+            indexes.append((f'ix_{table}_user_id_timestamp', table, ['user_id', 'timestamp']))
+            break
+    return indexes
+
+
+def upgrade() -> None:
+    """Upgrade schema - add composite history indexes."""
+    for name, table, columns in _indexes():
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema - drop composite history indexes."""
+    inspector = sa.inspect(op.get_bind())
+    for name, table, _ in _indexes():
+        if name in {ix['name'] for ix in inspector.get_indexes(table)}:
+            op.drop_index(name, table_name=table)
@@ -30,21 +30,42 @@ class Settings(BaseSettings):
 
     # ── Database ─────────────────────────────────────────────────────────
     DATABASE_URL: str = "sqlite:///./chikitsak.db"
+    DB_QUERY_COUNTER_ENABLED: bool = False  # Count SQL statements per endpoint (/health/db-queries)
+    SQLITE_PRODUCTION_MODE: bool = True  # File SQLite: WAL, tuned pragmas, single writer connection + reader pool
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000  # Wait this long for another process's write lock
+    SQLITE_CACHE_SIZE_KB: int = 65536  # Page cache per connection
+    SQLITE_MMAP_SIZE_MB: int = 256  # Memory-mapped I/O window (0 disables)
+    SQLITE_READ_POOL_SIZE: int = 8  # Reader connections (plus as many overflow)
+    SQLITE_WRITER_TIMEOUT_SECONDS: float = 30.0  # Max wait for the writer connection before erroring
+    PROFILE_CACHE_TTL_SECONDS: float = 30.0  # Per-process cache of user clinical profiles (0 disables)
 
     # ── Auth / JWT ───────────────────────────────────────────────────────
     SECRET_KEY: str = _get_secure_secret_key()
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    AUTH_PRINCIPAL_CACHE_TTL_SECONDS: float = 60.0  # Verified-token cache for get_current_principal (0 disables)
     
     # ── Account Security ────────────────────────────────────────────────–
     MAX_LOGIN_ATTEMPTS: int = 5
     ACCOUNT_LOCKOUT_DURATION_MINUTES: int = 15
+    BCRYPT_ROUNDS: int = 12  # Cost factor for new hashes; older costs are rehashed on login
+    PASSWORD_HASH_WORKERS: int = 0  # bcrypt pool size (0 = half the CPU cores)
+    PASSWORD_HASH_MAX_QUEUE: int = 16  # Hashes allowed to wait for a worker before returning 429
+    PASSWORD_HASH_RETRY_AFTER_SECONDS: int = 1  # Retry-After sent with 429 when the queue is full
 
     # ── Rate Limiting ───────────────────────────────────────────────────–
     RATE_LIMIT_ENABLED: bool = True
     RATE_LIMIT_REQUESTS_PER_MINUTE: int = 60  # Global rate limit
     RATE_LIMIT_AUTH_REQUESTS_PER_MINUTE: int = 10  # Auth endpoints (login, register)
+    RATE_LIMIT_BACKEND: str = "memory"  # "memory" (per worker) or "sqlite" (shared file across workers)
+    RATE_LIMIT_SQLITE_PATH: str = "./rate_limit.db"
+    RATE_LIMIT_SHARDS: int = 16  # Lock stripes for the in-memory store
+    RATE_LIMIT_MAX_KEYS: int = 100_000  # Clients tracked per worker before the oldest are dropped
+    USAGE_METERING_ENABLED: bool = True  # Count per-user daily plan usage (chat, symptom checks, ...)
+    USAGE_LIMITS_ENFORCED: bool = False  # 403 outside the plan, 429 past its daily limits
+    USAGE_FLUSH_INTERVAL_SECONDS: float = 5.0  # Write-behind interval; bounds the counts lost on a crash
+    USAGE_FLUSH_MAX_PENDING: int = 1000  # Flush early once this many increments are buffered
 
     # ── CORS ─────────────────────────────────────────────────────────────
     CORS_ORIGINS: list[str] = ["http://localhost:3000", "http://127.0.0.1:3000"]
@@ -72,10 +93,35 @@ class Settings(BaseSettings):
     OPENROUTER_MODEL: str = "openrouter/auto"  # or specific model like "anthropic/claude-3-5-sonnet"
     LLM_CONFIDENCE_THRESHOLD: float = 0.65  # Use fallback if ML confidence < threshold
     LLM_TIMEOUT: int = 30  # seconds
+    OPENROUTER_BASE_URL: str = "https://openrouter.ai/api/v1"
+    OPENROUTER_MAX_CONCURRENCY: int = 8  # In-flight requests per worker (pooled connections)
+    OPENROUTER_MAX_RETRIES: int = 2  # Retries on 429/5xx/connection errors, with jittered backoff
+    OPENROUTER_RETRY_BACKOFF_SECONDS: float = 0.5  # Backoff base; doubles per attempt (max 8s)
+    OPENROUTER_BREAKER_FAILURES: int = 5  # Consecutive failures before the circuit opens
+    OPENROUTER_BREAKER_RESET_SECONDS: int = 30  # Open time before a single probe call is allowed
+    LLM_CACHE_MAX_ENTRIES: int = 1024  # In-process LRU size for cached LLM responses
+    LLM_CACHE_TTL_SECONDS: int = 300
+    LLM_CACHE_BACKEND: str = "memory"  # memory | sqlite (shared by all workers on the host)
+    LLM_CACHE_SQLITE_PATH: str = "./llm_cache.db"
 
     # ── ML Model Configuration ────────────────────────────────────────────
     ML_MODEL_TIMEOUT: int = 10  # seconds for local ML inference
     GPU_ENABLED: bool = False  # Set True if GPU available
+    INFERENCE_BATCHING_ENABLED: bool = True  # Micro-batch concurrent image classifier requests
+    INFERENCE_BATCH_MAX_SIZE: int = 16  # Max images per batched forward pass
+    INFERENCE_BATCH_WINDOW_MS: float = 5.0  # How long to wait for more requests before running a batch
+    INFERENCE_MAX_WORKERS: int = 0  # Inference thread pool size (0 = torch.get_num_threads())
+    INFERENCE_MAX_QUEUE: int = 32  # Requests allowed to wait for a worker before returning 503
+    INFERENCE_RETRY_AFTER_SECONDS: int = 2  # Retry-After sent with 503 when the queue is full
+    MEDQUAD_RETRIEVAL_BACKEND: str = "ivf"  # ivf | exact
+    MEDQUAD_IVF_NPROBE: int = 8  # IVF cells scanned per MedQuAD query
+    TRIAGE_BATCH_MAX_ROWS: int = 1000  # Max intake forms per /symptoms/analyze/batch request
+    HEALTH_ORCHESTRATOR_PARALLEL: bool = True  # Run /full-health/analyze engines concurrently
+    HEALTH_ORCHESTRATOR_WORKERS: int = 4  # Thread pool for the CPU-bound engine stages
+    HEALTH_STAGE_TIMEOUT_SECONDS: float = 10.0  # Per-stage budget; slower stages are dropped from the result
+    CHIKITSAK_PIPELINE_WORKERS: int = 8  # Thread pool for the chat analysis stages (CDSS, triage, RAG, XAI)
+    CHIKITSAK_STAGE_BUDGET_SECONDS: float = 5.0  # Budget for each local analysis stage
+    CHIKITSAK_TRIAGE_BUDGET_SECONDS: float = 8.0  # Triage budget; past it the LLM fallback is abandoned for the local model
 
     # ── Email / MailBluster ──────────────────────────────────────────────
     MAILBLUSTER_API_KEY: str = ""
@@ -1,6 +1,8 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
 from sqlalchemy.pool import QueuePool, StaticPool
+from sqlalchemy.sql.dml import UpdateBase
+from sqlalchemy.sql.elements import TextClause
 from backend.app.config import get_settings
 
 settings = get_settings()
@@ -8,19 +10,107 @@ settings = get_settings()
 # SQLite needs check_same_thread=False
 # PostgreSQL uses QueuePool with configurable pool size.
 is_sqlite = "sqlite" in settings.DATABASE_URL
+is_memory_sqlite = is_sqlite and (":memory:" in settings.DATABASE_URL or settings.DATABASE_URL.rstrip("/") == "sqlite:")
+
+# File-based SQLite in production mode: WAL, tuned pragmas, one writer connection, a reader pool
+sqlite_production = is_sqlite and not is_memory_sqlite and settings.SQLITE_PRODUCTION_MODE
+
+
+def _sqlite_pragmas(read_only: bool):
+    """Connect hook applying the production pragmas to every new SQLite connection."""
+    def on_connect(dbapi_conn, connection_record):
+        # Let SQLAlchemy's "begin" hook below emit BEGIN instead of pysqlite
+        dbapi_conn.isolation_level = None
+        cursor = dbapi_conn.cursor()
+        cursor.execute("PRAGMA journal_mode = WAL")
+        cursor.execute("PRAGMA synchronous = NORMAL")  # durable on commit checkpoint; safe with WAL
+        cursor.execute(f"PRAGMA busy_timeout = {int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+        cursor.execute(f"PRAGMA cache_size = -{int(settings.SQLITE_CACHE_SIZE_KB)}")
+        cursor.execute(f"PRAGMA mmap_size = {int(settings.SQLITE_MMAP_SIZE_MB) * 1024 * 1024}")
+        cursor.execute("PRAGMA temp_store = MEMORY")
+        if read_only:
+            cursor.execute("PRAGMA query_only = ON")
+        cursor.close()
+    return on_connect
+
+
+def create_sqlite_engine(url: str, read_only: bool):
+    """File SQLite engine with the production pragmas: the single writer, or the reader pool."""
+    if read_only:
+        pool_kwargs = {"pool_size": settings.SQLITE_READ_POOL_SIZE, "max_overflow": settings.SQLITE_READ_POOL_SIZE}
+    else:
+        # A single connection: concurrent writers queue for it in-process instead of
+        # racing for SQLite's write lock and failing with "database is locked"
+        pool_kwargs = {"pool_size": 1, "max_overflow": 0, "pool_timeout": settings.SQLITE_WRITER_TIMEOUT_SECONDS}
+    sqlite_engine = create_engine(
+        url,
+        connect_args={"check_same_thread": False},
+        poolclass=QueuePool,
+        **pool_kwargs,
+    )
+    event.listen(sqlite_engine, "connect", _sqlite_pragmas(read_only))
+    # Writers take the write lock up front (other processes wait out busy_timeout); readers
+    # read a consistent WAL snapshot
+    begin = "BEGIN" if read_only else "BEGIN IMMEDIATE"
+    event.listen(sqlite_engine, "begin", lambda conn: conn.exec_driver_sql(begin))
+    return sqlite_engine
+
+
+def _is_write(clause) -> bool:
+    if isinstance(clause, UpdateBase):
+        return True
+    if isinstance(clause, TextClause):
+        return clause.text.lstrip()[:7].upper().startswith(("INSERT", "UPDATE", "DELETE", "REPLACE"))
+    return False
+
+
+class RoutingSession(Session):
+    """
+    Session that reads through ``reader`` and writes through its bind.
+
+    From a transaction's first write (a flush, or an INSERT/UPDATE/DELETE
+    statement) until its commit or rollback, everything goes to the writer,
+    so the transaction reads its own uncommitted changes.
+    """
+
+    _writing = False
+
+    def __init__(self, *args, reader=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.reader = reader
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self._writing or self._flushing or _is_write(clause):
+            self._writing = True
+            return self.bind
+        return self.reader
+
+
+@event.listens_for(RoutingSession, "after_transaction_end")
+def _release_writer(session, transaction):
+    if transaction.parent is None:
+        session._writing = False
+
 
 engine_kwargs: dict = {}
-if is_sqlite:
-    engine_kwargs["connect_args"] = {"check_same_thread": False}
-    # Do NOT use StaticPool for file-based SQLite; it restricts to a single connection.
+if sqlite_production:
+    engine = create_sqlite_engine(settings.DATABASE_URL, read_only=False)
+    read_engine = create_sqlite_engine(settings.DATABASE_URL, read_only=True)
+    SessionLocal = sessionmaker(class_=RoutingSession, autocommit=False, autoflush=False,
+                                bind=engine, reader=read_engine)
 else:
-    engine_kwargs["poolclass"] = QueuePool
-    engine_kwargs["pool_size"] = 10
-    engine_kwargs["max_overflow"] = 20
-    engine_kwargs["pool_pre_ping"] = True  # Reconnect stale connections
+    if is_sqlite:
+        engine_kwargs["connect_args"] = {"check_same_thread": False}
+        # Do NOT use StaticPool for file-based SQLite; it restricts to a single connection.
+    else:
+        engine_kwargs["poolclass"] = QueuePool
+        engine_kwargs["pool_size"] = 10
+        engine_kwargs["max_overflow"] = 20
+        engine_kwargs["pool_pre_ping"] = True  # Reconnect stale connections
 
-engine = create_engine(settings.DATABASE_URL, **engine_kwargs)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    engine = create_engine(settings.DATABASE_URL, **engine_kwargs)
+    read_engine = engine
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 
@@ -31,3 +121,18 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def database_stats() -> dict:
+    """Connection layout and pool usage, for /health/database."""
+    stats = {
+        "dialect": engine.dialect.name,
+        "sqlite_production_mode": sqlite_production,
+        "pool": engine.pool.status(),
+    }
+    if sqlite_production:
+        with read_engine.connect() as conn:
+            stats["journal_mode"] = conn.exec_driver_sql("PRAGMA journal_mode").scalar()
+        stats["writer_pool"] = stats.pop("pool")
+        stats["reader_pool"] = read_engine.pool.status()
+    return stats
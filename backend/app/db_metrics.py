@@ -0,0 +1,117 @@
+"""
+SQL statement counting per endpoint.
+
+A ``before_cursor_execute`` listener on the engine bumps the counter of
+whatever request is current. ``QueryCountMiddleware`` opens a counter for
+each HTTP request and, once it finishes, folds it into per-route totals
+(keyed by the route template, e.g. ``/chat/history``), exposed at
+``/health/db-queries``.
+
+The counter lives in a ContextVar holding a mutable object: the thread
+pool that runs sync endpoints and dependencies copies the request's
+context, so statements issued from worker threads land on the same
+counter.
+
+Enabled with DB_QUERY_COUNTER_ENABLED. ``count_queries()`` counts a block
+of code directly (tests, benchmarks).
+"""
+
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+
+class QueryCount:
+    """Statements issued while this counter was current."""
+
+    __slots__ = ("count", "statements", "_keep")
+
+    def __init__(self, keep_statements: bool = False):
+        self.count = 0
+        self.statements: List[str] = []
+        self._keep = keep_statements
+
+    def add(self, statement: str) -> None:
+        self.count += 1
+        if self._keep:
+            self.statements.append(statement)
+
+
+_current: ContextVar[Optional[QueryCount]] = ContextVar("db_query_count", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    counter = _current.get()
+    if counter is not None:
+        counter.add(statement)
+
+
+def install_query_counter(engine: Engine) -> None:
+    """Attach the counting listener to ``engine`` (idempotent)."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+
+
+@contextmanager
+def count_queries(keep_statements: bool = False) -> Iterator[QueryCount]:
+    """Count the statements issued inside the block (the listener must be installed)."""
+    counter = QueryCount(keep_statements)
+    token = _current.set(counter)
+    try:
+        yield counter
+    finally:
+        _current.reset(token)
+
+
+# ── Per-endpoint totals ───────────────────────────────────────────────
+
+_lock = threading.Lock()
+_by_route: Dict[str, Dict[str, Any]] = {}
+
+
+def _record(route: str, count: int) -> None:
+    with _lock:
+        entry = _by_route.setdefault(route, {"requests": 0, "statements": 0, "max": 0})
+        entry["requests"] += 1
+        entry["statements"] += count
+        entry["max"] = max(entry["max"], count)
+
+
+def query_stats() -> Dict[str, Dict[str, Any]]:
+    """``{"METHOD /route": {requests, statements, max, avg}}``."""
+    with _lock:
+        return {
+            route: {**entry, "avg": round(entry["statements"] / entry["requests"], 2)}
+            for route, entry in sorted(_by_route.items())
+        }
+
+
+def reset_query_stats() -> None:
+    with _lock:
+        _by_route.clear()
+
+
+class QueryCountMiddleware:
+    """Pure ASGI middleware attributing SQL statements to the matched route."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with count_queries() as counter:
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                # The router stores the matched route on the (shared) scope
+                route = scope.get("route")
+                path = getattr(route, "path", None) or "<unmatched>"
+                _record(f"{scope['method']} {path}", counter.count)
@@ -6,6 +6,8 @@ from fastapi import FastAPI, Request, HTTPException
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
 from backend.app.logging_config import get_logger
+from backend.app.responses import EnvelopeResponse
+from backend.app.services.password_hasher import PasswordHasherBusy
 
 logger = get_logger("exception_handlers")
 
@@ -16,20 +18,21 @@ def register_exception_handlers(app: FastAPI) -> None:
     @app.exception_handler(HTTPException)
     async def http_exception_handler(request: Request, exc: HTTPException):
         logger.warning("HTTP %d on %s: %s", exc.status_code, request.url.path, exc.detail)
-        return JSONResponse(
+        return EnvelopeResponse(
             status_code=exc.status_code,
             content={
                 "status": "error",
                 "data": None,
                 "message": exc.detail,
             },
+            headers=getattr(exc, "headers", None),
         )
 
     @app.exception_handler(RequestValidationError)
     async def validation_exception_handler(request: Request, exc: RequestValidationError):
         errors = exc.errors()
         logger.warning("Validation error on %s: %s", request.url.path, errors)
-        return JSONResponse(
+        return EnvelopeResponse(
             status_code=422,
             content={
                 "status": "error",
@@ -38,9 +41,25 @@ def register_exception_handlers(app: FastAPI) -> None:
             },
         )
 
+    @app.exception_handler(PasswordHasherBusy)
+    async def password_hasher_busy_handler(request: Request, exc: PasswordHasherBusy):
+        logger.warning("Password hashing queue full, rejecting %s", request.url.path)
+        return EnvelopeResponse(
+            status_code=429,
+            content={
+                "status": "error",
+                "data": None,
+                "message": "Too many authentication requests. Please retry shortly.",
+            },
+            headers={"Retry-After": str(exc.retry_after)},
+        )
+
     @app.exception_handler(Exception)
     async def unhandled_exception_handler(request: Request, exc: Exception):
         logger.error("Unhandled exception on %s: %s", request.url.path, str(exc), exc_info=True)
+        # Served by Starlette's outermost ServerErrorMiddleware, outside the
+        # response wrapper, so this returns a plain JSONResponse without the
+        # envelope marker header
         return JSONResponse(
             status_code=500,
             content={
@@ -9,7 +9,7 @@ from sqlalchemy import text
 
 from backend.app.config import get_settings
 from backend.app.logging_config import setup_logging, get_logger
-from backend.app.database import engine, Base
+from backend.app.database import engine, read_engine, Base
 from backend.app.middleware import ResponseWrapperMiddleware
 from backend.app.exception_handlers import register_exception_handlers
 
@@ -115,6 +115,23 @@ TAGS_METADATA = [
 # Lifespan Events
 # ─────────────────────────────────────────
 
+def _backfill_daily_rollups() -> None:
+    """Fill daily_rollups from the raw logs when create_all has just added it (or it was never backfilled)."""
+    from backend.app.database import SessionLocal
+    from backend.app.services.daily_rollup import backfill_if_empty
+
+    db = SessionLocal()
+    try:
+        written = backfill_if_empty(db)
+        if written:
+            logger.info("Backfilled %d daily rollup rows", written)
+    except Exception as e:
+        db.rollback()
+        logger.warning("Daily rollup backfill skipped: %s", e)
+    finally:
+        db.close()
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     setup_logging()
@@ -122,14 +139,29 @@ async def lifespan(app: FastAPI):
     import backend.app.models  # noqa: F401 – ensure all models register with Base
     Base.metadata.create_all(bind=engine)
     _ensure_sqlite_columns()
+    _backfill_daily_rollups()
 
     # Pre-load ML models
     from backend.app.engine_startup import init_engines
     init_engines()
 
+    from backend.app.services.openrouter_client import start_openrouter_client, close_openrouter_client
+    await start_openrouter_client()
+
     logger.info("Chikitsak API is ready")
     yield
     logger.info("Shutting down…")
+    await close_openrouter_client()
+    from backend.app.services.inference_executor import shutdown_inference_executor
+    shutdown_inference_executor()
+    from backend.app.services.health_orchestrator import shutdown_orchestrator_pool
+    shutdown_orchestrator_pool()
+    from backend.app.services.stage_pipeline import shutdown_pipeline_pool
+    shutdown_pipeline_pool()
+    from backend.app.services.password_hasher import shutdown_password_hasher
+    shutdown_password_hasher()
+    from backend.app.services.usage_meter import shutdown_usage_meter
+    shutdown_usage_meter()
 
 # ─────────────────────────────────────────
 # App Initialization
@@ -157,6 +189,16 @@ register_exception_handlers(app)
 
 app.add_middleware(ResponseWrapperMiddleware)
 
+if settings.RATE_LIMIT_ENABLED:
+    from backend.app.rate_limit import RateLimitMiddleware
+    app.add_middleware(RateLimitMiddleware)
+
+if settings.DB_QUERY_COUNTER_ENABLED:
+    from backend.app.db_metrics import QueryCountMiddleware, install_query_counter
+    install_query_counter(engine)
+    install_query_counter(read_engine)
+    app.add_middleware(QueryCountMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.CORS_ORIGINS,
@@ -2,65 +2,79 @@
 Global response wrapper middleware.
 
 Wraps all JSON responses in a consistent envelope:
-    { "success": bool, "data": ..., "message": str }
+    { "status": "success" | "error", "data": ..., "message": str }
 
-File-upload responses (e.g. multipart) are passed through unchanged.
+Pure ASGI: responses rendered by ``EnvelopeResponse`` (already enveloped)
+and non-JSON responses (file downloads, HTML, redirects, event streams) are
+forwarded without buffering. Only other JSON responses are buffered, parsed
+and re-wrapped.
 """
 
-import json
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
-from starlette.requests import Request
-from starlette.responses import Response, StreamingResponse, JSONResponse
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from backend.app.responses import ENVELOPE_HEADER, envelope, is_envelope, json_dumps, json_loads
 
-class ResponseWrapperMiddleware(BaseHTTPMiddleware):
+_DOCS_PATHS = ("/docs", "/redoc", "/openapi.json")
 
-    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
-        response = await call_next(request)
 
-        # Skip wrapping for non-JSON responses (file downloads, HTML, redirects, etc.)
-        content_type = response.headers.get("content-type", "")
-        if "application/json" not in content_type:
-            return response
+class ResponseWrapperMiddleware:
 
-        # Skip OpenAPI docs endpoints
-        if request.url.path in ("/docs", "/redoc", "/openapi.json"):
-            return response
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
 
-        # Read the original body
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        # Skip non-HTTP traffic and the OpenAPI docs endpoints
+        if scope["type"] != "http" or scope["path"] in _DOCS_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Message = {}
         body_chunks: list[bytes] = []
-        async for chunk in response.body_iterator:
-            body_chunks.append(chunk if isinstance(chunk, bytes) else chunk.encode())
-        raw_body = b"".join(body_chunks)
-
-        try:
-            original = json.loads(raw_body)
-        except (json.JSONDecodeError, ValueError):
-            return response  # Not valid JSON — pass through
-
-        # If response already follows the API envelope contract, don't re-wrap.
-        if (
-            isinstance(original, dict)
-            and "status" in original
-            and ("message" in original or "data" in original or "response" in original)
-        ):
-            return JSONResponse(content=original, status_code=response.status_code)
-
-        is_success = 200 <= response.status_code < 400
-        status_str = "success" if is_success else "error"
-
-        # Construct the standardized envelope
-        wrapped = {
-            "status": status_str,
-            "data": original if is_success else (original.get("data") if isinstance(original, dict) else None),
-            "message": "OK" if is_success else (original.get("detail", "An error occurred") if isinstance(original, dict) else str(original)),
-        }
-
-        # Inject confidence if available in the original response
-        if isinstance(original, dict) and "confidence" in original:
-            wrapped["confidence"] = original["confidence"]
-
-        return JSONResponse(
-            content=wrapped,
-            status_code=response.status_code,
-        )
+        buffering = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start_message, buffering
+
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                if ENVELOPE_HEADER in headers:
+                    del headers[ENVELOPE_HEADER]
+                    await send(message)
+                elif "application/json" not in headers.get("content-type", ""):
+                    await send(message)
+                else:
+                    start_message = message
+                    buffering = True
+                return
+
+            if message["type"] != "http.response.body" or not buffering:
+                await send(message)
+                return
+
+            body_chunks.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+            raw_body = b"".join(body_chunks)
+            body = _wrap_body(raw_body, start_message["status"])
+
+            if body is not raw_body:
+                headers = MutableHeaders(scope=start_message)
+                headers["content-length"] = str(len(body))
+            await send(start_message)
+            await send({"type": "http.response.body", "body": body, "more_body": False})
+
+        await self.app(scope, receive, send_wrapper)
+
+
+def _wrap_body(raw_body: bytes, status_code: int) -> bytes:
+    """Envelope a legacy route's JSON body; invalid JSON and envelopes pass through."""
+    try:
+        original = json_loads(raw_body)
+    except ValueError:
+        return raw_body  # Not valid JSON — pass through
+
+    # If response already follows the API envelope contract, don't re-wrap.
+    if is_envelope(original):
+        return raw_body
+    return json_dumps(envelope(original, status_code))
@@ -0,0 +1,288 @@
+"""
+Approximate nearest-neighbour index for TF-IDF retrieval.
+
+Pure-NumPy IVF (inverted file) index over LSA vectors:
+
+1. TruncatedSVD projects the L2-normalised TF-IDF rows to a dense
+   ``n_components`` space (LSA), re-normalised to unit length.
+2. k-means partitions those vectors into ``n_lists`` cells.
+3. A query is projected the same way, the ``n_probe`` nearest cells are
+   scanned in LSA space, and the best few candidates — plus the postings
+   of the query's rare terms, which LSA tends to smear out — are re-ranked
+   with the exact sparse TF-IDF cosine so returned scores match the
+   brute-force path.
+
+The index is saved as ``.npy`` files that are memory-mapped on load, and
+tagged with a corpus fingerprint so a stale index is rebuilt rather than
+silently reused.
+"""
+
+import hashlib
+import json
+import os
+from typing import Iterable, Optional, Tuple
+
+import numpy as np
+
+from backend.app.logging_config import get_logger
+
+logger = get_logger("ml_models.ann_index")
+
+INDEX_VERSION = 2
+
+# Arrays persisted as ivf_<name>.npy (memory-mapped on load)
+_ARRAYS = ("term_vectors", "centroids", "list_offsets", "list_ids", "list_vectors")
+
+# Candidates re-ranked exactly per requested result (top_k * factor, floor below)
+_RERANK_FACTOR = 4
+_RERANK_MIN = 20
+# Upper bound on documents pulled in from rare-term postings per query
+_MAX_POSTINGS = 256
+
+
+def corpus_fingerprint(texts: Iterable[str]) -> str:
+    """Stable hash of the indexed documents, used to detect stale index files."""
+    digest = hashlib.sha1()
+    for text in texts:
+        digest.update(text.encode("utf-8", errors="ignore"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+def _normalize_rows(x: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(x, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return x / norms
+
+
+def _kmeans(x: np.ndarray, k: int, iterations: int, seed: int) -> np.ndarray:
+    """Spherical k-means (cosine) on unit-length rows; returns unit-length centroids."""
+    rng = np.random.default_rng(seed)
+    centroids = x[rng.choice(len(x), size=k, replace=False)].copy()
+    for _ in range(iterations):
+        assign = np.argmax(x @ centroids.T, axis=1)
+        for c in range(k):
+            members = x[assign == c]
+            if len(members):
+                centroids[c] = members.sum(axis=0)
+            else:  # re-seed empty cells on a random point
+                centroids[c] = x[rng.integers(len(x))]
+        centroids = _normalize_rows(centroids)
+    return centroids.astype(np.float32)
+
+
+class IVFIndex:
+    """IVF index over LSA projections of a TF-IDF matrix."""
+
+    def __init__(
+        self,
+        term_vectors: np.ndarray,
+        centroids: np.ndarray,
+        list_offsets: np.ndarray,
+        list_ids: np.ndarray,
+        list_vectors: np.ndarray,
+        fingerprint: str = "",
+        n_probe: int = 8,
+    ):
+        self.term_vectors = term_vectors      # (vocab, n_components) SVD components, transposed
+        self.centroids = centroids            # (n_lists, n_components)
+        self.list_offsets = list_offsets      # (n_lists + 1,) CSR-style offsets into list_ids
+        self.list_ids = list_ids              # document ids grouped by cell
+        self.list_vectors = list_vectors      # unit-length LSA rows, same order as list_ids
+        self.fingerprint = fingerprint
+        self.n_probe = n_probe
+        self._postings = None                 # CSC copy of the TF-IDF matrix, see attach_postings
+
+    @property
+    def n_lists(self) -> int:
+        return len(self.centroids)
+
+    @property
+    def n_components(self) -> int:
+        return self.term_vectors.shape[1]
+
+    # ── Build / persist ───────────────────────────────────────────────
+
+    @classmethod
+    def build(
+        cls,
+        tfidf_matrix,
+        n_components: int = 128,
+        n_lists: Optional[int] = None,
+        n_probe: int = 8,
+        fingerprint: str = "",
+        kmeans_iterations: int = 10,
+        seed: int = 42,
+    ) -> "IVFIndex":
+        from sklearn.decomposition import TruncatedSVD
+
+        n_docs, vocab = tfidf_matrix.shape
+        n_components = max(2, min(n_components, vocab - 1, n_docs - 1))
+        n_lists = n_lists or max(1, int(np.sqrt(n_docs)))
+        n_lists = min(n_lists, n_docs)
+
+        svd = TruncatedSVD(n_components=n_components, random_state=seed)
+        vectors = _normalize_rows(svd.fit_transform(tfidf_matrix)).astype(np.float32)
+        centroids = _kmeans(vectors, n_lists, kmeans_iterations, seed)
+
+        assign = np.argmax(vectors @ centroids.T, axis=1)
+        order = np.argsort(assign, kind="stable")
+        counts = np.bincount(assign, minlength=n_lists)
+        offsets = np.concatenate(([0], np.cumsum(counts))).astype(np.int64)
+
+        logger.info(
+            "Built IVF index: %d docs, %d dims, %d lists (largest=%d)",
+            n_docs, n_components, n_lists, int(counts.max()),
+        )
+        return cls(
+            term_vectors=np.ascontiguousarray(svd.components_.T, dtype=np.float32),
+            centroids=centroids,
+            list_offsets=offsets,
+            list_ids=order.astype(np.int32),
+            list_vectors=np.ascontiguousarray(vectors[order]),
+            fingerprint=fingerprint,
+            n_probe=n_probe,
+        )
+
+    def save(self, directory: str) -> None:
+        """Write the index arrays as ``ivf_*.npy`` files (plus ``ivf.json``) into ``directory``."""
+        os.makedirs(directory, exist_ok=True)
+        for name in _ARRAYS:
+            tmp_path = os.path.join(directory, f"ivf_{name}.tmp.npy")
+            np.save(tmp_path, getattr(self, name))
+            os.replace(tmp_path, os.path.join(directory, f"ivf_{name}.npy"))
+        # ivf.json last: its presence marks a complete index
+        tmp_meta = os.path.join(directory, "ivf.json.tmp")
+        with open(tmp_meta, "w", encoding="utf-8") as f:
+            json.dump({"version": INDEX_VERSION, "fingerprint": self.fingerprint}, f)
+        os.replace(tmp_meta, os.path.join(directory, "ivf.json"))
+
+    @classmethod
+    def load(
+        cls,
+        directory: str,
+        fingerprint: Optional[str] = None,
+        n_probe: int = 8,
+        mmap: bool = True,
+    ) -> Optional["IVFIndex"]:
+        """Load a saved index; returns None if missing, outdated, or built for another corpus."""
+        meta_path = os.path.join(directory, "ivf.json")
+        if not os.path.exists(meta_path):
+            return None
+        try:
+            with open(meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+            if meta.get("version") != INDEX_VERSION:
+                return None
+            if fingerprint is not None and meta.get("fingerprint") != fingerprint:
+                logger.info("IVF index in %s is stale, rebuilding", directory)
+                return None
+            arrays = {
+                name: np.load(os.path.join(directory, f"ivf_{name}.npy"), mmap_mode="r" if mmap else None)
+                for name in _ARRAYS
+            }
+            return cls(fingerprint=meta["fingerprint"], n_probe=n_probe, **arrays)
+        except Exception as e:
+            logger.warning("Failed to load IVF index from %s: %s", directory, e)
+            return None
+
+    def attach_postings(self, tfidf_matrix) -> "IVFIndex":
+        """Keep a column-major view of the matrix so rare query terms can add candidates."""
+        self._postings = tfidf_matrix.tocsc(copy=False)
+        return self
+
+    # ── Search ────────────────────────────────────────────────────────
+
+    def project(self, query_tfidf) -> np.ndarray:
+        """LSA projection of a ``(1, vocab)`` sparse query, touching only its non-zero terms."""
+        q = query_tfidf.tocsr()
+        if q.nnz == 0:
+            return np.zeros(self.n_components, dtype=np.float32)
+        return (q.data.astype(np.float32) @ self.term_vectors[q.indices]).astype(np.float32)
+
+    def candidates(self, query_tfidf, n_probe: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Document ids in the ``n_probe`` cells nearest to the query, with their LSA scores."""
+        n_probe = min(n_probe or self.n_probe, self.n_lists)
+        projected = self.project(query_tfidf)
+        cell_scores = self.centroids @ projected
+        if n_probe < self.n_lists:
+            cells = np.argpartition(-cell_scores, n_probe - 1)[:n_probe]
+        else:
+            cells = np.arange(self.n_lists)
+
+        offsets = self.list_offsets
+        spans = [slice(offsets[c], offsets[c + 1]) for c in cells]
+        ids = np.concatenate([self.list_ids[span] for span in spans])
+        scores = np.concatenate([self.list_vectors[span] @ projected for span in spans])
+        return ids, scores
+
+    def rare_term_candidates(self, query_tfidf, max_postings: int = _MAX_POSTINGS) -> np.ndarray:
+        """Documents containing the query's rarest terms, up to ``max_postings`` in total."""
+        q = query_tfidf.tocsr()
+        if self._postings is None or q.nnz == 0:
+            return np.empty(0, dtype=np.int32)
+        indptr = self._postings.indptr
+        df = indptr[q.indices + 1] - indptr[q.indices]
+        chunks, total = [], 0
+        for term, count in sorted(zip(q.indices, df), key=lambda t: t[1]):
+            if total + count > max_postings:
+                break
+            chunks.append(self._postings.indices[indptr[term]:indptr[term + 1]])
+            total += count
+        return np.concatenate(chunks) if chunks else np.empty(0, dtype=np.int32)
+
+    def search(
+        self, query_tfidf, tfidf_matrix, top_k: int = 5, n_probe: Optional[int] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Top-k (ids, cosine scores) for a single ``(1, vocab)`` TF-IDF query.
+
+        Candidates come from the IVF cells, pre-ranked in LSA space, plus any
+        rare-term postings; the shortlist is scored with exact TF-IDF cosines
+        (rows from TfidfVectorizer are already L2-normalised).
+        """
+        ids, approx_scores = self.candidates(query_tfidf, n_probe)
+        shortlist = max(top_k * _RERANK_FACTOR, _RERANK_MIN)
+        if len(ids) > shortlist:
+            ids = ids[np.argpartition(-approx_scores, shortlist - 1)[:shortlist]]
+        ids = np.unique(np.concatenate((ids, self.rare_term_candidates(query_tfidf))))
+        if len(ids) == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        return top_k_scores(ids, sparse_row_dots(tfidf_matrix, ids, query_tfidf), top_k)
+
+
+def sparse_row_dots(matrix, ids: np.ndarray, query_tfidf) -> np.ndarray:
+    """Dot products of selected CSR rows with a sparse query, without slicing the matrix."""
+    q = query_tfidf.tocsr()
+    dense_query = np.zeros(matrix.shape[1], dtype=np.float64)
+    dense_query[q.indices] = q.data
+
+    starts = matrix.indptr[ids]
+    lengths = matrix.indptr[ids + 1] - starts
+    rows = np.repeat(np.arange(len(ids)), lengths)
+    # Positions of every stored value in the selected rows
+    positions = np.arange(lengths.sum()) + np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+    contributions = matrix.data[positions] * dense_query[matrix.indices[positions]]
+    return np.bincount(rows, weights=contributions, minlength=len(ids))
+
+
+def exact_search(query_tfidf, tfidf_matrix, top_k: int = 5) -> Tuple[np.ndarray, np.ndarray]:
+    """Brute-force top-k cosine search over the full TF-IDF matrix (reference path)."""
+    scores = np.asarray((tfidf_matrix @ query_tfidf.T).todense()).ravel()
+    return top_k_scores(np.arange(len(scores)), scores, top_k)
+
+
+def top_k_scores(ids: np.ndarray, scores: np.ndarray, top_k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Select the ``top_k`` highest scores (ties broken by lower id), best first."""
+    top_k = min(top_k, len(scores))
+    if top_k <= 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+    if top_k < len(scores):
+        # Keep every score tied with the k-th so the id tie-break is exact
+        kth = -np.partition(-scores, top_k - 1)[top_k - 1]
+        part = np.flatnonzero(scores >= kth)
+    else:
+        part = np.arange(len(scores))
+    order = np.lexsort((ids[part], -scores[part]))
+    chosen = part[order][:top_k]
+    return ids[chosen].astype(np.int64), scores[chosen]
@@ -0,0 +1,49 @@
+"""
+Offline build step for retrieval artifacts.
+
+Fits the MedQuAD and medical-RAG TF-IDF vectorizers once and writes the
+vocabulary, IDF weights, CSR/CSC matrices and the MedQuAD IVF index under
+``ml_models/artifacts/``, along with the compiled drug interaction pair
+index. Workers then memory-map / unpickle these files at startup instead of
+refitting.
+
+Run from the repository root (e.g. in the Docker build or a deploy hook):
+    python -m backend.app.ml_models.build_artifacts
+"""
+
+import os
+import sys
+import time
+
+
+def main() -> int:
+    from backend.app.logging_config import setup_logging, get_logger
+    from backend.app.ml_models import drug_engine, medquad_engine
+    from backend.app.services import medical_rag
+
+    setup_logging()
+    logger = get_logger("ml_models.build_artifacts")
+
+    builds = [("medical_rag", medical_rag.build_artifacts)]
+    if os.path.exists(medquad_engine.MEDQUAD_PATH):
+        builds.insert(0, ("medquad", medquad_engine.build_artifacts))
+    else:
+        logger.warning("Skipping medquad artifacts: %s not found", medquad_engine.MEDQUAD_PATH)
+    if os.path.exists(drug_engine.DRUG_PATH):
+        builds.append(("drug_interactions", drug_engine.build_artifacts))
+    else:
+        logger.warning("Skipping drug interaction index: %s not found", drug_engine.DRUG_PATH)
+
+    failures = 0
+    for name, build in builds:
+        start = time.perf_counter()
+        if build():
+            logger.info("Built %s artifacts in %.2fs", name, time.perf_counter() - start)
+        else:
+            logger.error("Failed to build %s artifacts", name)
+            failures += 1
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
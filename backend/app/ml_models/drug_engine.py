@@ -1,51 +1,153 @@
 import os
+import threading
 
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../"))
 DRUG_PATH = os.path.join(BASE_DIR, "datasets", "medication", "db_drug_interactions.csv")
+ARTIFACTS_DIR = os.path.join(os.path.dirname(__file__), "artifacts")
+DRUG_ARTIFACT_PATH = os.path.join(ARTIFACTS_DIR, "drug_interactions.pkl")
 
-_drug_df = None
+# Bump when the pickled index layout changes
+INDEX_VERSION = 1
 
+_index = None
+_index_lock = threading.Lock()
 
-def _get_drug_df():
-    global _drug_df
-    if _drug_df is None:
-        import pandas as pd
+
+def _normalise(name):
+    """Canonical drug name: lower case, surrounding/repeated whitespace collapsed."""
+    return " ".join(str(name).lower().split())
+
+
+def _read_drug_df():
+    import pandas as pd
+    df = pd.read_csv(DRUG_PATH)
+    df.columns = [c.strip().lower() for c in df.columns]
+    return df
+
+
+# ── Pair index ─────────────────────────────────────────────────────────────
+
+
+def _csv_fingerprint(path):
+    import hashlib
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def compile_interaction_index(df):
+    """
+    ``{frozenset({name_a, name_b}): (interaction, severity)}`` from the CSV rows.
+
+    Either orientation of a pair maps to one key; the first row for a pair
+    wins, as ``match.iloc[0]`` did in the row scan.
+    """
+    has_severity = "severity" in df.columns
+    severities = df["severity"].tolist() if has_severity else ["Unknown"] * len(df)
+    index = {}
+    for d1, d2, interaction, severity in zip(
+        df["drug1"].tolist(), df["drug2"].tolist(), df["interaction"].tolist(), severities
+    ):
+        if not isinstance(d1, str) or not isinstance(d2, str):
+            continue
+        index.setdefault(frozenset((_normalise(d1), _normalise(d2))), (interaction, severity))
+    return index
+
+
+def _load_persisted_index(fingerprint):
+    import pickle
+    try:
+        with open(DRUG_ARTIFACT_PATH, "rb") as f:
+            payload = pickle.load(f)
+        if payload.get("version") != INDEX_VERSION or payload.get("fingerprint") != fingerprint:
+            return None
+        return payload["index"]
+    except Exception:
+        # Missing, truncated or foreign file: rebuild from the CSV
+        return None
+
+
+def _persist_index(index, fingerprint):
+    import pickle
+    import uuid
+    os.makedirs(os.path.dirname(DRUG_ARTIFACT_PATH), exist_ok=True)
+    tmp_path = f"{DRUG_ARTIFACT_PATH}.tmp-{uuid.uuid4().hex[:8]}"
+    try:
+        with open(tmp_path, "wb") as f:
+            pickle.dump(
+                {"version": INDEX_VERSION, "fingerprint": fingerprint, "index": index},
+                f, protocol=pickle.HIGHEST_PROTOCOL,
+            )
+        os.replace(tmp_path, DRUG_ARTIFACT_PATH)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _load_index():
+    """The pair index, from the persisted artifact when it matches the CSV, else compiled."""
+    global _index
+    if _index is not None:
+        return _index
+    with _index_lock:
+        if _index is not None:
+            return _index
+        from backend.app.logging_config import get_logger
+        logger = get_logger("ml_models.drug_engine")
         if not os.path.exists(DRUG_PATH):
-            from backend.app.logging_config import get_logger
-            get_logger("ml_models.drug_engine").warning(f"Engine data absent: {DRUG_PATH}")
+            logger.warning(f"Engine data absent: {DRUG_PATH}")
             return None
-        _drug_df = pd.read_csv(DRUG_PATH)
-        _drug_df.columns = [c.strip().lower() for c in _drug_df.columns]
-    return _drug_df
+
+        fingerprint = _csv_fingerprint(DRUG_PATH)
+        index = _load_persisted_index(fingerprint)
+        if index is None:
+            index = compile_interaction_index(_read_drug_df())
+            try:
+                _persist_index(index, fingerprint)
+            except OSError as e:
+                logger.warning("Could not persist drug interaction index: %s", e)
+        _index = index
+    return _index
+
+
+def build_artifacts():
+    """Offline build: compile and persist the drug interaction pair index."""
+    global _index
+    if os.path.exists(DRUG_ARTIFACT_PATH):
+        os.remove(DRUG_ARTIFACT_PATH)
+    _index = None
+    return _load_index() is not None
+
+
+# ── Lookup ─────────────────────────────────────────────────────────────────
+
+
+def _interactions_result(interactions_found):
+    if not interactions_found:
+        return {"status": "No interactions found", "details": []}
+    return {"status": "Interactions detected", "details": interactions_found}
 
 
 def check_drug_interactions(med_list):
-    drug_df = _get_drug_df()
-    if drug_df is None:
+    index = _load_index()
+    if index is None:
         return {"status": "Service unavailable (data missing)", "details": []}
 
+    names = [_normalise(med) for med in med_list]
     interactions_found = []
 
     for i in range(len(med_list)):
         for j in range(i + 1, len(med_list)):
-            d1 = med_list[i].lower()
-            d2 = med_list[j].lower()
-
-            match = drug_df[
-                ((drug_df["drug1"].str.lower() == d1) & (drug_df["drug2"].str.lower() == d2)) |
-                ((drug_df["drug1"].str.lower() == d2) & (drug_df["drug2"].str.lower() == d1))
-            ]
-
-            if not match.empty:
-                row = match.iloc[0]
+            hit = index.get(frozenset((names[i], names[j])))
+            if hit is not None:
                 interactions_found.append({
-                    "drug_1": d1,
-                    "drug_2": d2,
-                    "interaction": row["interaction"],
-                    "severity": row.get("severity", "Unknown")
+                    "drug_1": med_list[i].lower(),
+                    "drug_2": med_list[j].lower(),
+                    "interaction": hit[0],
+                    "severity": hit[1],
                 })
 
-    if not interactions_found:
-        return {"status": "No interactions found", "details": []}
+    return _interactions_result(interactions_found)
 
-    return {"status": "Interactions detected", "details": interactions_found}
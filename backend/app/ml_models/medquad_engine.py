@@ -2,10 +2,18 @@ import os
 
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../"))
 MEDQUAD_PATH = os.path.join(BASE_DIR, "datasets", "triage", "medquad.csv")
+ARTIFACTS_DIR = os.path.join(os.path.dirname(__file__), "artifacts")
+MEDQUAD_ARTIFACTS_DIR = os.path.join(ARTIFACTS_DIR, "medquad")
 
 _vectorizer = None
 _tfidf_matrix = None
 _answers = None
+_ann_index = None
+
+
+def _make_vectorizer():
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    return TfidfVectorizer(stop_words="english")
 
 
 def _load_engine():
@@ -20,14 +28,21 @@ def _load_engine():
 
     try:
         import pandas as pd
-        from sklearn.feature_extraction.text import TfidfVectorizer
+        from .ann_index import corpus_fingerprint
+        from .tfidf_artifacts import load_or_fit_tfidf
 
         medquad_df = pd.read_csv(MEDQUAD_PATH)
         questions = medquad_df["question"].astype(str)
         _answers = medquad_df["answer"].astype(str)
 
-        _vectorizer = TfidfVectorizer(stop_words="english")
-        _tfidf_matrix = _vectorizer.fit_transform(questions)
+        # Fitted vocabulary/IDF and the CSR matrix are memory-mapped from
+        # MEDQUAD_ARTIFACTS_DIR so workers share one copy instead of refitting
+        artifacts = load_or_fit_tfidf(
+            MEDQUAD_ARTIFACTS_DIR, questions, _make_vectorizer, corpus_fingerprint(questions)
+        )
+        _tfidf_matrix = artifacts.matrix
+        _load_ann_index(artifacts)
+        _vectorizer = artifacts.vectorizer
         return True
     except Exception as e:
         from backend.app.logging_config import get_logger
@@ -35,18 +50,76 @@ def _load_engine():
         return False
 
 
-def get_medical_answer(user_query):
+def _load_ann_index(artifacts):
+    """Load the persisted IVF index for this corpus, building and saving it if needed."""
+    global _ann_index
+    from backend.app.config import get_settings
+
+    settings = get_settings()
+    if settings.MEDQUAD_RETRIEVAL_BACKEND != "ivf":
+        return
+
+    from .ann_index import IVFIndex
+    from backend.app.logging_config import get_logger
+
+    logger = get_logger("ml_models.medquad_engine")
+    index = IVFIndex.load(MEDQUAD_ARTIFACTS_DIR, artifacts.fingerprint, n_probe=settings.MEDQUAD_IVF_NPROBE)
+    if index is None:
+        index = IVFIndex.build(
+            artifacts.matrix, fingerprint=artifacts.fingerprint, n_probe=settings.MEDQUAD_IVF_NPROBE
+        )
+        try:
+            index.save(MEDQUAD_ARTIFACTS_DIR)
+        except OSError as e:
+            logger.warning("Could not persist MedQuAD IVF index: %s", e)
+    _ann_index = index.attach_postings(artifacts.postings)
+
+
+def build_artifacts():
+    """Offline build: fit and persist the MedQuAD TF-IDF artifacts and IVF index."""
+    global _vectorizer, _ann_index
+    import shutil
+
+    shutil.rmtree(MEDQUAD_ARTIFACTS_DIR, ignore_errors=True)
+    _vectorizer = None
+    _ann_index = None
+    return _load_engine()
+
+
+def search_medical_answers(user_query, top_k=5, exact=False):
+    """
+    Top-k MedQuAD matches for a query as ``[{"index", "answer", "confidence"}]``.
+
+    Uses the IVF index when one is loaded; ``exact=True`` forces the
+    brute-force cosine scan (kept for recall comparison).
+    """
     if not _load_engine():
-        return {"answer": "Medical knowledge base unavailable.", "confidence": 0.0}
+        return []
+
+    from .ann_index import exact_search
 
-    from sklearn.metrics.pairwise import cosine_similarity
     user_vector = _vectorizer.transform([user_query])
-    similarity = cosine_similarity(user_vector, _tfidf_matrix)
+    if _ann_index is not None and not exact:
+        ids, scores = _ann_index.search(user_vector, _tfidf_matrix, top_k)
+    else:
+        ids, scores = exact_search(user_vector, _tfidf_matrix, top_k)
+
+    return [
+        {"index": int(i), "answer": _answers.iloc[int(i)], "confidence": float(s)}
+        for i, s in zip(ids, scores)
+    ]
+
+
+def get_medical_answer(user_query):
+    if not _load_engine():
+        return {"answer": "Medical knowledge base unavailable.", "confidence": 0.0}
 
-    best_match_index = similarity.argmax()
-    confidence = similarity[0][best_match_index]
+    matches = search_medical_answers(user_query, top_k=1)
+    if not matches or matches[0]["confidence"] <= 0:
+        matches = search_medical_answers(user_query, top_k=1, exact=True)
+    best = matches[0]
 
     return {
-        "answer": _answers.iloc[best_match_index],
-        "confidence": float(confidence)
+        "answer": best["answer"],
+        "confidence": best["confidence"]
     }
@@ -0,0 +1,220 @@
+"""
+Persisted TF-IDF retrieval artifacts.
+
+Fitting ``TfidfVectorizer`` on every process start (and again in every
+uvicorn/gunicorn worker) is wasted work. A fitted vectorizer and its
+document matrix are written once to a directory:
+
+    meta.json            vectorizer params, corpus fingerprint, matrix shape
+    vocabulary.json      term -> column index
+    idf.npy              IDF weights
+    data.npy / indices.npy / indptr.npy            CSR document matrix
+    csc_data.npy / csc_indices.npy / csc_indptr.npy  CSC copy (term postings)
+
+and loaded back with ``np.load(mmap_mode="r")`` so every worker maps the
+same page-cache copy instead of holding a private one.
+"""
+
+import json
+import os
+import shutil
+import uuid
+from typing import Any, Dict, NamedTuple, Optional
+
+import numpy as np
+
+from backend.app.logging_config import get_logger
+
+logger = get_logger("ml_models.tfidf_artifacts")
+
+ARTIFACT_VERSION = 1
+
+# Vectorizer params that affect transform(); everything else only matters when fitting
+_TRANSFORM_PARAMS = (
+    "analyzer", "binary", "lowercase", "ngram_range", "norm", "stop_words",
+    "strip_accents", "sublinear_tf", "token_pattern", "use_idf",
+)
+
+_CSR_FILES = ("data", "indices", "indptr")
+
+
+class FrozenTfidfVectorizer:
+    """
+    Transform-only TF-IDF vectorizer rebuilt from a persisted vocabulary and IDF.
+
+    Produces the same vectors as the fitted ``TfidfVectorizer`` it was saved
+    from, without sklearn's per-call validation overhead.
+    """
+
+    def __init__(self, params: Dict, vocabulary: Dict[str, int], idf: np.ndarray):
+        from sklearn.feature_extraction.text import TfidfVectorizer
+
+        params = dict(params)
+        if params.get("ngram_range") is not None:
+            params["ngram_range"] = tuple(params["ngram_range"])
+        self.params = params
+        self.vocabulary_ = vocabulary
+        self.idf_ = idf
+        self._analyzer = TfidfVectorizer(**params).build_analyzer()
+
+    def transform(self, raw_documents):
+        from scipy.sparse import csr_matrix
+
+        indptr = [0]
+        indices: list = []
+        values: list = []
+        for doc in raw_documents:
+            counts: Dict[int, int] = {}
+            for token in self._analyzer(doc):
+                col = self.vocabulary_.get(token)
+                if col is not None:
+                    counts[col] = counts.get(col, 0) + 1
+            for col in sorted(counts):
+                indices.append(col)
+                values.append(counts[col])
+            indptr.append(len(indices))
+
+        data = np.asarray(values, dtype=np.float64)
+        cols = np.asarray(indices, dtype=np.int32)
+        if self.params.get("binary"):
+            data[:] = 1.0
+        if self.params.get("sublinear_tf"):
+            data = np.log(data) + 1.0
+        if self.params.get("use_idf", True):
+            data = data * self.idf_[cols]
+
+        matrix = csr_matrix(
+            (data, cols, np.asarray(indptr, dtype=np.int32)),
+            shape=(len(indptr) - 1, len(self.vocabulary_)),
+        )
+        norm = self.params.get("norm", "l2")
+        if norm:
+            from sklearn.preprocessing import normalize
+            matrix = normalize(matrix, norm=norm, copy=False)
+        return matrix
+
+
+class TfidfArtifacts(NamedTuple):
+    vectorizer: FrozenTfidfVectorizer
+    matrix: Any       # scipy CSR document matrix (memory-mapped arrays)
+    postings: Any     # scipy CSC copy, for term -> documents lookups
+    fingerprint: str
+
+
+def save_tfidf_artifacts(directory: str, vectorizer, matrix, fingerprint: str) -> None:
+    """
+    Write a fitted vectorizer and its document matrix to ``directory``.
+
+    The files are written to a temporary sibling and moved into place, so a
+    concurrently starting worker never sees a half-written directory.
+    """
+    params = vectorizer.get_params()
+    meta = {
+        "version": ARTIFACT_VERSION,
+        "fingerprint": fingerprint,
+        "shape": list(matrix.shape),
+        "params": {
+            k: (list(params[k]) if isinstance(params[k], tuple) else params[k])
+            for k in _TRANSFORM_PARAMS
+        },
+    }
+    vocabulary = {term: int(col) for term, col in vectorizer.vocabulary_.items()}
+
+    csr = matrix.tocsr()
+    csr.sort_indices()
+    csc = csr.tocsc()
+    csc.sort_indices()
+
+    parent = os.path.dirname(os.path.abspath(directory))
+    os.makedirs(parent, exist_ok=True)
+    tmp_dir = f"{directory}.tmp-{uuid.uuid4().hex[:8]}"
+    os.makedirs(tmp_dir)
+    try:
+        with open(os.path.join(tmp_dir, "vocabulary.json"), "w", encoding="utf-8") as f:
+            json.dump(vocabulary, f)
+        # Vectorizers fitted with use_idf=False have no idf_; transform() skips it then
+        idf = getattr(vectorizer, "idf_", None)
+        idf = np.ones(len(vocabulary)) if idf is None else idf
+        np.save(os.path.join(tmp_dir, "idf.npy"), np.asarray(idf, dtype=np.float64))
+        for name in _CSR_FILES:
+            np.save(os.path.join(tmp_dir, f"{name}.npy"), getattr(csr, name))
+            np.save(os.path.join(tmp_dir, f"csc_{name}.npy"), getattr(csc, name))
+        # meta.json last: its presence marks a complete artifact set
+        with open(os.path.join(tmp_dir, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+
+        if os.path.isdir(directory):
+            shutil.rmtree(directory, ignore_errors=True)
+        os.replace(tmp_dir, directory)
+        logger.info("Saved TF-IDF artifacts to %s (%d docs, %d terms)", directory, *matrix.shape)
+    except OSError:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+
+def load_tfidf_artifacts(
+    directory: str, fingerprint: Optional[str] = None, mmap: bool = True
+) -> Optional[TfidfArtifacts]:
+    """
+    Load artifacts written by :func:`save_tfidf_artifacts`.
+
+    Returns None when the directory is missing, from another artifact
+    version, or built for a different corpus (fingerprint mismatch).
+    """
+    meta_path = os.path.join(directory, "meta.json")
+    if not os.path.exists(meta_path):
+        return None
+    try:
+        from scipy.sparse import csc_matrix, csr_matrix
+
+        with open(meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("version") != ARTIFACT_VERSION:
+            return None
+        if fingerprint is not None and meta.get("fingerprint") != fingerprint:
+            logger.info("TF-IDF artifacts at %s are stale, refitting", directory)
+            return None
+
+        with open(os.path.join(directory, "vocabulary.json"), encoding="utf-8") as f:
+            vocabulary = json.load(f)
+
+        mmap_mode = "r" if mmap else None
+
+        def _load(name: str) -> np.ndarray:
+            return np.load(os.path.join(directory, f"{name}.npy"), mmap_mode=mmap_mode)
+
+        shape = tuple(meta["shape"])
+        matrix = csr_matrix(tuple(_load(n) for n in _CSR_FILES), shape=shape, copy=False)
+        postings = csc_matrix(tuple(_load(f"csc_{n}") for n in _CSR_FILES), shape=shape, copy=False)
+        matrix.has_sorted_indices = True
+        postings.has_sorted_indices = True
+
+        vectorizer = FrozenTfidfVectorizer(meta["params"], vocabulary, _load("idf"))
+        return TfidfArtifacts(vectorizer, matrix, postings, meta["fingerprint"])
+    except Exception as e:
+        logger.warning("Failed to load TF-IDF artifacts from %s: %s", directory, e)
+        return None
+
+
+def load_or_fit_tfidf(directory: str, texts, make_vectorizer, fingerprint: str) -> TfidfArtifacts:
+    """
+    Memory-map the artifacts for this corpus, fitting and persisting them first if needed.
+
+    ``make_vectorizer`` returns an unfitted ``TfidfVectorizer``. If the
+    artifacts cannot be written (read-only deploy, disk full) the freshly
+    fitted in-memory objects are returned instead.
+    """
+    artifacts = load_tfidf_artifacts(directory, fingerprint)
+    if artifacts is not None:
+        return artifacts
+
+    vectorizer = make_vectorizer()
+    matrix = vectorizer.fit_transform(texts)
+    try:
+        save_tfidf_artifacts(directory, vectorizer, matrix, fingerprint)
+        artifacts = load_tfidf_artifacts(directory, fingerprint)
+        if artifacts is not None:
+            return artifacts
+    except OSError as e:
+        logger.warning("Could not persist TF-IDF artifacts to %s: %s", directory, e)
+    return TfidfArtifacts(vectorizer, matrix, matrix.tocsc(), fingerprint)
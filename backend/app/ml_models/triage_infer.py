@@ -7,6 +7,7 @@ DATASET_PATH = os.path.join(BASE_DIR, "datasets", "triage", "Training.csv")
 
 _model = None
 _symptom_columns = None
+_symptom_index = None
 
 # Follow-up question templates per body system
 FOLLOW_UP_MAP = {
@@ -71,7 +72,7 @@ DEFAULT_FOLLOW_UPS = [
 
 
 def _load_resources():
-    global _model, _symptom_columns
+    global _model, _symptom_columns, _symptom_index
     if _model is not None and _symptom_columns is not None:
         return True
 
@@ -88,6 +89,7 @@ def _load_resources():
         df = pd.read_csv(DATASET_PATH)
         df = df.loc[:, ~df.columns.str.contains("^Unnamed")]
         _symptom_columns = df.drop("prognosis", axis=1).columns.tolist()
+        _symptom_index = _compile_symptom_index(_symptom_columns)
         return True
     except Exception as e:
         from backend.app.logging_config import get_logger
@@ -95,25 +97,59 @@ def _load_resources():
         return False
 
 
+def _compile_symptom_index(columns):
+    """
+    Map every accepted spelling of a symptom column to its index.
+
+    Exact column names win; "a b" and "a_b" spellings are added as aliases
+    without overriding another column's exact name.
+    """
+    index = {}
+    for i, column in enumerate(columns):
+        index.setdefault(column, i)
+    for i, column in enumerate(columns):
+        index.setdefault(column.replace(" ", "_"), i)
+        index.setdefault(column.replace("_", " "), i)
+    return index
+
+
+def _symptom_indices(user_symptoms):
+    indices = set()
+    for symptom in user_symptoms:
+        symptom = symptom.strip().lower()
+        for form in (symptom, symptom.replace(" ", "_")):
+            i = _symptom_index.get(form)
+            if i is not None:
+                indices.add(i)
+    return indices
+
+
 def build_symptom_vector(user_symptoms):
     if not _symptom_columns:
         return []
 
     vector = [0] * len(_symptom_columns)
-    for symptom in user_symptoms:
-        symptom = symptom.strip().lower()
-        if symptom in _symptom_columns:
-            index = _symptom_columns.index(symptom)
-            vector[index] = 1
-        # Also try with underscores replaced by spaces and vice versa
-        symptom_alt = symptom.replace(" ", "_")
-        if symptom_alt in _symptom_columns:
-            index = _symptom_columns.index(symptom_alt)
-            vector[index] = 1
-
+    for i in _symptom_indices(user_symptoms):
+        vector[i] = 1
     return vector
 
 
+def build_symptom_matrix(symptom_lists):
+    """One-hot (n_rows x n_symptoms) float32 matrix for a batch of symptom lists."""
+    import numpy as np
+
+    matrix = np.zeros((len(symptom_lists), len(_symptom_columns or ())), dtype=np.float32)
+    if not _symptom_columns:
+        return matrix
+    rows, cols = [], []
+    for row, symptoms in enumerate(symptom_lists):
+        for i in _symptom_indices(symptoms):
+            rows.append(row)
+            cols.append(i)
+    matrix[rows, cols] = 1.0
+    return matrix
+
+
 def predict_disease(user_symptoms):
     """Original prediction function — kept for backward compatibility."""
     if not _load_resources():
@@ -154,81 +190,50 @@ def get_follow_up_questions(symptoms):
     return questions[:5]
 
 
-def predict_disease_safe(user_symptoms):
-    """
-    Safe prediction with minimum-symptom enforcement, probability normalization,
-    confidence thresholds, and follow-up question generation.
+def _needs_more_symptoms(user_symptoms, symptom_count):
+    follow_ups = get_follow_up_questions(user_symptoms) if user_symptoms else DEFAULT_FOLLOW_UPS[:5]
+    return {
+        "disease_prediction": None,
+        "top_predictions": [],
+        "confidence": 0.0,
+        "needs_more_info": True,
+        "follow_up_questions": follow_ups,
+        "symptom_count": symptom_count,
+        "message": (
+            "I need a bit more information to provide an accurate assessment. "
+            "Please answer a few follow-up questions."
+        ),
+    }
 
-    Returns:
-        {
-            "disease_prediction": str or None,
-            "top_predictions": list[dict],  # [{name, probability}, ...]
-            "confidence": float (0-1),
-            "needs_more_info": bool,
-            "follow_up_questions": list[str],
-            "symptom_count": int,
-        }
-    """
-    symptom_count = len(user_symptoms) if user_symptoms else 0
 
-    # Minimum symptom check
-    if symptom_count < 2:
-        follow_ups = get_follow_up_questions(user_symptoms) if user_symptoms else DEFAULT_FOLLOW_UPS[:5]
-        return {
-            "disease_prediction": None,
-            "top_predictions": [],
-            "confidence": 0.0,
-            "needs_more_info": True,
-            "follow_up_questions": follow_ups,
-            "symptom_count": symptom_count,
-            "message": (
-                "I need a bit more information to provide an accurate assessment. "
-                "Please answer a few follow-up questions."
-            ),
-        }
+def _model_unavailable(symptom_count):
+    return {
+        "disease_prediction": "Unknown (Model unavailable)",
+        "top_predictions": [],
+        "confidence": 0.0,
+        "needs_more_info": False,
+        "follow_up_questions": [],
+        "symptom_count": symptom_count,
+    }
 
-    if not _load_resources():
-        return {
-            "disease_prediction": "Unknown (Model unavailable)",
-            "top_predictions": [],
-            "confidence": 0.0,
-            "needs_more_info": False,
-            "follow_up_questions": [],
-            "symptom_count": symptom_count,
-        }
 
-    vector = build_symptom_vector(user_symptoms)
-    if not vector or sum(vector) == 0:
-        # No recognized symptoms matched the model's vocabulary
-        return {
-            "disease_prediction": None,
-            "top_predictions": [],
-            "confidence": 0.0,
-            "needs_more_info": True,
-            "follow_up_questions": get_follow_up_questions(user_symptoms),
-            "symptom_count": symptom_count,
-            "message": (
-                "I couldn't match your symptoms to my medical database. "
-                "Could you describe them differently?"
-            ),
-        }
+def _unrecognised_symptoms(user_symptoms, symptom_count):
+    # No recognized symptoms matched the model's vocabulary
+    return {
+        "disease_prediction": None,
+        "top_predictions": [],
+        "confidence": 0.0,
+        "needs_more_info": True,
+        "follow_up_questions": get_follow_up_questions(user_symptoms),
+        "symptom_count": symptom_count,
+        "message": (
+            "I couldn't match your symptoms to my medical database. "
+            "Could you describe them differently?"
+        ),
+    }
 
-    # Get probabilities for all classes
-    try:
-        probabilities = _model.predict_proba([vector])[0]
-        classes = _model.classes_
-    except AttributeError:
-        # Model doesn't support predict_proba — fall back to single prediction
-        prediction = _model.predict([vector])[0]
-        return {
-            "disease_prediction": prediction,
-            "top_predictions": [{"name": prediction, "probability": 0.75}],
-            "confidence": 0.75,
-            "needs_more_info": False,
-            "follow_up_questions": get_follow_up_questions(user_symptoms),
-            "symptom_count": symptom_count,
-        }
 
+def _format_probabilities(user_symptoms, symptom_count, probabilities, classes):
     # Get top-3 predictions sorted by probability
     sorted_indices = probabilities.argsort()[::-1][:3]
     top_predictions = []
@@ -269,3 +274,80 @@ def predict_disease_safe(user_symptoms):
         "follow_up_questions": get_follow_up_questions(user_symptoms),
         "symptom_count": symptom_count,
     }
+
+
+def predict_disease_safe_batch(symptom_lists):
+    """
+    :func:`predict_disease_safe` for many symptom lists at once.
+
+    Rows that pass the minimum-symptom and vocabulary checks are scored with
+    a single ``predict_proba`` call over one NumPy matrix. Returns one result
+    dict per input list, in order.
+    """
+    results = [None] * len(symptom_lists)
+    pending = []
+    for row, user_symptoms in enumerate(symptom_lists):
+        symptom_count = len(user_symptoms) if user_symptoms else 0
+        # Minimum symptom check
+        if symptom_count < 2:
+            results[row] = _needs_more_symptoms(user_symptoms, symptom_count)
+        else:
+            pending.append(row)
+
+    if not pending:
+        return results
+
+    if not _load_resources():
+        for row in pending:
+            results[row] = _model_unavailable(len(symptom_lists[row]))
+        return results
+
+    matrix = build_symptom_matrix([symptom_lists[row] for row in pending])
+    recognised = matrix.any(axis=1)
+    for row, ok in zip(pending, recognised.tolist()):
+        if not ok:
+            results[row] = _unrecognised_symptoms(symptom_lists[row], len(symptom_lists[row]))
+    scored = [row for row, ok in zip(pending, recognised.tolist()) if ok]
+    if not scored:
+        return results
+    matrix = matrix[recognised]
+
+    # Get probabilities for all classes
+    try:
+        probabilities = _model.predict_proba(matrix)
+        classes = _model.classes_
+    except AttributeError:
+        # Model doesn't support predict_proba — fall back to single prediction
+        for row, prediction in zip(scored, _model.predict(matrix)):
+            results[row] = {
+                "disease_prediction": prediction,
+                "top_predictions": [{"name": prediction, "probability": 0.75}],
+                "confidence": 0.75,
+                "needs_more_info": False,
+                "follow_up_questions": get_follow_up_questions(symptom_lists[row]),
+                "symptom_count": len(symptom_lists[row]),
+            }
+        return results
+
+    for row, row_probabilities in zip(scored, probabilities):
+        user_symptoms = symptom_lists[row]
+        results[row] = _format_probabilities(user_symptoms, len(user_symptoms), row_probabilities, classes)
+    return results
+
+
+def predict_disease_safe(user_symptoms):
+    """
+    Safe prediction with minimum-symptom enforcement, probability normalization,
+    confidence thresholds, and follow-up question generation.
+
+    Returns:
+        {
+            "disease_prediction": str or None,
+            "top_predictions": list[dict],  # [{name, probability}, ...]
+            "confidence": float (0-1),
+            "needs_more_info": bool,
+            "follow_up_questions": list[str],
+            "symptom_count": int,
+        }
+    """
+    return predict_disease_safe_batch([user_symptoms])[0]
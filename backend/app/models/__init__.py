@@ -11,6 +11,8 @@ from backend.app.models.feedback import Feedback
 from backend.app.models.image_analysis import ImageAnalysis
 from backend.app.models.location_data import LocationData
 from backend.app.models.password_reset_token import PasswordResetToken
+from backend.app.models.feature_usage import FeatureUsage
+from backend.app.models.daily_rollup import DailyRollup
 
 __all__ = [
     "User",
@@ -26,5 +28,7 @@ __all__ = [
     "ImageAnalysis",
     "LocationData",
     "PasswordResetToken",
+    "FeatureUsage",
+    "DailyRollup",
 ]
 
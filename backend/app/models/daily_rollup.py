@@ -0,0 +1,36 @@
+from sqlalchemy import Column, Integer, String, Float, Text, Date, DateTime, ForeignKey, UniqueConstraint
+from datetime import datetime, timezone
+from backend.app.database import Base
+
+
+class DailyRollup(Base):
+    """Per-user UTC-day totals behind the dashboard, maintained on write (services/daily_rollup.py)."""
+    __tablename__ = "daily_rollups"
+    __table_args__ = (
+        UniqueConstraint("user_id", "day", name="uq_daily_rollups_user_day"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    day = Column(Date, nullable=False)  # UTC
+
+    # Nutrition
+    calories = Column(Float, nullable=False, default=0, server_default="0")
+    meals = Column(Integer, nullable=False, default=0, server_default="0")
+
+    # Symptom logs by triage level
+    symptoms_emergency = Column(Integer, nullable=False, default=0, server_default="0")
+    symptoms_urgent = Column(Integer, nullable=False, default=0, server_default="0")
+    symptoms_routine = Column(Integer, nullable=False, default=0, server_default="0")
+    symptoms_self_care = Column(Integer, nullable=False, default=0, server_default="0")
+    symptoms_other = Column(Integer, nullable=False, default=0, server_default="0")
+
+    # Chat sessions whose first message was sent this day
+    chat_sessions = Column(Integer, nullable=False, default=0, server_default="0")
+
+    # Latest lab report of the day
+    lab_report_name = Column(String(255), nullable=True)
+    lab_summary = Column(Text, nullable=True)
+    lab_at = Column(DateTime, nullable=True)
+
+    updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
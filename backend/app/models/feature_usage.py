@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey, UniqueConstraint
+from datetime import datetime, timezone
+from backend.app.database import Base
+
+
+class FeatureUsage(Base):
+    """Per-user daily usage count of one plan limit (e.g. chat_messages_per_day)."""
+    __tablename__ = "feature_usage"
+    __table_args__ = (
+        UniqueConstraint("user_id", "limit_key", "day", name="uq_feature_usage_user_key_day"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    limit_key = Column(String(50), nullable=False)
+    day = Column(Date, nullable=False)  # UTC
+    count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
@@ -0,0 +1,95 @@
+"""
+Query plan checks — find full table scans in the plans of real statements.
+
+``capture_statements(engine)`` records the SQL and parameters a block of
+code actually sends; ``plan_problems(conn, sql, params)`` explains one of
+them and returns what is wrong with its plan:
+
+- SQLite (``EXPLAIN QUERY PLAN``): ``SCAN <table>`` of a stored table,
+  with or without an index (a scan of a subquery, CTE, table-valued
+  function such as ``json_each`` or a FROM-less SELECT's constant row is
+  fine).
+- PostgreSQL (``EXPLAIN (FORMAT JSON)`` with ``enable_seqscan`` off, so
+  small test tables do not hide a missing index): any ``Seq Scan``.
+
+Sorts an index should have provided (``USE TEMP B-TREE FOR ORDER BY`` /
+``Sort`` nodes) are problems too once there are more than
+``allowed_sorts`` of them, e.g. a UNION ALL whose merge has to sort.
+
+Used by tests/test_query_plans.py to keep hot user-scoped queries on
+their indexes.
+"""
+
+import json
+from contextlib import contextmanager
+from typing import Any, Iterator, List, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine
+
+Statement = Tuple[str, Any]
+
+
+@contextmanager
+def capture_statements(engine: Engine) -> Iterator[List[Statement]]:
+    """Collect ``(sql, parameters)`` for every statement ``engine`` executes inside the block."""
+    captured: List[Statement] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if not executemany:
+            captured.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield captured
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+def explain(conn: Connection, sql: str, parameters: Any = ()) -> List[str]:
+    """The plan of ``sql`` as readable lines (SQLite detail strings, or PostgreSQL node summaries)."""
+    if conn.dialect.name == "postgresql":
+        return [_pg_line(node) for node in _pg_nodes(_pg_plan(conn, sql, parameters))]
+    return [row[3] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}", parameters)]
+
+
+def plan_problems(conn: Connection, sql: str, parameters: Any = (), allowed_sorts: int = 0) -> List[str]:
+    """Plan lines showing full table scans, plus all sorts when there are more than ``allowed_sorts``."""
+    if conn.dialect.name == "postgresql":
+        nodes = list(_pg_nodes(_pg_plan(conn, sql, parameters)))
+        scans = [_pg_line(node) for node in nodes if node["Node Type"] == "Seq Scan"]
+        sorts = [_pg_line(node) for node in nodes if node["Node Type"] == "Sort"]
+    else:
+        lines = explain(conn, sql, parameters)
+        scans = _sqlite_scans(lines)
+        sorts = [line for line in lines if line.startswith("USE TEMP B-TREE FOR ORDER BY")]
+    return scans + (sorts if len(sorts) > allowed_sorts else [])
+
+
+def _sqlite_scans(lines: Sequence[str]) -> List[str]:
+    # Subqueries and CTEs show up as "CO-ROUTINE x" / "MATERIALIZE x" and are then scanned by name
+    derived = {line.split()[1] for line in lines if line.startswith(("CO-ROUTINE ", "MATERIALIZE "))}
+    return [
+        line for line in lines
+        if line.startswith("SCAN ") and line.split()[1] not in derived and "VIRTUAL TABLE" not in line
+        and line != "SCAN CONSTANT ROW"
+    ]
+
+
+def _pg_plan(conn: Connection, sql: str, parameters: Any) -> dict:
+    with conn.begin_nested() if conn.in_transaction() else conn.begin():
+        conn.exec_driver_sql("SET LOCAL enable_seqscan = off")
+        raw = conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}", parameters).scalar()
+    return (json.loads(raw) if isinstance(raw, str) else raw)[0]["Plan"]
+
+
+def _pg_nodes(plan: dict) -> Iterator[dict]:
+    yield plan
+    for child in plan.get("Plans", ()):
+        yield from _pg_nodes(child)
+
+
+def _pg_line(node: dict) -> str:
+    relation = node.get("Relation Name")
+    index = node.get("Index Name")
+    return node["Node Type"] + (f" on {relation}" if relation else "") + (f" using {index}" if index else "")
@@ -1,65 +1,430 @@
-"""Rate limiting utilities for API endpoints."""
+"""
+Rate limiting for API endpoints — sliding-window counters.
 
-from collections import defaultdict
-from datetime import datetime, timedelta
-from typing import Dict, Tuple, Optional
+Each client key keeps a fixed three-field state ``(window_start, previous,
+current)``: the request counts of the current fixed window and the one
+before it. The sliding estimate weights ``previous`` by how much of it
+still overlaps the last ``window`` seconds:
+
+    estimate = previous * (1 - elapsed / window) + current
+
+so a check is O(1) in time and memory however many requests a client
+made. State lives in one of two stores:
+
+- ``ShardedMemoryStore`` (default, per worker): keys are spread over
+  RATE_LIMIT_SHARDS dicts, each with its own lock, so concurrent checks for
+  different clients rarely contend. Keys idle for two windows are swept
+  from a shard at most once per window, and each shard holds at most its
+  share of RATE_LIMIT_MAX_KEYS.
+- ``SQLiteRateLimitStore`` (RATE_LIMIT_BACKEND=sqlite): the same state in a
+  WAL-mode SQLite file, so limits hold across every worker on the host.
+  Store errors fail open.
+
+``RateLimitMiddleware`` applies the 'auth' limiter per client IP on the
+credential endpoints and the 'global' limiter everywhere else — per user
+(scaled by subscription plan) for bearer-token requests, per IP otherwise.
+"""
+
+import math
+import os
+import sqlite3
 import threading
+import time
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from backend.app.config import get_settings
+from backend.app.logging_config import get_logger
+
+logger = get_logger("rate_limit")
+settings = get_settings()
+
+WINDOW_SECONDS = 60.0
+
+# (window_start, previous window count, current window count)
+WindowState = Tuple[float, int, int]
+
+# Shared-store writes between sweeps of idle rows
+_SWEEP_EVERY = 1024
+
+
+class RateLimitDecision(NamedTuple):
+    allowed: bool
+    retry_after: Optional[int]
+    limit: int
+    remaining: int
+
+
+def _slide(state: Optional[WindowState], now: float, window: float, limit: int) -> Tuple[WindowState, RateLimitDecision]:
+    """Count one request against ``state``; returns the new state and the decision."""
+    start = now - (now % window)
+    if state is None:
+        previous, current = 0, 0
+    elif state[0] == start:
+        previous, current = state[1], state[2]
+    else:
+        # Only the immediately preceding window still overlaps the sliding one
+        previous, current = (state[2] if start - state[0] == window else 0), 0
+
+    elapsed = now - start
+    estimate = previous * (window - elapsed) / window + current
+    if estimate + 1 <= limit:
+        current += 1
+        remaining = max(0, int(limit - estimate - 1))
+        return (start, previous, current), RateLimitDecision(True, None, limit, remaining)
+
+    if current + 1 <= limit and previous:
+        # Wait until enough of the previous window has slid out
+        wait = window - elapsed - (limit - 1 - current) * window / previous
+    else:
+        # Wait for the next window, then for this one's count to slide out
+        wait = window - elapsed + window * max(0.0, 1 - (limit - 1) / max(current, 1))
+    return (start, previous, current), RateLimitDecision(False, max(1, math.ceil(wait)), limit, 0)
+
+
+# ── Stores ───────────────────────────────────────────────────────────────
+
+
+class _Shard:
+    __slots__ = ("lock", "windows", "last_sweep")
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.windows: Dict[str, WindowState] = {}
+        self.last_sweep = 0.0
+
+
+class ShardedMemoryStore:
+    """Per-process window state, lock-striped across shards."""
+
+    blocking = False
+
+    def __init__(self, shards: int = 16, max_keys: int = 100_000):
+        self.shards = [_Shard() for _ in range(max(1, shards))]
+        self.max_keys_per_shard = max(1, max_keys // len(self.shards))
+        self._evictions = 0
+        self._dropped = 0
+
+    def hit(self, key: str, limit: int, window: float, now: float) -> RateLimitDecision:
+        shard = self.shards[hash(key) % len(self.shards)]
+        with shard.lock:
+            if now - shard.last_sweep >= window:
+                self._sweep(shard, now, window)
+            state = shard.windows.get(key)
+            if state is None and len(shard.windows) >= self.max_keys_per_shard:
+                # Oldest-inserted key goes; at worst that client's count restarts
+                del shard.windows[next(iter(shard.windows))]
+                self._dropped += 1
+            shard.windows[key], decision = _slide(state, now, window, limit)
+        return decision
+
+    def _sweep(self, shard: _Shard, now: float, window: float) -> None:
+        # Caller holds shard.lock. A key whose newest window ended before the
+        # previous one began carries no weight any more.
+        cutoff = now - (now % window) - window
+        idle = [key for key, state in shard.windows.items() if state[0] < cutoff]
+        for key in idle:
+            del shard.windows[key]
+        self._evictions += len(idle)
+        shard.last_sweep = now
+
+    def clear(self) -> None:
+        for shard in self.shards:
+            with shard.lock:
+                shard.windows.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": "memory",
+            "shards": len(self.shards),
+            "keys": sum(len(shard.windows) for shard in self.shards),
+            "max_keys": self.max_keys_per_shard * len(self.shards),
+            "idle_evictions": self._evictions,
+            "dropped": self._dropped,
+        }
+
+
+class SQLiteRateLimitStore:
+    """
+    Window state shared by every worker through a SQLite file.
+
+    Each thread gets its own connection; the database runs in WAL mode and
+    every check is one short ``BEGIN IMMEDIATE`` transaction.
+    """
+
+    blocking = True
+
+    def __init__(self, path: str, timeout: float = 1.0):
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+        self._writes = 0
+        self._errors = 0
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._conn()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS rate_limit ("
+                " key TEXT PRIMARY KEY, window_start REAL NOT NULL,"
+                " previous INTEGER NOT NULL, current INTEGER NOT NULL)"
+            )
+            self._local.conn = conn
+        return conn
+
+    def hit(self, key: str, limit: int, window: float, now: float) -> RateLimitDecision:
+        try:
+            conn = self._conn()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                state = conn.execute(
+                    "SELECT window_start, previous, current FROM rate_limit WHERE key = ?", (key,)
+                ).fetchone()
+                new_state, decision = _slide(state, now, window, limit)
+                if new_state != state:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO rate_limit (key, window_start, previous, current)"
+                        " VALUES (?, ?, ?, ?)",
+                        (key, *new_state),
+                    )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        except sqlite3.Error as e:
+            self._errors += 1
+            logger.warning("Rate limit store unavailable, allowing request: %s", e)
+            return RateLimitDecision(True, None, limit, limit)
+
+        self._writes += 1
+        if self._writes % _SWEEP_EVERY == 0:
+            self.sweep(now, window)
+        return decision
+
+    def sweep(self, now: float, window: float) -> int:
+        """Drop rows whose windows no longer overlap the sliding one."""
+        try:
+            with self._conn() as conn:
+                return conn.execute(
+                    "DELETE FROM rate_limit WHERE window_start < ?", (now - (now % window) - window,)
+                ).rowcount
+        except sqlite3.Error as e:
+            logger.warning("Rate limit store sweep failed: %s", e)
+            return 0
+
+    def clear(self) -> None:
+        with self._conn() as conn:
+            conn.execute("DELETE FROM rate_limit")
+
+    def stats(self) -> Dict[str, Any]:
+        try:
+            keys = self._conn().execute("SELECT COUNT(*) FROM rate_limit").fetchone()[0]
+        except sqlite3.Error:
+            keys = None
+        return {"backend": "sqlite", "path": self.path, "keys": keys, "store_errors": self._errors}
+
+
+# ── Limiters ─────────────────────────────────────────────────────────────
 
 
 class RateLimiter:
-    """Simple in-memory rate limiter using sliding window."""
-    
-    def __init__(self, requests_per_minute: int = 60):
+    """Sliding-window rate limiter for one scope."""
+
+    def __init__(self, requests_per_minute: int = 60, store=None, name: str = "default"):
         self.requests_per_minute = requests_per_minute
-        self.requests: Dict[str, list[float]] = defaultdict(list)
-        self._lock = threading.Lock()
-    
-    def _cleanup_old_requests(self, client_id: str, now: float) -> None:
-        """Remove requests older than 1 minute."""
-        cutoff = now - 60
-        self.requests[client_id] = [ts for ts in self.requests[client_id] if ts > cutoff]
-    
+        self.name = name
+        self.store = store if store is not None else ShardedMemoryStore()
+        self._allowed = 0
+        self._rejected = 0
+
+    def check(self, client_id: str, limit: Optional[int] = None) -> RateLimitDecision:
+        """Count a request from ``client_id`` against ``limit`` (default: the scope's limit)."""
+        decision = self.store.hit(
+            f"{self.name}:{client_id}", limit or self.requests_per_minute, WINDOW_SECONDS, time.time()
+        )
+        # Unlocked counters: approximate under contention, which is fine for stats
+        if decision.allowed:
+            self._allowed += 1
+        else:
+            self._rejected += 1
+        return decision
+
     def is_allowed(self, client_id: str) -> Tuple[bool, Optional[int]]:
         """
         Check if request is allowed for client.
-        
+
         Returns:
             (allowed, retry_after_seconds): Boolean and seconds to wait if rate limited
         """
-        with self._lock:
-            now = datetime.now().timestamp()
-            self._cleanup_old_requests(client_id, now)
-            
-            if len(self.requests[client_id]) < self.requests_per_minute:
-                self.requests[client_id].append(now)
-                return True, None
-            else:
-                # Calculate when oldest request expires
-                oldest_request = self.requests[client_id][0]
-                retry_after = int(60 - (now - oldest_request)) + 1
-                return False, retry_after
+        decision = self.check(client_id)
+        return decision.allowed, decision.retry_after
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "requests_per_minute": self.requests_per_minute,
+            "allowed": self._allowed,
+            "rejected": self._rejected,
+        }
 
 
 class PerClientRateLimiter:
-    """Rate limiters for different endpoints/scopes."""
-    
-    def __init__(self):
+    """Rate limiters for different endpoints/scopes, sharing one store."""
+
+    def __init__(self, store=None):
+        self.store = store if store is not None else ShardedMemoryStore()
         self.limiters: Dict[str, RateLimiter] = {}
         self._lock = threading.Lock()
-    
+
     def add_limiter(self, name: str, requests_per_minute: int) -> None:
         """Add a named rate limiter."""
         with self._lock:
-            self.limiters[name] = RateLimiter(requests_per_minute)
-    
+            self.limiters[name] = RateLimiter(requests_per_minute, store=self.store, name=name)
+
+    def check(self, limiter_name: str, client_id: str, limit: Optional[int] = None) -> Optional[RateLimitDecision]:
+        """Decision for one request, or None when no such limiter is configured."""
+        limiter = self.limiters.get(limiter_name)
+        return limiter.check(client_id, limit) if limiter is not None else None
+
     def is_allowed(self, limiter_name: str, client_id: str) -> Tuple[bool, Optional[int]]:
         """Check if request is allowed."""
         if limiter_name not in self.limiters:
             return True, None  # No limiter configured
         return self.limiters[limiter_name].is_allowed(client_id)
 
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": settings.RATE_LIMIT_ENABLED,
+            "store": self.store.stats(),
+            "limiters": {name: limiter.stats() for name, limiter in self.limiters.items()},
+        }
+
+
+def _build_store():
+    if settings.RATE_LIMIT_BACKEND == "sqlite":
+        try:
+            return SQLiteRateLimitStore(settings.RATE_LIMIT_SQLITE_PATH)
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(
+                "Shared rate limit store at %s unavailable, limiting per worker: %s",
+                settings.RATE_LIMIT_SQLITE_PATH, e,
+            )
+    return ShardedMemoryStore(shards=settings.RATE_LIMIT_SHARDS, max_keys=settings.RATE_LIMIT_MAX_KEYS)
+
 
 # Global rate limiters
-rate_limiters = PerClientRateLimiter()
-rate_limiters.add_limiter('global', 60)  # 60 requests/minute globally
-rate_limiters.add_limiter('auth', 10)    # 10 requests/minute for auth endpoints
+rate_limiters = PerClientRateLimiter(store=_build_store())
+rate_limiters.add_limiter('global', settings.RATE_LIMIT_REQUESTS_PER_MINUTE)
+rate_limiters.add_limiter('auth', settings.RATE_LIMIT_AUTH_REQUESTS_PER_MINUTE)
+
+
+# ── Middleware ───────────────────────────────────────────────────────────
+
+# Credential endpoints, limited per IP by the 'auth' limiter
+AUTH_PATHS = frozenset({"/auth/login", "/auth/register", "/auth/forgot-password", "/auth/reset-password"})
+# Probes and API docs; each path is exempt along with its own subpaths only
+_EXEMPT_PATHS = ("/health", "/docs", "/redoc", "/openapi.json")
+
+
+def _is_exempt(path: str) -> bool:
+    # "/health" must not exempt "/health-score", "/health-twin", ...
+    return any(path == exempt or path.startswith(exempt + "/") for exempt in _EXEMPT_PATHS)
+
+
+def _bearer_claims(scope: Scope) -> Optional[Dict[str, Any]]:
+    """Claims of a valid access token on the request, or None."""
+    authorization = Headers(scope=scope).get("authorization", "")
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    from jose import JWTError, jwt
+    try:
+        claims = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    except JWTError:
+        return None
+    return claims if claims.get("type") == "access" and claims.get("sub") else None
+
+
+def _plan_tier(claims: Dict[str, Any]) -> Optional[str]:
+    """The verified principal's plan tier from the DB when cached, else the token's ``plan`` claim."""
+    from backend.app.services.principal_cache import get_principal_cache
+    try:
+        key = (int(claims["sub"]), claims.get("iat", claims.get("exp")))
+    except ValueError:
+        return claims.get("plan")
+    principal = get_principal_cache().peek(key)
+    return principal.plan_tier if principal is not None else claims.get("plan")
+
+
+class RateLimitMiddleware:
+    """Pure ASGI middleware answering 429 with Retry-After once a client is over its limit."""
+
+    def __init__(self, app: ASGIApp, limiters: Optional[PerClientRateLimiter] = None) -> None:
+        self.app = app
+        self.limiters = limiters or rate_limiters
+
+    def _classify(self, scope: Scope) -> Tuple[str, str, Optional[int]]:
+        """(limiter name, client key, limit override) for a request."""
+        client = scope.get("client")
+        ip = client[0] if client else "unknown"
+        if scope["path"] in AUTH_PATHS:
+            return "auth", ip, None
+        claims = _bearer_claims(scope)
+        if claims is None:
+            return "global", f"ip:{ip}", None
+        from backend.app.services.subscription_service import api_requests_per_minute
+        limiter = self.limiters.limiters.get("global")
+        base = limiter.requests_per_minute if limiter else settings.RATE_LIMIT_REQUESTS_PER_MINUTE
+        return "global", f"user:{claims['sub']}", api_requests_per_minute(_plan_tier(claims), base)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] == "OPTIONS"
+            or _is_exempt(scope["path"])
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        name, key, limit = self._classify(scope)
+        if self.limiters.store.blocking:
+            decision = await run_in_threadpool(self.limiters.check, name, key, limit)
+        else:
+            decision = self.limiters.check(name, key, limit)
+        if decision is None:
+            await self.app(scope, receive, send)
+            return
+
+        if not decision.allowed:
+            logger.warning("Rate limit exceeded on %s for %s", scope["path"], key)
+            # Sent outside the response wrapper, so the body is already an envelope
+            # and there is no marker header for the wrapper to strip
+            response = JSONResponse(
+                status_code=429,
+                content={
+                    "status": "error",
+                    "data": None,
+                    "message": f"Too many requests. Please try again in {decision.retry_after} seconds",
+                },
+                headers={"Retry-After": str(decision.retry_after), "X-RateLimit-Limit": str(decision.limit)},
+            )
+            await response(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers["X-RateLimit-Limit"] = str(decision.limit)
+                headers["X-RateLimit-Remaining"] = str(decision.remaining)
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
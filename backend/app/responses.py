@@ -0,0 +1,86 @@
+"""
+API response envelope and JSON encoding.
+
+Every JSON response is delivered as
+    { "status": "success" | "error", "data": ..., "message": str }
+
+Routes opt into building the envelope themselves with ``EnvelopeResponse``
+(usually as a router's ``default_response_class``); the response is rendered
+once and ResponseWrapperMiddleware forwards it untouched. Other JSON
+responses are still parsed and wrapped by the middleware.
+
+orjson is used for encoding/decoding when installed.
+"""
+
+import json
+from typing import Any, Optional
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # optional speed-up
+    orjson = None
+
+# Set by EnvelopeResponse; the middleware strips it before the response leaves the app
+ENVELOPE_HEADER = "x-chikitsak-envelope"
+
+
+def json_dumps(content: Any) -> bytes:
+    """Compact UTF-8 JSON, matching starlette.JSONResponse's output."""
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def json_loads(raw: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def sse_event(event: str, data: Any) -> bytes:
+    """One Server-Sent Events frame with a JSON payload."""
+    return b"event: " + event.encode() + b"\ndata: " + json_dumps(data) + b"\n\n"
+
+
+def is_envelope(content: Any) -> bool:
+    """Whether a response body already follows the API envelope contract."""
+    return (
+        isinstance(content, dict)
+        and "status" in content
+        and ("message" in content or "data" in content or "response" in content)
+    )
+
+
+def envelope(content: Any, status_code: int) -> Any:
+    """Wrap a plain JSON body in the API envelope (envelopes are returned as-is)."""
+    if is_envelope(content):
+        return content
+
+    is_success = 200 <= status_code < 400
+    wrapped = {
+        "status": "success" if is_success else "error",
+        "data": content if is_success else (content.get("data") if isinstance(content, dict) else None),
+        "message": "OK" if is_success else (
+            content.get("detail", "An error occurred") if isinstance(content, dict) else str(content)
+        ),
+    }
+
+    # Inject confidence if available in the original response
+    if isinstance(content, dict) and "confidence" in content:
+        wrapped["confidence"] = content["confidence"]
+    return wrapped
+
+
+class EnvelopeResponse(JSONResponse):
+    """JSON response that renders the API envelope itself, so the middleware needn't re-parse it."""
+
+    def __init__(self, content: Any, status_code: int = 200, headers: Optional[dict] = None, **kwargs):
+        super().__init__(content, status_code=status_code, headers=headers, **kwargs)
+        self.headers[ENVELOPE_HEADER] = "1"
+
+    def render(self, content: Any) -> bytes:
+        return json_dumps(envelope(content, self.status_code))
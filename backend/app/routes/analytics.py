@@ -1,4 +1,6 @@
-from fastapi import APIRouter, Depends, Query
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 
 from backend.app.database import get_db
@@ -9,7 +11,7 @@ from backend.app.services.health_analytics import (
 )
 from backend.app.schemas.analytics import (
     NutritionSummaryResponse,
-    TimelineEvent,
+    TimelinePage,
 )
 
 router = APIRouter(prefix="/analytics", tags=["Analytics"])
@@ -34,11 +36,15 @@ def nutrition_summary(
     return get_nutrition_summary(db, user_id, days)
 
 
-@router.get("/{user_id}/timeline", response_model=list[TimelineEvent])
+@router.get("/{user_id}/timeline", response_model=TimelinePage)
 def health_timeline(
     user_id: int,
     limit: int = Query(default=50, ge=1, le=200),
+    cursor: Optional[str] = Query(default=None, description="next_cursor from the previous page"),
     db: Session = Depends(get_db),
 ):
-    """Get chronological health event timeline for a user."""
-    return get_health_timeline(db, user_id, limit)
+    """Get chronological health event timeline for a user, one page at a time."""
+    try:
+        return get_health_timeline(db, user_id, limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
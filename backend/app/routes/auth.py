@@ -2,9 +2,12 @@
 Authentication Routes — register, login, refresh, logout, change-password.
 """
 
+from typing import Optional, Tuple
+
 from fastapi import APIRouter, Depends, HTTPException, status, Request
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 from datetime import datetime, timezone, timedelta
 
 from backend.app.database import get_db
@@ -22,8 +25,9 @@ from backend.app.schemas.auth import (
     PasswordResetConfirm,
 )
 from backend.app.services.auth_service import (
-    hash_password,
-    verify_password,
+    ahash_password,
+    averify_password,
+    password_needs_rehash,
     create_access_token,
     create_refresh_token,
     validate_refresh_token,
@@ -35,6 +39,8 @@ from backend.app.services.auth_service import (
     validate_password_reset_token,
     reset_password,
 )
+from backend.app.services.password_hasher import PasswordHasherBusy
+from backend.app.services.principal_cache import invalidate_principals
 from backend.app.logging_config import get_logger
 
 logger = get_logger("routes.auth")
@@ -43,8 +49,52 @@ settings = get_settings()
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 
+def _email_registered(db: Session, email: str) -> bool:
+    return db.query(User.id).filter(User.email == email).first() is not None
+
+
+def _create_user(db: Session, payload: RegisterRequest, password_hash: str) -> dict:
+    user = User(
+        name=payload.name,
+        email=payload.email,
+        password_hash=password_hash,
+    )
+    user.city = getattr(payload, 'city', None)
+    user.country = getattr(payload, 'country', None)
+
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+
+    # Initialize health profile for new user
+    try:
+        from backend.app.services.health_profile_service import initialize_health_profile
+        initialize_health_profile(db, user)
+    except Exception as e:
+        logger.warning("Failed to initialize health profile for user %d: %s", user.id, e)
+
+    access_token = create_access_token(user.id, user.plan_tier)
+    refresh_token = create_refresh_token(db, user.id)
+
+    logger.info("User registered: %s (id=%d)", user.email, user.id)
+
+    return {
+        "access_token": access_token,
+        "refresh_token": refresh_token,
+        "user": {
+            "id": user.id,
+            "name": user.name,
+            "email": user.email,
+        },
+    }
+
+
+# The credential routes are async so a request waiting for bcrypt holds no
+# threadpool thread: hashing is awaited on the hasher pool, DB work runs in
+# the threadpool.
+
 @router.post("/register", response_model=TokenResponse, status_code=status.HTTP_201_CREATED)
-def register(payload: RegisterRequest, db: Session = Depends(get_db)):
+async def register(payload: RegisterRequest, db: Session = Depends(get_db)):
     """Register a new user, initialize health profile, and return tokens."""
     
     # Validate password strength
@@ -55,47 +105,17 @@ def register(payload: RegisterRequest, db: Session = Depends(get_db)):
             detail=error,
         )
     
-    existing = db.query(User).filter(User.email == payload.email).first()
-    if existing:
+    if await run_in_threadpool(_email_registered, db, payload.email):
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="Email already registered",
         )
 
-    try:
-        user = User(
-            name=payload.name,
-            email=payload.email,
-            password_hash=hash_password(payload.password),
-        )
-        user.city = getattr(payload, 'city', None)
-        user.country = getattr(payload, 'country', None)
-        
-        db.add(user)
-        db.commit()
-        db.refresh(user)
+    # Outside the try: a full hashing queue must surface as 429, not 500
+    password_hash = await ahash_password(payload.password)
 
-        # Initialize health profile for new user
-        try:
-            from backend.app.services.health_profile_service import initialize_health_profile
-            initialize_health_profile(db, user)
-        except Exception as e:
-            logger.warning("Failed to initialize health profile for user %d: %s", user.id, e)
-
-        access_token = create_access_token(user.id)
-        refresh_token = create_refresh_token(db, user.id)
-
-        logger.info("User registered: %s (id=%d)", user.email, user.id)
-
-        return {
-            "access_token": access_token,
-            "refresh_token": refresh_token,
-            "user": {
-                "id": user.id,
-                "name": user.name,
-                "email": user.email,
-            },
-        }
+    try:
+        return await run_in_threadpool(_create_user, db, payload, password_hash)
     except Exception as e:
         import traceback
         logger.error(f"Registration Error: {str(e)}")
@@ -106,21 +126,9 @@ def register(payload: RegisterRequest, db: Session = Depends(get_db)):
         )
 
 
-@router.post("/login", response_model=TokenResponse)
-def login(payload: LoginRequest, db: Session = Depends(get_db), request: Request = None):
-    """Authenticate a user and return tokens."""
-    
-    # Rate limiting on auth endpoints
-    if settings.RATE_LIMIT_ENABLED and request:
-        client_id = request.client.host if request.client else "unknown"
-        allowed, retry_after = rate_limiters.is_allowed('auth', client_id)
-        if not allowed:
-            raise HTTPException(
-                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                detail=f"Too many login attempts. Please try again in {retry_after} seconds",
-            )
-    
-    user = db.query(User).filter(User.email == payload.email).first()
+def _find_login_user(db: Session, email: str) -> Tuple[Optional[User], Optional[str]]:
+    """The user and their password hash; raises 403 while locked, lifts an expired lockout."""
+    user = db.query(User).filter(User.email == email).first()
     
     # Check if account is locked
     if user and user.account_locked:
@@ -136,44 +144,49 @@ def login(payload: LoginRequest, db: Session = Depends(get_db), request: Request
             user.account_locked_until = None
             user.failed_login_attempts = 0
             db.commit()
-    
-    # Check password
-    if not user or not verify_password(payload.password, user.password_hash):
-        # Increment failed login attempts
-        if user:
-            user.failed_login_attempts = (user.failed_login_attempts or 0) + 1
-            
-            # Lock account if max attempts exceeded
-            if user.failed_login_attempts >= settings.MAX_LOGIN_ATTEMPTS:
-                user.account_locked = True
-                user.account_locked_until = datetime.now(timezone.utc) + timedelta(
-                    minutes=settings.ACCOUNT_LOCKOUT_DURATION_MINUTES
-                )
-                db.commit()
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail=f"Too many failed login attempts. Account locked for {settings.ACCOUNT_LOCKOUT_DURATION_MINUTES} minutes",
-                )
-            
+    return user, user.password_hash if user else None
+
+
+def _reject_login(db: Session, user: Optional[User]) -> None:
+    """Count a failed attempt (locking the account past MAX_LOGIN_ATTEMPTS) and raise."""
+    if user:
+        user.failed_login_attempts = (user.failed_login_attempts or 0) + 1
+        
+        # Lock account if max attempts exceeded
+        if user.failed_login_attempts >= settings.MAX_LOGIN_ATTEMPTS:
+            user.account_locked = True
+            user.account_locked_until = datetime.now(timezone.utc) + timedelta(
+                minutes=settings.ACCOUNT_LOCKOUT_DURATION_MINUTES
+            )
             db.commit()
+            invalidate_principals(user.id)
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=f"Too many failed login attempts. Account locked for {settings.ACCOUNT_LOCKOUT_DURATION_MINUTES} minutes",
+            )
         
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid email or password",
-        )
+        db.commit()
     
+    raise HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid email or password",
+    )
+
+
+def _complete_login(db: Session, user: User, new_hash: Optional[str], client_ip: Optional[str]) -> dict:
     # Successful login - reset failed attempts and update last login
     user.failed_login_attempts = 0
+    if new_hash:
+        user.password_hash = new_hash
     user.last_login = datetime.now(timezone.utc)
-    if request and request.client:
-        user.last_login_ip = request.client.host
+    if client_ip:
+        user.last_login_ip = client_ip
     db.commit()
 
-    access_token = create_access_token(user.id)
+    access_token = create_access_token(user.id, user.plan_tier)
     refresh_token = create_refresh_token(db, user.id)
 
-    logger.info("User logged in: %s (id=%d) from %s", 
-                user.email, user.id, request.client.host if request and request.client else "unknown")
+    logger.info("User logged in: %s (id=%d) from %s", user.email, user.id, client_ip or "unknown")
 
     return {
         "access_token": access_token,
@@ -186,14 +199,38 @@ def login(payload: LoginRequest, db: Session = Depends(get_db), request: Request
     }
 
 
+@router.post("/login", response_model=TokenResponse)
+async def login(payload: LoginRequest, db: Session = Depends(get_db), request: Request = None):
+    """Authenticate a user and return tokens."""
+    
+    # Per-IP rate limiting is applied by RateLimitMiddleware
+    user, password_hash = await run_in_threadpool(_find_login_user, db, payload.email)
+    
+    # Check password
+    if not user or not await averify_password(payload.password, password_hash):
+        await run_in_threadpool(_reject_login, db, user)
+
+    new_hash = None
+    if password_needs_rehash(password_hash):
+        # BCRYPT_ROUNDS changed since this hash was made; upgrade while we have the password
+        try:
+            new_hash = await ahash_password(payload.password)
+            logger.info("Rehashed password for user %d with the current cost factor", user.id)
+        except PasswordHasherBusy:
+            pass  # try again on a later login
+
+    client_ip = request.client.host if request and request.client else None
+    return await run_in_threadpool(_complete_login, db, user, new_hash, client_ip)
+
+
 @router.post("/refresh", response_model=TokenResponse)
 def refresh(payload: RefreshRequest, db: Session = Depends(get_db)):
     """Exchange a valid refresh token for a new access token."""
     session = validate_refresh_token(db, payload.refresh_token)
 
     # Issue new access token (refresh token stays the same)
-    access_token = create_access_token(session.user_id)
     user = db.query(User).filter(User.id == session.user_id).first()
+    access_token = create_access_token(session.user_id, user.plan_tier)
 
     return {
         "access_token": access_token,
@@ -218,14 +255,22 @@ class ChangePasswordRequest(BaseModel):
     new_password: str
 
 
+def _set_password(db: Session, user: User, password_hash: str) -> None:
+    user.password_hash = password_hash
+    db.commit()
+
+    # Revoke all other sessions for security
+    revoke_all_user_sessions(db, user.id)
+
+
 @router.post("/change-password", response_model=MessageResponse)
-def change_password(
+async def change_password(
     payload: ChangePasswordRequest,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     """Change password for the authenticated user."""
-    if not verify_password(payload.current_password, current_user.password_hash):
+    if not await averify_password(payload.current_password, current_user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Current password is incorrect",
@@ -238,11 +283,7 @@ def change_password(
             detail=error,
         )
 
-    current_user.password_hash = hash_password(payload.new_password)
-    db.commit()
-
-    # Revoke all other sessions for security
-    revoke_all_user_sessions(db, current_user.id)
+    await run_in_threadpool(_set_password, db, current_user, await ahash_password(payload.new_password))
 
     logger.info("Password changed for user %d", current_user.id)
     return {"message": "Password changed successfully"}
@@ -3,21 +3,24 @@ Chat Routes.
 """
 
 from fastapi import APIRouter, Depends, Query
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel, Field
 from typing import Optional, Literal
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from backend.app.database import get_db
 from backend.app.models.user import User
 from backend.app.models.chat_history import ChatHistory
 from backend.app.services.auth_service import get_current_user
 from backend.app.services.chat_service import process_chat
+from backend.app.services.usage_meter import meter_feature
 from backend.app.logging_config import get_logger
+from backend.app.responses import EnvelopeResponse, sse_event
 
 logger = get_logger("routes.chat")
 
-router = APIRouter(prefix="/chat", tags=["Chatbot"])
+router = APIRouter(prefix="/chat", tags=["Chatbot"], default_response_class=EnvelopeResponse)
 
 
 class ChatRequest(BaseModel):
@@ -35,6 +38,7 @@ class ChatResponse(BaseModel):
     causes: list[dict] = []
     next_steps: list[str] = []
     session_id: str
+    trace: Optional[dict] = None  # analysis stage timings, only with ?debug=true
 
 
 class ChatHistoryItem(BaseModel):
@@ -51,6 +55,7 @@ class ChatHistoryItem(BaseModel):
 @router.post("", response_model=ChatResponse)
 def chat(
     payload: ChatRequest,
+    debug: bool = Query(False, description="Include per-stage analysis timings in the response"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -58,6 +63,7 @@ def chat(
         "Chat request from user %d | mode=%s | lang=%s",
         current_user.id, payload.mode, payload.language,
     )
+    meter_feature(current_user.id, current_user.plan_tier, "basic_chat")
 
     result = process_chat(
         db=db,
@@ -69,9 +75,58 @@ def chat(
     )
     if result.get("status") == "error":
         return JSONResponse(status_code=500, content=result)
+    if not debug:
+        result.pop("trace", None)
     return result
 
 
+@router.post("/stream")
+async def chat_stream(
+    payload: ChatRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Chat over Server-Sent Events.
+
+    Emits ``triage`` (emergency check) at once, then ``differential`` (CDSS),
+    ``token`` events with the answer text as it is generated, and ``done``
+    with the ChatResponse fields once the exchange has been saved.
+    """
+    from backend.app.services.chat_stream import stream_chat
+    from backend.app.services.user_profile_cache import load_user_profile
+
+    user_id = current_user.id
+    await run_in_threadpool(meter_feature, user_id, current_user.plan_tier, "basic_chat")
+    # Resolved now, from the user get_current_user loaded: the session is closed once the body streams
+    profile = await run_in_threadpool(load_user_profile, db, user_id) if payload.mode == "health" else None
+    logger.info(
+        "Streaming chat request from user %d | mode=%s | lang=%s",
+        user_id, payload.mode, payload.language,
+    )
+
+    async def events():
+        try:
+            async for event, data in stream_chat(
+                user_id=user_id,
+                message=payload.message,
+                mode=payload.mode,
+                language=payload.language,
+                session_id=payload.session_id,
+                profile=profile,
+            ):
+                yield sse_event(event, data)
+        except Exception as exc:
+            logger.error("chat stream failed: %s", exc, exc_info=True)
+            yield sse_event("error", {"status": "error", "message": "Unable to process request"})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/history", response_model=list[ChatHistoryItem])
 def get_chat_history(
     session_id: Optional[str] = Query(None, description="Filter by session ID"),
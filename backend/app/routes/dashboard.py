@@ -4,21 +4,19 @@ Dashboard Routes — aggregated health summary for the authenticated user.
 
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
-from sqlalchemy import func
 from datetime import datetime, timedelta, timezone
 
 from backend.app.database import get_db
 from backend.app.models.user import User
 from backend.app.models.symptom_log import SymptomLog
-from backend.app.models.nutrition_log import NutritionLog
-from backend.app.models.lab_report import LabReport
-from backend.app.models.chat_history import ChatHistory
 from backend.app.services.auth_service import get_current_user
+from backend.app.services.daily_rollup import dashboard_totals
 from backend.app.logging_config import get_logger
+from backend.app.responses import EnvelopeResponse
 
 logger = get_logger("routes.dashboard")
 
-router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
+router = APIRouter(prefix="/dashboard", tags=["Dashboard"], default_response_class=EnvelopeResponse)
 
 
 @router.get("/summary")
@@ -27,11 +25,11 @@ def get_dashboard_summary(
     current_user: User = Depends(get_current_user),
 ):
     """
-    Aggregated health dashboard data from real DB records.
+    Aggregated health dashboard data: the user's daily rollups for the last
+    seven days plus their five most recent symptom logs.
     """
     now = datetime.now(timezone.utc)
     week_ago = now - timedelta(days=7)
-    today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
 
     # Recent symptom logs (last 7 days)
     recent_symptoms = (
@@ -43,36 +41,10 @@ def get_dashboard_summary(
         .all()
     )
 
-    # Today's nutrition
-    today_nutrition = (
-        db.query(func.sum(NutritionLog.calories))
-        .filter(NutritionLog.user_id == current_user.id)
-        .filter(NutritionLog.timestamp >= today_start)
-        .scalar()
-    ) or 0
-
-    nutrition_count = (
-        db.query(func.count(NutritionLog.id))
-        .filter(NutritionLog.user_id == current_user.id)
-        .filter(NutritionLog.timestamp >= today_start)
-        .scalar()
-    ) or 0
-
-    # Latest lab report
-    latest_lab = (
-        db.query(LabReport)
-        .filter(LabReport.user_id == current_user.id)
-        .order_by(LabReport.timestamp.desc())
-        .first()
-    )
-
-    # Chat session count (last 7 days)
-    chat_sessions = (
-        db.query(func.count(func.distinct(ChatHistory.session_id)))
-        .filter(ChatHistory.user_id == current_user.id)
-        .filter(ChatHistory.created_at >= week_ago)
-        .scalar()
-    ) or 0
+    # Today's nutrition, weekly symptom/chat counts and the latest lab report
+    totals = dashboard_totals(db, current_user.id, now.date())
+    today_nutrition = totals["calories_today"]
+    latest_lab = totals["lab"]
 
     # Compute health score from available data
     score = 80  # base
@@ -82,8 +54,8 @@ def get_dashboard_summary(
         score -= high_triage * 5
     if today_nutrition > 0:
         score += 5  # tracking nutrition is positive
-    if latest_lab and latest_lab.analysis_result:
-        summary = latest_lab.analysis_result.get("summary", "")
+    if latest_lab and latest_lab["summary"] is not None:
+        summary = latest_lab["summary"]
         if "normal" in summary.lower():
             score += 5
         elif "abnormalities" in summary.lower():
@@ -118,14 +90,15 @@ def get_dashboard_summary(
         ],
         "nutrition_today": {
             "calories": round(today_nutrition, 1),
-            "meals_logged": nutrition_count,
+            "meals_logged": totals["meals_today"],
         },
         "lab_status": {
-            "latest_report": latest_lab.report_name if latest_lab else None,
-            "summary": latest_lab.analysis_result.get("summary") if latest_lab and latest_lab.analysis_result else None,
-            "date": latest_lab.timestamp.isoformat() if latest_lab and latest_lab.timestamp else None,
+            "latest_report": latest_lab["report_name"] if latest_lab else None,
+            "summary": latest_lab["summary"] if latest_lab else None,
+            "date": latest_lab["at"].isoformat() if latest_lab else None,
         },
-        "chat_sessions_this_week": chat_sessions,
+        "symptoms_this_week": totals["symptoms"],
+        "chat_sessions_this_week": totals["chat_sessions"],
         "user": {
             "name": current_user.name,
             "city": current_user.city,
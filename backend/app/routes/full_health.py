@@ -1,11 +1,13 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from pydantic import BaseModel
 from typing import List, Optional, Dict
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from backend.app.config import get_settings
 from backend.app.database import get_db
 from backend.app.services.auth_service import get_current_user
 from backend.app.models.user import User
-from backend.app.services.health_orchestrator import run_full_health_analysis
+from backend.app.services.health_orchestrator import run_full_health_analysis, run_full_health_analysis_async
 
 router = APIRouter(prefix="/full-health", tags=["Unified Health Intelligence"])
 
@@ -20,9 +22,12 @@ class FullHealthRequest(BaseModel):
     location: Optional[str] = None
 
 @router.post("/analyze")
-def analyze(
+async def analyze(
     request: FullHealthRequest,
+    debug: bool = Query(False, description="Include per-stage timings in the response"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    return run_full_health_analysis(db, current_user.id, request.model_dump())
\ No newline at end of file
+    if get_settings().HEALTH_ORCHESTRATOR_PARALLEL:
+        return await run_full_health_analysis_async(current_user.id, request.model_dump(), include_timings=debug)
+    return await run_in_threadpool(run_full_health_analysis, db, current_user.id, request.model_dump())
@@ -53,3 +53,108 @@ def liveness_check():
         "alive": True,
         "timestamp": __import__("datetime").datetime.now(__import__("datetime").timezone.utc).isoformat(),
     }
+
+
+@router.get("/inference")
+def inference_stats():
+    """
+    Inference metrics for the image classifiers.
+    Executor occupancy plus per-model queue depth, batch-size histogram
+    and p50/p99 latency from the micro-batcher.
+    """
+    from backend.app.services.inference_batcher import get_batching_stats
+    from backend.app.services.inference_executor import get_inference_executor
+    return {
+        "executor": get_inference_executor().stats(),
+        "batching": get_batching_stats(),
+    }
+
+
+@router.get("/llm-cache")
+def llm_cache_stats():
+    """
+    OpenRouter response cache metrics.
+    Hits, shared-store hits, misses, coalesced in-flight requests, evictions
+    and current size.
+    """
+    from backend.app.services.llm_cache import get_llm_cache
+    return get_llm_cache().stats()
+
+
+@router.get("/llm-client")
+def llm_client_stats():
+    """
+    OpenRouter client metrics.
+    Whether the pooled session is up, request and retry counts, and the
+    circuit breaker state.
+    """
+    from backend.app.services.openrouter_client import get_openrouter_client
+    return get_openrouter_client().stats()
+
+
+@router.get("/auth-cache")
+def auth_cache_stats():
+    """
+    Verified-principal cache metrics for claims-only routes.
+    Size, hit rate and per-user invalidations (lockout, password change).
+    """
+    from backend.app.services.principal_cache import get_principal_cache
+    return get_principal_cache().stats()
+
+
+@router.get("/password-hasher")
+def password_hasher_stats():
+    """
+    bcrypt pool metrics.
+    Occupancy, queue depth, rejections (429s), and average/max queue wait
+    and hash time.
+    """
+    from backend.app.services.password_hasher import get_password_hasher
+    return get_password_hasher().stats()
+
+
+@router.get("/rate-limit")
+def rate_limit_stats():
+    """
+    Rate limiter metrics.
+    Store backend and tracked clients, idle evictions, and allowed/rejected
+    counts per limiter.
+    """
+    from backend.app.rate_limit import rate_limiters
+    return rate_limiters.stats()
+
+
+@router.get("/usage-meter")
+def usage_meter_stats():
+    """
+    Plan usage metering metrics.
+    Buffered increments, flush count/latency/errors, and per-user loads.
+    """
+    from backend.app.services.usage_meter import get_usage_meter
+    return get_usage_meter().stats()
+
+
+@router.get("/db-queries")
+def db_query_stats():
+    """
+    SQL statements per endpoint (requests, total, max and average per
+    request) when DB_QUERY_COUNTER_ENABLED is set, plus user profile cache
+    metrics.
+    """
+    from backend.app.db_metrics import query_stats
+    from backend.app.services.user_profile_cache import get_profile_cache
+    return {
+        "enabled": settings.DB_QUERY_COUNTER_ENABLED,
+        "routes": query_stats(),
+        "profile_cache": get_profile_cache().stats(),
+    }
+
+
+@router.get("/database")
+def database_stats():
+    """
+    Database connection layout: dialect, whether the SQLite production
+    profile is on (journal mode, writer and reader pools), pool usage.
+    """
+    from backend.app.database import database_stats as stats
+    return stats()
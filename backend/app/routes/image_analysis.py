@@ -5,11 +5,14 @@ Unified Image Analysis Routes — single endpoint for MRI, X-ray, and skin analy
 from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Depends
 from typing import Optional
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from backend.app.database import get_db
 from backend.app.models.user import User
 from backend.app.models.image_analysis import ImageAnalysis
 from backend.app.services.auth_service import get_current_user
+from backend.app.services.inference_executor import InferenceQueueFull, run_inference
+from backend.app.services.usage_meter import meter_feature
 from backend.app.logging_config import get_logger
 
 logger = get_logger("routes.image_analysis")
@@ -32,6 +35,7 @@ async def analyze_image(
     """
     if not file.content_type or not file.content_type.startswith("image/"):
         raise HTTPException(status_code=400, detail="File must be an image (JPEG, PNG, etc.)")
+    await run_in_threadpool(meter_feature, current_user.id, current_user.plan_tier, "image_analysis")
 
     image_type_lower = image_type.strip().lower()
     
@@ -51,13 +55,13 @@ async def analyze_image(
         
         if image_type_lower == "xray":
             from backend.app.services.xray_service import predict_xray
-            result = predict_xray(contents)
+            result = await run_inference(predict_xray, contents)
         elif image_type_lower == "mri":
             from backend.app.services.mri_service import predict_mri
-            result = predict_mri(contents)
+            result = await run_inference(predict_mri, contents)
         elif image_type_lower == "skin":
             from backend.app.services.skin_service import predict_skin
-            result = predict_skin(contents)
+            result = await run_inference(predict_skin, contents)
         else:
             raise HTTPException(status_code=400, detail=f"Unsupported type: {image_type}")
 
@@ -87,6 +91,13 @@ async def analyze_image(
 
         return result
 
+    except InferenceQueueFull as e:
+        logger.warning("Inference queue full, rejecting %s analysis", image_type_lower)
+        raise HTTPException(
+            status_code=503,
+            detail="Image analysis is busy. Please retry shortly.",
+            headers={"Retry-After": str(e.retry_after)},
+        )
     except FileNotFoundError as e:
         logger.error("Model not found for %s: %s", image_type_lower, e)
         raise HTTPException(
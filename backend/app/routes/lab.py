@@ -5,6 +5,7 @@ Lab Report Routes — analyze lab values with auth, DB persistence, PDF/image OC
 from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Depends
 from typing import Dict, Optional
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 import csv
 import io
 import json
@@ -13,6 +14,8 @@ from backend.app.database import get_db
 from backend.app.models.user import User
 from backend.app.models.lab_report import LabReport
 from backend.app.services.auth_service import get_current_user
+from backend.app.services.daily_rollup import record_lab_report
+from backend.app.services.usage_meter import meter_feature
 from backend.app.ml_models.lab_engine import (
     analyze_lab_report,
     extract_lab_values_from_text,
@@ -93,6 +96,7 @@ async def analyze_lab(
 
     Results are persisted to the database.
     """
+    await run_in_threadpool(meter_feature, current_user.id, current_user.plan_tier, "lab_reports")
     parsed: Dict[str, float] = {}
 
     if file is not None:
@@ -179,6 +183,8 @@ async def analyze_lab(
         analysis_result=result,
     )
     db.add(report)
+    db.flush()
+    record_lab_report(db, current_user.id, report.report_name, result.get("summary"), report.timestamp)
     db.commit()
 
     logger.info("Lab report analyzed for user %d: %s", current_user.id, result.get("summary"))
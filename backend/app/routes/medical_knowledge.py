@@ -5,11 +5,10 @@ Medical Knowledge Routes — search medical knowledge base and get evidence-base
 from fastapi import APIRouter, Depends
 from pydantic import BaseModel, Field
 from typing import Optional
-from sqlalchemy.orm import Session
 
-from backend.app.database import get_db
-from backend.app.models.user import User
-from backend.app.services.auth_service import get_current_user
+from backend.app.services.auth_service import get_current_principal
+from backend.app.services.principal_cache import Principal
+from backend.app.services.usage_meter import meter_feature
 from backend.app.services.medical_rag import (
     search_knowledge,
     generate_evidence_based_answer,
@@ -38,10 +37,10 @@ class GuidelineRequest(BaseModel):
 @router.post("/search")
 def search_medical_knowledge(
     req: SearchRequest,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ):
     """Search the medical knowledge base using semantic search."""
+    meter_feature(current_user.id, current_user.plan_tier, "knowledge_search")
     results = search_knowledge(req.query, top_k=req.top_k)
     logger.info("Knowledge search by user %d: '%s' → %d results", current_user.id, req.query, len(results))
     return {
@@ -54,10 +53,10 @@ def search_medical_knowledge(
 @router.post("/explain")
 def explain_condition(
     req: ExplainRequest,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ):
     """Get an evidence-based explanation for a medical question."""
+    meter_feature(current_user.id, current_user.plan_tier, "knowledge_explain")
     answer = generate_evidence_based_answer(req.question)
     logger.info("Knowledge explain by user %d: '%s'", current_user.id, req.question)
     return answer
@@ -66,8 +65,7 @@ def explain_condition(
 @router.post("/guidelines")
 def get_guidelines(
     req: GuidelineRequest,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ):
     """Get WHO/CDC treatment guidelines for a specific condition."""
     guidelines = get_condition_guidelines(req.condition)
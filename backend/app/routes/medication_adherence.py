@@ -8,8 +8,8 @@ from typing import List, Optional
 from sqlalchemy.orm import Session
 
 from backend.app.database import get_db
-from backend.app.models.user import User
-from backend.app.services.auth_service import get_current_user
+from backend.app.services.auth_service import get_current_principal
+from backend.app.services.principal_cache import Principal
 from backend.app.services.medication_adherence_service import (
     check_drug_interactions,
     create_medication_schedule,
@@ -51,7 +51,7 @@ class MissedDoseRequest(BaseModel):
 @router.post("/check-interactions")
 def check_interactions(
     req: InteractionCheckRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ):
     """Check for drug-drug interactions between medications."""
     interactions = check_drug_interactions(req.medications)
@@ -67,7 +67,7 @@ def check_interactions(
 @router.post("/schedule")
 def build_schedule(
     req: ScheduleRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ):
     """Create a daily medication schedule with reminder times."""
     meds = [m.dict() for m in req.medications]
@@ -78,7 +78,7 @@ def build_schedule(
 @router.post("/adherence-score")
 def get_adherence(
     req: AdherenceRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ):
     """Calculate medication adherence score."""
     return calculate_adherence_score(
@@ -91,7 +91,7 @@ def get_adherence(
 @router.post("/missed-dose")
 def missed_dose(
     req: MissedDoseRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ):
     """Get advice for a missed medication dose."""
     return get_missed_dose_advice(req.medication, req.hours_late)
@@ -11,6 +11,7 @@ from backend.app.models.user import User
 from backend.app.models.nutrition_log import NutritionLog
 from backend.app.schemas.nutrition_log import NutritionLogCreate, NutritionLogResponse
 from backend.app.services.auth_service import get_current_user
+from backend.app.services.daily_rollup import record_meal
 from backend.app.ml_models.nutrition_engine import analyze_food
 from backend.app.logging_config import get_logger
 
@@ -49,6 +50,8 @@ def log_nutrition(
         fats=fats,
     )
     db.add(db_entry)
+    db.flush()
+    record_meal(db, current_user.id, calories, db_entry.timestamp)
     db.commit()
     db.refresh(db_entry)
 
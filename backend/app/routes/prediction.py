@@ -4,8 +4,9 @@ Prediction Routes — ML inference for medical images with authentication.
 
 from fastapi import APIRouter, UploadFile, File, HTTPException, Depends
 from backend.app.services.xray_service import predict_xray as model_predict_xray
-from backend.app.models.user import User
-from backend.app.services.auth_service import get_current_user
+from backend.app.services.auth_service import get_current_principal
+from backend.app.services.principal_cache import Principal
+from backend.app.services.inference_executor import InferenceQueueFull, run_inference
 from backend.app.logging_config import get_logger
 
 router = APIRouter(prefix="/predict", tags=["Prediction"])
@@ -13,16 +14,26 @@ router = APIRouter(prefix="/predict", tags=["Prediction"])
 logger = get_logger("routes.predict")
 
 
+def _busy(exc: InferenceQueueFull) -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail="Prediction service is busy. Please retry shortly.",
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
 @router.post("/mri")
 async def predict_mri(
     file: UploadFile = File(...),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ):
     """Predict brain MRI anomalies using ResNet18 model."""
     contents = await file.read()
     try:
         from backend.app.services.mri_service import predict_mri as mri_predict
-        return mri_predict(contents)
+        return await run_inference(mri_predict, contents)
+    except InferenceQueueFull as e:
+        raise _busy(e)
     except FileNotFoundError:
         raise HTTPException(status_code=503, detail="MRI model not available")
     except Exception as e:
@@ -33,12 +44,14 @@ async def predict_mri(
 @router.post("/xray")
 async def predict_xray(
     file: UploadFile = File(...),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ):
     """Predict chest X-ray conditions using ResNet18 model."""
     contents = await file.read()
     try:
-        return model_predict_xray(contents)
+        return await run_inference(model_predict_xray, contents)
+    except InferenceQueueFull as e:
+        raise _busy(e)
     except FileNotFoundError:
         raise HTTPException(status_code=503, detail="X-ray model not available")
     except Exception as e:
@@ -49,13 +62,15 @@ async def predict_xray(
 @router.post("/skin")
 async def predict_skin(
     file: UploadFile = File(...),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ):
     """Predict skin lesion classification using ISIC model."""
     contents = await file.read()
     try:
         from backend.app.services.skin_service import predict_skin as skin_predict
-        return skin_predict(contents)
+        return await run_inference(skin_predict, contents)
+    except InferenceQueueFull as e:
+        raise _busy(e)
     except FileNotFoundError:
         raise HTTPException(status_code=503, detail="Skin model not available")
     except Exception as e:
@@ -66,13 +81,15 @@ async def predict_skin(
 @router.post("/food")
 async def predict_food(
     file: UploadFile = File(...),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ):
     """Predict food item from image using food recognition model."""
     contents = await file.read()
     try:
         from backend.app.services.food_service import predict_food as food_predict
-        return food_predict(contents)
+        return await run_inference(food_predict, contents)
+    except InferenceQueueFull as e:
+        raise _busy(e)
     except FileNotFoundError:
         raise HTTPException(status_code=503, detail="Food model not available")
     except Exception as e:
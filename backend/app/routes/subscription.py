@@ -8,10 +8,12 @@ from sqlalchemy.orm import Session
 
 from backend.app.database import get_db
 from backend.app.models.user import User
-from backend.app.services.auth_service import get_current_user
+from backend.app.services.auth_service import create_access_token, get_current_user
+from backend.app.services.principal_cache import invalidate_principals
 from backend.app.services.subscription_service import (
-    get_plans, get_user_plan, check_feature_access, PlanTier,
+    get_plans, get_user_plan, PlanTier,
 )
+from backend.app.services.usage_meter import get_usage_meter
 from backend.app.logging_config import get_logger
 
 logger = get_logger("routes.subscription")
@@ -62,6 +64,8 @@ def upgrade_plan(
     old_plan = current_user.plan_tier
     current_user.plan_tier = req.plan
     db.commit()
+    # Cached principals carry the old tier; the new token carries the new rate tier
+    invalidate_principals(current_user.id)
 
     new_plan = get_user_plan(req.plan)
     logger.info("User %d upgraded: %s → %s", current_user.id, old_plan, req.plan)
@@ -72,6 +76,7 @@ def upgrade_plan(
         "old_plan": old_plan,
         "new_plan": req.plan,
         "features_unlocked": new_plan["features"],
+        "access_token": create_access_token(current_user.id, req.plan),
     }
 
 
@@ -80,8 +85,28 @@ def check_access(
     feature: str,
     current_user: User = Depends(get_current_user),
 ):
-    """Check if user's plan allows access to a specific feature."""
-    result = check_feature_access(current_user.plan_tier, feature)
+    """Check if user's plan allows access to a specific feature, and today's remaining uses."""
+    result = get_usage_meter().check(current_user.id, current_user.plan_tier, feature)
     if not result["allowed"]:
         return {**result, "status": "restricted"}
     return {**result, "status": "allowed"}
+
+
+@router.get("/usage")
+def usage_today(
+    current_user: User = Depends(get_current_user),
+):
+    """Get today's (UTC) usage against each of the plan's daily limits."""
+    plan = get_user_plan(current_user.plan_tier)
+    used = get_usage_meter().usage(current_user.id)
+    return {
+        "plan_tier": current_user.plan_tier,
+        "usage": {
+            key: {
+                "used": used.get(key, 0),
+                "limit": limit,
+                "remaining": -1 if limit == -1 else max(0, limit - used.get(key, 0)),
+            }
+            for key, limit in plan["limits"].items()
+        },
+    }
@@ -2,20 +2,26 @@
 Symptom Routes — log symptoms with authentication, hybrid AI triage, and safety checks.
 """
 
+from typing import Optional
+
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 from pydantic import BaseModel, Field
 
+from backend.app.config import get_settings
 from backend.app.database import get_db
 from backend.app.models.user import User
 from backend.app.models.symptom_log import SymptomLog
 from backend.app.schemas.symptom_log import SymptomLogCreate, SymptomLogResponse
 from backend.app.services.auth_service import get_current_user
+from backend.app.services.daily_rollup import record_symptom
 from backend.app.services.hybrid_triage_service import predict_disease_with_fallback, calculate_severity_with_hybrid
 from backend.app.services.safety_system import detect_emergency, format_emergency_response, should_override_ai_response
+from backend.app.services.usage_meter import meter_feature
 from backend.app.logging_config import get_logger
 
 logger = get_logger("routes.symptoms")
+settings = get_settings()
 
 router = APIRouter(prefix="/symptoms", tags=["Symptoms"])
 
@@ -35,6 +41,19 @@ class SymptomAnalysisResponse(BaseModel):
     confidence: float
 
 
+class IntakeForm(BaseModel):
+    """One patient's intake form in a bulk upload."""
+    reference: Optional[str] = Field(None, max_length=100)
+    symptoms: list[str] = Field(..., max_items=30)
+    age: Optional[int] = Field(None, ge=0, le=130)
+    gender: Optional[str] = None
+
+
+class SymptomBatchRequest(BaseModel):
+    """Bulk symptom analysis request (e.g. a clinic's intake forms)."""
+    forms: list[IntakeForm] = Field(..., min_items=1, max_items=settings.TRIAGE_BATCH_MAX_ROWS)
+
+
 @router.post("/log", response_model=SymptomLogResponse)
 def log_symptoms(
     entry: SymptomLogCreate,
@@ -72,6 +91,8 @@ def log_symptoms(
         triage_level=triage,
     )
     db.add(db_entry)
+    db.flush()
+    record_symptom(db, current_user.id, triage, db_entry.timestamp)
     db.commit()
     db.refresh(db_entry)
     
@@ -97,7 +118,8 @@ def analyze_symptoms(
     Clinical-grade symptom analysis with CDSS, Explainable AI,
     emergency detection, and evidence-based reasoning.
     """
-    
+    meter_feature(current_user.id, current_user.plan_tier, "basic_symptom_checker")
+
     symptoms_text = " ".join(request.symptoms)
     
     # 1. Emergency check
@@ -189,3 +211,56 @@ def analyze_symptoms(
         "confidence": ml_confidence,
     }
 
+
+@router.post("/analyze/batch")
+def analyze_symptoms_batch(
+    request: SymptomBatchRequest,
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Bulk triage for intake forms: emergency screening, severity, and the local
+    triage model's prediction for every form, scored in one model call.
+
+    Uses the local model only — no per-row LLM fallback. Each form counts as
+    one symptom check; a batch larger than what is left of today's limit is
+    rejected whole.
+    """
+    meter_feature(current_user.id, current_user.plan_tier, "basic_symptom_checker", uses=len(request.forms))
+
+    from backend.app.ml_models.severity_engine import calculate_severity
+    from backend.app.ml_models.triage_infer import predict_disease_safe_batch
+
+    forms = request.forms
+    predictions = predict_disease_safe_batch([form.symptoms for form in forms])
+
+    results = []
+    emergencies = 0
+    for form, prediction in zip(forms, predictions):
+        emergency_detection = detect_emergency(" ".join(form.symptoms), age=form.age, gender=form.gender)
+        is_emergency = should_override_ai_response(emergency_detection)
+        severity = calculate_severity(form.symptoms)
+        if is_emergency:
+            emergencies += 1
+        results.append({
+            "reference": form.reference,
+            "emergency": is_emergency,
+            "emergency_type": emergency_detection.get("type") if is_emergency else None,
+            "triage_level": "Emergency" if is_emergency else severity.get("triage_level"),
+            "severity_score": severity.get("severity_score"),
+            "red_flags": severity.get("red_flags", []),
+            "disease_prediction": prediction.get("disease_prediction"),
+            "confidence": prediction.get("confidence", 0.0),
+            "top_predictions": prediction.get("top_predictions", []),
+            "needs_more_info": prediction.get("needs_more_info", False),
+        })
+
+    logger.info(
+        "Batch symptom analysis by user %d: %d forms, %d emergencies",
+        current_user.id, len(forms), emergencies,
+    )
+
+    return {
+        "status": "success",
+        "data": {"count": len(results), "emergencies": emergencies, "results": results},
+        "message": f"Analyzed {len(results)} intake forms",
+    }
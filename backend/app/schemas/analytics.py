@@ -21,3 +21,8 @@ class TimelineEvent(BaseModel):
     description: str
     detail: Optional[str] = None
     timestamp: Optional[str] = None
+
+
+class TimelinePage(BaseModel):
+    events: list[TimelineEvent]
+    next_cursor: Optional[str] = None
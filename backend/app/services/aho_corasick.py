@@ -0,0 +1,171 @@
+"""
+Aho–Corasick multi-pattern automaton.
+
+Finds every occurrence of a fixed set of patterns in one left-to-right pass
+over the input, independent of how many patterns there are. Patterns and
+inputs are sequences of hashable symbols: characters of a string for raw
+substring search, or word tokens for whole-word phrase matching.
+
+:class:`KeywordMatcher` is the plain-string substring variant; it uses the
+``pyahocorasick`` C automaton when installed, since per-character Python
+loops are slower than CPython's own ``str.__contains__``.
+"""
+
+import re
+from collections import deque
+from typing import Any, Dict, Hashable, Iterable, Iterator, List, Sequence, Set, Tuple
+
+
+class AhoCorasick:
+    """
+    Compiled automaton over ``(pattern, value)`` pairs.
+
+    ``value`` is returned with every match of its pattern; a pattern added
+    more than once reports all of its values.
+    """
+
+    def __init__(self, patterns: Iterable[Tuple[Sequence[Hashable], Any]]):
+        self._goto: List[Dict[Hashable, int]] = [{}]
+        self._fail: List[int] = [0]
+        # Per state: (pattern length, value) for every pattern ending here,
+        # including those reached through failure links
+        self._out: List[List[Tuple[int, Any]]] = [[]]
+
+        for pattern, value in patterns:
+            if len(pattern) == 0:
+                continue
+            state = 0
+            for symbol in pattern:
+                nxt = self._goto[state].get(symbol)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][symbol] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                state = nxt
+            self._out[state].append((len(pattern), value))
+
+        self._build_failure_links()
+
+    def _build_failure_links(self) -> None:
+        # Breadth-first, so a state's failure target is complete before its children.
+        # _delta is the full DFA: each state's transitions with failure moves
+        # already folded in, so matching never walks failure links.
+        self._delta: List[Dict[Hashable, int]] = [dict(self._goto[0])] + [{} for _ in self._goto[1:]]
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            delta = dict(self._delta[self._fail[state]])
+            delta.update(self._goto[state])
+            self._delta[state] = delta
+            for symbol, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and symbol not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(symbol, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                if self._out[self._fail[nxt]]:
+                    self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def __len__(self) -> int:
+        return len(self._goto)
+
+    def find_all(self, sequence: Sequence[Hashable]) -> List[Tuple[int, int, Any]]:
+        """``(start, end, value)`` for every match, ordered by end position."""
+        delta, out = self._delta, self._out
+        matches = []
+        state = 0
+        for i, symbol in enumerate(sequence):
+            # A symbol missing from the DFA row appears in no pattern: back to the root
+            state = delta[state].get(symbol, 0)
+            if out[state]:
+                for length, value in out[state]:
+                    matches.append((i + 1 - length, i + 1, value))
+        return matches
+
+    def iter_matches(self, sequence: Sequence[Hashable]) -> Iterator[Tuple[int, int, Any]]:
+        """Lazy :meth:`find_all`, for callers that stop at the first match."""
+        delta, out = self._delta, self._out
+        state = 0
+        for i, symbol in enumerate(sequence):
+            state = delta[state].get(symbol, 0)
+            if out[state]:
+                for length, value in out[state]:
+                    yield i + 1 - length, i + 1, value
+
+    def contains_any(self, sequence: Sequence[Hashable]) -> bool:
+        for _ in self.iter_matches(sequence):
+            return True
+        return False
+
+
+class KeywordMatcher:
+    """
+    Which of a fixed set of keywords occur as substrings of a text.
+
+    ``find(text)`` returns exactly ``{k for k in keywords if k in text}``
+    (overlapping matches included) in one scan of ``text``. ``backend`` is
+    ``"auto"`` (pyahocorasick if importable) or ``"regex"``.
+    """
+
+    def __init__(self, keywords: Iterable[str], backend: str = "auto"):
+        self.keywords = sorted({k for k in keywords if k})
+        try:
+            if backend == "regex":
+                raise ImportError("regex backend requested")
+            import ahocorasick
+
+            automaton = ahocorasick.Automaton()
+            for keyword in self.keywords:
+                automaton.add_word(keyword, keyword)
+            automaton.make_automaton()
+            self._automaton = automaton
+            self.backend = "pyahocorasick"
+        except ImportError:
+            self._automaton = None
+            self._regex = re.compile(_trie_regex(self.keywords)) if self.keywords else None
+            # Every keyword that also matches where a longer keyword matched
+            self._prefixes = {
+                k: [p for p in self.keywords if k.startswith(p)] for k in self.keywords
+            }
+            self.backend = "regex"
+
+    def find(self, text: str) -> Set[str]:
+        if self._automaton is not None:
+            if not self.keywords:
+                return set()
+            return {keyword for _, keyword in self._automaton.iter(text)}
+
+        # The trie regex is greedy, so each search returns the longest keyword
+        # starting at its position; shorter ones there are its prefixes.
+        # Restarting one character later catches overlapping matches.
+        found: Set[str] = set()
+        if self._regex is None:
+            return found
+        search = self._regex.search
+        match = search(text)
+        while match is not None:
+            found.update(self._prefixes[match.group()])
+            match = search(text, match.start() + 1)
+        return found
+
+
+def _trie_regex(words: Iterable[str]) -> str:
+    """One alternation regex shaped like a trie, preferring the longest word."""
+    trie: Dict[str, Any] = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = True
+
+    def build(node: Dict[str, Any]) -> str:
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
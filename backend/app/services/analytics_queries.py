@@ -0,0 +1,267 @@
+"""
+Analytics Queries — dialect-aware SQL aggregation for health analytics.
+
+Symptom frequency and nutrition summaries used to load a user's whole
+history as ORM objects and aggregate in Python. These queries make the
+database do the work and return one row per distinct symptom spelling (or
+one row of sums), however long the history is:
+
+- Symptoms are stored as a JSON array per log. The array is unnested with
+  ``json_each`` on SQLite and ``json_array_elements`` on PostgreSQL and
+  grouped by value. Spellings are merged in Python with the same
+  ``strip().lower()`` as before; there are only a few hundred of them, and
+  that keeps Unicode case folding identical to Python's. Legacy rows
+  holding a comma-separated string instead of an array are fetched on
+  their own and split in Python.
+- Nutrition totals are a single ``COUNT``/``SUM`` over the window.
+- The health timeline is a ``UNION ALL`` over the four log tables with the
+  page size pushed into each branch and keyset pagination on
+  ``(timestamp, type, id)``, so a page costs the same however long the
+  history is (with the ``(user_id, timestamp)`` indexes from migration
+  ``add_timeline_indexes``).
+
+The symptom and nutrition functions return None on other dialects so
+callers can fall back to their ORM implementation; the timeline is
+portable Core SQL.
+"""
+
+import base64
+import json
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import (
+    JSON, DateTime, Float, Integer, String, and_, bindparam, column, literal, or_, select, table, text,
+    true, union_all,
+)
+from sqlalchemy.orm import Session
+
+# String elements of array-valued rows, counted per distinct value
+_SYMPTOM_COUNTS_SQL = {
+    "sqlite": """
+        SELECT je.value, COUNT(*)
+        FROM symptom_logs AS s,
+             json_each(CASE WHEN json_type(s.symptoms) = 'array' THEN s.symptoms ELSE '[]' END) AS je
+        WHERE s.user_id = :user_id AND je.type = 'text'
+        GROUP BY je.value
+    """,
+    "postgresql": """
+        SELECT e.value #>> '{}', COUNT(*)
+        FROM symptom_logs AS s
+        CROSS JOIN LATERAL json_array_elements(
+            CASE WHEN json_typeof(s.symptoms::json) = 'array' THEN s.symptoms::json ELSE '[]'::json END
+        ) AS e(value)
+        WHERE s.user_id = :user_id AND json_typeof(e.value) = 'string'
+        GROUP BY 1
+    """,
+}
+
+# Rows that are not JSON arrays (legacy comma-separated strings)
+_LEGACY_SYMPTOMS_SQL = {
+    "sqlite": "SELECT symptoms FROM symptom_logs WHERE user_id = :user_id AND json_type(symptoms) <> 'array'",
+    "postgresql": (
+        "SELECT symptoms FROM symptom_logs WHERE user_id = :user_id AND json_typeof(symptoms::json) <> 'array'"
+    ),
+}
+
+_NUTRITION_TOTALS = text("""
+    SELECT COUNT(*),
+           COALESCE(SUM(COALESCE(calories, 0)), 0),
+           COALESCE(SUM(COALESCE(protein, 0)), 0),
+           COALESCE(SUM(COALESCE(carbs, 0)), 0),
+           COALESCE(SUM(COALESCE(fats, 0)), 0)
+    FROM nutrition_logs
+    WHERE user_id = :user_id AND timestamp >= :cutoff
+""").bindparams(bindparam("cutoff", type_=DateTime()))
+
+
+def _dialect(db: Session) -> str:
+    return db.get_bind().dialect.name
+
+
+def _count(counter: Counter, symptom: str, n: int = 1) -> None:
+    cleaned = symptom.strip().lower()
+    if cleaned:
+        counter[cleaned] += n
+
+
+def symptom_frequency(db: Session, user_id: int) -> Optional[List[Dict]]:
+    """``[{"symptom", "count"}]`` by count descending (ties by name), or None on unsupported dialects."""
+    dialect = _dialect(db)
+    if dialect not in _SYMPTOM_COUNTS_SQL:
+        return None
+
+    counter: Counter = Counter()
+    for value, n in db.execute(text(_SYMPTOM_COUNTS_SQL[dialect]), {"user_id": user_id}):
+        _count(counter, value, n)
+
+    legacy = text(_LEGACY_SYMPTOMS_SQL[dialect]).columns(column("symptoms", JSON))
+    for (symptoms,) in db.execute(legacy, {"user_id": user_id}):
+        if isinstance(symptoms, str):
+            for symptom in symptoms.split(","):
+                _count(counter, symptom)
+
+    ranked = sorted(counter.items(), key=lambda item: (-item[1], item[0]))
+    return [{"symptom": symptom, "count": count} for symptom, count in ranked]
+
+
+def nutrition_totals(db: Session, user_id: int, cutoff: datetime) -> Dict:
+    """Entry count and summed macros for a user's logs since ``cutoff``."""
+    entries, calories, protein, carbs, fats = db.execute(
+        _NUTRITION_TOTALS, {"user_id": user_id, "cutoff": cutoff}
+    ).one()
+    return {
+        "entries": entries,
+        "calories": calories,
+        "protein": protein,
+        "carbs": carbs,
+        "fats": fats,
+    }
+
+
+# ── Timeline ───────────────────────────────────────────────────────────────
+
+
+def _log_table(name: str, *columns):
+    return table(name, column("id", Integer), column("user_id", Integer), column("timestamp", DateTime), *columns)
+
+
+# Event type -> source table. Ties on timestamp order by type descending, which
+# keeps the old feed order: symptom, nutrition, medication, lab_report.
+_TIMELINE_SOURCES = {
+    "symptom": _log_table("symptom_logs", column("symptoms", JSON), column("predicted_disease", String)),
+    "nutrition": _log_table("nutrition_logs", column("food_name", String), column("calories", Float)),
+    "medication": _log_table("medication_logs", column("medication_name", String)),
+    "lab_report": _log_table("lab_reports", column("report_name", String), column("abnormal_values", JSON)),
+}
+
+# (timestamp, type, id) of the last event on the previous page
+TimelineKey = Tuple[Optional[datetime], str, int]
+
+
+def encode_cursor(key: TimelineKey) -> str:
+    timestamp, kind, row_id = key
+    payload = json.dumps([timestamp.isoformat() if timestamp else None, kind, row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> TimelineKey:
+    """Parse an opaque timeline cursor; raises ValueError when it is malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        timestamp, kind, row_id = json.loads(raw)
+        if kind not in _TIMELINE_SOURCES or not isinstance(row_id, int):
+            raise ValueError(cursor)
+        return (datetime.fromisoformat(timestamp) if timestamp is not None else None), kind, row_id
+    except (ValueError, TypeError):
+        raise ValueError("Invalid timeline cursor") from None
+
+
+def _dated_after(t, kind: str, cursor: Optional[TimelineKey]):
+    """Branch filter for dated rows that sort after ``cursor`` in (timestamp, type, id) DESC order."""
+    if cursor is None:
+        return t.c.timestamp.isnot(None)
+    timestamp, cursor_kind, cursor_id = cursor
+    if kind < cursor_kind:
+        return t.c.timestamp <= timestamp
+    if kind > cursor_kind:
+        return t.c.timestamp < timestamp
+    # The redundant range bound lets the (user_id, timestamp) index seek to the cursor
+    return and_(t.c.timestamp <= timestamp, or_(t.c.timestamp < timestamp, t.c.id < cursor_id))
+
+
+def _undated_after(t, kind: str, cursor: Optional[TimelineKey]):
+    """Branch filter for rows without a timestamp (sorted last), or None when the branch is exhausted."""
+    if cursor is None or cursor[0] is not None:
+        return true()
+    _, cursor_kind, cursor_id = cursor
+    if kind < cursor_kind:
+        return true()
+    if kind > cursor_kind:
+        return None
+    return t.c.id < cursor_id
+
+
+def _timeline_keys(db: Session, user_id: int, n: int, dated: bool, cursor: Optional[TimelineKey]) -> List:
+    branches = []
+    for kind, t in _TIMELINE_SOURCES.items():
+        if dated:
+            after, order = _dated_after(t, kind, cursor), (t.c.timestamp.desc(), t.c.id.desc())
+        else:
+            after, order = _undated_after(t, kind, cursor), (t.c.id.desc(),)
+            if after is not None:
+                after = and_(t.c.timestamp.is_(None), after)
+        if after is None:
+            continue
+        branch = (
+            select(literal(kind, String).label("type"), t.c.id, t.c.timestamp)
+            .where(t.c.user_id == user_id, after)
+            .order_by(*order)
+            .limit(n)
+            .subquery()
+        )
+        branches.append(select(*branch.c))
+    if not branches:
+        return []
+    merged = union_all(*branches).subquery("timeline")
+    order = (merged.c.timestamp.desc(),) if dated else ()
+    query = select(merged).order_by(*order, merged.c.type.desc(), merged.c.id.desc()).limit(n)
+    return [(timestamp, kind, row_id) for kind, row_id, timestamp in db.execute(query)]
+
+
+def _as_text(value) -> Optional[str]:
+    """JSON list/dict columns rendered as a comma-separated string for the feed."""
+    if isinstance(value, (list, dict)):
+        return ", ".join(str(item) for item in value)
+    return value
+
+
+def _timeline_event(kind: str, row) -> Dict:
+    if kind == "symptom":
+        description, detail = _as_text(row.symptoms), row.predicted_disease
+    elif kind == "nutrition":
+        description, detail = row.food_name, f"{row.calories or 0} kcal"
+    elif kind == "medication":
+        description, detail = row.medication_name, None
+    else:
+        description, detail = row.report_name, _as_text(row.abnormal_values)
+    return {
+        "type": kind,
+        "description": description,
+        "detail": detail,
+        "timestamp": row.timestamp.isoformat() if row.timestamp else None,
+    }
+
+
+def timeline_page(
+    db: Session, user_id: int, limit: int, cursor: Optional[str] = None
+) -> Tuple[List[Dict], Optional[str]]:
+    """
+    One page of the user's health events, newest first, and the cursor for
+    the next page (None on the last page).
+
+    Events without a timestamp come after all dated events. Raises
+    ValueError for a malformed ``cursor``.
+    """
+    after = decode_cursor(cursor) if cursor else None
+    n = limit + 1  # one extra row tells us whether there is a next page
+
+    keys = []
+    if after is None or after[0] is not None:
+        keys = _timeline_keys(db, user_id, n, True, after)
+    if len(keys) < n:
+        keys += _timeline_keys(db, user_id, n - len(keys), False, after)
+
+    next_cursor = encode_cursor(keys[limit - 1]) if len(keys) > limit else None
+    keys = keys[:limit]
+
+    # Hydrate the page: one primary-key lookup per event type present
+    rows = {}
+    for kind, t in _TIMELINE_SOURCES.items():
+        ids = [row_id for _, k, row_id in keys if k == kind]
+        if ids:
+            for row in db.execute(select(t).where(t.c.id.in_(ids))):
+                rows[kind, row.id] = row
+    events = [_timeline_event(kind, rows[kind, row_id]) for _, kind, row_id in keys if (kind, row_id) in rows]
+    return events, next_cursor
@@ -6,23 +6,26 @@ Provides:
   - JWT access token generation (stateless, short-lived)
   - Refresh token management (database-backed, long-lived)
   - get_current_user dependency for route protection
+  - get_current_principal: cached, claims-only variant (no DB session on hits)
 """
 
 from datetime import datetime, timedelta, timezone
+from typing import Optional
 import secrets
-import bcrypt
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from passlib.context import CryptContext
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 
 from backend.app.config import get_settings
-from backend.app.database import get_db
+from backend.app.database import SessionLocal, get_db
 from backend.app.models.user import User
 from backend.app.models.auth_token import AuthSession
 from backend.app.logging_config import get_logger
+from backend.app.services.password_hasher import get_password_hasher
+from backend.app.services.principal_cache import Principal, get_principal_cache, invalidate_principals
 
 logger = get_logger("services.auth_service")
 settings = get_settings()
@@ -32,37 +35,48 @@ settings = get_settings()
 # ─────────────────────────────────────────────────────────────────────────
 
 def hash_password(password: str) -> str:
-    """Hash a password using bcrypt."""
-    # bcrypt maximum length is 72 bytes
-    pwd_bytes = password.encode("utf-8")[:72]
-    salt = bcrypt.gensalt()
-    hashed = bcrypt.hashpw(pwd_bytes, salt)
-    return hashed.decode("utf-8")
+    """Hash a password using bcrypt (BCRYPT_ROUNDS) on the password hashing pool."""
+    return get_password_hasher().hash(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a plain password against a bcrypt hash."""
-    try:
-        pwd_bytes = plain_password.encode("utf-8")[:72]
-        hash_bytes = hashed_password.encode("utf-8")
-        return bcrypt.checkpw(pwd_bytes, hash_bytes)
-    except Exception as e:
-        logger.error("Password verification error: %s", e)
-        return False
+    """
+    Verify a plain password against a bcrypt hash on the password hashing pool.
+    Raises PasswordHasherBusy when the pool's queue is full.
+    """
+    return get_password_hasher().verify(plain_password, hashed_password)
+
+
+async def ahash_password(password: str) -> str:
+    """:func:`hash_password` for async routes: awaits the pool without holding a threadpool thread."""
+    return await get_password_hasher().ahash(password)
+
+
+async def averify_password(plain_password: str, hashed_password: str) -> bool:
+    """:func:`verify_password` for async routes. Raises PasswordHasherBusy when the pool's queue is full."""
+    return await get_password_hasher().averify(plain_password, hashed_password)
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """True if the hash was made with a different cost factor than BCRYPT_ROUNDS."""
+    return get_password_hasher().needs_rehash(hashed_password)
 
 
 # ─────────────────────────────────────────────────────────────────────────
 # JWT Access Token
 # ─────────────────────────────────────────────────────────────────────────
 
-def create_access_token(user_id: int) -> str:
-    """Create a short-lived JWT access token."""
+def create_access_token(user_id: int, plan: Optional[str] = None) -> str:
+    """Create a short-lived JWT access token (``plan`` sets the user's API rate tier)."""
     expire = datetime.now(timezone.utc) + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     payload = {
         "sub": str(user_id),
+        "iat": datetime.now(timezone.utc),
         "exp": expire,
         "type": "access",
     }
+    if plan:
+        payload["plan"] = plan
     return jwt.encode(payload, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
 
 
@@ -150,6 +164,7 @@ def revoke_all_user_sessions(db: Session, user_id: int) -> int:
         .delete()
     )
     db.commit()
+    invalidate_principals(user_id)
     logger.info("Revoked %d sessions for user %d", count, user_id)
     return count
 
@@ -161,6 +176,34 @@ def revoke_all_user_sessions(db: Session, user_id: int) -> int:
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
 
+def _is_locked(account_locked: bool, locked_until: Optional[datetime]) -> bool:
+    """Locked, and the lockout has not expired yet (login lifts expired ones)."""
+    if not account_locked:
+        return False
+    if locked_until is None:
+        return True
+    if locked_until.tzinfo is None:
+        locked_until = locked_until.replace(tzinfo=timezone.utc)
+    return locked_until > datetime.now(timezone.utc)
+
+
+def _user_id_from(payload: dict) -> int:
+    user_id = payload.get("sub")
+    if user_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token payload",
+        )
+    return int(user_id)
+
+
+def _account_locked() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_403_FORBIDDEN,
+        detail="Account is locked",
+    )
+
+
 def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: Session = Depends(get_db),
@@ -175,22 +218,71 @@ def get_current_user(
             ...
     """
     payload = decode_access_token(token)
-    user_id = payload.get("sub")
-
-    if user_id is None:
+    user_id = _user_id_from(payload)
+
+    # medical_profile is loaded in the same query; later lookups of this user in
+    # the request (chat profile, safety checks) hit the session identity map
+    user = (
+        db.query(User)
+        .options(joinedload(User.medical_profile))
+        .filter(User.id == user_id)
+        .first()
+    )
+    if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token payload",
+            detail="User not found",
         )
+    if _is_locked(user.account_locked, user.account_locked_until):
+        raise _account_locked()
 
-    user = db.query(User).filter(User.id == int(user_id)).first()
-    if not user:
+    return user
+
+
+def get_current_principal(token: str = Depends(oauth2_scheme)) -> Principal:
+    """
+    Claims-only variant of :func:`get_current_user` for routes that just
+    need the caller's id.
+
+    The token is verified against the database (user exists, not locked)
+    once per ``(sub, iat)`` and then served from the principal cache, so
+    cached requests open no DB session at all.
+
+    Usage:
+        @router.post("/search")
+        def search(principal: Principal = Depends(get_current_principal)):
+            ...
+    """
+    payload = decode_access_token(token)
+    user_id = _user_id_from(payload)
+    cache = get_principal_cache()
+    key = (user_id, payload.get("iat", payload.get("exp")))
+
+    principal = cache.get(key)
+    if principal is not None:
+        return principal
+
+    generation = cache.generation(user_id)
+    db = SessionLocal()
+    try:
+        row = (
+            db.query(User.account_locked, User.account_locked_until, User.plan_tier)
+            .filter(User.id == user_id)
+            .first()
+        )
+    finally:
+        db.close()
+    if row is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found",
         )
+    if _is_locked(row.account_locked, row.account_locked_until):
+        raise _account_locked()
 
-    return user
+    principal = Principal(id=user_id, claims=payload, plan_tier=row.plan_tier)
+    cache.put(key, principal, payload.get("exp"), generation)
+    return principal
 
 
 # ─────────────────────────────────────────────────────────────────────────
@@ -302,6 +394,7 @@ def reset_password(db: Session, token: str, new_password: str) -> tuple[bool, st
     reset_token.used_at = datetime.now(timezone.utc)
     
     db.commit()
+    invalidate_principals(user.id)
     logger.info("Password reset for user id=%d", user.id)
     return True, "Password reset successful"
 
@@ -8,7 +8,10 @@ Provides:
 """
 
 import logging
-from typing import Dict, Any, List, Optional
+from functools import lru_cache
+from typing import Dict, Any, List, NamedTuple, Optional
+
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
@@ -257,7 +260,7 @@ GENDER_MODIFIERS = {
 # Differential Diagnosis Ranking
 # ─────────────────────────────────────────────────────────────────────────
 
-def rank_differential_diagnosis(
+def _rank_differential_diagnosis_loop(
     symptoms: List[str],
     age: Optional[int] = None,
     gender: Optional[str] = None,
@@ -265,17 +268,9 @@ def rank_differential_diagnosis(
     family_history: Optional[List[str]] = None,
 ) -> List[Dict[str, Any]]:
     """
-    Rank possible diagnoses using prevalence-weighted Bayesian-style scoring.
-
-    Returns list of dicts sorted by probability:
-        [{
-            "condition": str,
-            "probability": float (0-100),
-            "confidence": float (0-100),
-            "risk_level": "low" | "medium" | "high",
-            "matching_symptoms": list[str],
-            "missing_key_symptoms": list[str],
-        }]
+    Reference implementation: scores one patient with a Python loop over
+    every disease. Kept for the equivalence tests and benchmark of the
+    compiled scorer below, which must return identical output.
     """
     if not symptoms:
         return []
@@ -386,6 +381,286 @@ def rank_differential_diagnosis(
     return top
 
 
+# ─────────────────────────────────────────────────────────────────────────
+# Compiled (vectorised) scorer
+#
+# DISEASE_SYMPTOM_MATRIX is compiled once into sparse disease x symptom
+# weight/presence matrices over a symptom-index vocabulary. A batch of
+# patients becomes a symptom x patient indicator matrix, so matched weights
+# and matched counts for every (disease, patient) pair are two sparse-dense
+# products. Age/gender/family/condition modifiers are cached per distinct
+# value as disease-length vectors.
+#
+# Output is identical to _rank_differential_diagnosis_loop: each CSR row
+# keeps its symptoms in the matrix's dict order, so the matched-weight sums
+# are accumulated in the same order as the loop, and every later step uses
+# the same float operations in the same order.
+# ─────────────────────────────────────────────────────────────────────────
+
+class _CompiledMatrix(NamedTuple):
+    diseases: List[str]
+    vocabulary: Dict[str, int]           # symptom (underscore and space form) -> column
+    weights: Any                         # CSR (n_diseases x n_symptoms), rows in dict order
+    presence: Any                        # CSR, 1.0 where the disease lists the symptom
+    total_weight: np.ndarray             # (n_diseases, 1)
+    n_symptoms: np.ndarray               # (n_diseases, 1)
+    entries: List[List[tuple]]           # per disease: [(readable, column, weight)] in dict order
+
+
+_TOP_K = 6
+
+
+@lru_cache(maxsize=1)
+def _compiled_matrix() -> _CompiledMatrix:
+    from scipy.sparse import csr_matrix
+
+    diseases = list(DISEASE_SYMPTOM_MATRIX)
+    vocabulary: Dict[str, int] = {}
+    n_columns = 0
+    indptr, indices, data, entries = [0], [], [], []
+    total_weight, n_symptoms = [], []
+
+    for disease in diseases:
+        symptom_weights = DISEASE_SYMPTOM_MATRIX[disease]
+        row, total = [], 0.0
+        for symptom, weight in symptom_weights.items():
+            col = vocabulary.get(symptom)
+            if col is None:
+                col = vocabulary[symptom] = n_columns
+                n_columns += 1
+            readable = symptom.replace("_", " ")
+            vocabulary.setdefault(readable, col)
+            indices.append(col)
+            data.append(weight)
+            row.append((readable, col, weight))
+            total += weight
+        indptr.append(len(indices))
+        entries.append(row)
+        total_weight.append(total)
+        n_symptoms.append(max(len(symptom_weights), 1))
+
+    shape = (len(diseases), n_columns)
+    indptr = np.asarray(indptr, dtype=np.int32)
+    indices = np.asarray(indices, dtype=np.int32)
+    # Indices are deliberately left unsorted: the product sums each row in stored order
+    weights = csr_matrix((np.asarray(data, dtype=np.float64), indices, indptr), shape=shape)
+    presence = csr_matrix((np.ones(len(indices)), indices, indptr), shape=shape)
+
+    return _CompiledMatrix(
+        diseases=diseases,
+        vocabulary=vocabulary,
+        weights=weights,
+        presence=presence,
+        total_weight=np.asarray(total_weight, dtype=np.float64)[:, None],
+        n_symptoms=np.asarray(n_symptoms, dtype=np.float64)[:, None],
+        entries=entries,
+    )
+
+
+@lru_cache(maxsize=256)
+def _age_vector(age: Optional[int]) -> np.ndarray:
+    return np.array(
+        [AGE_MODIFIERS.get(d, lambda a: 1.0)(age) for d in DISEASE_SYMPTOM_MATRIX], dtype=np.float64
+    )
+
+
+@lru_cache(maxsize=64)
+def _gender_vector(gender_clean: str) -> np.ndarray:
+    return np.array(
+        [GENDER_MODIFIERS.get(d, lambda g: 1.0)(gender_clean) for d in DISEASE_SYMPTOM_MATRIX],
+        dtype=np.float64,
+    )
+
+
+@lru_cache(maxsize=1024)
+def _family_vector(family_history: tuple) -> np.ndarray:
+    boosts = []
+    family_lower = [f.lower() for f in family_history]
+    for disease in DISEASE_SYMPTOM_MATRIX:
+        family_boost = 1.0
+        if family_history:
+            disease_lower = disease.lower()
+            for fh in family_lower:
+                if fh in disease_lower or disease_lower in fh:
+                    family_boost = 1.2
+                    break
+            if any("heart" in f or "cardiac" in f for f in family_lower) and "cardial" in disease_lower:
+                family_boost = 1.2
+            if any("diabetes" in f for f in family_lower) and "diabetes" in disease_lower:
+                family_boost = 1.25
+        boosts.append(family_boost)
+    return np.array(boosts, dtype=np.float64)
+
+
+@lru_cache(maxsize=1024)
+def _condition_vector(existing_conditions: tuple) -> np.ndarray:
+    boosts = []
+    conds_lower = [c.lower() for c in existing_conditions]
+    for disease in DISEASE_SYMPTOM_MATRIX:
+        condition_boost = 1.0
+        if existing_conditions:
+            if "hypertension" in conds_lower and disease in ("Myocardial Infarction", "Hypertension Crisis"):
+                condition_boost = 1.3
+            if "diabetes" in conds_lower and disease == "Myocardial Infarction":
+                condition_boost *= 1.2
+        boosts.append(condition_boost)
+    return np.array(boosts, dtype=np.float64)
+
+
+def _symptom_columns(symptoms: List[str], vocabulary: Dict[str, int]) -> set:
+    cols = set()
+    for s in symptoms:
+        clean = s.strip().lower()
+        for form in (clean.replace(" ", "_"), clean):
+            col = vocabulary.get(form)
+            if col is not None:
+                cols.add(col)
+    return cols
+
+
+def rank_differential_diagnosis_batch(cases: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+    """
+    Rank differential diagnoses for many patients at once.
+
+    ``cases`` is a list of dicts with the keyword arguments of
+    :func:`rank_differential_diagnosis` (``symptoms`` required; ``age``,
+    ``gender``, ``existing_conditions``, ``family_history`` optional).
+    Returns one ranking per case, in order.
+    """
+    compiled = _compiled_matrix()
+    n_cases = len(cases)
+    if n_cases == 0:
+        return []
+
+    case_cols = [_symptom_columns(c.get("symptoms") or [], compiled.vocabulary) for c in cases]
+
+    # Symptom x patient indicator matrix
+    indicator = np.zeros((compiled.weights.shape[1], n_cases), dtype=np.float64)
+    rows = [col for cols in case_cols for col in cols]
+    patients = [j for j, cols in enumerate(case_cols) for _ in cols]
+    indicator[rows, patients] = 1.0
+
+    matched_weight = compiled.weights @ indicator          # (n_diseases, n_cases)
+    matched_count = compiled.presence @ indicator
+
+    age_mod = np.column_stack([_age_vector(c.get("age")) for c in cases])
+    gender_mod = np.column_stack([
+        _gender_vector((c.get("gender") or "").lower().strip()) for c in cases
+    ])
+    family_boost = np.column_stack([
+        _family_vector(tuple(c.get("family_history") or ())) for c in cases
+    ])
+    condition_boost = np.column_stack([
+        _condition_vector(tuple(c.get("existing_conditions") or ())) for c in cases
+    ])
+
+    base_prob = (matched_weight / compiled.total_weight) * 100
+    coverage = matched_count / compiled.n_symptoms
+    coverage_bonus = coverage * 15
+    adjusted = (base_prob + coverage_bonus) * age_mod * gender_mod * family_boost * condition_boost
+    adjusted = np.minimum(95.0, adjusted)
+    confidence = np.minimum(95.0, coverage * 100 * 0.6 + matched_count * 8)
+
+    # Top-k shortlist per patient. Probabilities are ranked after rounding to
+    # one decimal, so anything within 0.1 of the k-th best may still tie with
+    # it and is kept; the exact (stable) ordering is settled below.
+    scores = np.where(matched_count > 0, adjusted, -np.inf).T       # (n_cases, n_diseases)
+    k = min(_TOP_K, scores.shape[1])
+    kth_best = np.partition(scores, -k, axis=1)[:, -k:][:, :1]
+    shortlist = (scores >= kth_best - 0.1) & np.isfinite(scores)
+    case_idx, disease_idx = np.nonzero(shortlist)                   # row-major: dict order per case
+    bounds = np.searchsorted(case_idx, np.arange(n_cases + 1)).tolist()
+    disease_idx_list = disease_idx.tolist()
+    adjusted_list = adjusted[disease_idx, case_idx].tolist()
+    confidence_list = confidence[disease_idx, case_idx].tolist()
+
+    results = []
+    for j, case in enumerate(cases):
+        lo, hi = bounds[j], bounds[j + 1]
+        if not case.get("symptoms") or lo == hi:
+            results.append([])
+            continue
+        probs = [round(p, 1) for p in adjusted_list[lo:hi]]
+        # Stable sort, like the loop's list.sort(reverse=True)
+        order = sorted(range(hi - lo), key=lambda m: -probs[m])[:_TOP_K]
+
+        total = sum(probs[m] for m in order)
+        cols = case_cols[j]
+        ranking = []
+        for m in order:
+            d = disease_idx_list[lo + m]
+            raw = adjusted_list[lo + m]
+            matching, missing_key = [], []
+            for readable, col, weight in compiled.entries[d]:
+                if col in cols:
+                    matching.append(readable)
+                elif weight >= 0.7:
+                    missing_key.append(readable)
+            ranking.append({
+                "condition": compiled.diseases[d],
+                "probability": round((probs[m] / total) * 100, 1) if total > 0 else probs[m],
+                "confidence": round(confidence_list[lo + m], 1),
+                "risk_level": "high" if raw > 50 else ("medium" if raw > 25 else "low"),
+                "matching_symptoms": matching,
+                "missing_key_symptoms": missing_key[:3],
+            })
+        results.append(ranking)
+    return results
+
+
+def rank_differential_diagnosis(
+    symptoms: List[str],
+    age: Optional[int] = None,
+    gender: Optional[str] = None,
+    existing_conditions: Optional[List[str]] = None,
+    family_history: Optional[List[str]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Rank possible diagnoses using prevalence-weighted Bayesian-style scoring.
+
+    Returns list of dicts sorted by probability:
+        [{
+            "condition": str,
+            "probability": float (0-100),
+            "confidence": float (0-100),
+            "risk_level": "low" | "medium" | "high",
+            "matching_symptoms": list[str],
+            "missing_key_symptoms": list[str],
+        }]
+    """
+    if not symptoms:
+        return []
+    return rank_differential_diagnosis_batch([{
+        "symptoms": symptoms,
+        "age": age,
+        "gender": gender,
+        "existing_conditions": existing_conditions,
+        "family_history": family_history,
+    }])[0]
+
+
+def rank_symptom_logs(logs: List[Any], users: Optional[Dict[int, Any]] = None) -> Dict[int, List[Dict[str, Any]]]:
+    """
+    Differential diagnosis for many ``SymptomLog`` rows in one vectorised pass.
+
+    ``users`` optionally maps ``user_id`` to a ``User`` (or any object with
+    ``age``, ``gender`` and ``existing_conditions``) to apply the patient
+    modifiers. Returns ``{log.id: ranking}``.
+    """
+    users = users or {}
+    cases = []
+    for log in logs:
+        user = users.get(log.user_id)
+        cases.append({
+            "symptoms": log.symptoms or [],
+            "age": getattr(user, "age", None),
+            "gender": getattr(user, "gender", None),
+            "existing_conditions": getattr(user, "existing_conditions", None) or [],
+        })
+    rankings = rank_differential_diagnosis_batch(cases)
+    return {log.id: ranking for log, ranking in zip(logs, rankings)}
+
+
 # ─────────────────────────────────────────────────────────────────────────
 # Risk Scoring Models
 # ─────────────────────────────────────────────────────────────────────────
@@ -11,7 +11,6 @@ Integrated features:
 
 from __future__ import annotations
 
-import re
 import uuid
 from typing import Any
 
@@ -19,6 +18,7 @@ from sqlalchemy.orm import Session
 
 from backend.app.logging_config import get_logger
 from backend.app.models.chat_history import ChatHistory
+from backend.app.services.daily_rollup import record_chat_session
 from backend.app.services.health_orchestrator import run_full_health_analysis
 from backend.app.services.safety_system import (
     detect_emergency,
@@ -34,37 +34,26 @@ from backend.app.services.hybrid_triage_service import (
     predict_disease_with_fallback,
     calculate_severity_with_hybrid,
 )
-from backend.app.models.user import User
+from backend.app.services.user_profile_cache import load_user, load_user_profile
 
 logger = get_logger("services.chat_service")
 
 
-def _normalize_text(text: str) -> str:
-    return re.sub(r"[^a-z0-9_ ]+", " ", text.lower()).strip()
-
-
 def _extract_symptoms(message: str) -> list[str]:
     """
-    Extract symptom names by matching normalized tokens against triage columns.
+    Extract symptom names from a message in one pass over its words.
+
+    Triage columns are matched exactly as before (whole normalised words), so
+    the triage model's minimum-symptom check sees the same list; synonyms are
+    left out here.
     """
     try:
-        from backend.app.ml_models.triage_infer import _symptom_columns
+        from backend.app.services.symptom_extractor import extract_symptoms
+        return extract_symptoms(message)
     except Exception as exc:
-        logger.error("triage symptom columns unavailable: %s", exc)
-        return []
-
-    columns = _symptom_columns or []
-    if not columns:
+        logger.error("symptom extractor unavailable: %s", exc)
         return []
 
-    normalized_msg = f" {_normalize_text(message).replace('_', ' ')} "
-    found: list[str] = []
-    for symptom in columns:
-        normalized_symptom = symptom.lower().replace("_", " ")
-        if f" {normalized_symptom} " in normalized_msg:
-            found.append(symptom)
-    return found
-
 
 def _triage_summary(analysis: dict[str, Any]) -> tuple[str, list[dict[str, Any]], list[str]]:
     triage = analysis.get("health_triage") or {}
@@ -114,7 +103,7 @@ def _triage_summary(analysis: dict[str, Any]) -> tuple[str, list[dict[str, Any]]
 def _get_user_demographics(db: Session, user_id: int) -> dict[str, Any]:
     """Get user age and gender for bot routing."""
     try:
-        user = db.query(User).filter(User.id == user_id).first()
+        user = load_user(db, user_id)
         if user:
             return {
                 "age": user.age,
@@ -126,6 +115,15 @@ def _get_user_demographics(db: Session, user_id: int) -> dict[str, Any]:
     return {"age": None, "gender": None}
 
 
+def _load_user_profile(db: Session, user_id: int) -> dict[str, Any]:
+    """Demographics, conditions and medical profile for personalised clinical analysis."""
+    try:
+        return load_user_profile(db, user_id)
+    except Exception as e:
+        logger.warning("Could not fetch user profile for engine: %s", e)
+        return {}
+
+
 from backend.app.services.chikitsak_engine import ChikitsakEngine
 
 def _health_response(db: Session, user_id: int, message: str, language: str) -> dict[str, Any]:
@@ -135,31 +133,16 @@ def _health_response(db: Session, user_id: int, message: str, language: str) ->
     symptoms = _extract_symptoms(message)
     
     # 2. Get User Profile for personalized clinical analysis
-    user_profile = {}
-    try:
-        user = db.query(User).filter(User.id == user_id).first()
-        if user:
-            user_profile = {
-                "age": user.age,
-                "gender": user.gender,
-                "existing_conditions": user.existing_conditions or [],
-            }
-            # Merge with medical profile if exists
-            if user.medical_profile:
-                mp = user.medical_profile
-                user_profile.update({
-                    "height_cm": mp.height_cm,
-                    "weight_kg": mp.weight_kg,
-                    "activity_level": mp.activity_level,
-                    "chronic_conditions": mp.chronic_conditions or [],
-                    "family_history": mp.family_history or [],
-                })
-    except Exception as e:
-        logger.warning("Could not fetch user profile for engine: %s", e)
+    user_profile = _load_user_profile(db, user_id)
 
     # 3. Run through Chikitsak Engine
     analysis = ChikitsakEngine.analyze_health_query(user_id, message, symptoms, user_profile)
-    
+    trace = analysis.get("trace", {})
+    logger.info(
+        "Health analysis took %.0f ms | critical path: %s",
+        trace.get("total_ms", 0.0), " → ".join(trace.get("critical_path", [])),
+    )
+
     # 3. Format response based on engine output
     if analysis.get("is_emergency"):
         return {
@@ -169,7 +152,8 @@ def _health_response(db: Session, user_id: int, message: str, language: str) ->
             "triage": "Emergency",
             "causes": [{"name": "Emergency", "risk": "critical", "description": analysis["reasoning"]}],
             "next_steps": analysis["nextSteps"],
-            "risk_flags": ["emergency"]
+            "risk_flags": ["emergency"],
+            "trace": trace,
         }
 
     # Handle insufficient symptoms
@@ -187,11 +171,12 @@ def _health_response(db: Session, user_id: int, message: str, language: str) ->
             "causes": [],
             "next_steps": ["Answer follow-up questions"],
             "risk_flags": ["needs_more_info"],
-            "follow_up_questions": analysis["followUpQuestions"]
+            "follow_up_questions": analysis["followUpQuestions"],
+            "trace": trace,
         }
 
     # Standard healthy/triage response
-    disease = analysis["possibleConditions"][0] if analysis["possibleConditions"] else "General Query"
+    disease = analysis.get("topDiagnosis") or "General Query"
     return {
         "status": "success",
         "response": f"Based on your symptoms, the most likely condition is **{disease}**. \n\nReasoning: {analysis['reasoning']}",
@@ -208,7 +193,8 @@ def _health_response(db: Session, user_id: int, message: str, language: str) ->
         ],
         "next_steps": analysis["nextSteps"],
         "risk_flags": [],
-        "model_used": "chikitsak_v1_engine"
+        "model_used": "chikitsak_v1_engine",
+        "trace": trace,
     }
 
 
@@ -277,6 +263,48 @@ def _mental_response(db: Session, user_id: int, message: str) -> dict[str, Any]:
         }
 
 
+def save_chat_exchange(
+    db: Session,
+    user_id: int,
+    session_id: str,
+    message: str,
+    mode: str,
+    language: str,
+    result: dict[str, Any],
+    new_session: bool = False,
+) -> None:
+    """
+    Persist the user message and the assistant reply as ChatHistory rows.
+
+    ``new_session`` means ``session_id`` was minted for this message, so the
+    rollup counts it without checking for earlier messages.
+    """
+    record_chat_session(db, user_id, session_id, new=new_session)
+    db.add(ChatHistory(
+        user_id=user_id,
+        role="user",
+        content=message,
+        session_id=session_id,
+        metadata_={"mode": mode, "language": language},
+    ))
+    db.add(ChatHistory(
+        user_id=user_id,
+        role="assistant",
+        content=result.get("response", ""),
+        session_id=session_id,
+        metadata_={
+            "mode": mode,
+            "confidence": result.get("confidence"),
+            "triage": result.get("triage"),
+            "risk_flags": result.get("risk_flags", []),
+            "causes": result.get("causes", []),
+            "next_steps": result.get("next_steps", []),
+            "model_used": result.get("model_used", "unknown"),
+        },
+    ))
+    db.commit()
+
+
 def process_chat(
     db: Session,
     user_id: int,
@@ -287,18 +315,10 @@ def process_chat(
 ) -> dict[str, Any]:
     """Main chat processing function with all safety and AI systems integrated."""
     
-    if not session_id:
+    new_session = not session_id
+    if new_session:
         session_id = str(uuid.uuid4())
 
-    user_entry = ChatHistory(
-        user_id=user_id,
-        role="user",
-        content=message,
-        session_id=session_id,
-        metadata_={"mode": mode, "language": language},
-    )
-    db.add(user_entry)
-
     try:
         if mode == "mental":
             result = _mental_response(db, user_id, message)
@@ -313,23 +333,7 @@ def process_chat(
             "session_id": session_id,
         }
 
-    assistant_entry = ChatHistory(
-        user_id=user_id,
-        role="assistant",
-        content=result.get("response", ""),
-        session_id=session_id,
-        metadata_={
-            "mode": mode,
-            "confidence": result.get("confidence"),
-            "triage": result.get("triage"),
-            "risk_flags": result.get("risk_flags", []),
-            "causes": result.get("causes", []),
-            "next_steps": result.get("next_steps", []),
-            "model_used": result.get("model_used", "unknown"),
-        },
-    )
-    db.add(assistant_entry)
-    db.commit()
+    save_chat_exchange(db, user_id, session_id, message, mode, language, result, new_session=new_session)
 
     result["session_id"] = session_id
     return result
@@ -0,0 +1,243 @@
+"""
+Streaming chat pipeline used by /chat/stream.
+
+Yields ``(event, data)`` pairs as each stage finishes instead of one
+response at the end, so time-to-first-byte is the emergency check rather
+than the whole pipeline:
+
+    triage        detect_emergency verdict (immediately)
+    differential  extracted symptoms, CDSS differential and local severity
+    token         LLM answer text, streamed as OpenRouter produces it
+    done          final ChatResponse-shaped result, after ChatHistory is saved
+
+Emergencies and mental mode skip the LLM and send their answer as one
+token. When OpenRouter is unavailable (no key, circuit open, error before
+the first token) a locally composed answer is sent instead.
+
+As in /chat, the emergency check runs on the message alone (no age or
+gender) and ``language`` is only recorded with the saved exchange; neither
+path translates. Health answers differ: /chat runs the ChikitsakEngine
+pipeline (triage model, follow-up questions), the stream ranks the CDSS
+differential and has the LLM explain it.
+"""
+
+from __future__ import annotations
+
+import uuid
+from typing import Any, AsyncIterator, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from backend.app.logging_config import get_logger
+from backend.app.services.safety_system import detect_emergency, format_emergency_response
+
+logger = get_logger("services.chat_stream")
+
+_DIFFERENTIAL_EVENT_SIZE = 5
+_DEFAULT_NEXT_STEPS = ["Consult a healthcare professional for a formal diagnosis"]
+
+
+def _load_profile(user_id: int) -> dict[str, Any]:
+    from backend.app.database import SessionLocal
+    from backend.app.services.chat_service import _load_user_profile
+
+    db = SessionLocal()
+    try:
+        return _load_user_profile(db, user_id)
+    finally:
+        db.close()
+
+
+def _persist(
+    user_id: int,
+    session_id: str,
+    message: str,
+    mode: str,
+    language: str,
+    result: dict[str, Any],
+    new_session: bool = False,
+) -> None:
+    # The request's get_db session is already closed once the body streams
+    from backend.app.database import SessionLocal
+    from backend.app.services.chat_service import save_chat_exchange
+
+    db = SessionLocal()
+    try:
+        save_chat_exchange(db, user_id, session_id, message, mode, language, result, new_session=new_session)
+    except Exception as e:
+        db.rollback()
+        logger.error("Failed to save streamed chat exchange: %s", e)
+    finally:
+        db.close()
+
+
+def _mental(message: str) -> dict[str, Any]:
+    from backend.app.services.chat_service import _mental_response
+    return _mental_response(None, None, message)
+
+
+def _clinical_stage(message: str, profile: dict[str, Any]) -> dict[str, Any]:
+    """Symptom extraction, CDSS differential and local severity (CPU-bound, run off the loop)."""
+    from backend.app.services.cdss_engine import rank_differential_diagnosis
+    from backend.app.services.symptom_extractor import extract_symptoms
+
+    # No triage-model minimum-symptom check here, so synonyms can widen the CDSS match
+    symptoms = extract_symptoms(message, synonyms=True)
+    differential = rank_differential_diagnosis(
+        symptoms=symptoms,
+        age=profile.get("age"),
+        gender=profile.get("gender"),
+        existing_conditions=profile.get("existing_conditions", []) + profile.get("chronic_conditions", []),
+        family_history=profile.get("family_history", []),
+    )
+
+    severity: dict[str, Any] = {}
+    if symptoms:
+        try:
+            from backend.app.ml_models.severity_engine import calculate_severity
+            severity = calculate_severity(symptoms) or {}
+        except Exception as e:
+            logger.warning("Local severity engine failed: %s", e)
+
+    return {
+        "symptoms": symptoms,
+        "differential": differential,
+        "triage_level": severity.get("triage_level", "Routine"),
+        "severity_score": severity.get("severity_score"),
+        "red_flags": severity.get("red_flags", []),
+    }
+
+
+def _llm_prompt(message: str, clinical: dict[str, Any]) -> str:
+    differential = "\n".join(
+        f"- {d['condition']} ({d['probability']}%)" for d in clinical["differential"][:3]
+    ) or "- none identified"
+    return f"""Patient message: {message}
+
+Reported symptoms: {", ".join(clinical["symptoms"]) or "none identified"}
+Clinical decision support differential (most likely first):
+{differential}
+Triage level: {clinical["triage_level"]}
+
+Explain the most likely causes in plain language, what the patient can do now,
+and when they should see a doctor. Keep it under 200 words."""
+
+
+def _local_answer(clinical: dict[str, Any]) -> str:
+    if not clinical["differential"]:
+        return "Please share more symptoms for better analysis."
+    top = clinical["differential"][0]
+    lines = [f"Based on your symptoms, the most likely condition is **{top['condition']}**."]
+    others = [d["condition"] for d in clinical["differential"][1:3]]
+    if others:
+        lines.append(f"Other possibilities: {', '.join(others)}.")
+    lines.append(f"Triage level: {clinical['triage_level']}")
+    return "\n\n".join(lines)
+
+
+def _health_result(clinical: dict[str, Any], text: str, model_used: str) -> dict[str, Any]:
+    differential = clinical["differential"]
+    confidence = differential[0]["confidence"] / 100 if differential else 0.0
+    return {
+        "status": "success",
+        "response": text,
+        "confidence": round(confidence, 3),
+        "triage": clinical["triage_level"],
+        "causes": [
+            {
+                "name": d["condition"],
+                "probability": d["probability"],
+                "confidence": d["confidence"],
+                "risk": d["risk_level"],
+                "description": f"Matching symptoms: {', '.join(d['matching_symptoms'])}",
+            }
+            for d in differential[:3]
+        ],
+        "next_steps": _DEFAULT_NEXT_STEPS,
+        "risk_flags": clinical["red_flags"],
+        "model_used": model_used,
+    }
+
+
+async def stream_chat(
+    user_id: Optional[int],
+    message: str,
+    mode: str = "health",
+    language: str = "en",
+    session_id: Optional[str] = None,
+    profile: Optional[dict[str, Any]] = None,
+    persist: bool = True,
+) -> AsyncIterator[tuple[str, dict[str, Any]]]:
+    """
+    Run the chat pipeline stage by stage, yielding ``(event, data)`` pairs.
+
+    ``profile`` skips the database lookup of the user's clinical profile;
+    ``persist=False`` skips saving the exchange (used by benchmarks).
+    """
+    new_session = not session_id
+    session_id = session_id or str(uuid.uuid4())
+    streamed = False
+
+    emergency = detect_emergency(message)
+    yield "triage", {
+        "session_id": session_id,
+        "is_emergency": emergency["is_emergency"],
+        "level": emergency["level"],
+        "type": emergency["type"],
+        "message": emergency["message"],
+        "red_flags": emergency["red_flags"],
+        "hotlines": emergency["hotlines"],
+    }
+
+    if emergency["is_emergency"]:
+        next_steps = ["Call emergency services immediately", "Go to the nearest hospital"]
+        result = {
+            "status": "success",
+            "response": format_emergency_response(emergency),
+            "confidence": 1.0,
+            "triage": "Emergency",
+            "causes": [{"name": "Emergency", "risk": "critical", "description": f"Emergency detected: {emergency['type']}"}],
+            "next_steps": next_steps,
+            "risk_flags": ["emergency"],
+            "model_used": "safety_system",
+        }
+    elif mode == "mental":
+        result = await run_in_threadpool(_mental, message)
+    else:
+        if profile is None:
+            profile = await run_in_threadpool(_load_profile, user_id) if user_id is not None else {}
+        clinical = await run_in_threadpool(_clinical_stage, message, profile)
+        yield "differential", {
+            **clinical,
+            "differential": clinical["differential"][:_DIFFERENTIAL_EVENT_SIZE],
+        }
+
+        from backend.app.services.multibot_router import get_bot_system_prompt, get_bot_type
+        from backend.app.services.openrouter_service import stream_openrouter
+
+        system_prompt = get_bot_system_prompt(
+            get_bot_type(age=profile.get("age"), gender=profile.get("gender"), query=message)
+        )
+        chunks: list[str] = []
+        try:
+            async for chunk in stream_openrouter(
+                _llm_prompt(message, clinical), system_prompt=system_prompt, temperature=0.4, max_tokens=600
+            ):
+                chunks.append(chunk)
+                yield "token", {"text": chunk}
+        except Exception as e:
+            logger.warning("LLM stream unavailable, answering locally: %s", e)
+
+        streamed = bool(chunks)
+        if streamed:
+            result = _health_result(clinical, "".join(chunks), "openrouter")
+        else:
+            result = _health_result(clinical, _local_answer(clinical), "chikitsak_v1_engine")
+
+    if not streamed:
+        yield "token", {"text": result.get("response", "")}
+
+    if persist and user_id is not None:
+        await run_in_threadpool(_persist, user_id, session_id, message, mode, language, result, new_session)
+    result["session_id"] = session_id
+    yield "done", result
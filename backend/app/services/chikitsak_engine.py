@@ -4,22 +4,101 @@ This engine coordinates triage, image analysis, lab results, and user history
 to provide a holistic medical assessment.
 """
 
-from typing import Dict, Any, List
+import time
+from typing import Dict, Any, List, Optional
+from backend.app.config import get_settings
+from backend.app.services.cdss_engine import rank_differential_diagnosis, get_risk_scores_for_symptoms
 from backend.app.services.hybrid_triage_service import predict_disease_with_fallback
+from backend.app.services.medical_rag import generate_evidence_based_answer
 from backend.app.services.safety_system import detect_emergency
+from backend.app.services.stage_pipeline import PipelineTrace, Stage, get_pipeline_pool, run_pipeline
+from backend.app.services.xai_engine import explain_diagnosis
+
+settings = get_settings()
+
+_DEFAULT_NEXT_STEPS = ["Consult a healthcare professional for a formal diagnosis"]
+
+
+def _top_diagnosis(differential: List[Dict[str, Any]], triage: Dict[str, Any]) -> str:
+    return differential[0]["condition"] if differential else triage.get("disease_prediction", "Unknown")
+
+
+def _evidence(diagnosis: str) -> Dict[str, Any]:
+    return generate_evidence_based_answer(f"Explain {diagnosis} symptoms and precautions")
+
+
+def _health_stages(symptoms: List[str], profile: Dict[str, Any]) -> List[Stage]:
+    """
+    The analysis DAG. CDSS, risk scoring and triage are independent; the
+    RAG lookup for the top CDSS diagnosis starts as soon as CDSS is done,
+    while triage (which may wait on the LLM) is still running.
+    """
+    age = profile.get("age")
+    chronic = profile.get("chronic_conditions", [])
+    stage_budget = settings.CHIKITSAK_STAGE_BUDGET_SECONDS
+
+    def cdss():
+        return rank_differential_diagnosis(
+            symptoms=symptoms,
+            age=age,
+            gender=profile.get("gender"),
+            existing_conditions=profile.get("existing_conditions", []),
+        )
+
+    def risk():
+        return get_risk_scores_for_symptoms(
+            symptoms=symptoms,
+            age=age,
+            risk_factors=profile.get("family_history", []) + chronic,
+            existing_conditions=profile.get("existing_conditions", []) + chronic,
+        )
+
+    def rag_prefetch(cdss):
+        return _evidence(cdss[0]["condition"]) if cdss else None
+
+    def knowledge(rag_prefetch, triage):
+        # The prefetch already covers the top diagnosis unless CDSS had none
+        return rag_prefetch if rag_prefetch is not None else _evidence(_top_diagnosis([], triage))
+
+    def xai(cdss, triage):
+        return explain_diagnosis(
+            symptoms=symptoms,
+            diagnosis=_top_diagnosis(cdss, triage),
+            ml_confidence=triage.get("confidence", 0.0),
+            differential=cdss,
+        )
+
+    return [
+        Stage("cdss", cdss, budget=stage_budget, fallback=[]),
+        Stage("risk", risk, budget=stage_budget, fallback=[]),
+        # A slow LLM fallback is abandoned for the local model's own answer
+        Stage(
+            "triage", lambda: predict_disease_with_fallback(symptoms),
+            budget=settings.CHIKITSAK_TRIAGE_BUDGET_SECONDS,
+            fallback=lambda: predict_disease_with_fallback(symptoms, allow_llm=False),
+        ),
+        Stage("rag_prefetch", rag_prefetch, deps=("cdss",), budget=stage_budget),
+        Stage("knowledge", knowledge, deps=("rag_prefetch", "triage"), budget=stage_budget),
+        Stage("xai", xai, deps=("cdss", "triage"), budget=stage_budget),
+    ]
+
 
 class ChikitsakEngine:
     @staticmethod
-    def analyze_health_query(user_id: int, message: str, symptoms: List[str], user_profile: Dict[str, Any] = None) -> Dict[str, Any]:
+    def analyze_health_query(user_id: int, message: str, symptoms: List[str], user_profile: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Unified analysis of a health-related query with clinical-grade reasoning (CDSS, XAI, RAG).
+
+        The stages run as a DAG on the shared pipeline pool (see
+        ``_health_stages``); ``trace`` in the result reports each stage's
+        status and timings.
         """
-        from backend.app.services.cdss_engine import rank_differential_diagnosis, get_risk_scores_for_symptoms
-        from backend.app.services.xai_engine import explain_diagnosis
-        from backend.app.services.medical_rag import generate_evidence_based_answer
+        trace = PipelineTrace()
 
         # 1. Emergency Check
+        start = time.perf_counter()
         emergency = detect_emergency(message)
+        trace.record("emergency", "ok", start, time.perf_counter())
         if emergency.get("is_emergency"):
             return {
                 "topDiagnosis": "EMERGENCY",
@@ -30,59 +109,36 @@ class ChikitsakEngine:
                 "aiConfidence": 1.0,
                 "reasoning": f"Emergency detected: {emergency.get('emergency_type')}",
                 "is_emergency": True,
-                "clinical_data": {"emergency_type": emergency.get("emergency_type")}
+                "clinical_data": {"emergency_type": emergency.get("emergency_type")},
+                "trace": trace.as_dict(),
             }
 
-        # 2. Clinical Differential Diagnosis (CDSS)
-        age = user_profile.get("age") if user_profile else None
-        gender = user_profile.get("gender") if user_profile else None
-        
-        differential = rank_differential_diagnosis(
-            symptoms=symptoms,
-            age=age,
-            gender=gender,
-            existing_conditions=user_profile.get("existing_conditions") if user_profile else []
-        )
-        
-        # 3. Clinical Risk Scoring
-        risk_scores = get_risk_scores_for_symptoms(
-            symptoms=symptoms,
-            age=age,
-            risk_factors=(user_profile.get("family_history", []) + 
-                          user_profile.get("chronic_conditions", [])),
-            existing_conditions=(user_profile.get("existing_conditions", []) + 
-                                 user_profile.get("chronic_conditions", []))
-        )
-
-        # 4. Triage Prediction (ML Fallback integration)
-        triage_result = predict_disease_with_fallback(symptoms)
-        top_diagnosis = differential[0]["condition"] if differential else triage_result.get("disease_prediction", "Unknown")
+        # 2-6. CDSS, risk scores, triage (ML + LLM fallback), RAG and XAI
+        stages = run_pipeline(_health_stages(symptoms, user_profile or {}), get_pipeline_pool(), trace)
+        differential = stages["cdss"]
+        triage_result = stages["triage"]
+        explanation = stages["xai"]
         ml_conf = triage_result.get("confidence", 0.0)
 
-        # 5. Explainable AI (XAI)
-        explanation = explain_diagnosis(
-            symptoms=symptoms,
-            diagnosis=top_diagnosis,
-            ml_confidence=ml_conf,
-            differential=differential
-        )
-
-        # 6. Medical Knowledge RAG
-        rag_info = generate_evidence_based_answer(f"Explain {top_diagnosis} symptoms and precautions")
-
         # 7. Comprehensive Clinical Output
         return {
-            "topDiagnosis": top_diagnosis,
+            "topDiagnosis": _top_diagnosis(differential, triage_result),
             "differentialDiagnosis": differential,
-            "clinicalRiskScores": risk_scores,
+            "clinicalRiskScores": stages["risk"],
             "explainableAI": explanation,
-            "medicalKnowledge": rag_info,
+            "medicalKnowledge": stages["knowledge"],
             "triageLevel": triage_result.get("triage_level", "Routine"),
-            "nextSteps": triage_result.get("next_steps", ["Consult a healthcare professional for a formal diagnosis"]),
+            "nextSteps": triage_result.get("next_steps", _DEFAULT_NEXT_STEPS),
             "followUpQuestions": triage_result.get("follow_up_questions", []),
-            "aiConfidence": explanation["confidence_breakdown"]["combined_confidence"] / 100,
-            "reasoning": explanation["reasoning"]["clinical_narrative"],
-            "needsMoreInfo": triage_result.get("needs_more_info", False)
+            "aiConfidence": (
+                explanation["confidence_breakdown"]["combined_confidence"] / 100 if explanation else ml_conf
+            ),
+            "reasoning": (
+                explanation["reasoning"]["clinical_narrative"] if explanation
+                else triage_result.get("reasoning", "")
+            ),
+            "needsMoreInfo": triage_result.get("needs_more_info", False),
+            "trace": trace.as_dict(),
         }
 
     @staticmethod
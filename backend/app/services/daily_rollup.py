@@ -0,0 +1,354 @@
+"""
+Daily Rollups — per-user, per-UTC-day totals behind the dashboard.
+
+The dashboard summary used to run five aggregate queries over the raw logs
+on every (polled) load. The logging endpoints now bump the user's
+``daily_rollups`` row for the day in the same transaction as the log they
+write, so the dashboard reads at most eight small rows: the last seven days
+plus the day of the latest lab report.
+
+The raw logs stay the source of truth. ``compute_rollups`` derives the rows
+from them; ``backfill`` rewrites the table from that and ``check`` reports
+rows that have drifted. App startup backfills an empty table (as left by
+the 0005 migration or create_all); both are also available by hand:
+
+    python -m backend.app.services.daily_rollup backfill [--user-id N]
+    python -m backend.app.services.daily_rollup check [--user-id N]
+"""
+
+import argparse
+import math
+import sys
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import (
+    JSON, Date, DateTime, Float, Integer, String, column, delete, exists, func, insert, inspect, literal, or_, select,
+    table,
+)
+from sqlalchemy.orm import Session
+
+from backend.app.logging_config import get_logger
+
+logger = get_logger("services.daily_rollup")
+
+# Symptom log triage level -> rollup column
+TRIAGE_COLUMNS = {
+    "Emergency": "symptoms_emergency",
+    "Urgent": "symptoms_urgent",
+    "Routine": "symptoms_routine",
+    "Self-care": "symptoms_self_care",
+}
+SYMPTOM_COLUMNS = ("symptoms_emergency", "symptoms_urgent", "symptoms_routine", "symptoms_self_care", "symptoms_other")
+COUNTER_COLUMNS = ("meals",) + SYMPTOM_COLUMNS + ("chat_sessions",)
+LAB_COLUMNS = ("lab_report_name", "lab_summary", "lab_at")
+
+_ROLLUPS = table(
+    "daily_rollups",
+    column("user_id", Integer),
+    column("day", Date),
+    column("calories", Float),
+    *[column(name, Integer) for name in COUNTER_COLUMNS],
+    column("lab_report_name", String),
+    column("lab_summary", String),
+    column("lab_at", DateTime),
+    column("updated_at", DateTime),
+)
+
+# Raw log columns the rollups are derived from
+_SYMPTOM_LOGS = table("symptom_logs", column("user_id", Integer), column("triage_level", String),
+                      column("timestamp", DateTime))
+_NUTRITION_LOGS = table("nutrition_logs", column("user_id", Integer), column("calories", Float),
+                        column("timestamp", DateTime))
+_LAB_REPORTS = table("lab_reports", column("user_id", Integer), column("report_name", String),
+                     column("analysis_result", JSON), column("timestamp", DateTime))
+_CHAT_HISTORY = table("chat_history", column("user_id", Integer), column("session_id", String))
+
+RollupKey = Tuple[int, date]
+
+
+def _chat_history_with_time(db: Session):
+    """
+    chat_history with its message time column, resolved against the live
+    schema: ``created_at`` for the app models, ``timestamp`` in databases
+    built by the initial migration.
+    """
+    columns = {c["name"] for c in inspect(db.get_bind()).get_columns("chat_history")}
+    at = "created_at" if "created_at" in columns else "timestamp"
+    t = table("chat_history", column("user_id", Integer), column("session_id", String), column(at, DateTime))
+    return t, t.c[at]
+
+
+def _utc_day(at: Optional[datetime]) -> date:
+    """UTC calendar day of a log timestamp (naive timestamps are UTC), or today."""
+    if at is None:
+        return datetime.now(timezone.utc).date()
+    if at.tzinfo is not None:
+        at = at.astimezone(timezone.utc)
+    return at.date()
+
+
+def triage_column(triage_level: Optional[str]) -> str:
+    return TRIAGE_COLUMNS.get(triage_level, "symptoms_other")
+
+
+# ── Write path ─────────────────────────────────────────────────────────────
+
+
+def _dialect_insert(db: Session):
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    return dialect_insert
+
+
+def _upsert(db: Session, user_id: int, day: date, add: Dict[str, float], assign: Optional[Dict[str, Any]] = None):
+    """Add ``add`` to (and overwrite ``assign`` on) the user's row for ``day``, creating it if needed."""
+    assign = assign or {}
+    now = datetime.now(timezone.utc)
+    stmt = _dialect_insert(db)(_ROLLUPS).values(user_id=user_id, day=day, updated_at=now, **add, **assign)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["user_id", "day"],
+        set_={
+            **{name: _ROLLUPS.c[name] + stmt.excluded[name] for name in add},
+            **{name: stmt.excluded[name] for name in assign},
+            "updated_at": now,
+        },
+    )
+    db.execute(stmt)
+
+
+def record_symptom(db: Session, user_id: int, triage_level: Optional[str], at: Optional[datetime] = None) -> None:
+    """Count a symptom log; call before committing the log itself."""
+    _upsert(db, user_id, _utc_day(at), {triage_column(triage_level): 1})
+
+
+def record_meal(db: Session, user_id: int, calories: Optional[float], at: Optional[datetime] = None) -> None:
+    """Count a nutrition log; call before committing the log itself."""
+    _upsert(db, user_id, _utc_day(at), {"meals": 1, "calories": calories or 0})
+
+
+def record_lab_report(
+    db: Session, user_id: int, report_name: str, summary: Optional[str], at: Optional[datetime] = None
+) -> None:
+    """Make this the day's latest lab report; call before committing the report itself."""
+    at = at or datetime.now(timezone.utc)
+    _upsert(db, user_id, _utc_day(at), {}, {"lab_report_name": report_name, "lab_summary": summary, "lab_at": at})
+
+
+def record_chat_session(
+    db: Session, user_id: int, session_id: str, at: Optional[datetime] = None, new: bool = False
+) -> None:
+    """
+    Count ``session_id`` if it has no messages yet; call before adding its ChatHistory rows.
+
+    ``new=True`` (the caller minted the id for this message) counts it outright.
+    Otherwise the "no messages yet" test is part of the upsert statement, so it
+    runs in the transaction that inserts the session's first rows: SQLite
+    serialises writers, and on PostgreSQL a transaction-scoped advisory lock
+    on the session makes a concurrent first message wait and then see ours.
+    """
+    day = _utc_day(at)
+    if new:
+        _upsert(db, user_id, day, {"chat_sessions": 1})
+        return
+
+    dialect_insert = _dialect_insert(db)
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(select(func.pg_advisory_xact_lock(func.hashtext(f"chat_session:{user_id}:{session_id}"))))
+    t = _CHAT_HISTORY
+    now = datetime.now(timezone.utc)
+    first_message = select(literal(user_id, Integer), literal(day, Date), literal(1, Integer),
+                           literal(now, DateTime)).where(
+        ~exists().where(t.c.user_id == user_id, t.c.session_id == session_id)
+    )
+    stmt = dialect_insert(_ROLLUPS).from_select(["user_id", "day", "chat_sessions", "updated_at"], first_message)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["user_id", "day"],
+        set_={"chat_sessions": _ROLLUPS.c.chat_sessions + 1, "updated_at": now},
+    )
+    db.execute(stmt)
+
+
+# ── Dashboard read ─────────────────────────────────────────────────────────
+
+
+def dashboard_totals(db: Session, user_id: int, today: Optional[date] = None) -> Dict[str, Any]:
+    """
+    Today's nutrition, symptom counts by triage level and new chat sessions
+    over the seven days ending ``today``, and the latest lab report, in one
+    query.
+    """
+    today = today or _utc_day(None)
+    week_start = today - timedelta(days=6)
+    r = _ROLLUPS
+    latest_lab_day = (
+        select(func.max(r.c.day)).where(r.c.user_id == user_id, r.c.lab_at.isnot(None)).scalar_subquery()
+    )
+    rows = db.execute(
+        select(r).where(r.c.user_id == user_id, or_(r.c.day >= week_start, r.c.day == latest_lab_day))
+    ).all()
+
+    totals: Dict[str, Any] = {
+        "calories_today": 0.0,
+        "meals_today": 0,
+        "symptoms": {name[len("symptoms_"):]: 0 for name in SYMPTOM_COLUMNS},
+        "chat_sessions": 0,
+        "lab": None,
+    }
+    for row in rows:
+        if row.day == today:
+            totals["calories_today"] = row.calories
+            totals["meals_today"] = row.meals
+        if week_start <= row.day <= today:
+            for name in SYMPTOM_COLUMNS:
+                totals["symptoms"][name[len("symptoms_"):]] += getattr(row, name)
+            totals["chat_sessions"] += row.chat_sessions
+        if row.lab_at is not None and (totals["lab"] is None or row.day > totals["lab"]["day"]):
+            totals["lab"] = {"day": row.day, "report_name": row.lab_report_name,
+                             "summary": row.lab_summary, "at": row.lab_at}
+    return totals
+
+
+# ── Backfill & consistency ─────────────────────────────────────────────────
+
+
+def _empty_rollup() -> Dict[str, Any]:
+    return {"calories": 0.0, **{name: 0 for name in COUNTER_COLUMNS}, **{name: None for name in LAB_COLUMNS}}
+
+
+def compute_rollups(db: Session, user_id: Optional[int] = None) -> Dict[RollupKey, Dict[str, Any]]:
+    """Rollup rows derived from the raw logs (all users, or one)."""
+    rollups: Dict[RollupKey, Dict[str, Any]] = {}
+
+    def row(uid: int, at: datetime) -> Dict[str, Any]:
+        key = (uid, _utc_day(at))
+        if key not in rollups:
+            rollups[key] = _empty_rollup()
+        return rollups[key]
+
+    def scan(t, *columns, where=None, group_by=None, order_by=None):
+        stmt = select(t.c.user_id, *columns)
+        if user_id is not None:
+            stmt = stmt.where(t.c.user_id == user_id)
+        if where is not None:
+            stmt = stmt.where(where)
+        if group_by is not None:
+            stmt = stmt.group_by(t.c.user_id, *group_by)
+        if order_by is not None:
+            stmt = stmt.order_by(order_by)
+        return db.execute(stmt.execution_options(yield_per=10_000))
+
+    t = _NUTRITION_LOGS
+    for uid, calories, at in scan(t, t.c.calories, t.c.timestamp):
+        if at is not None:
+            r = row(uid, at)
+            r["meals"] += 1
+            r["calories"] += calories or 0
+
+    t = _SYMPTOM_LOGS
+    for uid, triage_level, at in scan(t, t.c.triage_level, t.c.timestamp):
+        if at is not None:
+            row(uid, at)[triage_column(triage_level)] += 1
+
+    t, at = _chat_history_with_time(db)
+    for uid, started in scan(
+        t, func.min(at), where=t.c.session_id.isnot(None), group_by=[t.c.session_id]
+    ):
+        if started is not None:
+            row(uid, started)["chat_sessions"] += 1
+
+    t = _LAB_REPORTS
+    for uid, report_name, analysis_result, at in scan(
+        t, t.c.report_name, t.c.analysis_result, t.c.timestamp, order_by=t.c.timestamp
+    ):
+        if at is not None:
+            summary = analysis_result.get("summary") if isinstance(analysis_result, dict) else None
+            row(uid, at).update(lab_report_name=report_name, lab_summary=summary, lab_at=at)
+
+    return rollups
+
+
+def _stored_rollups(db: Session, user_id: Optional[int]) -> Dict[RollupKey, Dict[str, Any]]:
+    r = _ROLLUPS
+    stmt = select(r)
+    if user_id is not None:
+        stmt = stmt.where(r.c.user_id == user_id)
+    fields = ("calories",) + COUNTER_COLUMNS + LAB_COLUMNS
+    return {(row.user_id, row.day): {name: getattr(row, name) for name in fields} for row in db.execute(stmt)}
+
+
+def backfill(db: Session, user_id: Optional[int] = None) -> int:
+    """Replace the stored rollups (all users, or one) with ones derived from the raw logs; returns rows written."""
+    rollups = compute_rollups(db, user_id)
+    stmt = delete(_ROLLUPS)
+    if user_id is not None:
+        stmt = stmt.where(_ROLLUPS.c.user_id == user_id)
+    db.execute(stmt)
+    now = datetime.now(timezone.utc)
+    rows = [{"user_id": uid, "day": day, "updated_at": now, **values} for (uid, day), values in rollups.items()]
+    if rows:
+        db.execute(insert(_ROLLUPS), rows)
+    db.commit()
+    logger.info("Backfilled %d daily rollups%s", len(rows), f" for user {user_id}" if user_id is not None else "")
+    return len(rows)
+
+
+def backfill_if_empty(db: Session) -> int:
+    """:func:`backfill` when ``daily_rollups`` has no rows yet (first start after the upgrade); returns rows written."""
+    if db.execute(select(_ROLLUPS.c.user_id).limit(1)).first() is not None:
+        return 0
+    return backfill(db)
+
+
+def _same(name: str, expected: Any, actual: Any) -> bool:
+    if name == "calories":
+        return math.isclose(expected or 0, actual or 0, rel_tol=1e-9, abs_tol=1e-6)
+    if name == "lab_at" and expected is not None and actual is not None:
+        return expected.replace(tzinfo=None) == actual.replace(tzinfo=None)
+    return expected == actual
+
+
+def check(db: Session, user_id: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Stored rollup fields that disagree with the raw logs: ``[{user_id, day, field, expected, actual}]``."""
+    expected = compute_rollups(db, user_id)
+    stored = _stored_rollups(db, user_id)
+    empty = _empty_rollup()
+    mismatches = []
+    for key in sorted(expected.keys() | stored.keys()):
+        want, have = expected.get(key, empty), stored.get(key, empty)
+        for name in want:
+            if not _same(name, want[name], have[name]):
+                mismatches.append({"user_id": key[0], "day": key[1], "field": name,
+                                   "expected": want[name], "actual": have[name]})
+    return mismatches
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from backend.app.database import SessionLocal
+    from backend.app.logging_config import setup_logging
+
+    parser = argparse.ArgumentParser(description="Rebuild or verify the dashboard's daily rollups")
+    parser.add_argument("command", choices=("backfill", "check"))
+    parser.add_argument("--user-id", type=int, default=None)
+    args = parser.parse_args(argv)
+    setup_logging()
+
+    db = SessionLocal()
+    try:
+        if args.command == "backfill":
+            backfill(db, args.user_id)
+            return 0
+        mismatches = check(db, args.user_id)
+        for m in mismatches[:50]:
+            logger.warning("Rollup drift user=%s day=%s %s: expected %r, stored %r",
+                           m["user_id"], m["day"], m["field"], m["expected"], m["actual"])
+        logger.info("Rollup check: %d mismatched fields", len(mismatches))
+        return 1 if mismatches else 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -11,6 +11,7 @@ import os
 from PIL import Image
 from pathlib import Path
 from backend.app.logging_config import get_logger
+from backend.app.services.inference_batcher import classify
 
 logger = get_logger("services.food_service")
 
@@ -107,21 +108,18 @@ def predict_food(image_bytes: bytes) -> dict:
     """Run inference on a food image to identify the item."""
     import torch
 
-    model = load_model()
-    device = get_device()
+    load_model()  # raise FileNotFoundError before the request is queued
     transform = get_transform()
     class_names = _load_class_names()
 
     try:
         image = Image.open(io.BytesIO(image_bytes)).convert("RGB")
-        image_tensor = transform(image).unsqueeze(0).to(device)
+        image_tensor = transform(image)
 
-        with torch.no_grad():
-            outputs = model(image_tensor)
-            probabilities = torch.softmax(outputs, dim=1)
+        probabilities = classify("food", load_model, image_tensor).unsqueeze(0)
 
-            # Get top 3 predictions
-            top3_conf, top3_idx = torch.topk(probabilities, min(3, probabilities.shape[1]))
+        # Get top 3 predictions
+        top3_conf, top3_idx = torch.topk(probabilities, min(3, probabilities.shape[1]))
 
         top_confidence = float(top3_conf[0][0].item())
         top_idx = int(top3_idx[0][0].item())
@@ -1,12 +1,10 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func
 from datetime import datetime, timedelta, timezone
 from collections import Counter
+from typing import Optional
 
 from backend.app.models.symptom_log import SymptomLog
-from backend.app.models.nutrition_log import NutritionLog
-from backend.app.models.medication_log import MedicationLog
-from backend.app.models.lab_report import LabReport
+from backend.app.services.analytics_queries import nutrition_totals, symptom_frequency, timeline_page
 from backend.app.logging_config import get_logger
 
 logger = get_logger("services.health_analytics")
@@ -14,39 +12,40 @@ logger = get_logger("services.health_analytics")
 
 def get_symptom_frequency(db: Session, user_id: int) -> list[dict]:
     """Count occurrences of each symptom across all logs for a user."""
-    logs = db.query(SymptomLog).filter(SymptomLog.user_id == user_id).all()
+    result = symptom_frequency(db, user_id)
+    if result is None:
+        result = _symptom_frequency_orm(db, user_id)
+    logger.debug("Symptom frequency for user %d: %d unique symptoms", user_id, len(result))
+    return result
+
+
+def _symptom_frequency_orm(db: Session, user_id: int) -> list[dict]:
+    """Python fallback for dialects without JSON array unnesting in analytics_queries."""
+    logs = db.query(SymptomLog.symptoms).filter(SymptomLog.user_id == user_id).all()
 
     counter: Counter[str] = Counter()
-    for log in logs:
+    for (symptoms,) in logs:
         # Support both JSON list and legacy comma-separated string
-        if isinstance(log.symptoms, list):
-            symptoms_list = log.symptoms
+        if isinstance(symptoms, list):
+            symptoms_list = symptoms
         else:
-            symptoms_list = log.symptoms.split(",")
+            symptoms_list = symptoms.split(",")
 
         for symptom in symptoms_list:
             cleaned = symptom.strip().lower()
             if cleaned:
                 counter[cleaned] += 1
 
-    result = [
-        {"symptom": symptom, "count": count}
-        for symptom, count in counter.most_common()
-    ]
-    logger.debug("Symptom frequency for user %d: %d unique symptoms", user_id, len(result))
-    return result
+    ranked = sorted(counter.items(), key=lambda item: (-item[1], item[0]))
+    return [{"symptom": symptom, "count": count} for symptom, count in ranked]
 
 
 def get_nutrition_summary(db: Session, user_id: int, days: int = 7) -> dict:
     """Calculate average daily macros over the given number of days."""
     cutoff = datetime.now(timezone.utc) - timedelta(days=days)
-    logs = (
-        db.query(NutritionLog)
-        .filter(NutritionLog.user_id == user_id, NutritionLog.timestamp >= cutoff)
-        .all()
-    )
+    totals = nutrition_totals(db, user_id, cutoff)
 
-    if not logs:
+    if not totals["entries"]:
         return {
             "period_days": days,
             "total_entries": 0,
@@ -56,57 +55,21 @@ def get_nutrition_summary(db: Session, user_id: int, days: int = 7) -> dict:
             "avg_daily_fats": 0,
         }
 
-    total_cal = sum(l.calories or 0 for l in logs)
-    total_pro = sum(l.protein or 0 for l in logs)
-    total_carb = sum(l.carbs or 0 for l in logs)
-    total_fat = sum(l.fats or 0 for l in logs)
-
     return {
         "period_days": days,
-        "total_entries": len(logs),
-        "avg_daily_calories": round(total_cal / days, 1),
-        "avg_daily_protein": round(total_pro / days, 1),
-        "avg_daily_carbs": round(total_carb / days, 1),
-        "avg_daily_fats": round(total_fat / days, 1),
+        "total_entries": totals["entries"],
+        "avg_daily_calories": round(totals["calories"] / days, 1),
+        "avg_daily_protein": round(totals["protein"] / days, 1),
+        "avg_daily_carbs": round(totals["carbs"] / days, 1),
+        "avg_daily_fats": round(totals["fats"] / days, 1),
     }
 
 
-def get_health_timeline(db: Session, user_id: int, limit: int = 50) -> list[dict]:
-    """Return a chronological feed of all health events for a user."""
-    events: list[dict] = []
-
-    for log in db.query(SymptomLog).filter(SymptomLog.user_id == user_id).all():
-        events.append({
-            "type": "symptom",
-            "description": log.symptoms,
-            "detail": log.predicted_disease,
-            "timestamp": log.timestamp.isoformat() if log.timestamp else None,
-        })
-
-    for log in db.query(NutritionLog).filter(NutritionLog.user_id == user_id).all():
-        events.append({
-            "type": "nutrition",
-            "description": log.food_name,
-            "detail": f"{log.calories or 0} kcal",
-            "timestamp": log.timestamp.isoformat() if log.timestamp else None,
-        })
-
-    for log in db.query(MedicationLog).filter(MedicationLog.user_id == user_id).all():
-        events.append({
-            "type": "medication",
-            "description": log.medication_name,
-            "detail": None,
-            "timestamp": log.timestamp.isoformat() if log.timestamp else None,
-        })
-
-    for log in db.query(LabReport).filter(LabReport.user_id == user_id).all():
-        events.append({
-            "type": "lab_report",
-            "description": log.report_name,
-            "detail": log.abnormal_values,
-            "timestamp": log.timestamp.isoformat() if log.timestamp else None,
-        })
-
-    # Sort descending by timestamp, newest first
-    events.sort(key=lambda e: e["timestamp"] or "", reverse=True)
-    return events[:limit]
+def get_health_timeline(db: Session, user_id: int, limit: int = 50, cursor: Optional[str] = None) -> dict:
+    """
+    One page of the chronological feed of all health events for a user,
+    newest first. Pass the returned ``next_cursor`` back to get the next
+    page; raises ValueError for a malformed cursor.
+    """
+    events, next_cursor = timeline_page(db, user_id, limit, cursor)
+    return {"events": events, "next_cursor": next_cursor}
@@ -1,5 +1,13 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
 from sqlalchemy.orm import Session
+from backend.app.config import get_settings
+from backend.app.logging_config import get_logger
 from backend.app.ml_models.health_engine import run_health_engine
 from backend.app.ml_models.severity_engine import calculate_severity
 from backend.app.ml_models.lab_engine import analyze_lab_report
@@ -10,32 +18,74 @@ from backend.app.services.medication_safety_service import run_safety_check
 from backend.app.services.location_service import get_region_alerts
 from backend.app.services.translation_service import translate_to_english, translate_from_english
 
-def run_full_health_analysis(db: Session, user_id: int, payload: dict):
-    """
-    Master Intelligence Orchestrator.
-    Combines triage, severity, labs, drugs, mental, nutrition, and epidemiology.
+
+logger = get_logger("services.health_orchestrator")
+settings = get_settings()
+
+
+class _Stage(NamedTuple):
+    name: str
+    kind: str                       # "cpu" (orchestrator pool) | "io" (asyncio default executor)
+    fn: Callable[..., Any]
+    args: tuple
+
+
+def _translate_input(payload: dict, language: str) -> None:
+    if payload.get("symptoms"):
+        payload["symptoms"] = [translate_to_english(s, language) for s in payload["symptoms"]]
+    if payload.get("mental_text"):
+        payload["mental_text"] = translate_to_english(payload["mental_text"], language)
+    if payload.get("user_query"):
+        payload["user_query"] = translate_to_english(payload["user_query"], language)
+    if payload.get("food"):
+        payload["food"] = translate_to_english(payload["food"], language)
+
+
+def _safety_check_own_session(user_id: int, medications: List[str]) -> dict:
+    """run_safety_check on a session the stage opens and closes itself."""
+    from backend.app.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        return run_safety_check(db, user_id, medications)
+    finally:
+        db.close()
+
+
+def _plan_stages(db: Optional[Session], user_id: int, payload: dict) -> List[_Stage]:
     """
-    result = {}
-    language = payload.get("language", "en")
-    location = payload.get("location")
+    The independent engine calls this payload needs, in the sequential order.
 
-    # 1. Translation Layer (Input)
-    if language != "en":
-        if payload.get("symptoms"):
-            payload["symptoms"] = [translate_to_english(s, language) for s in payload["symptoms"]]
-        if payload.get("mental_text"):
-            payload["mental_text"] = translate_to_english(payload["mental_text"], language)
-        if payload.get("user_query"):
-            payload["user_query"] = translate_to_english(payload["user_query"], language)
-        if payload.get("food"):
-            payload["food"] = translate_to_english(payload["food"], language)
-
-    # 2. Symptom & Triage Pipeline
+    Without ``db`` the safety stage opens its own session, so it never shares
+    one between threads or outlives the request's session after a timeout.
+    """
+    stages = []
     if payload.get("symptoms"):
-        symptoms = payload["symptoms"]
-        triage = run_health_engine(symptoms, payload.get("user_query"))
-        severity = calculate_severity(symptoms)
-        
+        stages.append(_Stage("triage", "cpu", run_health_engine, (payload["symptoms"], payload.get("user_query"))))
+        stages.append(_Stage("severity", "cpu", calculate_severity, (payload["symptoms"],)))
+    if payload.get("lab_values"):
+        stages.append(_Stage("lab", "cpu", analyze_lab_report, (payload["lab_values"],)))
+    if payload.get("medications"):
+        stages.append(_Stage("interactions", "cpu", check_drug_interactions, (payload["medications"],)))
+        if db is None:
+            stages.append(_Stage("safety", "io", _safety_check_own_session, (user_id, payload["medications"])))
+        else:
+            stages.append(_Stage("safety", "io", run_safety_check, (db, user_id, payload["medications"])))
+    if payload.get("mental_text"):
+        stages.append(_Stage("mental", "cpu", analyze_mental_state, (payload["mental_text"],)))
+    if payload.get("food"):
+        stages.append(_Stage("nutrition", "cpu", analyze_food, (payload["food"],)))
+    if payload.get("location"):
+        stages.append(_Stage("epidemiology", "io", get_region_alerts, (payload["location"],)))
+    return stages
+
+
+def _assemble(outputs: Dict[str, Any]) -> dict:
+    """Build the response from finished stages; stages missing from ``outputs`` failed."""
+    result = {}
+    if "triage" in outputs or "severity" in outputs:
+        triage = outputs.get("triage") or {}
+        severity = outputs.get("severity") or {}
         result["health_triage"] = {
             "disease_prediction": triage.get("predicted_disease"),
             "severity_score": severity.get("total_severity_score"),
@@ -44,31 +94,42 @@ def run_full_health_analysis(db: Session, user_id: int, payload: dict):
             "precautions": triage.get("precautions")
         }
 
-    # 3. Diagnostic & Safety Pipeline
-    if payload.get("lab_values"):
-        result["lab_analysis"] = analyze_lab_report(payload["lab_values"])
+    if "lab" in outputs:
+        result["lab_analysis"] = outputs["lab"]
 
-    if payload.get("medications"):
-        meds = payload["medications"]
-        interactions = check_drug_interactions(meds)
-        safety = run_safety_check(db, user_id, meds)
-        
+    if "interactions" in outputs or "safety" in outputs:
+        safety = outputs.get("safety") or {}
         result["medication_analysis"] = {
-            "interactions": interactions,
+            "interactions": outputs.get("interactions"),
             "safety_flags": safety.get("flags", []),
             "summary": safety.get("summary", "No major medication issues detected.")
         }
 
-    # 4. Mental & Nutrition Pipeline
-    if payload.get("mental_text"):
-        result["mental_analysis"] = analyze_mental_state(payload["mental_text"])
+    if "mental" in outputs:
+        result["mental_analysis"] = outputs["mental"]
 
-    if payload.get("food"):
-        result["nutrition_analysis"] = analyze_food(payload["food"])
+    if "nutrition" in outputs:
+        result["nutrition_analysis"] = outputs["nutrition"]
+
+    if "epidemiology" in outputs:
+        result["epidemiology"] = outputs["epidemiology"]
+    return result
 
-    # 5. Contextual Intelligence (Epidemiology)
-    if location:
-        result["epidemiology"] = get_region_alerts(location)
+
+def run_full_health_analysis(db: Session, user_id: int, payload: dict):
+    """
+    Master Intelligence Orchestrator.
+    Combines triage, severity, labs, drugs, mental, nutrition, and epidemiology.
+    """
+    language = payload.get("language", "en")
+
+    # 1. Translation Layer (Input)
+    if language != "en":
+        _translate_input(payload, language)
+
+    # 2-5. Triage, diagnostics & safety, mental & nutrition, epidemiology
+    outputs = {stage.name: stage.fn(*stage.args) for stage in _plan_stages(db, user_id, payload)}
+    result = _assemble(outputs)
 
     # 6. Translation Layer (Output)
     if language != "en":
@@ -77,6 +138,116 @@ def run_full_health_analysis(db: Session, user_id: int, payload: dict):
 
     return result
 
+
+# ── Concurrent mode ───────────────────────────────────────────────────
+
+_pool: Optional[ThreadPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> ThreadPoolExecutor:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ThreadPoolExecutor(
+                    max_workers=settings.HEALTH_ORCHESTRATOR_WORKERS, thread_name_prefix="health-stage"
+                )
+    return _pool
+
+
+def shutdown_orchestrator_pool() -> None:
+    """Stop the stage pool (called from the app lifespan on shutdown)."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+def _timed(fn: Callable[..., Any], args: tuple) -> Tuple[Any, float, float]:
+    """Run ``fn`` and return (value, start, end) on the perf_counter clock."""
+    start = time.perf_counter()
+    value = fn(*args)
+    return value, start, time.perf_counter()
+
+
+async def run_full_health_analysis_async(
+    user_id: int,
+    payload: dict,
+    timeout: Optional[float] = None,
+    include_timings: bool = False,
+) -> dict:
+    """
+    :func:`run_full_health_analysis` with the engine stages run concurrently.
+
+    CPU-bound engines go to a bounded thread pool, I/O-bound ones (the
+    regional alerts lookup, the DB-backed safety check) and the translation
+    model to the event loop's default executor. Each stage gets ``timeout``
+    seconds; stages that fail or time out are left out of the result and
+    listed under ``stage_errors``. ``include_timings`` adds per-stage
+    start/end offsets and the slowest stage (the critical path) under
+    ``timings``.
+
+    A timed-out stage's thread is not interrupted; it finishes in the
+    background and its result is discarded. The safety stage therefore uses
+    its own database session rather than the request's.
+    """
+    timeout = settings.HEALTH_STAGE_TIMEOUT_SECONDS if timeout is None else timeout
+    language = payload.get("language", "en")
+    started = time.perf_counter()
+
+    loop = asyncio.get_running_loop()
+    if language != "en":
+        await loop.run_in_executor(None, _translate_input, payload, language)
+
+    stages = _plan_stages(None, user_id, payload)
+    pool = _get_pool()
+    futures = [
+        loop.run_in_executor(pool if stage.kind == "cpu" else None, _timed, stage.fn, stage.args)
+        for stage in stages
+    ]
+    settled = await asyncio.gather(
+        *(asyncio.wait_for(future, timeout) for future in futures), return_exceptions=True
+    )
+
+    outputs: Dict[str, Any] = {}
+    errors: Dict[str, str] = {}
+    timings: Dict[str, Dict[str, Any]] = {}
+    for stage, outcome in zip(stages, settled):
+        if isinstance(outcome, asyncio.TimeoutError):
+            logger.warning("Health stage %s timed out after %.1fs", stage.name, timeout)
+            errors[stage.name] = "timeout"
+            timings[stage.name] = {"status": "timeout"}
+        elif isinstance(outcome, BaseException):
+            logger.error("Health stage %s failed: %s", stage.name, outcome)
+            errors[stage.name] = f"error: {str(outcome)[:200]}"
+            timings[stage.name] = {"status": "error"}
+        else:
+            value, stage_start, stage_end = outcome
+            outputs[stage.name] = value
+            timings[stage.name] = {
+                "status": "ok",
+                "start_ms": round((stage_start - started) * 1000, 1),
+                "end_ms": round((stage_end - started) * 1000, 1),
+                "duration_ms": round((stage_end - stage_start) * 1000, 1),
+            }
+
+    result = _assemble(outputs)
+    if language != "en":
+        result = await loop.run_in_executor(None, _deep_translate, result, language)
+    if errors:
+        result["stage_errors"] = errors
+    if include_timings:
+        finished = [(name, t["end_ms"]) for name, t in timings.items() if t["status"] == "ok"]
+        result["timings"] = {
+            "stages": timings,
+            "total_ms": round((time.perf_counter() - started) * 1000, 1),
+            "critical_path": max(finished, key=lambda item: item[1])[0] if finished else None,
+        }
+    return result
+
+
 def _deep_translate(data, lang):
     if isinstance(data, dict):
         return {k: _deep_translate(v, lang) for k, v in data.items()}
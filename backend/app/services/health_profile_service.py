@@ -12,6 +12,7 @@ from sqlalchemy.orm import Session
 
 from backend.app.models.user import User
 from backend.app.models.medical_profile import MedicalProfile
+from backend.app.services.user_profile_cache import invalidate_user_profile
 
 logger = logging.getLogger(__name__)
 
@@ -64,6 +65,7 @@ def initialize_health_profile(
     db.add(profile)
     db.commit()
     db.refresh(profile)
+    invalidate_user_profile(user.id)
     
     logger.info("Health profile created for user %d (age=%s, gender=%s)", user.id, age, gender)
     return profile
@@ -247,6 +249,7 @@ def update_health_profile(
     profile.updated_at = datetime.now(timezone.utc)
     db.commit()
     db.refresh(profile)
+    invalidate_user_profile(user_id)
     
     logger.info("Health profile updated for user %d", user_id)
     return profile
@@ -19,6 +19,7 @@ from backend.app.services.openrouter_service import (
     should_use_fallback,
     get_triage_system_prompt,
 )
+from backend.app.services.openrouter_client import is_openrouter_degraded
 from backend.app.services.ml_models_registry import (
     get_model,
     is_model_available,
@@ -29,9 +30,12 @@ logger = logging.getLogger(__name__)
 settings = get_settings()
 
 
-def predict_disease_with_fallback(user_symptoms: List[str]) -> Dict[str, Any]:
+def predict_disease_with_fallback(user_symptoms: List[str], allow_llm: bool = True) -> Dict[str, Any]:
     """
     Predict disease using local ML model, fall back to LLM if needed.
+
+    With ``allow_llm=False`` the LLM is never called: a low-confidence local
+    prediction is returned as is, and "Unknown" if the local model has none.
     
     Returns:
         {
@@ -86,7 +90,12 @@ def predict_disease_with_fallback(user_symptoms: List[str]) -> Dict[str, Any]:
             confidence = safe_result.get("confidence", 0.75)
             
             if disease and disease != "Unknown" and disease != "Unknown (Model unavailable)":
-                if not should_use_fallback(confidence):
+                use_llm = should_use_fallback(confidence)
+                if use_llm and (not allow_llm or is_openrouter_degraded()):
+                    # Upstream failing or out of budget: a low-confidence local answer beats a default one
+                    logger.info("⚠️ LLM fallback unavailable, keeping low-confidence LOCAL ML prediction")
+                    use_llm = False
+                if not use_llm:
                     top_preds = safe_result.get("top_predictions", [])
                     logger.info(
                         "🧠 Disease prediction from LOCAL ML MODEL: %s (confidence: %.2f) | Symptoms: %s",
@@ -121,6 +130,17 @@ def predict_disease_with_fallback(user_symptoms: List[str]) -> Dict[str, Any]:
     except Exception as e:
         logger.warning("Local ML model inference failed: %s", str(e))
 
+    if not allow_llm:
+        return {
+            "disease_prediction": "Unknown",
+            "confidence": 0.0,
+            "model_used": "default",
+            "model_info": {"name": "None", "type": "Fallback"},
+            "description": "Unable to analyze symptoms at this time. Please try again.",
+            "reasoning": "Local model unavailable and LLM fallback skipped",
+            "triage_level": "Self-care",
+        }
+
     # 2. Fall back to OpenRouter LLM
     logger.info(
         "⚠️ Using OPENROUTER LLM for triage (confidence threshold not met or ML unavailable) | Symptoms: %s",
@@ -0,0 +1,245 @@
+"""
+Inference Batcher — dynamic micro-batching for the ResNet image classifiers.
+
+Concurrent requests for the same model are collected for a short window
+(or until ``max_batch_size`` is reached) and pushed through the network as
+a single batched forward pass. Each caller receives its own probability row.
+
+Callers submit an already-transformed ``(C, H, W)`` tensor and block on the
+result, so the batcher works from sync handlers, thread pools, and (via
+``asyncio.wrap_future``) coroutines alike. A request whose caller times out
+before its batch starts is cancelled and never reaches the model.
+
+Usage:
+    probs = classify("xray", load_model, image_tensor)   # 1-D softmax tensor
+"""
+
+import math
+import queue
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from backend.app.config import get_settings
+from backend.app.logging_config import get_logger
+
+logger = get_logger("services.inference_batcher")
+settings = get_settings()
+
+# Number of recent request latencies kept per model for percentile reporting
+_LATENCY_WINDOW = 2048
+
+
+class MicroBatcher:
+    """Collects single-image requests for one model and runs them batched."""
+
+    def __init__(
+        self,
+        name: str,
+        model_loader: Callable[[], Any],
+        max_batch_size: int = 16,
+        max_wait_ms: float = 5.0,
+    ):
+        self.name = name
+        self.model_loader = model_loader
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+
+        self._queue: "queue.Queue[Tuple[Any, Future, float]]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+        self._stats_lock = threading.Lock()
+        self._batch_sizes: Counter = Counter()
+        self._latencies: deque = deque(maxlen=_LATENCY_WINDOW)
+        self._requests = 0
+        self._batches = 0
+        self._errors = 0
+        self._timeouts = 0
+
+    # ── Public API ────────────────────────────────────────────────────
+
+    def submit(self, tensor) -> Future:
+        """Queue a single ``(C, H, W)`` tensor; the future resolves to its softmax row."""
+        self._ensure_worker()
+        future: Future = Future()
+        self._queue.put((tensor, future, time.perf_counter()))
+        return future
+
+    def infer(self, tensor, timeout: Optional[float] = None):
+        """Blocking convenience wrapper around :meth:`submit`; cancels the request on timeout."""
+        future = self.submit(tensor)
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            # Still queued: drop it so it takes no batch slot. Already running: nothing to reclaim.
+            future.cancel()
+            with self._stats_lock:
+                self._timeouts += 1
+            raise
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of queue depth, batch-size histogram and latency percentiles."""
+        with self._stats_lock:
+            latencies = sorted(self._latencies)
+            histogram = dict(sorted(self._batch_sizes.items()))
+            requests, batches, errors = self._requests, self._batches, self._errors
+            timeouts = self._timeouts
+
+        return {
+            "model": self.name,
+            "queue_depth": self._queue.qsize(),
+            "max_batch_size": self.max_batch_size,
+            "window_ms": round(self.max_wait * 1000, 2),
+            "requests": requests,
+            "batches": batches,
+            "errors": errors,
+            "timeouts": timeouts,
+            "avg_batch_size": round(requests / batches, 2) if batches else 0.0,
+            "batch_size_histogram": histogram,
+            "latency_ms": {
+                "p50": _percentile(latencies, 50),
+                "p99": _percentile(latencies, 99),
+                "samples": len(latencies),
+            },
+        }
+
+    # ── Worker ────────────────────────────────────────────────────────
+
+    def _ensure_worker(self) -> None:
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._start_lock:
+            if self._worker is not None and self._worker.is_alive():
+                return
+            self._worker = threading.Thread(
+                target=self._run, name=f"batcher-{self.name}", daemon=True
+            )
+            self._worker.start()
+            logger.info(
+                "Started micro-batcher for %s (max_batch=%d, window=%.1fms)",
+                self.name, self.max_batch_size, self.max_wait * 1000,
+            )
+
+    def _collect(self) -> List[Tuple[Any, Future, float]]:
+        """
+        Block for the first request, then gather more until full or the window closes.
+
+        Requests whose caller already gave up are dropped as they are taken,
+        so they use no batch slot; the rest are marked running and can no
+        longer be cancelled.
+        """
+        batch: List[Tuple[Any, Future, float]] = []
+        while not batch:
+            _take_live(batch, self._queue.get())
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                if remaining <= 0:
+                    item = self._queue.get_nowait()
+                else:
+                    item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            _take_live(batch, item)
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._collect()
+            try:
+                probabilities = self._forward([item[0] for item in batch])
+            except Exception as e:  # fan the failure out to every waiter
+                logger.error("Batched inference failed for %s: %s", self.name, e)
+                with self._stats_lock:
+                    self._errors += len(batch)
+                for _, future, _ in batch:
+                    future.set_exception(e)
+                continue
+
+            now = time.perf_counter()
+            for row, (_, future, enqueued) in zip(probabilities, batch):
+                future.set_result(row)
+            with self._stats_lock:
+                self._requests += len(batch)
+                self._batches += 1
+                self._batch_sizes[len(batch)] += 1
+                self._latencies.extend((now - enqueued) * 1000 for _, _, enqueued in batch)
+
+    def _forward(self, tensors: list):
+        import torch
+
+        model = self.model_loader()
+        device = next(model.parameters()).device
+        inputs = torch.stack(tensors).to(device)
+        with torch.no_grad():
+            outputs = model(inputs)
+            probabilities = torch.softmax(outputs, dim=1).cpu()
+        return list(probabilities)
+
+
+def _take_live(batch: list, item: Tuple[Any, Future, float]) -> None:
+    if item[1].set_running_or_notify_cancel():
+        batch.append(item)
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list (0.0 when empty)."""
+    if not sorted_values:
+        return 0.0
+    rank = min(len(sorted_values) - 1, max(0, math.ceil(pct / 100 * len(sorted_values)) - 1))
+    return round(sorted_values[rank], 2)
+
+
+# ─────────────────────────────────────────────────────────────────────────
+# Registry
+# ─────────────────────────────────────────────────────────────────────────
+
+_batchers: Dict[str, MicroBatcher] = {}
+_registry_lock = threading.Lock()
+
+
+def get_batcher(name: str, model_loader: Callable[[], Any]) -> MicroBatcher:
+    """Return the shared batcher for ``name``, creating it on first use."""
+    batcher = _batchers.get(name)
+    if batcher is not None:
+        return batcher
+    with _registry_lock:
+        if name not in _batchers:
+            _batchers[name] = MicroBatcher(
+                name,
+                model_loader,
+                max_batch_size=settings.INFERENCE_BATCH_MAX_SIZE,
+                max_wait_ms=settings.INFERENCE_BATCH_WINDOW_MS,
+            )
+        return _batchers[name]
+
+
+def classify(name: str, model_loader: Callable[[], Any], tensor):
+    """
+    Return the softmax probabilities for a single transformed image.
+
+    Goes through the shared micro-batcher when ``INFERENCE_BATCHING_ENABLED``,
+    otherwise runs an unbatched forward pass in the calling thread.
+    """
+    if settings.INFERENCE_BATCHING_ENABLED:
+        return get_batcher(name, model_loader).infer(tensor, timeout=settings.ML_MODEL_TIMEOUT)
+
+    import torch
+
+    model = model_loader()
+    device = next(model.parameters()).device
+    with torch.no_grad():
+        outputs = model(tensor.unsqueeze(0).to(device))
+        return torch.softmax(outputs, dim=1)[0].cpu()
+
+
+def get_batching_stats() -> Dict[str, Any]:
+    """Per-model batching metrics for every batcher created so far."""
+    return {
+        "enabled": settings.INFERENCE_BATCHING_ENABLED,
+        "models": {name: batcher.stats() for name, batcher in sorted(_batchers.items())},
+    }
@@ -0,0 +1,143 @@
+"""
+Inference Executor — runs blocking ML inference off the asyncio event loop.
+
+The async upload routes used to call ``predict_xray`` / ``predict_mri`` /
+``predict_skin`` directly on the event loop, so one CPU forward pass stalled
+every other request on that worker. This module owns a dedicated, bounded
+thread pool for that work:
+
+- Pool size follows the torch intra-op thread budget (or INFERENCE_MAX_WORKERS).
+- At most INFERENCE_MAX_QUEUE requests may wait behind the running ones;
+  beyond that ``InferenceQueueFull`` is raised so the route can answer
+  503 with a Retry-After header instead of piling up work.
+
+Usage:
+    result = await run_inference(predict_xray, contents)
+"""
+
+import asyncio
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from backend.app.config import get_settings
+from backend.app.logging_config import get_logger
+
+logger = get_logger("services.inference_executor")
+settings = get_settings()
+
+
+class InferenceQueueFull(Exception):
+    """Raised when the inference pool and its wait queue are both full."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Inference queue full, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+def _default_workers() -> int:
+    """Size the pool to the torch thread budget, falling back to CPU count."""
+    if settings.INFERENCE_MAX_WORKERS > 0:
+        return settings.INFERENCE_MAX_WORKERS
+    try:
+        import torch
+        return max(2, torch.get_num_threads())
+    except Exception:
+        return max(2, os.cpu_count() or 2)
+
+
+class InferenceExecutor:
+    """Bounded thread pool with admission control for blocking inference calls."""
+
+    def __init__(self, max_workers: int, max_queue: int, retry_after: int = 2):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.retry_after = retry_after
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="inference")
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._rejected = 0
+        self._completed = 0
+
+    @property
+    def capacity(self) -> int:
+        return self.max_workers + self.max_queue
+
+    def _acquire(self) -> None:
+        with self._lock:
+            if self._in_flight >= self.capacity:
+                self._rejected += 1
+                raise InferenceQueueFull(self.retry_after)
+            self._in_flight += 1
+
+    def _release(self, _future=None) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            self._completed += 1
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run ``fn(*args, **kwargs)`` on the pool, or raise InferenceQueueFull."""
+        self._acquire()
+        try:
+            future = self._pool.submit(functools.partial(fn, *args, **kwargs))
+        except Exception:
+            self._release()
+            raise
+        # Release on completion of the pool task itself, so a cancelled
+        # request still holds its slot until the thread is actually free.
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            in_flight = self._in_flight
+            rejected, completed = self._rejected, self._completed
+        return {
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "in_flight": in_flight,
+            "queued": max(0, in_flight - self.max_workers),
+            "completed": completed,
+            "rejected": rejected,
+        }
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+_executor: Optional[InferenceExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_inference_executor() -> InferenceExecutor:
+    """Return the process-wide inference executor, creating it on first use."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = InferenceExecutor(
+                    max_workers=_default_workers(),
+                    max_queue=settings.INFERENCE_MAX_QUEUE,
+                    retry_after=settings.INFERENCE_RETRY_AFTER_SECONDS,
+                )
+                logger.info(
+                    "Inference executor ready (workers=%d, queue=%d)",
+                    _executor.max_workers, _executor.max_queue,
+                )
+    return _executor
+
+
+async def run_inference(fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """Run a blocking inference call on the shared bounded executor."""
+    return await get_inference_executor().run(fn, *args, **kwargs)
+
+
+def shutdown_inference_executor() -> None:
+    """Stop the shared executor (called from the app lifespan on shutdown)."""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown()
+            _executor = None
@@ -0,0 +1,352 @@
+"""
+LLM Response Cache — bounded TTL + LRU cache with single-flight for OpenRouter calls.
+
+Successful LLM responses are kept per ``cache_key`` for ``ttl`` seconds in
+an in-process LRU holding at most ``max_entries`` items. Optionally a
+shared SQLite file sits behind it, so every uvicorn/gunicorn worker on the
+host sees the others' responses.
+
+Concurrent callers asking for the same key while a call is in flight wait
+for that one call instead of each hitting the API (request coalescing).
+Leaders and followers may be threads or coroutines in any mix.
+
+Usage:
+    result = get_llm_cache().get_or_call(key, lambda: _post(...), cacheable)
+    result = await get_llm_cache().aget_or_call(key, lambda: _apost(...), cacheable)
+"""
+
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import CancelledError, Future, TimeoutError as FutureTimeoutError
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from backend.app.config import get_settings
+from backend.app.logging_config import get_logger
+
+logger = get_logger("services.llm_cache")
+settings = get_settings()
+
+# Shared-store writes between sweeps of expired / excess rows
+_SWEEP_EVERY = 256
+
+
+class SQLiteCacheStore:
+    """
+    Cross-process key/value store in a SQLite file.
+
+    Each thread gets its own connection; the database runs in WAL mode so
+    readers in other workers are not blocked by a writer.
+    """
+
+    def __init__(self, path: str, max_entries: int):
+        self.path = path
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._writes = 0
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._conn() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                " key TEXT PRIMARY KEY, expires_at REAL NOT NULL, value TEXT NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_llm_cache_expires ON llm_cache (expires_at)")
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str, now: float) -> Optional[Tuple[float, Any]]:
+        row = self._conn().execute(
+            "SELECT expires_at, value FROM llm_cache WHERE key = ? AND expires_at > ?", (key, now)
+        ).fetchone()
+        if row is None:
+            return None
+        return row[0], json.loads(row[1])
+
+    def set(self, key: str, expires_at: float, value: Any) -> None:
+        with self._conn() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, expires_at, value) VALUES (?, ?, ?)",
+                (key, expires_at, json.dumps(value)),
+            )
+        self._writes += 1
+        if self._writes % _SWEEP_EVERY == 0:
+            self.sweep(time.time())
+
+    def sweep(self, now: float) -> int:
+        """Drop expired rows, then the soonest-expiring rows beyond ``max_entries``."""
+        with self._conn() as conn:
+            removed = conn.execute("DELETE FROM llm_cache WHERE expires_at <= ?", (now,)).rowcount
+            removed += conn.execute(
+                "DELETE FROM llm_cache WHERE key IN ("
+                " SELECT key FROM llm_cache ORDER BY expires_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            ).rowcount
+        return removed
+
+    def clear(self) -> None:
+        with self._conn() as conn:
+            conn.execute("DELETE FROM llm_cache")
+
+
+class LLMResponseCache:
+    """Size-bounded LRU with per-entry TTL, request coalescing and counters."""
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl: float = 300.0,
+        store: Optional[SQLiteCacheStore] = None,
+        wait_timeout: Optional[float] = None,
+    ):
+        self.max_entries = max(1, max_entries)
+        self.ttl = ttl
+        self.store = store
+        # How long a follower waits for the in-flight call before making its own
+        self.wait_timeout = wait_timeout
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[str, Future] = {}
+        self._counters = {
+            "hits": 0,
+            "shared_hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "store_errors": 0,
+        }
+
+    # ── Lookup / store ────────────────────────────────────────────────
+
+    def get(self, key: str) -> Optional[Any]:
+        """Cached value for ``key``, or None. Counts a hit but not a miss."""
+        cached = self._get_local(key)
+        return cached if cached is not None else self._get_shared(key)
+
+    def _get_local(self, key: str) -> Optional[Any]:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(key)
+                    self._counters["hits"] += 1
+                    return entry[1]
+                del self._entries[key]
+                self._counters["expirations"] += 1
+        return None
+
+    def _get_shared(self, key: str) -> Optional[Any]:
+        # Blocking (sqlite3, busy timeout): async callers run it in an executor
+        if self.store is None:
+            return None
+        try:
+            shared = self.store.get(key, time.time())
+        except sqlite3.Error as e:
+            self._count("store_errors")
+            logger.warning("LLM cache store read failed: %s", e)
+            return None
+        if shared is None:
+            return None
+        with self._lock:
+            self._put_local(key, shared[0], shared[1])
+            self._counters["shared_hits"] += 1
+        return shared[1]
+
+    def set(self, key: str, value: Any) -> None:
+        self._set_shared(key, self._set_local(key, value), value)
+
+    def _set_local(self, key: str, value: Any) -> float:
+        expires_at = time.time() + self.ttl
+        with self._lock:
+            self._put_local(key, expires_at, value)
+        return expires_at
+
+    def _set_shared(self, key: str, expires_at: float, value: Any) -> None:
+        # Blocking, like _get_shared
+        if self.store is None:
+            return
+        try:
+            self.store.set(key, expires_at, value)
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            self._count("store_errors")
+            logger.warning("LLM cache store write failed: %s", e)
+
+    def _put_local(self, key: str, expires_at: float, value: Any) -> None:
+        # Caller holds self._lock
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._counters["evictions"] += 1
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counters[name] += 1
+
+    # ── Single-flight ─────────────────────────────────────────────────
+
+    def _claim(self, key: str) -> Tuple[Future, bool]:
+        """The in-flight future for ``key`` and whether this caller must produce it."""
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                self._counters["coalesced"] += 1
+                return future, False
+            future = Future()
+            self._inflight[key] = future
+            self._counters["misses"] += 1
+            return future, True
+
+    def _finish(self, key: str, future: Future, result: Any, cacheable: Callable[[Any], bool]) -> Optional[float]:
+        """Cache ``result`` locally and hand it to the waiters; returns its expiry for the shared-store write."""
+        expires_at = self._set_local(key, result) if cacheable(result) else None
+        with self._lock:
+            self._inflight.pop(key, None)
+        future.set_result(result)
+        return expires_at
+
+    def _fail(self, key: str, future: Future, exc: BaseException) -> None:
+        with self._lock:
+            self._inflight.pop(key, None)
+        if isinstance(exc, Exception):
+            future.set_exception(exc)
+        else:
+            # Leader cancelled (client went away): waiters retry instead of inheriting it
+            future.cancel()
+
+    def get_or_call(
+        self,
+        key: str,
+        call: Callable[[], Any],
+        cacheable: Callable[[Any], bool] = lambda _: True,
+    ) -> Any:
+        """Cached value for ``key``, else the result of ``call()`` shared with concurrent callers."""
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+
+        future, leader = self._claim(key)
+        if not leader:
+            try:
+                return future.result(timeout=self.wait_timeout)
+            except CancelledError:
+                return self.get_or_call(key, call, cacheable)
+            except FutureTimeoutError:
+                logger.warning("Timed out waiting for in-flight LLM call %s, calling directly", key)
+                return call()
+
+        try:
+            result = call()
+        except BaseException as e:
+            self._fail(key, future, e)
+            raise
+        expires_at = self._finish(key, future, result, cacheable)
+        if expires_at is not None:
+            self._set_shared(key, expires_at, result)
+        return result
+
+    async def aget_or_call(
+        self,
+        key: str,
+        call: Callable[[], Awaitable[Any]],
+        cacheable: Callable[[Any], bool] = lambda _: True,
+    ) -> Any:
+        """
+        Async :meth:`get_or_call`; waiting on another caller never blocks the
+        event loop, and neither do shared-store reads and writes (run in the
+        default executor).
+        """
+        loop = asyncio.get_running_loop()
+        cached = self._get_local(key)
+        if cached is None and self.store is not None:
+            cached = await loop.run_in_executor(None, self._get_shared, key)
+        if cached is not None:
+            return cached
+
+        future, leader = self._claim(key)
+        if not leader:
+            try:
+                return await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), self.wait_timeout)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                return await self.aget_or_call(key, call, cacheable)
+            except asyncio.TimeoutError:
+                logger.warning("Timed out waiting for in-flight LLM call %s, calling directly", key)
+                return await call()
+
+        try:
+            result = await call()
+        except BaseException as e:
+            self._fail(key, future, e)
+            raise
+        expires_at = self._finish(key, future, result, cacheable)
+        if expires_at is not None and self.store is not None:
+            await loop.run_in_executor(None, self._set_shared, key, expires_at, result)
+        return result
+
+    # ── Maintenance ───────────────────────────────────────────────────
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+        if self.store is not None:
+            self.store.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters plus current size; hit_rate counts shared-store hits as hits."""
+        with self._lock:
+            counters = dict(self._counters)
+            size, inflight = len(self._entries), len(self._inflight)
+        lookups = counters["hits"] + counters["shared_hits"] + counters["misses"] + counters["coalesced"]
+        return {
+            "backend": "sqlite" if self.store is not None else "memory",
+            "size": size,
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl,
+            "inflight": inflight,
+            **counters,
+            "hit_rate": round((counters["hits"] + counters["shared_hits"]) / lookups, 4) if lookups else 0.0,
+        }
+
+
+_cache: Optional[LLMResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> LLMResponseCache:
+    """Process-wide OpenRouter response cache, configured from settings."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                store = None
+                if settings.LLM_CACHE_BACKEND == "sqlite":
+                    try:
+                        store = SQLiteCacheStore(settings.LLM_CACHE_SQLITE_PATH, settings.LLM_CACHE_MAX_ENTRIES)
+                    except (sqlite3.Error, OSError) as e:
+                        logger.warning(
+                            "Shared LLM cache at %s unavailable, using in-process cache only: %s",
+                            settings.LLM_CACHE_SQLITE_PATH, e,
+                        )
+                _cache = LLMResponseCache(
+                    max_entries=settings.LLM_CACHE_MAX_ENTRIES,
+                    ttl=settings.LLM_CACHE_TTL_SECONDS,
+                    store=store,
+                    wait_timeout=settings.LLM_TIMEOUT + 5,
+                )
+    return _cache
@@ -8,6 +8,7 @@ Provides:
 """
 
 import logging
+import os
 import re
 from typing import Dict, Any, List, Optional
 
@@ -240,20 +241,34 @@ KNOWLEDGE_BASE: List[Dict[str, Any]] = [
 # TF-IDF Vector Search
 # ─────────────────────────────────────────────────────────────────────────
 
+RAG_ARTIFACTS_DIR = os.path.normpath(
+    os.path.join(os.path.dirname(__file__), "..", "ml_models", "artifacts", "medical_rag")
+)
+
 _tfidf_vectorizer = None
 _tfidf_matrix = None
 _corpus_docs = None
 
 
+def _make_vectorizer():
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    return TfidfVectorizer(
+        stop_words="english",
+        max_features=5000,
+        ngram_range=(1, 2),
+    )
+
+
 def _build_index():
-    """Build TF-IDF index over the knowledge base."""
+    """Build TF-IDF index over the knowledge base (memory-mapped from persisted artifacts)."""
     global _tfidf_vectorizer, _tfidf_matrix, _corpus_docs
 
     if _tfidf_matrix is not None:
         return
 
     try:
-        from sklearn.feature_extraction.text import TfidfVectorizer
+        from backend.app.ml_models.ann_index import corpus_fingerprint
+        from backend.app.ml_models.tfidf_artifacts import load_or_fit_tfidf
 
         # Build searchable corpus: title + tags + content
         _corpus_docs = []
@@ -261,12 +276,11 @@ def _build_index():
             doc = f"{entry['title']} {' '.join(entry.get('tags', []))} {entry['content']}"
             _corpus_docs.append(doc)
 
-        _tfidf_vectorizer = TfidfVectorizer(
-            stop_words="english",
-            max_features=5000,
-            ngram_range=(1, 2),
+        artifacts = load_or_fit_tfidf(
+            RAG_ARTIFACTS_DIR, _corpus_docs, _make_vectorizer, corpus_fingerprint(_corpus_docs)
         )
-        _tfidf_matrix = _tfidf_vectorizer.fit_transform(_corpus_docs)
+        _tfidf_vectorizer = artifacts.vectorizer
+        _tfidf_matrix = artifacts.matrix
         logger.info("Medical RAG index built: %d entries", len(KNOWLEDGE_BASE))
 
     except ImportError:
@@ -275,6 +289,18 @@ def _build_index():
         _tfidf_matrix = None
 
 
+def build_artifacts() -> bool:
+    """Offline build: refit and persist the RAG TF-IDF artifacts."""
+    global _tfidf_vectorizer, _tfidf_matrix
+    import shutil
+
+    shutil.rmtree(RAG_ARTIFACTS_DIR, ignore_errors=True)
+    _tfidf_vectorizer = None
+    _tfidf_matrix = None
+    _build_index()
+    return _tfidf_matrix is not None
+
+
 def search_knowledge(query: str, top_k: int = 5) -> List[Dict[str, Any]]:
     """
     Search the medical knowledge base using TF-IDF similarity.
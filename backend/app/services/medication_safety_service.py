@@ -3,9 +3,9 @@ from datetime import datetime, timedelta, timezone
 
 from sqlalchemy.orm import Session
 
-from backend.app.models.user import User
 from backend.app.models.medication_log import MedicationLog
 from backend.app.logging_config import get_logger
+from backend.app.services.user_profile_cache import load_user
 
 logger = get_logger("services.medication_safety_service")
 
@@ -222,7 +222,7 @@ def run_safety_check(db: Session, user_id: int, medications: list[str]) -> dict:
     """
     Full medication safety analysis for a user.
     """
-    user = db.query(User).filter(User.id == user_id).first()
+    user = load_user(db, user_id)  # already in the session when called behind get_current_user
     if not user:
         return {"error": "User not found"}
 
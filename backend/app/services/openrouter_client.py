@@ -0,0 +1,501 @@
+"""
+OpenRouter HTTP client — app-lifetime connection pool, retries and circuit breaker.
+
+One ``aiohttp.ClientSession`` is created in the FastAPI lifespan and reused
+for every LLM call, so keep-alive connections skip DNS + TCP + TLS setup.
+Calls are limited by a per-host semaphore, retried with jittered
+exponential backoff on 429/5xx and connection errors, and short-circuited
+by a circuit breaker while the upstream keeps failing.
+
+Sync callers (route handlers running in the threadpool) are bridged onto
+the lifespan event loop so they share the same pool. Without a running
+client (scripts, tests, or a sync call made on the loop thread itself) a
+pooled ``requests.Session`` with the same retry and breaker policy is used.
+
+Usage:
+    status, body = await get_openrouter_client().post_chat(payload)
+    status, body = get_openrouter_client().post_chat_sync(payload)
+    async for text in get_openrouter_client().stream_chat(payload): ...
+"""
+
+import asyncio
+import json
+import random
+import threading
+import time
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+from backend.app.config import get_settings
+from backend.app.logging_config import get_logger
+
+logger = get_logger("services.openrouter_client")
+settings = get_settings()
+
+RETRYABLE_STATUS = frozenset({429, 500, 502, 503, 504})
+
+# Longest single backoff sleep, whatever the attempt number or Retry-After
+_MAX_BACKOFF_SECONDS = 8.0
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the upstream while the circuit breaker is open."""
+
+
+class UpstreamUnavailable(Exception):
+    """Retries exhausted on connection errors or timeouts."""
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    ``closed``: calls flow. After ``failure_threshold`` consecutive failures
+    it opens and rejects calls for ``reset_timeout`` seconds, then lets a
+    single probe through (``half_open``); the probe's outcome closes or
+    re-opens it.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probing = False
+        self.rejected = 0
+        self.trips = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state(time.monotonic())
+
+    def _state(self, now: float) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if now - self._opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self._state(time.monotonic())
+            if state == "closed":
+                return True
+            if state == "half_open" and not self._probing:
+                self._probing = True
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def release(self) -> None:
+        """A call ended without a verdict (cancelled): let the next probe through."""
+        with self._lock:
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._probing or self._failures >= self.failure_threshold:
+                if self._opened_at is None or self._probing:
+                    self.trips += 1
+                self._opened_at = time.monotonic()
+                self._probing = False
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "state": self._state(time.monotonic()),
+                "consecutive_failures": self._failures,
+                "trips": self.trips,
+                "rejected": self.rejected,
+            }
+
+
+def backoff_delay(attempt: int, base: float, retry_after: Optional[str] = None) -> float:
+    """Full-jitter exponential backoff; a numeric Retry-After header wins when present."""
+    if retry_after:
+        try:
+            return min(_MAX_BACKOFF_SECONDS, max(0.0, float(retry_after)))
+        except ValueError:
+            pass
+    return random.uniform(0, min(_MAX_BACKOFF_SECONDS, base * (2 ** attempt)))
+
+
+class OpenRouterClient:
+    """Pooled chat-completions client for one OpenRouter base URL."""
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str,
+        timeout: float = 30.0,
+        max_concurrency: int = 8,
+        max_retries: int = 2,
+        backoff_base: float = 0.5,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
+        self.url = base_url.rstrip("/") + "/chat/completions"
+        self.timeout = timeout
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_retries = max(0, max_retries)
+        self.backoff_base = backoff_base
+        self.breaker = breaker or CircuitBreaker()
+        self.headers = {
+            "Authorization": f"Bearer {api_key}",
+            "HTTP-Referer": "https://chikitsak.com",
+            "X-Title": "Chikitsak Health AI",
+            "Content-Type": "application/json",
+        }
+
+        self._session = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[int] = None
+
+        self._sync_session = None
+        self._sync_lock = threading.Lock()
+        self._sync_semaphore = threading.BoundedSemaphore(self.max_concurrency)
+
+        self._stats_lock = threading.Lock()
+        self._requests = 0
+        self._retries = 0
+
+    # ── Lifecycle ─────────────────────────────────────────────────────
+
+    async def start(self) -> None:
+        """Open the pooled session on the running loop (called from the app lifespan)."""
+        import aiohttp
+
+        if self._session is not None:
+            return
+        connector = aiohttp.TCPConnector(
+            limit=self.max_concurrency * 2,
+            limit_per_host=self.max_concurrency,
+            keepalive_timeout=60,
+            ttl_dns_cache=300,
+        )
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            headers=self.headers,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+        )
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        logger.info("OpenRouter client started (pool %d per host)", self.max_concurrency)
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+        self._session = self._semaphore = self._loop = self._loop_thread = None
+        with self._sync_lock:
+            if self._sync_session is not None:
+                self._sync_session.close()
+                self._sync_session = None
+
+    @property
+    def started(self) -> bool:
+        return self._session is not None and self._loop is not None and self._loop.is_running()
+
+    # ── Async path ────────────────────────────────────────────────────
+
+    async def post_chat(self, payload: Dict[str, Any]) -> Tuple[int, Any]:
+        """
+        POST a chat-completions payload.
+
+        Returns ``(status, body)`` with the decoded JSON body for 200 and the
+        response text otherwise. Raises CircuitOpenError, or UpstreamUnavailable
+        / asyncio.TimeoutError once retries are exhausted.
+        """
+        import aiohttp
+
+        if not self.breaker.allow():
+            raise CircuitOpenError("OpenRouter circuit breaker is open")
+        try:
+            if self._session is not None and asyncio.get_running_loop() is self._loop:
+                return await self._post_with(self._session, self._semaphore, payload)
+            # Not started by the lifespan (scripts, tests): a session for this call only
+            async with aiohttp.ClientSession(
+                headers=self.headers, timeout=aiohttp.ClientTimeout(total=self.timeout)
+            ) as session:
+                return await self._post_with(session, asyncio.Semaphore(1), payload)
+        except (CircuitOpenError, UpstreamUnavailable, asyncio.TimeoutError):
+            raise
+        except asyncio.CancelledError:
+            self.breaker.release()
+            raise
+        except Exception:
+            # Malformed response or client bug: still counts against the upstream
+            self.breaker.record_failure()
+            raise
+
+    async def _post_with(self, session, semaphore: asyncio.Semaphore, payload: Dict[str, Any]) -> Tuple[int, Any]:
+        import aiohttp
+
+        attempt = 0
+        while True:
+            self._count_request(attempt)
+            retry_after = None
+            try:
+                async with semaphore:
+                    async with session.post(self.url, json=payload) as response:
+                        status = response.status
+                        if status == 200:
+                            body = await response.json()
+                        else:
+                            body = await response.text()
+                            retry_after = response.headers.get("Retry-After")
+                error: Optional[BaseException] = None
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                status, body, error = 0, None, e
+
+            if status not in RETRYABLE_STATUS and error is None:
+                self.breaker.record_success()
+                return status, body
+            if attempt >= self.max_retries:
+                self.breaker.record_failure()
+                if isinstance(error, asyncio.TimeoutError):
+                    raise error
+                if error is not None:
+                    raise UpstreamUnavailable(str(error)) from error
+                return status, body
+            delay = backoff_delay(attempt, self.backoff_base, retry_after)
+            logger.warning(
+                "OpenRouter %s, retrying in %.2fs (attempt %d/%d)",
+                status or type(error).__name__, delay, attempt + 1, self.max_retries,
+            )
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def stream_chat(self, payload: Dict[str, Any]) -> AsyncIterator[str]:
+        """
+        Stream a chat completion, yielding content deltas as they arrive.
+
+        Only opening the stream is retried. A final non-200 status, or a
+        failure after tokens have started, raises UpstreamUnavailable.
+        """
+        import aiohttp
+
+        if not self.breaker.allow():
+            raise CircuitOpenError("OpenRouter circuit breaker is open")
+        payload = {**payload, "stream": True}
+        own_session = None
+        if self._session is not None and asyncio.get_running_loop() is self._loop:
+            session, semaphore = self._session, self._semaphore
+        else:
+            own_session = session = aiohttp.ClientSession(
+                headers=self.headers, timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+            semaphore = asyncio.Semaphore(1)
+        try:
+            async with semaphore:
+                response = await self._open_stream(session, payload)
+                try:
+                    async for line in response.content:
+                        line = line.strip()
+                        # Skip event separators and ": keep-alive" comments
+                        if not line.startswith(b"data:"):
+                            continue
+                        data = line[5:].strip()
+                        if data == b"[DONE]":
+                            break
+                        choices = json.loads(data).get("choices") or [{}]
+                        delta = (choices[0].get("delta") or {}).get("content")
+                        if delta:
+                            yield delta
+                except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+                    self.breaker.record_failure()
+                    raise UpstreamUnavailable(f"OpenRouter stream interrupted: {e}") from e
+                finally:
+                    response.release()
+                self.breaker.record_success()
+        except (GeneratorExit, asyncio.CancelledError):
+            # Consumer stopped early (client disconnected)
+            self.breaker.release()
+            raise
+        finally:
+            if own_session is not None:
+                await own_session.close()
+
+    async def _open_stream(self, session, payload: Dict[str, Any]):
+        import aiohttp
+
+        attempt = 0
+        while True:
+            self._count_request(attempt)
+            retry_after = None
+            status, error = 0, None
+            try:
+                response = await session.post(self.url, json=payload)
+                status = response.status
+                if status == 200:
+                    return response
+                body = await response.text()
+                retry_after = response.headers.get("Retry-After")
+                response.release()
+                if status not in RETRYABLE_STATUS:
+                    self.breaker.record_success()
+                    raise UpstreamUnavailable(f"OpenRouter returned {status}: {body[:200]}")
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                error = e
+
+            if attempt >= self.max_retries:
+                self.breaker.record_failure()
+                if isinstance(error, asyncio.TimeoutError):
+                    raise error
+                raise UpstreamUnavailable(str(error) if error else f"OpenRouter returned {status}")
+            delay = backoff_delay(attempt, self.backoff_base, retry_after)
+            logger.warning(
+                "OpenRouter stream %s, retrying in %.2fs (attempt %d/%d)",
+                status or type(error).__name__, delay, attempt + 1, self.max_retries,
+            )
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    # ── Sync path ─────────────────────────────────────────────────────
+
+    def post_chat_sync(self, payload: Dict[str, Any]) -> Tuple[int, Any]:
+        """
+        Blocking :meth:`post_chat`.
+
+        From a worker thread the call runs on the lifespan loop's pooled
+        session; otherwise through a pooled ``requests.Session``.
+        """
+        loop = self._loop
+        if self.started and threading.get_ident() != self._loop_thread:
+            future = asyncio.run_coroutine_threadsafe(self.post_chat(payload), loop)
+            budget = (self.timeout + _MAX_BACKOFF_SECONDS) * (self.max_retries + 1)
+            try:
+                return future.result(timeout=budget)
+            except FutureTimeoutError:
+                # Stop the coroutine so it releases its pooled connection and semaphore slot
+                future.cancel()
+                raise
+        return self._post_chat_requests(payload)
+
+    def _requests_session(self):
+        with self._sync_lock:
+            if self._sync_session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_concurrency)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                session.headers.update(self.headers)
+                self._sync_session = session
+            return self._sync_session
+
+    def _post_chat_requests(self, payload: Dict[str, Any]) -> Tuple[int, Any]:
+        if not self.breaker.allow():
+            raise CircuitOpenError("OpenRouter circuit breaker is open")
+        try:
+            return self._post_with_requests(payload)
+        except (UpstreamUnavailable, asyncio.TimeoutError):
+            raise
+        except Exception:
+            self.breaker.record_failure()
+            raise
+
+    def _post_with_requests(self, payload: Dict[str, Any]) -> Tuple[int, Any]:
+        import requests
+
+        session = self._requests_session()
+        attempt = 0
+        while True:
+            self._count_request(attempt)
+            retry_after = None
+            try:
+                with self._sync_semaphore:
+                    response = session.post(self.url, json=payload, timeout=self.timeout)
+                status = response.status_code
+                body = response.json() if status == 200 else response.text
+                retry_after = response.headers.get("Retry-After")
+                error: Optional[BaseException] = None
+            except (requests.ConnectionError, requests.Timeout) as e:
+                status, body, error = 0, None, e
+
+            if status not in RETRYABLE_STATUS and error is None:
+                self.breaker.record_success()
+                return status, body
+            if attempt >= self.max_retries:
+                self.breaker.record_failure()
+                if isinstance(error, requests.Timeout):
+                    raise asyncio.TimeoutError() from error
+                if error is not None:
+                    raise UpstreamUnavailable(str(error)) from error
+                return status, body
+            delay = backoff_delay(attempt, self.backoff_base, retry_after)
+            logger.warning(
+                "OpenRouter %s, retrying in %.2fs (attempt %d/%d)",
+                status or type(error).__name__, delay, attempt + 1, self.max_retries,
+            )
+            time.sleep(delay)
+            attempt += 1
+
+    # ── Metrics ───────────────────────────────────────────────────────
+
+    def _count_request(self, attempt: int) -> None:
+        with self._stats_lock:
+            self._requests += 1
+            if attempt:
+                self._retries += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            requests, retries = self._requests, self._retries
+        return {
+            "pooled": self.started,
+            "max_concurrency": self.max_concurrency,
+            "requests": requests,
+            "retries": retries,
+            "breaker": self.breaker.stats(),
+        }
+
+
+_client: Optional[OpenRouterClient] = None
+_client_lock = threading.Lock()
+
+
+def get_openrouter_client() -> OpenRouterClient:
+    """Process-wide client configured from settings (pooled once the lifespan starts it)."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = OpenRouterClient(
+                    base_url=settings.OPENROUTER_BASE_URL,
+                    api_key=settings.OPENROUTER_API_KEY,
+                    timeout=settings.LLM_TIMEOUT,
+                    max_concurrency=settings.OPENROUTER_MAX_CONCURRENCY,
+                    max_retries=settings.OPENROUTER_MAX_RETRIES,
+                    backoff_base=settings.OPENROUTER_RETRY_BACKOFF_SECONDS,
+                    breaker=CircuitBreaker(
+                        settings.OPENROUTER_BREAKER_FAILURES,
+                        settings.OPENROUTER_BREAKER_RESET_SECONDS,
+                    ),
+                )
+    return _client
+
+
+def is_openrouter_degraded() -> bool:
+    """True while the circuit breaker is rejecting calls to the upstream."""
+    return _client is not None and _client.breaker.state == "open"
+
+
+async def start_openrouter_client() -> None:
+    await get_openrouter_client().start()
+
+
+async def close_openrouter_client() -> None:
+    if _client is not None:
+        await _client.close()
@@ -8,33 +8,17 @@ This service provides hybrid AI support:
 """
 
 import logging
-from typing import Optional, Any, Dict
+from typing import Optional, Any, AsyncIterator, Dict
 from datetime import datetime
 from backend.app.config import get_settings
-import json
-import time
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
-# Global cache for API response to avoid rate limiting during testing
-_response_cache: Dict[str, Any] = {}
-_cache_ttl = 300  # 5 minutes
 
-
-def _get_cached_response(key: str) -> Optional[Any]:
-    """Get response from cache if not expired."""
-    if key in _response_cache:
-        cached_time, cached_data = _response_cache[key]
-        if time.time() - cached_time < _cache_ttl:
-            return cached_data
-        del _response_cache[key]
-    return None
-
-
-def _cache_response(key: str, data: Any) -> None:
-    """Cache a response."""
-    _response_cache[key] = (time.time(), data)
+def _is_cacheable(result: Dict[str, Any]) -> bool:
+    """Only successful completions are cached; errors are retried on the next call."""
+    return result.get("status") == "success"
 
 
 async def call_openrouter_async(
@@ -65,83 +49,31 @@ async def call_openrouter_async(
             "confidence": 0.0,
         }
 
-    # Check cache
     if cache_key:
-        cached = _get_cached_response(cache_key)
-        if cached:
-            logger.info("Returning cached OpenRouter response for key: %s", cache_key)
-            return cached
+        from backend.app.services.llm_cache import get_llm_cache
 
-    try:
-        import aiohttp
-        import asyncio
-
-        headers = {
-            "Authorization": f"Bearer {settings.OPENROUTER_API_KEY}",
-            "HTTP-Referer": "https://chikitsak.com",
-            "X-Title": "Chikitsak Health AI",
-            "Content-Type": "application/json",
-        }
+        return await get_llm_cache().aget_or_call(
+            cache_key,
+            lambda: _post_openrouter_async(prompt, system_prompt, temperature, max_tokens),
+            _is_cacheable,
+        )
+    return await _post_openrouter_async(prompt, system_prompt, temperature, max_tokens)
 
-        payload = {
-            "model": settings.OPENROUTER_MODEL,
-            "messages": [
-                {"role": "system", "content": system_prompt or "You are a helpful health assistant."},
-                {"role": "user", "content": prompt},
-            ],
-            "temperature": temperature,
-            "max_tokens": max_tokens,
-        }
 
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                "https://openrouter.ai/api/v1/chat/completions",
-                json=payload,
-                headers=headers,
-                timeout=aiohttp.ClientTimeout(total=settings.LLM_TIMEOUT),
-            ) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    result = {
-                        "status": "success",
-                        "response": data["choices"][0]["message"]["content"],
-                        "model": data.get("model", settings.OPENROUTER_MODEL),
-                        "confidence": 0.8,  # Default confidence for LLM responses
-                        "usage": data.get("usage", {}),
-                    }
-                    
-                    # Cache successful response
-                    if cache_key:
-                        _cache_response(cache_key, result)
-                    
-                    logger.info("OpenRouter API call successful | Model: %s", result["model"])
-                    return result
-                else:
-                    error_text = await response.text()
-                    logger.error("OpenRouter API error (status=%d): %s", response.status, error_text)
-                    return {
-                        "status": "error",
-                        "response": f"API Error {response.status}: {error_text[:200]}",
-                        "model": "openrouter",
-                        "confidence": 0.0,
-                    }
-
-    except asyncio.TimeoutError:
-        logger.error("OpenRouter API timeout after %d seconds", settings.LLM_TIMEOUT)
-        return {
-            "status": "error",
-            "response": "AI service timeout. Please retry.",
-            "model": "openrouter",
-            "confidence": 0.0,
-        }
+async def _post_openrouter_async(
+    prompt: str,
+    system_prompt: Optional[str],
+    temperature: float,
+    max_tokens: int,
+) -> Dict[str, Any]:
+    from backend.app.services.openrouter_client import get_openrouter_client
+
+    payload = _build_payload(prompt, system_prompt, temperature, max_tokens)
+    try:
+        status, body = await get_openrouter_client().post_chat(payload)
+        return _to_result(status, body)
     except Exception as e:
-        logger.error("OpenRouter API error: %s", str(e))
-        return {
-            "status": "error",
-            "response": f"AI service error: {str(e)[:100]}",
-            "model": "openrouter",
-            "confidence": 0.0,
-        }
+        return _error_result(e)
 
 
 def call_openrouter_sync(
@@ -165,82 +97,124 @@ def call_openrouter_sync(
             "confidence": 0.0,
         }
 
-    # Check cache
     if cache_key:
-        cached = _get_cached_response(cache_key)
-        if cached:
-            logger.info("Returning cached OpenRouter response for key: %s", cache_key)
-            return cached
+        from backend.app.services.llm_cache import get_llm_cache
+
+        return get_llm_cache().get_or_call(
+            cache_key,
+            lambda: _post_openrouter_sync(prompt, system_prompt, temperature, max_tokens),
+            _is_cacheable,
+        )
+    return _post_openrouter_sync(prompt, system_prompt, temperature, max_tokens)
+
+
+def _post_openrouter_sync(
+    prompt: str,
+    system_prompt: Optional[str],
+    temperature: float,
+    max_tokens: int,
+) -> Dict[str, Any]:
+    from backend.app.services.openrouter_client import get_openrouter_client
 
+    payload = _build_payload(prompt, system_prompt, temperature, max_tokens)
     try:
-        import requests
+        status, body = get_openrouter_client().post_chat_sync(payload)
+        return _to_result(status, body)
+    except Exception as e:
+        return _error_result(e)
 
-        headers = {
-            "Authorization": f"Bearer {settings.OPENROUTER_API_KEY}",
-            "HTTP-Referer": "https://chikitsak.com",
-            "X-Title": "Chikitsak Health AI",
-            "Content-Type": "application/json",
-        }
 
-        payload = {
-            "model": settings.OPENROUTER_MODEL,
-            "messages": [
-                {"role": "system", "content": system_prompt or "You are a helpful health assistant."},
-                {"role": "user", "content": prompt},
-            ],
-            "temperature": temperature,
-            "max_tokens": max_tokens,
+def _build_payload(
+    prompt: str,
+    system_prompt: Optional[str],
+    temperature: float,
+    max_tokens: int,
+) -> Dict[str, Any]:
+    return {
+        "model": settings.OPENROUTER_MODEL,
+        "messages": [
+            {"role": "system", "content": system_prompt or "You are a helpful health assistant."},
+            {"role": "user", "content": prompt},
+        ],
+        "temperature": temperature,
+        "max_tokens": max_tokens,
+    }
+
+
+def _to_result(status: int, body: Any) -> Dict[str, Any]:
+    """Map an OpenRouter HTTP response onto the service's result dict."""
+    if status == 200:
+        result = {
+            "status": "success",
+            "response": body["choices"][0]["message"]["content"],
+            "model": body.get("model", settings.OPENROUTER_MODEL),
+            "confidence": 0.8,  # Default confidence for LLM responses
+            "usage": body.get("usage", {}),
         }
+        logger.info("OpenRouter API call successful | Model: %s", result["model"])
+        return result
+
+    error_text = str(body)[:200]
+    logger.error("OpenRouter API error (status=%d): %s", status, error_text)
+    return {
+        "status": "error",
+        "response": f"API Error {status}: {error_text}",
+        "model": "openrouter",
+        "confidence": 0.0,
+    }
 
-        response = requests.post(
-            "https://openrouter.ai/api/v1/chat/completions",
-            json=payload,
-            headers=headers,
-            timeout=settings.LLM_TIMEOUT,
-        )
 
-        if response.status_code == 200:
-            data = response.json()
-            result = {
-                "status": "success",
-                "response": data["choices"][0]["message"]["content"],
-                "model": data.get("model", settings.OPENROUTER_MODEL),
-                "confidence": 0.8,  # Default confidence for LLM responses
-                "usage": data.get("usage", {}),
-            }
-            
-            # Cache successful response
-            if cache_key:
-                _cache_response(cache_key, result)
-            
-            logger.info("OpenRouter API call successful | Model: %s", result["model"])
-            return result
-        else:
-            error_text = response.text[:200]
-            logger.error("OpenRouter API error (status=%d): %s", response.status_code, error_text)
-            return {
-                "status": "error",
-                "response": f"API Error {response.status_code}: {error_text}",
-                "model": "openrouter",
-                "confidence": 0.0,
-            }
-
-    except requests.Timeout:
-        logger.error("OpenRouter API timeout after %d seconds", settings.LLM_TIMEOUT)
+def _error_result(e: Exception) -> Dict[str, Any]:
+    import asyncio
+    from concurrent.futures import TimeoutError as FutureTimeoutError
+    from backend.app.services.openrouter_client import CircuitOpenError
+
+    if isinstance(e, CircuitOpenError):
+        logger.warning("OpenRouter circuit open, skipping LLM call")
         return {
             "status": "error",
-            "response": "AI service timeout. Please retry.",
-            "model": "openrouter",
+            "response": "AI service temporarily unavailable. Using local analysis.",
+            "model": "circuit_open",
             "confidence": 0.0,
         }
-    except Exception as e:
-        logger.error("OpenRouter API error: %s", str(e))
+    if isinstance(e, (asyncio.TimeoutError, FutureTimeoutError)):
+        logger.error("OpenRouter API timeout after %d seconds", settings.LLM_TIMEOUT)
         return {
             "status": "error",
-            "response": f"AI service error: {str(e)[:100]}",
+            "response": "AI service timeout. Please retry.",
             "model": "openrouter",
             "confidence": 0.0,
         }
+    logger.error("OpenRouter API error: %s", str(e))
+    return {
+        "status": "error",
+        "response": f"AI service error: {str(e)[:100]}",
+        "model": "openrouter",
+        "confidence": 0.0,
+    }
+
+
+async def stream_openrouter(
+    prompt: str,
+    system_prompt: Optional[str] = None,
+    temperature: float = 0.7,
+    max_tokens: int = 1000,
+) -> AsyncIterator[str]:
+    """
+    Stream an OpenRouter completion as text chunks (never cached).
+
+    Raises UpstreamUnavailable when no API key is configured, otherwise the
+    client's CircuitOpenError / UpstreamUnavailable / asyncio.TimeoutError;
+    callers fall back to a locally composed answer.
+    """
+    from backend.app.services.openrouter_client import UpstreamUnavailable, get_openrouter_client
+
+    if not settings.OPENROUTER_API_KEY or settings.OPENROUTER_API_KEY == "sk-or-v1-placeholder":
+        raise UpstreamUnavailable("OpenRouter API key not configured")
+
+    payload = _build_payload(prompt, system_prompt, temperature, max_tokens)
+    async for chunk in get_openrouter_client().stream_chat(payload):
+        yield chunk
 
 
 def should_use_fallback(ml_confidence: Optional[float]) -> bool:
@@ -0,0 +1,201 @@
+"""
+Password Hasher — bcrypt on a dedicated, bounded worker pool.
+
+bcrypt is deliberately slow (~250 ms at cost 12). Run inline in the sync
+auth routes, a login burst fills the threadpool FastAPI shares with every
+other sync route, and it uses every core doing so. This module runs hashing and
+verification on their own small pool instead, and the login, register and
+change-password routes await it (``ahash``/``averify``), so a request waiting
+for bcrypt holds no threadpool thread:
+
+- At most PASSWORD_HASH_WORKERS hashes run at once. bcrypt releases the
+  GIL, so threads use real cores without the pickling cost of processes.
+- At most PASSWORD_HASH_MAX_QUEUE calls may wait behind them. Beyond that
+  ``PasswordHasherBusy`` is raised before any work is queued, and the API
+  answers 429 with Retry-After.
+- New hashes use BCRYPT_ROUNDS. ``needs_rehash`` reports hashes made with
+  a different cost so login can upgrade them transparently.
+
+The sync ``hash``/``verify`` block the calling thread for the queue wait
+plus the hash; they are for the remaining sync callers (admin user
+creation, token password reset), which are rare.
+
+Usage:
+    hashed = await get_password_hasher().ahash(password)
+    ok = await get_password_hasher().averify(password, hashed)
+"""
+
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+import bcrypt
+
+from backend.app.config import get_settings
+from backend.app.logging_config import get_logger
+
+logger = get_logger("services.password_hasher")
+settings = get_settings()
+
+# bcrypt only uses the first 72 bytes of a password
+_BCRYPT_MAX_BYTES = 72
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when the hashing pool and its wait queue are both full."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Password hashing queue full, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+def _hashpw(password: str, rounds: int) -> str:
+    return bcrypt.hashpw(password.encode("utf-8")[:_BCRYPT_MAX_BYTES], bcrypt.gensalt(rounds)).decode("utf-8")
+
+
+def _checkpw(password: str, hashed: str) -> bool:
+    try:
+        return bcrypt.checkpw(password.encode("utf-8")[:_BCRYPT_MAX_BYTES], hashed.encode("utf-8"))
+    except Exception as e:
+        logger.error("Password verification error: %s", e)
+        return False
+
+
+def hash_cost(hashed: str) -> Optional[int]:
+    """The cost factor of a ``$2b$12$...`` hash, or None if it isn't one."""
+    parts = hashed.split("$")
+    try:
+        return int(parts[2]) if len(parts) > 3 and parts[1].startswith("2") else None
+    except ValueError:
+        return None
+
+
+def _default_workers() -> int:
+    if settings.PASSWORD_HASH_WORKERS > 0:
+        return settings.PASSWORD_HASH_WORKERS
+    # Leave most cores to the rest of the API
+    return max(1, (os.cpu_count() or 2) // 2)
+
+
+class PasswordHasher:
+    """Bounded bcrypt pool with admission control and queueing metrics."""
+
+    def __init__(self, max_workers: int, max_queue: int, rounds: int = 12, retry_after: int = 1):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.rounds = rounds
+        self.retry_after = retry_after
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bcrypt")
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._rejected = 0
+        self._completed = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._work_total = 0.0
+
+    @property
+    def capacity(self) -> int:
+        return self.max_workers + self.max_queue
+
+    def _submit(self, fn: Callable[..., Any], *args) -> Future:
+        with self._lock:
+            if self._in_flight >= self.capacity:
+                self._rejected += 1
+                raise PasswordHasherBusy(self.retry_after)
+            self._in_flight += 1
+        submitted = time.perf_counter()
+
+        def task():
+            started = time.perf_counter()
+            try:
+                return fn(*args)
+            finally:
+                done = time.perf_counter()
+                with self._lock:
+                    self._in_flight -= 1
+                    self._completed += 1
+                    self._wait_total += started - submitted
+                    self._wait_max = max(self._wait_max, started - submitted)
+                    self._work_total += done - started
+
+        try:
+            return self._pool.submit(task)
+        except Exception:
+            with self._lock:
+                self._in_flight -= 1
+            raise
+
+    # ── Async API (the hot auth routes) ──
+
+    async def ahash(self, password: str) -> str:
+        return await asyncio.wrap_future(self._submit(_hashpw, password, self.rounds))
+
+    async def averify(self, password: str, hashed: str) -> bool:
+        return await asyncio.wrap_future(self._submit(_checkpw, password, hashed))
+
+    # ── Sync API (blocks the caller's thread) ──
+
+    def hash(self, password: str) -> str:
+        return self._submit(_hashpw, password, self.rounds).result()
+
+    def verify(self, password: str, hashed: str) -> bool:
+        return self._submit(_checkpw, password, hashed).result()
+
+    def needs_rehash(self, hashed: str) -> bool:
+        cost = hash_cost(hashed)
+        return cost is not None and cost != self.rounds
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            completed = self._completed
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "rounds": self.rounds,
+                "in_flight": self._in_flight,
+                "queued": max(0, self._in_flight - self.max_workers),
+                "completed": completed,
+                "rejected": self._rejected,
+                "avg_wait_ms": round(self._wait_total / completed * 1000, 1) if completed else 0.0,
+                "max_wait_ms": round(self._wait_max * 1000, 1),
+                "avg_hash_ms": round(self._work_total / completed * 1000, 1) if completed else 0.0,
+            }
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+_hasher: Optional[PasswordHasher] = None
+_hasher_lock = threading.Lock()
+
+
+def get_password_hasher() -> PasswordHasher:
+    """Return the process-wide password hasher, creating it on first use."""
+    global _hasher
+    if _hasher is None:
+        with _hasher_lock:
+            if _hasher is None:
+                _hasher = PasswordHasher(
+                    max_workers=_default_workers(),
+                    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+                    rounds=settings.BCRYPT_ROUNDS,
+                    retry_after=settings.PASSWORD_HASH_RETRY_AFTER_SECONDS,
+                )
+                logger.info(
+                    "Password hasher ready (workers=%d, queue=%d, rounds=%d)",
+                    _hasher.max_workers, _hasher.max_queue, _hasher.rounds,
+                )
+    return _hasher
+
+
+def shutdown_password_hasher() -> None:
+    """Stop the shared hasher (called from the app lifespan on shutdown)."""
+    global _hasher
+    with _hasher_lock:
+        if _hasher is not None:
+            _hasher.shutdown()
+            _hasher = None
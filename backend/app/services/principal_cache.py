@@ -0,0 +1,144 @@
+"""
+Principal Cache — verified access-token principals, per process.
+
+``get_current_principal`` verifies a token once against the database (the
+user exists and is not locked), reads the user's current plan tier, and
+caches the result under the token's ``(sub, iat)``. Until the entry expires it authenticates without opening a
+DB session. An entry lives for AUTH_PRINCIPAL_CACHE_TTL_SECONDS, and never
+past the token's own ``exp``.
+
+``invalidate_principals(user_id)`` drops every cached token of a user. It
+is called on account lockout, password change/reset, session revocation and
+plan changes.
+A per-user generation counter stops a verification that was already in
+flight from re-caching a principal after it has been invalidated.
+"""
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Hashable, Optional, Set, Tuple
+
+from backend.app.config import get_settings
+
+settings = get_settings()
+
+PrincipalKey = Tuple[int, Hashable]
+
+
+@dataclass(frozen=True)
+class Principal:
+    """The authenticated user as seen by claims-only routes."""
+    id: int
+    claims: Dict[str, Any] = field(default_factory=dict, compare=False)
+    # From the database, not the token: a plan change does not reissue tokens
+    plan_tier: Optional[str] = field(default=None, compare=False)
+
+
+class PrincipalCache:
+    """TTL cache of verified principals with per-user invalidation."""
+
+    def __init__(self, ttl: float, max_entries: int = 10_000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: Dict[PrincipalKey, Tuple[float, Principal]] = {}
+        self._by_user: Dict[int, Set[PrincipalKey]] = {}
+        self._generations: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+
+    def get(self, key: PrincipalKey) -> Optional[Principal]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.time():
+                self._hits += 1
+                return entry[1]
+            if entry is not None:
+                self._discard(key)
+            self._misses += 1
+            return None
+
+    def peek(self, key: PrincipalKey) -> Optional[Principal]:
+        """The cached principal for ``key``, if any, without counting a lookup."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry[1] if entry is not None and entry[0] > time.time() else None
+
+    def generation(self, user_id: int) -> int:
+        with self._lock:
+            return self._generations.get(user_id, 0)
+
+    def put(self, key: PrincipalKey, principal: Principal, token_exp: Optional[float], generation: int) -> None:
+        """Cache ``principal`` unless the user was invalidated since ``generation`` was read."""
+        if self.ttl <= 0:
+            return
+        expires = time.time() + self.ttl
+        if token_exp is not None:
+            expires = min(expires, float(token_exp))
+        with self._lock:
+            if self._generations.get(principal.id, 0) != generation:
+                return
+            if len(self._entries) >= self.max_entries:
+                self._evict_expired()
+                if len(self._entries) >= self.max_entries:
+                    self._discard(next(iter(self._entries)))
+            self._entries[key] = (expires, principal)
+            self._by_user.setdefault(principal.id, set()).add(key)
+
+    def invalidate_user(self, user_id: int) -> None:
+        with self._lock:
+            self._generations[user_id] = self._generations.get(user_id, 0) + 1
+            for key in self._by_user.pop(user_id, ()):
+                self._entries.pop(key, None)
+            self._invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_user.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "size": len(self._entries),
+                "ttl_seconds": self.ttl,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 3) if lookups else 0.0,
+                "invalidations": self._invalidations,
+            }
+
+    def _discard(self, key: PrincipalKey) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            keys = self._by_user.get(entry[1].id)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_user[entry[1].id]
+
+    def _evict_expired(self) -> None:
+        now = time.time()
+        for key in [k for k, (expires, _) in self._entries.items() if expires <= now]:
+            self._discard(key)
+
+
+_cache: Optional[PrincipalCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_principal_cache() -> PrincipalCache:
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = PrincipalCache(ttl=settings.AUTH_PRINCIPAL_CACHE_TTL_SECONDS)
+    return _cache
+
+
+def invalidate_principals(user_id: int) -> None:
+    """Force the next request with any of this user's tokens to re-verify against the DB."""
+    get_principal_cache().invalidate_user(user_id)
@@ -9,6 +9,8 @@ import logging
 from typing import Optional, Dict, Any, List, Tuple
 import re
 
+from backend.app.services.aho_corasick import KeywordMatcher
+
 logger = logging.getLogger(__name__)
 
 
@@ -148,6 +150,71 @@ CRISIS_HOTLINES = {
 }
 
 
+# ─────────────────────────────────────────────────────────────────────────
+# Compiled keyword matcher
+#
+# Every EMERGENCY_PATTERNS / RED_FLAGS keyword (plus the infant-fever rule
+# keywords) is compiled once into a single KeywordMatcher, so detection is
+# one scan of the message. Each keyword remembers which patterns list it
+# and at what position, so results come out in the same order, with the
+# same keyword_match, as the per-pattern loops they replace.
+# ─────────────────────────────────────────────────────────────────────────
+
+INFANT_FEVER_KEYWORDS = ("fever", "high temperature")
+
+_NON_WORD = re.compile(r'[^\w\s]')
+
+
+def _keyword_owners(patterns: Dict[str, Dict[str, Any]]) -> Dict[str, List[Tuple[int, int, str]]]:
+    """keyword -> [(pattern position, keyword position, pattern type)]"""
+    owners: Dict[str, List[Tuple[int, int, str]]] = {}
+    for type_pos, (pattern_type, pattern) in enumerate(patterns.items()):
+        for keyword_pos, keyword in enumerate(pattern["keywords"]):
+            owners.setdefault(keyword, []).append((type_pos, keyword_pos, pattern_type))
+    return owners
+
+
+_EMERGENCY_OWNERS = _keyword_owners(EMERGENCY_PATTERNS)
+_RED_FLAG_OWNERS = _keyword_owners(RED_FLAGS)
+_KEYWORD_MATCHER = KeywordMatcher(
+    list(_EMERGENCY_OWNERS) + list(_RED_FLAG_OWNERS) + list(INFANT_FEVER_KEYWORDS)
+)
+
+
+def match_safety_keywords(text_normalized: str) -> Tuple[List[Tuple[str, str]], List[Tuple[str, str]], bool]:
+    """
+    Scan normalised text once for every safety keyword.
+
+    Returns ``(emergencies, red_flags, mentions_fever)``:
+    - emergencies: ``(type, keyword)`` per matched EMERGENCY_PATTERNS type, in
+      dict order, with the first of its keywords (in list order) that matched
+    - red_flags: ``(type, keyword)`` for every matched RED_FLAGS keyword, in
+      dict and list order
+    - mentions_fever: whether an INFANT_FEVER_KEYWORDS keyword matched
+    """
+    matched = _KEYWORD_MATCHER.find(text_normalized)
+    if not matched:
+        return [], [], False
+
+    first_keyword: Dict[str, Tuple[int, int, str]] = {}
+    red_flags: List[Tuple[int, int, str, str]] = []
+    for keyword in matched:
+        for type_pos, keyword_pos, pattern_type in _EMERGENCY_OWNERS.get(keyword, ()):
+            best = first_keyword.get(pattern_type)
+            if best is None or keyword_pos < best[1]:
+                first_keyword[pattern_type] = (type_pos, keyword_pos, keyword)
+        for type_pos, keyword_pos, flag_type in _RED_FLAG_OWNERS.get(keyword, ()):
+            red_flags.append((type_pos, keyword_pos, flag_type, keyword))
+
+    emergencies = [
+        (pattern_type, keyword)
+        for pattern_type, (_, _, keyword) in sorted(first_keyword.items(), key=lambda item: item[1][:2])
+    ]
+    red_flags.sort()
+    mentions_fever = any(keyword in matched for keyword in INFANT_FEVER_KEYWORDS)
+    return emergencies, [(flag_type, keyword) for _, _, flag_type, keyword in red_flags], mentions_fever
+
+
 def detect_emergency(text: str, age: Optional[int] = None, gender: Optional[str] = None) -> Dict[str, Any]:
     """
     Detect emergency conditions from user input.
@@ -170,40 +237,38 @@ def detect_emergency(text: str, age: Optional[int] = None, gender: Optional[str]
     """
     
     text_lower = text.lower()
-    text_normalized = re.sub(r'[^\w\s]', '', text_lower)
+    text_normalized = _NON_WORD.sub('', text_lower)
     
     detected_emergencies = []
     detected_red_flags = []
     
-    # Check for emergency patterns
-    for emergency_type, pattern in EMERGENCY_PATTERNS.items():
-        for keyword in pattern["keywords"]:
-            if keyword in text_normalized:
-                logger.warning("EMERGENCY DETECTED: %s (keyword: %s)", emergency_type, keyword)
-                detected_emergencies.append({
-                    "type": emergency_type,
-                    "level": pattern["level"],
-                    "message": pattern["message"],
-                    "action": pattern["action"],
-                    "keyword_match": keyword,
-                })
-                break
+    emergency_matches, red_flag_matches, mentions_fever = match_safety_keywords(text_normalized)
+    
+    # Emergency patterns
+    for emergency_type, keyword in emergency_matches:
+        pattern = EMERGENCY_PATTERNS[emergency_type]
+        logger.warning("EMERGENCY DETECTED: %s (keyword: %s)", emergency_type, keyword)
+        detected_emergencies.append({
+            "type": emergency_type,
+            "level": pattern["level"],
+            "message": pattern["message"],
+            "action": pattern["action"],
+            "keyword_match": keyword,
+        })
     
-    # Check for red flags
-    for flag_type, pattern in RED_FLAGS.items():
-        for keyword in pattern["keywords"]:
-            if keyword in text_normalized:
-                logger.warning("RED FLAG: %s (keyword: %s)", flag_type, keyword)
-                detected_red_flags.append({
-                    "type": flag_type,
-                    "reason": pattern["reason"],
-                    "keyword_match": keyword,
-                })
+    # Red flags
+    for flag_type, keyword in red_flag_matches:
+        logger.warning("RED FLAG: %s (keyword: %s)", flag_type, keyword)
+        detected_red_flags.append({
+            "type": flag_type,
+            "reason": RED_FLAGS[flag_type]["reason"],
+            "keyword_match": keyword,
+        })
     
     # Age-specific checks
     if age is not None and age < 3:
         # Infant fever is always critical
-        if any(keyword in text_normalized for keyword in ["fever", "high temperature"]):
+        if mentions_fever:
             logger.warning("CRITICAL: Fever in infant < 3 months")
             detected_emergencies.append({
                 "type": "infant_fever",
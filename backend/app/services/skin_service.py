@@ -9,6 +9,7 @@ import io
 from PIL import Image
 from pathlib import Path
 from backend.app.logging_config import get_logger
+from backend.app.services.inference_batcher import classify
 
 logger = get_logger("services.skin_service")
 
@@ -81,18 +82,15 @@ def predict_skin(image_bytes: bytes) -> dict:
     """Run inference on a skin lesion image."""
     import torch
 
-    model = load_model()
-    device = get_device()
+    load_model()  # raise FileNotFoundError before the request is queued
     transform = get_transform()
 
     try:
         image = Image.open(io.BytesIO(image_bytes)).convert("RGB")
-        image_tensor = transform(image).unsqueeze(0).to(device)
+        image_tensor = transform(image)
 
-        with torch.no_grad():
-            outputs = model(image_tensor)
-            probabilities = torch.softmax(outputs, dim=1)
-            confidence, predicted_class = torch.max(probabilities, 1)
+        probabilities = classify("skin", load_model, image_tensor)
+        confidence, predicted_class = torch.max(probabilities, 0)
 
         confidence_value = float(confidence.item())
         prediction = CLASSES[predicted_class.item()]
@@ -0,0 +1,165 @@
+"""
+Stage Pipeline — runs a small DAG of blocking stages on a thread pool.
+
+Each stage names the stages it depends on and receives their results as
+keyword arguments. A stage is submitted as soon as its dependencies have
+finished, so independent stages run concurrently.
+
+A stage that raises, or overruns its latency budget, is replaced by its
+``fallback`` (a value, or a callable taking the same keyword arguments)
+and the pipeline carries on. Python threads cannot be interrupted, so an
+abandoned stage keeps its worker until it returns; its result is dropped.
+
+Usage:
+    trace = PipelineTrace()
+    results = run_pipeline([
+        Stage("cdss", rank),
+        Stage("triage", predict, budget=8.0, fallback=predict_local),
+        Stage("xai", explain, deps=("cdss", "triage")),
+    ], get_pipeline_pool(), trace)
+    trace.as_dict()   # per-stage status/timings, total and critical path
+"""
+
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from backend.app.config import get_settings
+from backend.app.logging_config import get_logger
+
+logger = get_logger("services.stage_pipeline")
+settings = get_settings()
+
+
+@dataclass(frozen=True)
+class Stage:
+    name: str
+    fn: Callable[..., Any]
+    deps: Tuple[str, ...] = ()
+    budget: Optional[float] = None  # seconds from submission; None = wait indefinitely
+    fallback: Any = None            # value, or callable(**dep_results) used on error/timeout
+
+
+class PipelineTrace:
+    """Where the time went: one entry per stage, offsets relative to creation."""
+
+    def __init__(self):
+        self._origin = time.perf_counter()
+        self._stages: Dict[str, Dict[str, Any]] = {}
+        self._deps: Dict[str, Tuple[str, ...]] = {}
+
+    def record(self, name: str, status: str, start: float, end: float, deps: Sequence[str] = ()) -> None:
+        self._stages[name] = {
+            "status": status,
+            "start_ms": round((start - self._origin) * 1000, 1),
+            "end_ms": round((end - self._origin) * 1000, 1),
+            "duration_ms": round((end - start) * 1000, 1),
+        }
+        self._deps[name] = tuple(deps)
+
+    def critical_path(self) -> List[str]:
+        """Walk back from the last stage to finish through its latest-finishing dependency."""
+        if not self._stages:
+            return []
+        path = [max(self._stages, key=lambda n: self._stages[n]["end_ms"])]
+        while True:
+            deps = [d for d in self._deps.get(path[-1], ()) if d in self._stages]
+            if not deps:
+                return path[::-1]
+            path.append(max(deps, key=lambda n: self._stages[n]["end_ms"]))
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "total_ms": round((time.perf_counter() - self._origin) * 1000, 1),
+            "stages": dict(self._stages),
+            "critical_path": self.critical_path(),
+        }
+
+
+def _timed(fn: Callable[..., Any], kwargs: Dict[str, Any]) -> Tuple[Any, float, float]:
+    start = time.perf_counter()
+    value = fn(**kwargs)
+    return value, start, time.perf_counter()
+
+
+def _fallback(stage: Stage, kwargs: Dict[str, Any]) -> Any:
+    return stage.fallback(**kwargs) if callable(stage.fallback) else stage.fallback
+
+
+def run_pipeline(
+    stages: Sequence[Stage],
+    pool: ThreadPoolExecutor,
+    trace: Optional[PipelineTrace] = None,
+) -> Dict[str, Any]:
+    """Run ``stages`` respecting their dependencies; returns ``{stage name: result}``."""
+    trace = trace if trace is not None else PipelineTrace()
+    names = {stage.name for stage in stages}
+    for stage in stages:
+        missing = set(stage.deps) - names
+        if missing:
+            raise ValueError(f"Stage {stage.name!r} depends on unknown stages {sorted(missing)}")
+
+    results: Dict[str, Any] = {}
+    pending = list(stages)
+    running: Dict[Future, Tuple[Stage, float, Dict[str, Any]]] = {}
+
+    while pending or running:
+        for stage in [s for s in pending if all(d in results for d in s.deps)]:
+            pending.remove(stage)
+            kwargs = {d: results[d] for d in stage.deps}
+            running[pool.submit(_timed, stage.fn, kwargs)] = (stage, time.perf_counter(), kwargs)
+        if not running:
+            raise ValueError(f"Stage dependency cycle: {sorted(s.name for s in pending)}")
+
+        deadlines = [start + stage.budget for stage, start, _ in running.values() if stage.budget is not None]
+        timeout = max(0.0, min(deadlines) - time.perf_counter()) if deadlines else None
+        done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+
+        for future in done:
+            stage, submitted, kwargs = running.pop(future)
+            try:
+                results[stage.name], start, end = future.result()
+                trace.record(stage.name, "ok", start, end, stage.deps)
+            except Exception as e:
+                logger.warning("Pipeline stage %s failed, using fallback: %s", stage.name, e)
+                results[stage.name] = _fallback(stage, kwargs)
+                trace.record(stage.name, "error", submitted, time.perf_counter(), stage.deps)
+
+        now = time.perf_counter()
+        for future, (stage, submitted, kwargs) in list(running.items()):
+            if stage.budget is not None and now - submitted >= stage.budget:
+                del running[future]
+                future.cancel()  # only helps if it never left the queue
+                logger.warning("Pipeline stage %s exceeded its %.1fs budget, using fallback", stage.name, stage.budget)
+                results[stage.name] = _fallback(stage, kwargs)
+                trace.record(stage.name, "timeout", submitted, time.perf_counter(), stage.deps)
+
+    return results
+
+
+# ── Shared pool ───────────────────────────────────────────────────────
+
+_pool: Optional[ThreadPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def get_pipeline_pool() -> ThreadPoolExecutor:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ThreadPoolExecutor(
+                    max_workers=settings.CHIKITSAK_PIPELINE_WORKERS, thread_name_prefix="pipeline-stage"
+                )
+    return _pool
+
+
+def shutdown_pipeline_pool() -> None:
+    """Stop the stage pool (called from the app lifespan on shutdown)."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
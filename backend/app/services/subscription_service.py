@@ -160,6 +160,20 @@ for plan_key, plan in PLAN_CONFIG.items():
             FEATURE_PLAN_MAP[feature] = plan_key
 
 
+# Feature → daily limit key (features sharing a key share one counter)
+FEATURE_LIMIT_KEYS: Dict[str, str] = {
+    "basic_symptom_checker": "symptom_checks_per_day",
+    "advanced_symptom_checker": "symptom_checks_per_day",
+    "clinical_diagnosis": "symptom_checks_per_day",
+    "basic_chat": "chat_messages_per_day",
+    "advanced_chat": "chat_messages_per_day",
+    "image_analysis": "image_analyses_per_day",
+    "lab_reports": "lab_reports_per_day",
+    "knowledge_search": "knowledge_searches_per_day",
+    "knowledge_explain": "knowledge_searches_per_day",
+}
+
+
 def get_plans() -> List[Dict[str, Any]]:
     """Get all available plans for display."""
     return [
@@ -227,20 +241,7 @@ def check_rate_limit(user_plan: str, feature: str, current_usage: int) -> Dict[s
     plan = PLAN_CONFIG.get(user_plan, PLAN_CONFIG["free"])
     limits = plan.get("limits", {})
 
-    # Map feature to limit key
-    limit_key_map = {
-        "basic_symptom_checker": "symptom_checks_per_day",
-        "advanced_symptom_checker": "symptom_checks_per_day",
-        "clinical_diagnosis": "symptom_checks_per_day",
-        "basic_chat": "chat_messages_per_day",
-        "advanced_chat": "chat_messages_per_day",
-        "image_analysis": "image_analyses_per_day",
-        "lab_reports": "lab_reports_per_day",
-        "knowledge_search": "knowledge_searches_per_day",
-        "knowledge_explain": "knowledge_searches_per_day",
-    }
-
-    limit_key = limit_key_map.get(feature)
+    limit_key = FEATURE_LIMIT_KEYS.get(feature)
     if not limit_key:
         return {"allowed": True, "remaining": -1}
 
@@ -255,3 +256,20 @@ def check_rate_limit(user_plan: str, feature: str, current_usage: int) -> Dict[s
         "limit": max_usage,
         "upgrade_message": f"Daily limit reached ({max_usage}). Upgrade your plan for more." if remaining == 0 else None,
     }
+
+
+# ─────────────────────────────────────────────────────────────────────────
+# API Request Rate
+# ─────────────────────────────────────────────────────────────────────────
+
+# Multiples of RATE_LIMIT_REQUESTS_PER_MINUTE allowed per authenticated user
+PLAN_RATE_LIMIT_MULTIPLIER: Dict[str, int] = {
+    "free": 1,
+    "pro": 3,
+    "medical_plus": 5,
+}
+
+
+def api_requests_per_minute(user_plan: Optional[str], base: int) -> int:
+    """Per-user API request limit for a plan; unknown plans get the free rate."""
+    return base * PLAN_RATE_LIMIT_MULTIPLIER.get(user_plan or "free", 1)
@@ -0,0 +1,143 @@
+"""
+Single-pass symptom extraction for chat messages.
+
+Compiles the triage model's symptom columns plus synonym vocabularies
+(CDSS symptom keys, FOLLOW_UP_MAP categories and the Hindi terms in
+HINDI_TRANSLATIONS) into one word-level Aho–Corasick automaton, so a message
+is scanned once regardless of vocabulary size.
+
+Triage columns match exactly as the old per-column substring scan did: the
+message is normalised the same way and split on single spaces, so a column
+matches iff `` {column} `` occurred in `` {message} ``. By default only those
+columns are returned — the triage model's minimum-symptom check counts this
+list — and synonym matches are opt-in for callers that only rank with them.
+"""
+
+import re
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from backend.app.logging_config import get_logger
+from backend.app.services.aho_corasick import AhoCorasick
+
+logger = get_logger("services.symptom_extractor")
+
+_ASCII_JUNK = re.compile(r"[^a-z0-9_ ]+")
+# Devanagari letters and signs, excluding the danda punctuation marks
+_DEVANAGARI_WORD = re.compile(r"[ऀ-ॣ०-ॿ]+")
+
+
+def _ascii_tokens(text: str) -> List[str]:
+    return _ASCII_JUNK.sub(" ", text.lower()).strip().replace("_", " ").split(" ")
+
+
+def _synonym_vocabulary() -> List[str]:
+    """English symptom keys from the CDSS matrix and the follow-up question map."""
+    from backend.app.ml_models.triage_infer import FOLLOW_UP_MAP
+    from backend.app.services.cdss_engine import DISEASE_SYMPTOM_MATRIX
+
+    keys = list(FOLLOW_UP_MAP)
+    for weights in DISEASE_SYMPTOM_MATRIX.values():
+        keys.extend(weights)
+    return list(dict.fromkeys(keys))
+
+
+def _hindi_synonyms() -> Dict[str, str]:
+    """Hindi phrase -> English term, for every HINDI_TRANSLATIONS entry."""
+    from backend.app.services.translation_ai_service import HINDI_TRANSLATIONS
+    return {hindi: english for english, hindi in HINDI_TRANSLATIONS.items()}
+
+
+class SymptomExtractor:
+    """
+    Word-level automaton mapping symptom mentions to canonical symptom names.
+
+    ``extract`` returns the triage columns written out in the message, under
+    their column name and in column order (exactly what the old scan
+    returned, so ``[]`` when none match). With ``synonyms=True`` symptoms
+    found only through synonyms or Hindi terms follow, in order of mention.
+    """
+
+    def __init__(
+        self,
+        columns: Sequence[str],
+        synonyms: Sequence[str] = (),
+        hindi: Optional[Dict[str, str]] = None,
+    ):
+        self.columns = list(columns)
+        # canonical name -> sort rank (column index; synonyms rank after all columns)
+        self._rank: Dict[str, int] = {}
+        patterns: Dict[Tuple[str, ...], List[str]] = {}
+
+        for i, column in enumerate(self.columns):
+            self._rank.setdefault(column, i)
+            patterns.setdefault(tuple(column.lower().replace("_", " ").split(" ")), []).append(column)
+
+        # Synonyms never shadow a column spelled the same way
+        for key in synonyms:
+            tokens = tuple(key.lower().replace("_", " ").split(" "))
+            if tokens not in patterns:
+                patterns[tokens] = [key]
+
+        self._english = AhoCorasick(patterns.items())
+
+        hindi_patterns = []
+        for phrase, english in (hindi or {}).items():
+            tokens = tuple(_DEVANAGARI_WORD.findall(phrase))
+            # Only terms that are themselves symptoms (not diseases, UI phrases, ...)
+            target = patterns.get(tuple(_ascii_tokens(english)))
+            if tokens and target:
+                hindi_patterns.append((tokens, target))
+        self._hindi = AhoCorasick(hindi_patterns) if hindi_patterns else None
+
+    def extract(self, message: str, synonyms: bool = False) -> List[str]:
+        n_columns = len(self.columns)
+        columns: Dict[str, int] = {}       # column -> column index
+        others: Dict[str, int] = {}        # synonym match -> first mention
+        for start, _, names in self._english.find_all(_ascii_tokens(message)):
+            for name in names:
+                rank = self._rank.get(name, n_columns)
+                if rank < n_columns:
+                    columns[name] = rank
+                else:
+                    others.setdefault(name, start)
+        if not synonyms:
+            return sorted(columns, key=columns.get)
+        if self._hindi is not None:
+            words = _DEVANAGARI_WORD.findall(message)
+            if words:
+                offset = len(message) + 1  # after every English mention
+                for start, _, names in self._hindi.find_all(words):
+                    for name in names:
+                        if name not in columns:
+                            others.setdefault(name, offset + start)
+
+        return sorted(columns, key=columns.get) + sorted(others, key=others.get)
+
+
+_extractor: Optional[SymptomExtractor] = None
+_extractor_columns: Optional[list] = None
+
+
+def get_symptom_extractor() -> SymptomExtractor:
+    """
+    Extractor for the currently loaded triage columns.
+
+    Rebuilt only when triage_infer's column list changes (e.g. after the
+    model loads lazily); the automaton is otherwise shared across requests.
+    """
+    global _extractor, _extractor_columns
+    from backend.app.ml_models import triage_infer
+
+    columns = triage_infer._symptom_columns
+    if _extractor is None or columns is not _extractor_columns:
+        _extractor = SymptomExtractor(columns or [], _synonym_vocabulary(), _hindi_synonyms())
+        _extractor_columns = columns
+        logger.info(
+            "Compiled symptom extractor: %d columns, %d states",
+            len(columns or []), len(_extractor._english),
+        )
+    return _extractor
+
+
+def extract_symptoms(message: str, synonyms: bool = False) -> List[str]:
+    return get_symptom_extractor().extract(message, synonyms)
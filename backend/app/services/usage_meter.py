@@ -0,0 +1,368 @@
+"""
+Usage Meter — per-user daily feature counters with write-behind persistence.
+
+Plan limits (``PLAN_CONFIG[...]["limits"]``) are counted per user, per
+limit key and per UTC day. Requests are answered from memory: a user's
+counts for the day are loaded once per worker, then each metered request
+only increments an in-memory counter.
+
+A background thread flushes the buffered increments every
+USAGE_FLUSH_INTERVAL_SECONDS (or as soon as USAGE_FLUSH_MAX_PENDING have
+built up) as one batch of ``count = count + n`` upserts, and reads back
+the totals. Each flush therefore also picks up increments that other
+workers have flushed for the same users. On a crash at most one flush
+interval of increments is lost; a clean shutdown flushes everything.
+
+Usage:
+    meter_feature(user.id, user.plan_tier, "basic_chat")   # raises 403/429 when enforced
+    get_usage_meter().usage(user.id)                       # {"chat_messages_per_day": 4, ...}
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import Table, select
+
+from backend.app.config import get_settings
+from backend.app.logging_config import get_logger
+from backend.app.services.subscription_service import (
+    FEATURE_LIMIT_KEYS,
+    check_feature_access,
+    check_rate_limit,
+)
+
+logger = get_logger("services.usage_meter")
+settings = get_settings()
+
+# (user_id, limit_key, UTC day)
+UsageKey = Tuple[int, str, date]
+
+
+def _utc_today() -> date:
+    return datetime.now(timezone.utc).date()
+
+
+@dataclass
+class _Counter:
+    base: int = 0       # Persisted total as of the last load / flush
+    inflight: int = 0   # Being written by the current flush
+    pending: int = 0    # Not yet handed to a flush
+
+    @property
+    def total(self) -> int:
+        return self.base + self.inflight + self.pending
+
+
+class SQLUsageStore:
+    """
+    Reads and upserts rows of the ``feature_usage`` table.
+
+    Loads go through ``read_engine`` (default: ``engine``) so that, under
+    the SQLite production profile, they never wait for the single writer
+    connection; ``add`` always writes through ``engine``.
+    """
+
+    def __init__(self, engine, table: Table, read_engine=None):
+        self.engine = engine
+        self.read_engine = read_engine if read_engine is not None else engine
+        self.table = table
+        if engine.dialect.name == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+        self._insert = insert
+
+    def load(self, user_id: int, day: date) -> Dict[str, int]:
+        t = self.table
+        with self.read_engine.connect() as conn:
+            rows = conn.execute(
+                select(t.c.limit_key, t.c.count).where(t.c.user_id == user_id, t.c.day == day)
+            ).all()
+        return {limit_key: count for limit_key, count in rows}
+
+    def add(self, increments: Dict[UsageKey, int]) -> Dict[UsageKey, int]:
+        """Add ``increments`` in one transaction; returns the resulting totals."""
+        t = self.table
+        now = datetime.now(timezone.utc)
+        stmt = self._insert(t)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[t.c.user_id, t.c.limit_key, t.c.day],
+            set_={"count": t.c.count + stmt.excluded.count, "updated_at": now},
+        )
+        rows = [
+            {"user_id": user_id, "limit_key": limit_key, "day": day, "count": n, "updated_at": now}
+            for (user_id, limit_key, day), n in increments.items()
+        ]
+        users = {key[0] for key in increments}
+        days = {key[2] for key in increments}
+        with self.engine.begin() as conn:
+            conn.execute(stmt, rows)
+            totals = conn.execute(
+                select(t.c.user_id, t.c.limit_key, t.c.day, t.c.count)
+                .where(t.c.user_id.in_(users), t.c.day.in_(days))
+            ).all()
+        return {(user_id, limit_key, day): count for user_id, limit_key, day, count in totals}
+
+
+class UsageMeter:
+    """In-memory daily usage counters, persisted write-behind through a store."""
+
+    def __init__(
+        self,
+        store: SQLUsageStore,
+        flush_interval: float = 5.0,
+        max_pending: int = 1000,
+        today: Callable[[], date] = _utc_today,
+    ):
+        self.store = store
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._today = today
+        self._counters: Dict[UsageKey, _Counter] = {}
+        self._loaded: Set[Tuple[int, date]] = set()
+        self._pending_total = 0
+        self._lock = threading.Lock()
+        # Serialises flushes and loads, so a load never overwrites a newer flushed total
+        self._io_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._loads = 0
+        self._load_errors = 0
+        self._flushes = 0
+        self._flush_errors = 0
+        self._rows_flushed = 0
+        self._flush_total = 0.0
+
+    # ── Reads ──
+
+    def _ensure_loaded(self, user_id: int, day: date) -> None:
+        if (user_id, day) in self._loaded:
+            return
+        with self._io_lock:
+            if (user_id, day) in self._loaded:
+                return
+            try:
+                persisted = self.store.load(user_id, day)
+            except Exception as e:
+                # Count from zero for now; the next request retries the load
+                self._load_errors += 1
+                logger.warning("Usage load failed for user %d: %s", user_id, e)
+                return
+            with self._lock:
+                for limit_key, count in persisted.items():
+                    self._counters.setdefault((user_id, limit_key, day), _Counter()).base = count
+                self._loaded.add((user_id, day))
+                self._loads += 1
+
+    def usage(self, user_id: int) -> Dict[str, int]:
+        """Today's count per limit key for a user."""
+        day = self._today()
+        self._ensure_loaded(user_id, day)
+        with self._lock:
+            return {
+                key[1]: counter.total
+                for key, counter in self._counters.items()
+                if key[0] == user_id and key[2] == day
+            }
+
+    def check(self, user_id: int, plan: Optional[str], feature: str) -> Dict[str, Any]:
+        """``check_feature_access`` merged with ``check_rate_limit`` on today's count, without counting."""
+        return self._evaluate(user_id, plan, feature, consume=False, enforce=True)
+
+    def consume(
+        self, user_id: int, plan: Optional[str], feature: str, enforce: bool = True, uses: int = 1
+    ) -> Dict[str, Any]:
+        """
+        Like :meth:`check`, and count ``uses`` uses if allowed (always, when
+        not enforcing). Several uses are allowed only if all of them fit in
+        what is left of today's limit.
+        """
+        return self._evaluate(user_id, plan, feature, consume=True, enforce=enforce, uses=uses)
+
+    def _evaluate(
+        self, user_id: int, plan: Optional[str], feature: str, consume: bool, enforce: bool, uses: int = 1
+    ) -> Dict[str, Any]:
+        plan = plan or "free"
+        access = check_feature_access(plan, feature)
+        limit_key = FEATURE_LIMIT_KEYS.get(feature)
+        if limit_key is None:
+            return {**access, "remaining": -1}
+        if not access["allowed"] and enforce:
+            return access
+
+        day = self._today()
+        self._ensure_loaded(user_id, day)
+        wake = False
+        with self._lock:
+            counter = self._counters.setdefault((user_id, limit_key, day), _Counter())
+            result = {**access, **check_rate_limit(plan, feature, counter.total)}
+            if 0 <= result["remaining"] < uses and result["allowed"]:
+                result["allowed"] = False
+                result["upgrade_message"] = (
+                    f"Only {result['remaining']} of today's {result['limit']} uses left; this request needs {uses}."
+                )
+            result["allowed"] = access["allowed"] and result["allowed"]
+            if consume and (result["allowed"] or not enforce):
+                counter.pending += uses
+                self._pending_total += uses
+                wake = self._pending_total >= self.max_pending
+                if result["remaining"] > 0:
+                    result["remaining"] = max(0, result["remaining"] - uses)
+        if wake:
+            self._wake.set()
+        return result
+
+    # ── Write-behind ──
+
+    def flush(self) -> int:
+        """Persist buffered increments; returns the number of rows written."""
+        with self._io_lock:
+            with self._lock:
+                batch = {key: c.pending for key, c in self._counters.items() if c.pending}
+                for key in batch:
+                    counter = self._counters[key]
+                    counter.inflight, counter.pending = counter.pending, 0
+                self._pending_total = 0
+            if not batch:
+                self._prune()
+                return 0
+
+            started = time.perf_counter()
+            try:
+                totals = self.store.add(batch)
+            except Exception as e:
+                with self._lock:
+                    for key, n in batch.items():
+                        counter = self._counters[key]
+                        counter.pending += counter.inflight
+                        counter.inflight = 0
+                        self._pending_total += n
+                    self._flush_errors += 1
+                logger.warning("Usage flush of %d rows failed, keeping them buffered: %s", len(batch), e)
+                return 0
+
+            with self._lock:
+                for key, n in batch.items():
+                    counter = self._counters[key]
+                    counter.inflight = 0
+                    counter.base = totals.get(key, counter.base + n)
+                # Other workers' flushed counts for keys we hold
+                for key, total in totals.items():
+                    counter = self._counters.get(key)
+                    if counter is not None and key not in batch:
+                        counter.base = total
+                self._flushes += 1
+                self._rows_flushed += len(batch)
+                self._flush_total += time.perf_counter() - started
+            self._prune()
+            return len(batch)
+
+    def _prune(self) -> None:
+        """Forget previous days once nothing is left to write for them."""
+        today = self._today()
+        with self._lock:
+            for key in [k for k, c in self._counters.items() if k[2] < today and not c.pending and not c.inflight]:
+                del self._counters[key]
+            self._loaded = {entry for entry in self._loaded if entry[1] >= today}
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error("Usage flusher error: %s", e)
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="usage-flusher", daemon=True)
+            self._thread.start()
+
+    def shutdown(self) -> None:
+        """Stop the flusher and write out everything still buffered."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.flush_interval + 5)
+            self._thread = None
+        self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            flushes = self._flushes
+            return {
+                "counters": len(self._counters),
+                "users_loaded": len(self._loaded),
+                "pending": self._pending_total,
+                "flush_interval_seconds": self.flush_interval,
+                "flushes": flushes,
+                "rows_flushed": self._rows_flushed,
+                "flush_errors": self._flush_errors,
+                "avg_flush_ms": round(self._flush_total / flushes * 1000, 2) if flushes else 0.0,
+                "loads": self._loads,
+                "load_errors": self._load_errors,
+            }
+
+
+_meter: Optional[UsageMeter] = None
+_meter_lock = threading.Lock()
+
+
+def get_usage_meter() -> UsageMeter:
+    """Return the process-wide usage meter, starting its flusher on first use."""
+    global _meter
+    if _meter is None:
+        with _meter_lock:
+            if _meter is None:
+                from backend.app.database import engine, read_engine
+                from backend.app.models.feature_usage import FeatureUsage
+                meter = UsageMeter(
+                    SQLUsageStore(engine, FeatureUsage.__table__, read_engine=read_engine),
+                    flush_interval=settings.USAGE_FLUSH_INTERVAL_SECONDS,
+                    max_pending=settings.USAGE_FLUSH_MAX_PENDING,
+                )
+                meter.start()
+                _meter = meter
+    return _meter
+
+
+def shutdown_usage_meter() -> None:
+    """Flush and stop the shared meter (called from the app lifespan on shutdown)."""
+    global _meter
+    with _meter_lock:
+        if _meter is not None:
+            _meter.shutdown()
+            _meter = None
+
+
+def _seconds_until_utc_midnight() -> int:
+    now = datetime.now(timezone.utc)
+    midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time(), tzinfo=timezone.utc)
+    return max(1, int((midnight - now).total_seconds()))
+
+
+def meter_feature(user_id: int, plan: Optional[str], feature: str, uses: int = 1) -> Optional[Dict[str, Any]]:
+    """
+    Count ``uses`` uses of ``feature`` for the user. With USAGE_LIMITS_ENFORCED,
+    raises 403 for features outside the plan and 429 once the daily limit
+    is reached (or would be passed by ``uses``).
+    """
+    if not settings.USAGE_METERING_ENABLED:
+        return None
+    enforce = settings.USAGE_LIMITS_ENFORCED
+    result = get_usage_meter().consume(user_id, plan, feature, enforce=enforce, uses=uses)
+    if enforce and not result["allowed"]:
+        if result.get("required_plan"):
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=result["upgrade_message"])
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=result.get("upgrade_message") or "Daily limit reached",
+            headers={"Retry-After": str(_seconds_until_utc_midnight())},
+        )
+    return result
@@ -0,0 +1,142 @@
+"""
+User Profile Cache — the clinical profile used by chat and analysis.
+
+``get_current_user`` loads the User with its ``medical_profile`` in one
+query, and the instance stays in the request's Session identity map, so
+``load_user(db, user_id)`` later in the same request costs no SQL.
+
+On top of that, the flattened profile dict (demographics, conditions,
+medical profile) is cached per process for PROFILE_CACHE_TTL_SECONDS.
+That covers callers that run outside the request's session, such as the
+chat stream. Profile writes call ``invalidate_user_profile``. Other
+workers see the change once their entry expires.
+
+Usage:
+    profile = load_user_profile(db, user_id)
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from backend.app.config import get_settings
+from backend.app.logging_config import get_logger
+
+logger = get_logger("services.user_profile_cache")
+settings = get_settings()
+
+
+class UserProfileCache:
+    """Thread-safe TTL cache of profile dicts keyed by user id, bounded LRU."""
+
+    def __init__(self, ttl: float, max_entries: int = 4096):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[int, tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+
+    def get(self, user_id: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    del self._entries[user_id]
+                self._misses += 1
+                return None
+            self._entries.move_to_end(user_id)
+            self._hits += 1
+            return dict(entry[1])
+
+    def set(self, user_id: int, profile: Dict[str, Any]) -> None:
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + self.ttl, dict(profile))
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: int) -> None:
+        with self._lock:
+            self._entries.pop(user_id, None)
+            self._invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "size": len(self._entries),
+                "ttl_seconds": self.ttl,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 3) if lookups else 0.0,
+                "invalidations": self._invalidations,
+            }
+
+
+_cache: Optional[UserProfileCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_profile_cache() -> UserProfileCache:
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = UserProfileCache(ttl=settings.PROFILE_CACHE_TTL_SECONDS)
+    return _cache
+
+
+def load_user(db: Session, user_id: int):
+    """The User row, from the Session identity map when this request already loaded it."""
+    from backend.app.models.user import User
+    return db.get(User, user_id)
+
+
+def _build_profile(user) -> Dict[str, Any]:
+    profile: Dict[str, Any] = {
+        "age": user.age,
+        "gender": user.gender,
+        "existing_conditions": user.existing_conditions or [],
+    }
+    # Merge with medical profile if exists
+    if user.medical_profile:
+        mp = user.medical_profile
+        profile.update({
+            "height_cm": mp.height_cm,
+            "weight_kg": mp.weight_kg,
+            "activity_level": mp.activity_level,
+            "chronic_conditions": mp.chronic_conditions or [],
+            "family_history": mp.family_history or [],
+        })
+    return profile
+
+
+def load_user_profile(db: Session, user_id: int) -> Dict[str, Any]:
+    """Demographics, conditions and medical profile for personalised clinical analysis."""
+    cache = get_profile_cache()
+    profile = cache.get(user_id)
+    if profile is not None:
+        return profile
+
+    user = load_user(db, user_id)
+    if user is None:
+        return {}
+    profile = _build_profile(user)
+    cache.set(user_id, profile)
+    return profile
+
+
+def invalidate_user_profile(user_id: int) -> None:
+    """Drop the cached profile; call after writing the User or MedicalProfile."""
+    get_profile_cache().invalidate(user_id)
@@ -0,0 +1,156 @@
+"""
+Benchmark: symptom frequency and nutrition summary for a heavy user.
+
+Seeds a SQLite file with ``--rows`` symptom logs and ``--rows`` nutrition
+logs for each of ``--users`` users, then times for one user
+
+  orm — the previous implementation: load every log as an ORM object and
+        aggregate in Python
+  sql — analytics_queries: json_each + GROUP BY / COUNT + SUM in SQLite
+
+and reports the median latency of each and the rows materialised.
+
+Run from the repository root:
+    python backend/benchmarks/bench_analytics.py --rows 100000
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from sqlalchemy import JSON, Column, DateTime, Float, Integer, String, create_engine, insert  # noqa: E402
+from sqlalchemy.orm import Session, declarative_base  # noqa: E402
+
+from backend.app.services.analytics_queries import nutrition_totals, symptom_frequency  # noqa: E402
+
+# Same columns as models.symptom_log / models.nutrition_log, without the users FK
+Base = declarative_base()
+
+
+class SymptomLog(Base):
+    __tablename__ = "symptom_logs"
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, nullable=False, index=True)
+    symptoms = Column(JSON, nullable=False)
+    predicted_disease = Column(String(255))
+    timestamp = Column(DateTime)
+
+
+class NutritionLog(Base):
+    __tablename__ = "nutrition_logs"
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, nullable=False, index=True)
+    food_name = Column(String(255))
+    calories = Column(Float)
+    protein = Column(Float)
+    carbs = Column(Float)
+    fats = Column(Float)
+    timestamp = Column(DateTime)
+
+
+SYMPTOMS = [
+    "fever", "cough", "headache", "sore throat", "fatigue", "nausea", "chest pain", "dizziness",
+    "back pain", "joint pain", "shortness of breath", "rash", "vomiting", "diarrhea", "insomnia",
+]
+
+
+def _seed(path: str, users: int, rows: int):
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    rng = random.Random(0)
+    now = datetime.now(timezone.utc)
+    for user_id in range(1, users + 1):
+        symptoms = [
+            {"user_id": user_id, "symptoms": rng.sample(SYMPTOMS, rng.randint(1, 4)),
+             "predicted_disease": "Common Cold", "timestamp": now - timedelta(minutes=i)}
+            for i in range(rows)
+        ]
+        nutrition = [
+            {"user_id": user_id, "food_name": "meal", "calories": rng.uniform(50, 900),
+             "protein": rng.uniform(0, 40), "carbs": rng.uniform(0, 100), "fats": rng.uniform(0, 30),
+             "timestamp": now - timedelta(minutes=5 * i)}
+            for i in range(rows)
+        ]
+        with engine.begin() as conn:
+            conn.execute(insert(SymptomLog.__table__), symptoms)
+            conn.execute(insert(NutritionLog.__table__), nutrition)
+    return engine
+
+
+def _orm_symptoms(db: Session, user_id: int):
+    logs = db.query(SymptomLog).filter(SymptomLog.user_id == user_id).all()
+    counter = Counter()
+    for log in logs:
+        for symptom in log.symptoms:
+            counter[symptom.strip().lower()] += 1
+    return [{"symptom": s, "count": c} for s, c in counter.most_common()], len(logs)
+
+
+def _orm_nutrition(db: Session, user_id: int, cutoff: datetime):
+    logs = db.query(NutritionLog).filter(NutritionLog.user_id == user_id, NutritionLog.timestamp >= cutoff).all()
+    return {
+        "entries": len(logs),
+        "calories": sum(log.calories or 0 for log in logs),
+        "protein": sum(log.protein or 0 for log in logs),
+        "carbs": sum(log.carbs or 0 for log in logs),
+        "fats": sum(log.fats or 0 for log in logs),
+    }, len(logs)
+
+
+def _median_ms(engine, fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        with Session(engine) as db:
+            start = time.perf_counter()
+            fn(db)
+            samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=2)
+    parser.add_argument("--rows", type=int, default=100_000, help="symptom and nutrition logs per user")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    engine = _seed(str(Path(tempfile.mkdtemp()) / "analytics.db"), args.users, args.rows)
+    print(f"Analytics — {args.users} users x {args.rows:,} symptom + {args.rows:,} nutrition logs "
+          f"(seeded in {time.perf_counter() - start:.1f}s)")
+    print("-" * 72)
+
+    user_id = 1
+    cutoff = datetime.now(timezone.utc) - timedelta(days=30)
+    with Session(engine) as db:
+        orm_freq, symptom_rows = _orm_symptoms(db, user_id)
+        sql_freq = symptom_frequency(db, user_id)
+        assert sorted(map(tuple, (d.values() for d in orm_freq))) == sorted(map(tuple, (d.values() for d in sql_freq)))
+        orm_totals, nutrition_rows = _orm_nutrition(db, user_id, cutoff)
+        sql_totals = nutrition_totals(db, user_id, cutoff)
+        assert orm_totals["entries"] == sql_totals["entries"]
+        assert abs(orm_totals["calories"] - sql_totals["calories"]) < 1e-6 * max(1.0, orm_totals["calories"])
+
+    cases = [
+        ("symptom frequency", symptom_rows, len(sql_freq),
+         lambda db: _orm_symptoms(db, user_id), lambda db: symptom_frequency(db, user_id)),
+        ("nutrition 30d", nutrition_rows, 1,
+         lambda db: _orm_nutrition(db, user_id, cutoff), lambda db: nutrition_totals(db, user_id, cutoff)),
+    ]
+    for name, orm_rows, sql_rows, orm_fn, sql_fn in cases:
+        orm_ms = _median_ms(engine, orm_fn, args.repeat)
+        sql_ms = _median_ms(engine, sql_fn, args.repeat)
+        print(f"{name:18s} orm {orm_ms:8.1f} ms ({orm_rows:,} rows)   sql {sql_ms:7.1f} ms "
+              f"({sql_rows} rows)   {orm_ms / sql_ms:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Benchmark: authenticated requests/sec, ORM user vs cached principal.
+
+A small FastAPI app on a throwaway SQLite database serves one compute-only
+route behind each auth dependency:
+
+  orm            — get_current_user: JWT decode + User query (with the
+                   joined medical_profile) on a request-scoped session
+  claims-nocache — get_current_principal with the principal cache off:
+                   JWT decode + a two-column lookup on a short-lived session
+  claims         — get_current_principal with the cache on: JWT decode only
+
+driven in-process through httpx's ASGI transport.
+
+Run from the repository root:
+    python backend/benchmarks/bench_auth_principal.py --requests 3000
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+# Must be set before backend.app.config is imported
+os.environ["DATABASE_URL"] = f"sqlite:///{Path(tempfile.mkdtemp()) / 'bench_auth.db'}"
+
+import httpx  # noqa: E402
+from fastapi import Depends, FastAPI  # noqa: E402
+
+from backend.app.database import Base, SessionLocal, engine  # noqa: E402
+from backend.app.models.user import User  # noqa: E402
+from backend.app.services.auth_service import (  # noqa: E402
+    create_access_token,
+    get_current_principal,
+    get_current_user,
+)
+from backend.app.services.principal_cache import get_principal_cache  # noqa: E402
+
+
+def _seed_user() -> int:
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        user = User(name="Bench User", email="bench@example.com", password_hash="x", age=42)
+        db.add(user)
+        db.commit()
+        return user.id
+    finally:
+        db.close()
+
+
+def _app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/orm")
+    def orm(user=Depends(get_current_user)):
+        return {"id": user.id}
+
+    @app.get("/claims")
+    def claims(principal=Depends(get_current_principal)):
+        return {"id": principal.id}
+
+    return app
+
+
+async def _rps(app: FastAPI, path: str, token: str, n: int, concurrency: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    headers = {"Authorization": f"Bearer {token}"}
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", headers=headers) as client:
+        assert (await client.get(path)).status_code == 200
+
+        async def worker(count: int):
+            for _ in range(count):
+                r = await client.get(path)
+                assert r.status_code == 200
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(n // concurrency) for _ in range(concurrency)))
+        return (n // concurrency * concurrency) / (time.perf_counter() - start)
+
+
+async def main_async(args):
+    token = create_access_token(_seed_user())
+    app = _app()
+    cache = get_principal_cache()
+    ttl = cache.ttl
+
+    print(f"Authenticated requests — {args.requests} requests, concurrency {args.concurrency}")
+    print("-" * 64)
+    results = {"orm": await _rps(app, "/orm", token, args.requests, args.concurrency)}
+    cache.ttl = 0
+    cache.clear()
+    results["claims-nocache"] = await _rps(app, "/claims", token, args.requests, args.concurrency)
+    cache.ttl = ttl
+    results["claims"] = await _rps(app, "/claims", token, args.requests, args.concurrency)
+
+    base = results["orm"]
+    for variant, rps in results.items():
+        print(f"{variant:>15}: {rps:7.0f} req/s ({rps / base:.2f}x)")
+    print(f"principal cache: {cache.stats()}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=3000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
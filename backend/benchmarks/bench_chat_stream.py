@@ -0,0 +1,193 @@
+"""
+Benchmark: time-to-first-byte vs total latency, blocking /chat vs SSE /chat/stream.
+
+A local stub OpenRouter server answers chat completions after a fixed
+"thinking" delay and then produces tokens at a fixed rate, either all at
+once (blocking JSON) or as an SSE stream. Two endpoints run the same
+pipeline (detect_emergency, symptom extraction, CDSS differential, LLM
+answer) on a real uvicorn server:
+
+  blocking — one JSON response after the full completion (the /chat shape)
+  stream   — chat_stream.stream_chat over Server-Sent Events
+
+and the client records TTFB, the first answer token, and total time.
+Chat history is not persisted (the database models are not needed).
+
+Run from the repository root:
+    python backend/benchmarks/bench_chat_stream.py --requests 20 --tokens 120 --token-ms 10
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+STUB_PORT = _free_port()
+APP_PORT = _free_port()
+# Must be set before backend.app.config is imported
+os.environ["OPENROUTER_API_KEY"] = "sk-or-v1-bench"
+os.environ["OPENROUTER_BASE_URL"] = f"http://127.0.0.1:{STUB_PORT}/api/v1"
+
+import aiohttp  # noqa: E402
+import uvicorn  # noqa: E402
+from aiohttp import web  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+from fastapi.responses import StreamingResponse  # noqa: E402
+from pydantic import BaseModel  # noqa: E402
+
+from backend.app.responses import json_dumps, sse_event  # noqa: E402
+from backend.app.services.chat_stream import _clinical_stage, _llm_prompt, stream_chat  # noqa: E402
+from backend.app.services.openrouter_service import call_openrouter_async  # noqa: E402
+from backend.app.services.safety_system import detect_emergency  # noqa: E402
+
+MESSAGE = "I have had a headache, runny nose, sneezing, sore throat and a cough since yesterday"
+
+
+def _stub_app(first_token_ms: float, tokens: int, token_ms: float) -> web.Application:
+    words = [f"word{i} " for i in range(tokens)]
+
+    async def completions(request):
+        payload = await request.json()
+        await asyncio.sleep(first_token_ms / 1000)
+        if not payload.get("stream"):
+            await asyncio.sleep(tokens * token_ms / 1000)
+            return web.json_response({
+                "model": "stub/model",
+                "choices": [{"message": {"content": "".join(words)}}],
+                "usage": {},
+            })
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        await response.write(b": OPENROUTER PROCESSING\n\n")
+        # Paced against absolute deadlines so sleep overshoot doesn't accumulate
+        start = time.perf_counter()
+        for i, word in enumerate(words):
+            chunk = {"choices": [{"delta": {"content": word}}]}
+            await response.write(b"data: " + json_dumps(chunk) + b"\n\n")
+            await asyncio.sleep(max(0.0, start + (i + 1) * token_ms / 1000 - time.perf_counter()))
+        await response.write(b"data: [DONE]\n\n")
+        return response
+
+    app = web.Application()
+    app.router.add_post("/api/v1/chat/completions", completions)
+    return app
+
+
+class BenchChat(BaseModel):
+    message: str
+
+
+def _bench_app() -> FastAPI:
+    from starlette.concurrency import run_in_threadpool
+
+    app = FastAPI()
+
+    @app.post("/chat")
+    async def chat(payload: BenchChat):
+        detect_emergency(payload.message)
+        clinical = await run_in_threadpool(_clinical_stage, payload.message, {})
+        llm = await call_openrouter_async(_llm_prompt(payload.message, clinical), max_tokens=600)
+        return {"response": llm["response"], "differential": clinical["differential"][:5]}
+
+    @app.post("/chat/stream")
+    async def chat_stream(payload: BenchChat):
+        async def events():
+            async for event, data in stream_chat(None, payload.message, profile={}, persist=False):
+                yield sse_event(event, data)
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    return app
+
+
+def _run_in_thread(coro_factory) -> None:
+    ready = threading.Event()
+
+    def run():
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        loop.run_until_complete(coro_factory())
+        ready.set()
+        loop.run_forever()
+
+    threading.Thread(target=run, daemon=True).start()
+    ready.wait(10)
+
+
+async def _measure(session: aiohttp.ClientSession, path: str) -> tuple[float, float, float, str]:
+    """(ttfb, first answer text, total) in seconds, and the answer text."""
+    start = time.perf_counter()
+    ttfb = first_text = None
+    body = b""
+    async with session.post(f"http://127.0.0.1:{APP_PORT}{path}", json={"message": MESSAGE}) as response:
+        async for chunk in response.content.iter_any():
+            now = time.perf_counter() - start
+            if ttfb is None:
+                ttfb = now
+            body += chunk
+            if first_text is None and (b"event: token" in body or path == "/chat"):
+                first_text = now
+    total = time.perf_counter() - start
+    return ttfb, first_text or total, total, body.decode()
+
+
+def _summary(samples: list) -> str:
+    ms = [s * 1000 for s in samples]
+    return f"p50 {statistics.median(ms):7.1f} ms  max {max(ms):7.1f} ms"
+
+
+async def main_async(args):
+    stub_runner = web.AppRunner(_stub_app(args.first_token_ms, args.tokens, args.token_ms))
+
+    async def start_stub():
+        await stub_runner.setup()
+        await web.TCPSite(stub_runner, "127.0.0.1", STUB_PORT).start()
+
+    _run_in_thread(start_stub)
+
+    server = uvicorn.Server(uvicorn.Config(_bench_app(), host="127.0.0.1", port=APP_PORT, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        await asyncio.sleep(0.05)
+
+    llm_ms = args.first_token_ms + args.tokens * args.token_ms
+    print(f"Chat streaming — {args.requests} requests, stub LLM: {args.first_token_ms:.0f} ms to first token, "
+          f"{args.tokens} tokens x {args.token_ms:.0f} ms (~{llm_ms:.0f} ms)")
+    print("-" * 72)
+    async with aiohttp.ClientSession() as session:
+        await _measure(session, "/chat")            # warm-up: CDSS compile, imports
+        await _measure(session, "/chat/stream")
+        for path in ("/chat", "/chat/stream"):
+            runs = [await _measure(session, path) for _ in range(args.requests)]
+            assert all("word0" in r[3] for r in runs), f"{path}: no LLM text in response"
+            print(f"{path:>13}  TTFB        {_summary([r[0] for r in runs])}")
+            print(f"{'':>13}  first text  {_summary([r[1] for r in runs])}")
+            print(f"{'':>13}  total       {_summary([r[2] for r in runs])}")
+    server.should_exit = True
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--first-token-ms", type=float, default=400)
+    parser.add_argument("--tokens", type=int, default=120)
+    parser.add_argument("--token-ms", type=float, default=10)
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
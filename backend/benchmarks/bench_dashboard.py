@@ -0,0 +1,156 @@
+"""
+Benchmark: dashboard summary queries against history size.
+
+Seeds a SQLite file with one user per ``--sizes`` entry, each with that many
+symptom, nutrition and chat rows over the past year (plus a lab report a
+month), and their daily rollups via ``daily_rollup.backfill``. Then times
+
+  raw     — the previous reads: recent symptoms, today's calories and meal
+            count, latest lab report, distinct chat sessions this week
+  rollups — recent symptoms plus ``daily_rollup.dashboard_totals``
+
+and reports the median of ``--repeat`` runs.
+
+Run from the repository root:
+    python backend/benchmarks/bench_dashboard.py --sizes 1000 10000 100000
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from sqlalchemy import (  # noqa: E402
+    JSON, Column, Date, DateTime, Float, Index, Integer, MetaData, String, Table, Text, UniqueConstraint,
+    create_engine, func, insert, select,
+)
+from sqlalchemy.orm import Session  # noqa: E402
+
+from backend.app.services import daily_rollup  # noqa: E402
+
+# Same columns and indexes as the app models, without the users FK
+metadata = MetaData()
+symptom_logs = Table(
+    "symptom_logs", metadata, Column("id", Integer, primary_key=True), Column("user_id", Integer, index=True),
+    Column("symptoms", JSON), Column("predicted_disease", String(255)), Column("triage_level", String(50)),
+    Column("timestamp", DateTime, index=True),
+    Index("ix_symptom_logs_user_id_timestamp", "user_id", "timestamp"),
+)
+nutrition_logs = Table(
+    "nutrition_logs", metadata, Column("id", Integer, primary_key=True), Column("user_id", Integer, index=True),
+    Column("food_name", String(255)), Column("calories", Float), Column("timestamp", DateTime, index=True),
+    Index("ix_nutrition_logs_user_id_timestamp", "user_id", "timestamp"),
+)
+lab_reports = Table(
+    "lab_reports", metadata, Column("id", Integer, primary_key=True), Column("user_id", Integer, index=True),
+    Column("report_name", String(255)), Column("analysis_result", JSON), Column("timestamp", DateTime, index=True),
+    Index("ix_lab_reports_user_id_timestamp", "user_id", "timestamp"),
+)
+chat_history = Table(
+    "chat_history", metadata, Column("id", Integer, primary_key=True), Column("user_id", Integer, index=True),
+    Column("role", String(20)), Column("content", Text), Column("session_id", String(64), index=True),
+    Column("created_at", DateTime, index=True),
+)
+daily_rollups = Table(
+    "daily_rollups", metadata, Column("id", Integer, primary_key=True), Column("user_id", Integer, index=True),
+    Column("day", Date), Column("calories", Float, server_default="0"),
+    *[Column(name, Integer, server_default="0") for name in daily_rollup.COUNTER_COLUMNS],
+    Column("lab_report_name", String(255)), Column("lab_summary", Text), Column("lab_at", DateTime),
+    Column("updated_at", DateTime),
+    UniqueConstraint("user_id", "day"),
+)
+TRIAGE = ["Emergency", "Urgent", "Routine", "Self-care"]
+
+
+def _seed(path: str, sizes, now: datetime):
+    engine = create_engine(f"sqlite:///{path}")
+    metadata.create_all(engine)
+    rng = random.Random(0)
+    year = 365 * 24 * 60
+    for user_id, size in enumerate(sizes, start=1):
+        def at():
+            return now - timedelta(minutes=rng.randint(0, year))
+        with engine.begin() as conn:
+            conn.execute(insert(symptom_logs), [
+                {"user_id": user_id, "symptoms": ["cough"], "predicted_disease": "Flu",
+                 "triage_level": rng.choice(TRIAGE), "timestamp": at()} for _ in range(size)])
+            conn.execute(insert(nutrition_logs), [
+                {"user_id": user_id, "food_name": "meal", "calories": rng.uniform(100, 900), "timestamp": at()}
+                for _ in range(size)])
+            conn.execute(insert(chat_history), [
+                {"user_id": user_id, "role": "user", "content": "hi", "session_id": f"{user_id}-{i // 6}",
+                 "created_at": at()} for i in range(size)])
+            conn.execute(insert(lab_reports), [
+                {"user_id": user_id, "report_name": "CBC", "analysis_result": {"summary": "All values normal"},
+                 "timestamp": now - timedelta(days=30 * m + 3)} for m in range(12)])
+    with Session(engine) as db:
+        daily_rollup.backfill(db)
+    return engine
+
+
+def _recent_symptoms(db: Session, user_id: int, week_ago: datetime):
+    t = symptom_logs
+    return db.execute(
+        select(t).where(t.c.user_id == user_id, t.c.timestamp >= week_ago).order_by(t.c.timestamp.desc()).limit(5)
+    ).all()
+
+
+def _raw(db: Session, user_id: int, now: datetime):
+    week_ago = now - timedelta(days=7)
+    today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    n, lab, chat = nutrition_logs, lab_reports, chat_history
+    return (
+        _recent_symptoms(db, user_id, week_ago),
+        db.execute(select(func.sum(n.c.calories)).where(n.c.user_id == user_id, n.c.timestamp >= today_start)).scalar(),
+        db.execute(select(func.count(n.c.id)).where(n.c.user_id == user_id, n.c.timestamp >= today_start)).scalar(),
+        db.execute(select(lab).where(lab.c.user_id == user_id).order_by(lab.c.timestamp.desc()).limit(1)).first(),
+        db.execute(select(func.count(func.distinct(chat.c.session_id)))
+                   .where(chat.c.user_id == user_id, chat.c.created_at >= week_ago)).scalar(),
+    )
+
+
+def _rollups(db: Session, user_id: int, now: datetime):
+    return _recent_symptoms(db, user_id, now - timedelta(days=7)), daily_rollup.dashboard_totals(db, user_id, now.date())
+
+
+def _median_ms(engine, fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        with Session(engine) as db:
+            start = time.perf_counter()
+            fn(db)
+            samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000],
+                        help="symptom, nutrition and chat rows per user")
+    parser.add_argument("--repeat", type=int, default=15)
+    args = parser.parse_args()
+
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    start = time.perf_counter()
+    engine = _seed(str(Path(tempfile.mkdtemp()) / "dashboard.db"), args.sizes, now)
+    print(f"Dashboard summary reads (seeded + backfilled in {time.perf_counter() - start:.1f}s)")
+    print("-" * 72)
+    for user_id, size in enumerate(args.sizes, start=1):
+        with Session(engine) as db:
+            _, calories, meals, _, _ = _raw(db, user_id, now)
+            totals = _rollups(db, user_id, now)[1]
+            assert meals == totals["meals_today"] and abs((calories or 0) - totals["calories_today"]) < 1e-6
+        raw_ms = _median_ms(engine, lambda db: _raw(db, user_id, now), args.repeat)
+        rollup_ms = _median_ms(engine, lambda db: _rollups(db, user_id, now), args.repeat)
+        print(f"{size:>8,} rows/table   raw {raw_ms:7.2f} ms (5 queries)   "
+              f"rollups {rollup_ms:5.2f} ms (2 queries)   {raw_ms / rollup_ms:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark: SQL statements per request for the authenticated chat and
+analysis endpoints.
+
+Boots the full app on a throwaway SQLite database with the statement
+counter enabled (db_metrics), registers a user, sends each request
+``--requests`` times through TestClient and prints the per-route counts
+from /health/db-queries.
+
+Pass ``--profile-cache-ttl 0`` to see the counts without the per-process
+profile cache (identity-map reuse within a request still applies).
+
+Run from the repository root:
+    python backend/benchmarks/bench_db_queries.py --requests 5
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+ENDPOINTS = [
+    ("POST", "/chat", {"message": "I have a headache, runny nose and a sore throat"}),
+    ("POST", "/chat", {"message": "I feel anxious and can't sleep", "mode": "mental"}),
+    ("GET", "/chat/history", None),
+    ("POST", "/full-health/analyze", {"symptoms": ["headache", "fever"], "medications": ["ibuprofen"]}),
+    ("GET", "/dashboard/summary", None),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=5)
+    parser.add_argument("--profile-cache-ttl", type=float, default=30.0)
+    args = parser.parse_args()
+
+    db_path = Path(tempfile.mkdtemp()) / "bench_db_queries.db"
+    # Must be set before backend.app.config is imported
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+    os.environ["DB_QUERY_COUNTER_ENABLED"] = "true"
+    os.environ["PROFILE_CACHE_TTL_SECONDS"] = str(args.profile_cache_ttl)
+    os.environ["RATE_LIMIT_ENABLED"] = "false"
+    os.environ.pop("OPENROUTER_API_KEY", None)
+
+    from fastapi.testclient import TestClient
+
+    from backend.app.db_metrics import reset_query_stats
+    from backend.app.main import app
+
+    with TestClient(app) as client:
+        token = client.post("/auth/register", json={
+            "name": "Bench User", "email": "bench@example.com", "password": "Bench#Pass123",
+        }).json()["data"]["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        reset_query_stats()
+        for method, path, body in ENDPOINTS:
+            for _ in range(args.requests):
+                response = client.request(method, path, json=body, headers=headers)
+                assert response.status_code < 500, f"{method} {path}: {response.status_code}"
+        stats = client.get("/health/db-queries").json()["data"]
+
+    print(f"SQL statements per request — {args.requests} requests each, "
+          f"profile cache TTL {args.profile_cache_ttl:g}s")
+    print("-" * 64)
+    for route, entry in stats["routes"].items():
+        if route.startswith("GET /health"):
+            continue
+        print(f"{route:<32} avg {entry['avg']:5.2f}   max {entry['max']:3d}   ({entry['requests']} requests)")
+    print(f"profile cache: {stats['profile_cache']}")
+
+
+if __name__ == "__main__":
+    main()
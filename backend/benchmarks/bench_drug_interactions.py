@@ -0,0 +1,134 @@
+"""
+Benchmark: drug interaction checks for elderly polypharmacy lists.
+
+Checks ``--lists`` medication lists of 5, 10 and 15 drugs drawn from
+medications commonly co-prescribed to older adults, against
+
+  scan  — the previous lookup: a boolean scan of the whole interactions
+          DataFrame, lower-casing both name columns, for every pair
+  index — the compiled frozenset pair index (a hash lookup per pair)
+
+and reports ms per list, plus index compile time and artifact load time.
+
+Uses ``--csv`` when given, else a synthetic file with ``--rows`` rows over
+real drug names (the shape of the DrugBank DDI export).
+
+Run from the repository root:
+    python backend/benchmarks/bench_drug_interactions.py --rows 190000
+"""
+
+import argparse
+import csv
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from backend.app.ml_models import drug_engine  # noqa: E402
+
+ELDERLY_MEDICATIONS = [
+    "Warfarin", "Apixaban", "Aspirin", "Clopidogrel", "Metoprolol", "Atenolol", "Lisinopril",
+    "Losartan", "Amlodipine", "Diltiazem", "Digoxin", "Amiodarone", "Furosemide",
+    "Hydrochlorothiazide", "Spironolactone", "Potassium Chloride", "Atorvastatin", "Simvastatin",
+    "Metformin", "Glipizide", "Insulin Glargine", "Levothyroxine", "Omeprazole", "Pantoprazole",
+    "Alendronate", "Calcium Carbonate", "Cholecalciferol", "Tamsulosin", "Finasteride",
+    "Donepezil", "Memantine", "Sertraline", "Citalopram", "Mirtazapine", "Trazodone", "Zolpidem",
+    "Gabapentin", "Tramadol", "Oxycodone", "Acetaminophen", "Ibuprofen", "Naproxen", "Prednisone",
+    "Allopurinol", "Colchicine", "Tiotropium", "Albuterol", "Fluticasone", "Quetiapine", "Oxybutynin",
+]
+SEVERITIES = ["Minor", "Moderate", "Major"]
+
+
+def _synthetic_csv(rows: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    names = ELDERLY_MEDICATIONS + [f"Compound-{i:04d}" for i in range(4000)]
+    path = str(Path(tempfile.mkdtemp()) / "db_drug_interactions.csv")
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["drug1", "drug2", "interaction", "severity"])
+        for n in range(rows):
+            d1, d2 = rng.sample(names, 2)
+            writer.writerow([d1, d2, f"{d1} may alter the effect of {d2} (#{n})", rng.choice(SEVERITIES)])
+    return path
+
+
+def scan_check_drug_interactions(drug_df, med_list):
+    """The previous lookup: a full DataFrame scan per pair, for comparison."""
+    interactions_found = []
+
+    for i in range(len(med_list)):
+        for j in range(i + 1, len(med_list)):
+            d1 = med_list[i].lower()
+            d2 = med_list[j].lower()
+
+            match = drug_df[
+                ((drug_df["drug1"].str.lower() == d1) & (drug_df["drug2"].str.lower() == d2)) |
+                ((drug_df["drug1"].str.lower() == d2) & (drug_df["drug2"].str.lower() == d1))
+            ]
+
+            if not match.empty:
+                row = match.iloc[0]
+                interactions_found.append({
+                    "drug_1": d1,
+                    "drug_2": d2,
+                    "interaction": row["interaction"],
+                    "severity": row.get("severity", "Unknown")
+                })
+
+    return drug_engine._interactions_result(interactions_found)
+
+
+def _time_lists(check, lists) -> float:
+    start = time.perf_counter()
+    for meds in lists:
+        check(meds)
+    return (time.perf_counter() - start) * 1000 / len(lists)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--csv", default=None)
+    parser.add_argument("--rows", type=int, default=190_000)
+    parser.add_argument("--lists", type=int, default=3, help="lists per size for the scan (index runs 200x more)")
+    args = parser.parse_args()
+
+    drug_engine.DRUG_PATH = args.csv or _synthetic_csv(args.rows)
+    drug_engine.DRUG_ARTIFACT_PATH = str(Path(tempfile.mkdtemp()) / "drug_interactions.pkl")
+
+    start = time.perf_counter()
+    drug_engine._load_index()
+    compile_s = time.perf_counter() - start
+    drug_engine._index = None
+    start = time.perf_counter()
+    index = drug_engine._load_index()
+    load_s = time.perf_counter() - start
+    drug_df = drug_engine._read_drug_df()
+
+    def scan(meds):
+        return scan_check_drug_interactions(drug_df, meds)
+
+    print(f"Drug interactions — {os.path.basename(drug_engine.DRUG_PATH)}, {len(index)} pairs")
+    print(f"index: compile {compile_s:.2f}s, load persisted {load_s * 1000:.0f} ms "
+          f"({os.path.getsize(drug_engine.DRUG_ARTIFACT_PATH) / 1e6:.1f} MB)")
+    print("-" * 72)
+    rng = random.Random(1)
+    for size in (5, 10, 15):
+        lists = [rng.sample(ELDERLY_MEDICATIONS, size) for _ in range(args.lists)]
+        for meds in lists:
+            assert drug_engine.check_drug_interactions(meds) == scan(meds)
+        scan_ms = _time_lists(scan, lists)
+        index_ms = statistics.median(
+            _time_lists(drug_engine.check_drug_interactions, lists * 200) for _ in range(3)
+        )
+        pairs = size * (size - 1) // 2
+        print(f"{size:2d} drugs ({pairs:3d} pairs): scan {scan_ms:9.1f} ms   index {index_ms * 1000:7.1f} µs   "
+              f"({scan_ms / index_ms:,.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
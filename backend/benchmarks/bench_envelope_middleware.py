@@ -0,0 +1,182 @@
+"""
+Benchmark: response envelope middleware, BaseHTTPMiddleware vs pure ASGI.
+
+Serves /dashboard/summary- and /chat/history-shaped responses from a small
+FastAPI app (the real routes need the database models) under
+
+  legacy    — the previous BaseHTTPMiddleware wrapper: buffer, json.loads,
+              rebuild, JSONResponse re-render
+  fallback  — the pure-ASGI ResponseWrapperMiddleware re-wrapping a plain
+              JSONResponse route
+  envelope  — the pure-ASGI middleware with the router opted into
+              EnvelopeResponse (rendered once, forwarded untouched)
+
+and reports requests/sec for each, driven in-process through httpx's ASGI
+transport, after checking all variants return the same JSON.
+
+Run from the repository root:
+    python backend/benchmarks/bench_envelope_middleware.py --requests 3000 --history 200
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import httpx  # noqa: E402
+from fastapi import APIRouter, FastAPI  # noqa: E402
+from pydantic import BaseModel  # noqa: E402
+from starlette.middleware.base import BaseHTTPMiddleware  # noqa: E402
+from starlette.responses import JSONResponse  # noqa: E402
+
+from backend.app.middleware import ResponseWrapperMiddleware  # noqa: E402
+from backend.app.responses import EnvelopeResponse, orjson  # noqa: E402
+
+
+class LegacyResponseWrapperMiddleware(BaseHTTPMiddleware):
+    """The previous ResponseWrapperMiddleware, for comparison."""
+
+    async def dispatch(self, request, call_next):
+        response = await call_next(request)
+        if "application/json" not in response.headers.get("content-type", ""):
+            return response
+        if request.url.path in ("/docs", "/redoc", "/openapi.json"):
+            return response
+        body_chunks = []
+        async for chunk in response.body_iterator:
+            body_chunks.append(chunk if isinstance(chunk, bytes) else chunk.encode())
+        raw_body = b"".join(body_chunks)
+        headers = {
+            k: v for k, v in response.headers.items()
+            if k.lower() not in ("content-length", "content-type")
+        }
+        try:
+            original = json.loads(raw_body)
+        except (json.JSONDecodeError, ValueError):
+            return response
+        if (
+            isinstance(original, dict)
+            and "status" in original
+            and ("message" in original or "data" in original or "response" in original)
+        ):
+            return JSONResponse(content=original, status_code=response.status_code, headers=headers)
+        is_success = 200 <= response.status_code < 400
+        wrapped = {
+            "status": "success" if is_success else "error",
+            "data": original if is_success else (original.get("data") if isinstance(original, dict) else None),
+            "message": "OK" if is_success else (original.get("detail", "An error occurred") if isinstance(original, dict) else str(original)),
+        }
+        if isinstance(original, dict) and "confidence" in original:
+            wrapped["confidence"] = original["confidence"]
+        return JSONResponse(content=wrapped, status_code=response.status_code, headers=headers)
+
+
+class ChatHistoryItem(BaseModel):
+    id: int
+    role: str
+    content: str
+    session_id: Optional[str] = None
+    timestamp: Optional[str] = None
+
+
+def _dashboard_payload() -> dict:
+    now = datetime.now(timezone.utc)
+    return {
+        "health_score": 78,
+        "health_trend": [{"name": (now - timedelta(days=i)).strftime("%a"), "score": 70 + i} for i in range(7)],
+        "recent_symptoms": [
+            {
+                "symptoms": ["headache", "fever", "fatigue"],
+                "predicted_disease": "Influenza",
+                "triage_level": "Moderate",
+                "timestamp": (now - timedelta(hours=i)).isoformat(),
+            }
+            for i in range(5)
+        ],
+        "nutrition_today": {"calories": 1450.5, "meals_logged": 3},
+        "lab_status": {"latest_report": "CBC", "summary": "All values normal", "date": now.isoformat()},
+        "chat_sessions_this_week": 4,
+        "user": {"name": "Asha", "city": "Pune"},
+    }
+
+
+def _history_payload(n: int) -> list[dict]:
+    now = datetime.now(timezone.utc)
+    return [
+        {
+            "id": i,
+            "role": "user" if i % 2 else "assistant",
+            "content": "I have had a headache and mild fever since yesterday evening. " * 3,
+            "session_id": "3f1c2a9e-session",
+            "timestamp": (now - timedelta(minutes=i)).isoformat(),
+        }
+        for i in range(n)
+    ]
+
+
+def _app(variant: str, dashboard: dict, items: list[dict]) -> FastAPI:
+    kwargs = {"default_response_class": EnvelopeResponse} if variant == "envelope" else {}
+    router = APIRouter(**kwargs)
+
+    @router.get("/dashboard/summary")
+    def summary():
+        return dashboard
+
+    @router.get("/chat/history", response_model=list[ChatHistoryItem])
+    def chat_history():
+        return items
+
+    app = FastAPI()
+    app.include_router(router)
+    app.add_middleware(LegacyResponseWrapperMiddleware if variant == "legacy" else ResponseWrapperMiddleware)
+    return app
+
+
+async def _rps(app: FastAPI, path: str, n: int, concurrency: int) -> tuple[float, dict]:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        body = (await client.get(path)).json()
+
+        async def worker(count: int):
+            for _ in range(count):
+                r = await client.get(path)
+                assert r.status_code == 200
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(n // concurrency) for _ in range(concurrency)))
+        return (n // concurrency * concurrency) / (time.perf_counter() - start), body
+
+
+async def main_async(args):
+    variants = ("legacy", "fallback", "envelope")
+    dashboard, items = _dashboard_payload(), _history_payload(args.history)
+    apps = {v: _app(v, dashboard, items) for v in variants}
+    print(f"Envelope middleware — {args.requests} requests/path, concurrency {args.concurrency}, "
+          f"JSON encoder: {'orjson' if orjson is not None else 'json'}")
+    print("-" * 72)
+    for path in ("/dashboard/summary", "/chat/history"):
+        results = {v: await _rps(apps[v], path, args.requests, args.concurrency) for v in variants}
+        bodies = [body for _, body in results.values()]
+        assert all(b == bodies[0] for b in bodies), f"{path}: variants returned different JSON"
+        base = results["legacy"][0]
+        line = "   ".join(f"{v} {rps:7.0f} req/s ({rps / base:.2f}x)" for v, (rps, _) in results.items())
+        print(f"{path:>19}: {line}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=3000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--history", type=int, default=50, help="chat history items per response")
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Benchmark: micro-batched vs per-request ResNet18 inference under concurrency.
+
+Uses a randomly initialised ResNet18 (no weights file needed) and N client
+threads each classifying a stream of images, mirroring concurrent uploads
+to /image/analyze.
+
+Run from the repository root:
+    python backend/benchmarks/bench_inference_batching.py --clients 16 --requests 8
+"""
+
+import argparse
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import torch  # noqa: E402
+from torchvision import models  # noqa: E402
+
+from backend.app.services.inference_batcher import MicroBatcher, _percentile  # noqa: E402
+
+
+def _make_model():
+    model = models.resnet18(weights=None)
+    model.fc = torch.nn.Linear(model.fc.in_features, 2)
+    model.eval()
+    return model
+
+
+def _run_clients(clients: int, per_client: int, fn) -> tuple[float, list[float]]:
+    latencies: list[float] = []
+    lock = threading.Lock()
+    image = torch.randn(3, 224, 224)
+
+    def worker():
+        local = []
+        for _ in range(per_client):
+            start = time.perf_counter()
+            fn(image)
+            local.append((time.perf_counter() - start) * 1000)
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=worker) for _ in range(clients)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return time.perf_counter() - start, sorted(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=8, help="requests per client")
+    parser.add_argument("--max-batch", type=int, default=16)
+    parser.add_argument("--window-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    model = _make_model()
+    total = args.clients * args.requests
+
+    def unbatched(tensor):
+        with torch.no_grad():
+            return torch.softmax(model(tensor.unsqueeze(0)), dim=1)[0]
+
+    batcher = MicroBatcher("bench", lambda: model, args.max_batch, args.window_ms)
+
+    # Warm up both paths so lazy init is not measured
+    unbatched(torch.randn(3, 224, 224))
+    batcher.infer(torch.randn(3, 224, 224))
+
+    print(f"ResNet18 CPU inference — {args.clients} clients x {args.requests} requests "
+          f"(torch threads={torch.get_num_threads()})")
+    print("-" * 72)
+    for label, fn in (("per-request", unbatched), ("micro-batched", batcher.infer)):
+        elapsed, latencies = _run_clients(args.clients, args.requests, fn)
+        print(f"{label:>14}: {total / elapsed:7.1f} img/s   "
+              f"p50={_percentile(latencies, 50):7.1f}ms   p99={_percentile(latencies, 99):7.1f}ms")
+
+    stats = batcher.stats()
+    print("-" * 72)
+    print(f"batch-size histogram: {stats['batch_size_histogram']}")
+    print(f"avg batch size: {stats['avg_batch_size']}  "
+          f"batcher p50={stats['latency_ms']['p50']}ms p99={stats['latency_ms']['p99']}ms")
+
+
+if __name__ == "__main__":
+    main()
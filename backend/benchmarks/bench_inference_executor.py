@@ -0,0 +1,132 @@
+"""
+Load benchmark: health-check latency while image inference is saturated.
+
+Starts a small uvicorn app exposing /health plus two inference routes that
+run a ~300 ms CPU forward pass — one inline on the event loop (the old
+behaviour of /image/analyze and /predict/*) and one through the bounded
+inference executor. While N clients hammer an inference route, a probe
+measures /health latency.
+
+Run from the repository root:
+    python backend/benchmarks/bench_inference_executor.py --clients 16 --seconds 5
+"""
+
+import argparse
+import asyncio
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import httpx  # noqa: E402
+import torch  # noqa: E402
+import uvicorn  # noqa: E402
+from fastapi import FastAPI, HTTPException  # noqa: E402
+
+from backend.app.services.inference_batcher import _percentile  # noqa: E402
+from backend.app.services.inference_executor import (  # noqa: E402
+    InferenceExecutor,
+    InferenceQueueFull,
+)
+
+FORWARD_MS = 300
+
+
+def _fake_forward(_contents: bytes) -> dict:
+    """Burn roughly FORWARD_MS of CPU in torch kernels, like a ResNet forward pass."""
+    a = torch.randn(256, 256)
+    deadline = time.perf_counter() + FORWARD_MS / 1000
+    while time.perf_counter() < deadline:
+        a = torch.tanh(a @ a)
+    return {"prediction": "NORMAL", "confidence": 0.9}
+
+
+def _build_app(executor: InferenceExecutor) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/health")
+    async def health():
+        return {"status": "healthy"}
+
+    @app.post("/infer/inline")
+    async def infer_inline():
+        return _fake_forward(b"")
+
+    @app.post("/infer/executor")
+    async def infer_executor():
+        try:
+            return await executor.run(_fake_forward, b"")
+        except InferenceQueueFull as e:
+            raise HTTPException(503, "busy", headers={"Retry-After": str(e.retry_after)})
+
+    return app
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def _scenario(base: str, route: str, clients: int, seconds: float) -> dict:
+    stop = time.perf_counter() + seconds
+    codes: dict[int, int] = {}
+    health_ms: list[float] = []
+
+    async with httpx.AsyncClient(base_url=base, timeout=60) as client:
+        async def load():
+            while time.perf_counter() < stop:
+                r = await client.post(route)
+                codes[r.status_code] = codes.get(r.status_code, 0) + 1
+                if r.status_code == 503:
+                    await asyncio.sleep(0.05)
+
+        async def probe():
+            while time.perf_counter() < stop:
+                start = time.perf_counter()
+                await client.get("/health")
+                health_ms.append((time.perf_counter() - start) * 1000)
+                await asyncio.sleep(0.05)
+
+        await asyncio.gather(probe(), *(load() for _ in range(clients)))
+
+    health_ms.sort()
+    return {"codes": codes, "health": health_ms}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--workers", type=int, default=max(2, torch.get_num_threads()))
+    parser.add_argument("--queue", type=int, default=8)
+    args = parser.parse_args()
+
+    executor = InferenceExecutor(args.workers, args.queue)
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config(_build_app(executor), port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    base = f"http://127.0.0.1:{port}"
+
+    idle = asyncio.run(_scenario(base, "/health", 0, 1.0))["health"]
+    print(f"{args.clients} inference clients, {FORWARD_MS} ms forward, "
+          f"executor workers={args.workers} queue={args.queue}")
+    print("-" * 78)
+    print(f"{'idle':>10}: /health p50={_percentile(idle, 50):8.1f}ms  p99={_percentile(idle, 99):8.1f}ms")
+    for label, route in (("inline", "/infer/inline"), ("executor", "/infer/executor")):
+        result = asyncio.run(_scenario(base, route, args.clients, args.seconds))
+        h = result["health"]
+        print(f"{label:>10}: /health p50={_percentile(h, 50):8.1f}ms  p99={_percentile(h, 99):8.1f}ms  "
+              f"probes={len(h):4d}  inference responses={result['codes']}")
+
+    server.should_exit = True
+    executor.shutdown()
+
+
+if __name__ == "__main__":
+    main()
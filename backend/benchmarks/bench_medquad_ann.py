@@ -0,0 +1,139 @@
+"""
+Benchmark: IVF (ANN) vs brute-force MedQuAD question retrieval.
+
+Reports queries/sec and recall@1 / recall@5 of the IVF index measured
+against the exact cosine top-k. Uses datasets/triage/medquad.csv when it
+exists, otherwise a synthetic MedQuAD-shaped corpus (question templates x
+condition names built from the RAG knowledge-base vocabulary).
+
+Run from the repository root:
+    python backend/benchmarks/bench_medquad_ann.py --queries 500 --nprobe 4 8 16
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from sklearn.feature_extraction.text import TfidfVectorizer  # noqa: E402
+
+from backend.app.ml_models.ann_index import IVFIndex, exact_search  # noqa: E402
+from backend.app.ml_models.medquad_engine import MEDQUAD_PATH  # noqa: E402
+
+TEMPLATES = [
+    "What is {c} ?",
+    "What are the symptoms of {c} ?",
+    "What causes {c} ?",
+    "How to diagnose {c} ?",
+    "What are the treatments for {c} ?",
+    "How to prevent {c} ?",
+    "Who is at risk for {c} ?",
+    "Is {c} inherited ?",
+    "What is the outlook for {c} ?",
+    "How many people are affected by {c} ?",
+    "What are the genetic changes related to {c} ?",
+    "What research is being done for {c} ?",
+]
+
+QUALIFIERS = [
+    "juvenile", "familial", "congenital", "chronic", "acute", "hereditary",
+    "autosomal", "recessive", "dominant", "adult", "infantile", "progressive",
+]
+
+
+def _synthetic_questions(n_docs: int, seed: int) -> list[str]:
+    from backend.app.services.medical_rag import KNOWLEDGE_BASE
+
+    rng = random.Random(seed)
+    words = sorted({
+        w for entry in KNOWLEDGE_BASE
+        for w in re.findall(r"[a-z]{4,}", entry["content"].lower())
+    })
+    # MedQuAD clusters: a base condition plus qualified variants
+    # ("juvenile ...", "... type 2"), each asked with the same templates.
+    n_conditions = max(1, n_docs // len(TEMPLATES))
+    conditions = []
+    while len(conditions) < n_conditions:
+        base = " ".join(rng.sample(words, rng.randint(1, 2)))
+        conditions.append(base)
+        for qualifier in rng.sample(QUALIFIERS, rng.randint(0, 3)):
+            conditions.append(f"{qualifier} {base}")
+    return [t.format(c=c) for c in conditions for t in TEMPLATES][:n_docs]
+
+
+def _queries(questions: list[str], n: int, seed: int) -> list[str]:
+    """Perturb real questions (drop a word, swap template) to mimic chat phrasing."""
+    rng = random.Random(seed + 1)
+    queries = []
+    for q in rng.sample(questions, min(n, len(questions))):
+        tokens = q.rstrip(" ?").split()
+        if len(tokens) > 3:
+            tokens.pop(rng.randrange(len(tokens)))
+        queries.append("tell me " + " ".join(tokens))
+    return queries
+
+
+def _recall(approx_scores, exact_scores, k: int) -> float:
+    """
+    Score-based recall@k: an approximate hit counts if it scores at least the
+    exact k-th best, so documents tied with the true top-k are not penalised.
+    """
+    total = 0.0
+    for a, e in zip(approx_scores, exact_scores):
+        e = e[:k]
+        if len(e) == 0:
+            total += 1.0
+            continue
+        total += min(len(e), int((a[:k] >= e[-1] - 1e-9).sum())) / len(e)
+    return total / len(exact_scores)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--docs", type=int, default=16000, help="synthetic corpus size")
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[4, 8, 16])
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    if os.path.exists(MEDQUAD_PATH):
+        import pandas as pd
+        questions = pd.read_csv(MEDQUAD_PATH)["question"].astype(str).tolist()
+        source = "medquad.csv"
+    else:
+        questions = _synthetic_questions(args.docs, args.seed)
+        source = "synthetic"
+
+    vectorizer = TfidfVectorizer(stop_words="english")
+    matrix = vectorizer.fit_transform(questions)
+    query_vecs = [vectorizer.transform([q]) for q in _queries(questions, args.queries, args.seed)]
+
+    start = time.perf_counter()
+    index = IVFIndex.build(matrix).attach_postings(matrix)
+    build_s = time.perf_counter() - start
+
+    print(f"MedQuAD retrieval — {source}: {matrix.shape[0]} questions, vocab {matrix.shape[1]}, "
+          f"{len(query_vecs)} queries")
+    print(f"IVF build: {build_s:.2f}s, {index.n_lists} lists, {index.n_components} LSA dims")
+    print("-" * 72)
+
+    start = time.perf_counter()
+    exact = [exact_search(q, matrix, 5)[1] for q in query_vecs]
+    exact_qps = len(query_vecs) / (time.perf_counter() - start)
+    print(f"{'brute-force':>16}: {exact_qps:8.0f} QPS   recall@1=1.000  recall@5=1.000")
+
+    for n_probe in args.nprobe:
+        start = time.perf_counter()
+        approx = [index.search(q, matrix, 5, n_probe=n_probe)[1] for q in query_vecs]
+        qps = len(query_vecs) / (time.perf_counter() - start)
+        print(f"{f'ivf nprobe={n_probe}':>16}: {qps:8.0f} QPS   "
+              f"recall@1={_recall(approx, exact, 1):.3f}  recall@5={_recall(approx, exact, 5):.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+Benchmark: latency of non-auth endpoints during a login burst.
+
+A uvicorn server runs a sync ``/auth/login``-shaped route that verifies a
+bcrypt hash, next to a sync ``/ping`` route (the shape of most of the API).
+``--logins`` clients hammer the login route while one client measures
+``/ping`` latency, under
+
+  inline — bcrypt.checkpw directly in the route (the previous behaviour):
+           every login holds a threadpool slot and a core for the whole hash
+  pool   — verification on the bounded PasswordHasher pool; logins beyond
+           workers + queue get 429 immediately
+
+and reports /ping p50/p99 plus login throughput and rejections.
+
+Run from the repository root:
+    python backend/benchmarks/bench_password_hasher.py --logins 64 --seconds 5
+"""
+
+import argparse
+import asyncio
+import socket
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import aiohttp  # noqa: E402
+import bcrypt  # noqa: E402
+import uvicorn  # noqa: E402
+from fastapi import FastAPI, HTTPException  # noqa: E402
+from pydantic import BaseModel  # noqa: E402
+
+from backend.app.services.password_hasher import PasswordHasher, PasswordHasherBusy, _checkpw  # noqa: E402
+
+PASSWORD = "Bench#Pass123"
+
+
+class Login(BaseModel):
+    password: str
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _app(variant: str, hashed: str, hasher: PasswordHasher) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/auth/login")
+    def login(payload: Login):
+        if variant == "inline":
+            ok = _checkpw(payload.password, hashed)
+        else:
+            try:
+                ok = hasher.verify(payload.password, hashed)
+            except PasswordHasherBusy as e:
+                raise HTTPException(429, headers={"Retry-After": str(e.retry_after)})
+        if not ok:
+            raise HTTPException(401)
+        return {"access_token": "t"}
+
+    @app.get("/ping")
+    def ping():
+        return {"status": "ok", "items": list(range(20))}
+
+    return app
+
+
+async def _run(variant: str, args, hashed: str) -> dict:
+    hasher = PasswordHasher(max_workers=args.workers, max_queue=args.queue, rounds=args.rounds)
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config(
+        _app(variant, hashed, hasher), host="127.0.0.1", port=port, log_level="warning"
+    ))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        await asyncio.sleep(0.05)
+
+    base = f"http://127.0.0.1:{port}"
+    started = time.perf_counter()
+    stop = started + args.seconds
+    counts = {"ok": 0, "rejected": 0}
+    latencies = []
+
+    async def login_client(session):
+        while time.perf_counter() < stop:
+            async with session.post(f"{base}/auth/login", json={"password": PASSWORD}) as r:
+                await r.read()
+                if r.status == 200:
+                    counts["ok"] += 1
+                elif r.status == 429:
+                    counts["rejected"] += 1
+                    await asyncio.sleep(float(r.headers.get("Retry-After", 1)) / 10)
+
+    async def ping_client(session):
+        await asyncio.sleep(0.5)  # let the burst build up
+        while time.perf_counter() < stop:
+            start = time.perf_counter()
+            async with session.get(f"{base}/ping") as r:
+                await r.read()
+            latencies.append((time.perf_counter() - start) * 1000)
+            await asyncio.sleep(0.01)
+
+    connector = aiohttp.TCPConnector(limit=0)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        await asyncio.gather(ping_client(session), *(login_client(session) for _ in range(args.logins)))
+    elapsed = time.perf_counter() - started  # in-flight requests can run past --seconds
+
+    server.should_exit = True
+    hasher.shutdown()
+    latencies.sort()
+    return {
+        "p50": statistics.median(latencies),
+        "p99": latencies[max(0, int(len(latencies) * 0.99) - 1)],
+        "samples": len(latencies),
+        "elapsed": elapsed,
+        "logins_per_s": counts["ok"] / elapsed,
+        "rejected": counts["rejected"],
+    }
+
+
+async def main_async(args):
+    hashed = bcrypt.hashpw(PASSWORD.encode(), bcrypt.gensalt(args.rounds)).decode()
+    print(f"Login burst — {args.logins} login clients for {args.seconds:.0f}s, bcrypt cost {args.rounds}, "
+          f"pool {args.workers} workers + {args.queue} queued")
+    print("-" * 78)
+    for variant in ("inline", "pool"):
+        r = await _run(variant, args, hashed)
+        print(f"{variant:>7}: /ping p50 {r['p50']:8.1f} ms  p99 {r['p99']:8.1f} ms  ({r['samples']} pings)   "
+              f"logins {r['logins_per_s']:5.1f}/s  429s {r['rejected']}  [{r['elapsed']:.1f}s]")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--logins", type=int, default=64)
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--rounds", type=int, default=12)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--queue", type=int, default=8)
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
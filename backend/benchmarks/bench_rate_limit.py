@@ -0,0 +1,116 @@
+"""
+Benchmark: rate limiter throughput and memory with many clients.
+
+``--threads`` threads each check ``--checks`` requests spread over
+``--clients`` distinct client keys, against
+
+  list    — the previous limiter: a list of timestamps per client, rebuilt
+            on every check under one global lock, never evicted
+  sharded — ShardedMemoryStore: fixed three-field state per client, one
+            lock per shard
+  sqlite  — SQLiteRateLimitStore: the shared cross-worker store
+
+and reports checks/sec, plus the memory the in-process state retains once
+every client has made ``--limit`` requests (the sqlite state lives on disk).
+
+Run from the repository root:
+    python backend/benchmarks/bench_rate_limit.py --clients 2000 --checks 50000
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from collections import defaultdict
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from backend.app.rate_limit import (  # noqa: E402
+    RateLimiter,
+    ShardedMemoryStore,
+    SQLiteRateLimitStore,
+)
+
+
+class _ListLimiter:
+    """The timestamp-list limiter this module replaced."""
+
+    def __init__(self, requests_per_minute: int):
+        self.requests_per_minute = requests_per_minute
+        self.requests = defaultdict(list)
+        self._lock = threading.Lock()
+
+    def is_allowed(self, client_id: str):
+        with self._lock:
+            now = time.time()
+            cutoff = now - 60
+            self.requests[client_id] = [ts for ts in self.requests[client_id] if ts > cutoff]
+            if len(self.requests[client_id]) < self.requests_per_minute:
+                self.requests[client_id].append(now)
+                return True, None
+            return False, int(60 - (now - self.requests[client_id][0])) + 1
+
+
+def _run(limiter, args) -> dict:
+    keys = [f"ip:{i}" for i in range(args.clients)]
+
+    def worker(seed: int, checks: int):
+        rng = random.Random(seed)
+        for _ in range(checks):
+            limiter.is_allowed(rng.choice(keys))
+
+    threads = [threading.Thread(target=worker, args=(i, args.checks)) for i in range(args.threads)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return {"rate": args.threads * args.checks / (time.perf_counter() - start)}
+
+
+def _retained_mb(limiter, args) -> float:
+    """Memory held by the limiter after every client has sent ``--limit`` requests."""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    for i in range(args.clients):
+        for _ in range(args.limit):
+            limiter.is_allowed(f"ip:{i}")
+    retained = sum(s.size_diff for s in tracemalloc.take_snapshot().compare_to(before, "filename"))
+    tracemalloc.stop()
+    return retained / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, default=2_000)
+    parser.add_argument("--checks", type=int, default=50_000)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--limit", type=int, default=60)
+    parser.add_argument("--shards", type=int, default=16)
+    args = parser.parse_args()
+
+    variants = {
+        "list": lambda: _ListLimiter(args.limit),
+        "sharded": lambda: RateLimiter(args.limit, store=ShardedMemoryStore(shards=args.shards)),
+        "sqlite": lambda: RateLimiter(
+            args.limit, store=SQLiteRateLimitStore(str(Path(tempfile.mkdtemp()) / "bench_rate_limit.db"))
+        ),
+    }
+    print(f"Rate limiter — {args.threads} threads x {args.checks} checks over {args.clients} clients, "
+          f"limit {args.limit}/min")
+    print("-" * 72)
+    for name, factory in variants.items():
+        limiter = factory()
+        r = _run(limiter, args)
+        mb = _retained_mb(factory(), args) if name != "sqlite" else 0.0
+        print(f"{name:>8}: {r['rate']:9.0f} checks/s   retained {mb:7.2f} MB")
+        if name == "sqlite":
+            print(f"          store: {limiter.store.stats()}")
+
+
+if __name__ == "__main__":
+    main()
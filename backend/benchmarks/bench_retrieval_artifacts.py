@@ -0,0 +1,133 @@
+"""
+Benchmark: per-worker startup time and memory, refit vs memory-mapped artifacts.
+
+Spawns N concurrent worker processes that each prepare MedQuAD-style
+retrieval state, either
+
+  refit — TfidfVectorizer.fit_transform + IVF build in every worker (the
+          behaviour without persisted artifacts), or
+  mmap  — load_tfidf_artifacts + IVFIndex.load with np.load(mmap_mode="r").
+
+While all workers are alive the parent reads RSS and PSS (proportional set
+size, which splits shared pages between processes) from /proc, so page-cache
+sharing of the mapped arrays shows up as lower PSS.
+
+Run from the repository root (Linux only):
+    python backend/benchmarks/bench_retrieval_artifacts.py --workers 4 --docs 50000
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+
+def _corpus(docs: int) -> list[str]:
+    from bench_medquad_ann import _synthetic_questions
+    return _synthetic_questions(docs, seed=7)
+
+
+def _worker(mode: str, artifact_dir: str, docs: int) -> None:
+    from backend.app.ml_models.ann_index import IVFIndex, corpus_fingerprint
+    from backend.app.ml_models.medquad_engine import _make_vectorizer
+    from backend.app.ml_models.tfidf_artifacts import load_tfidf_artifacts
+
+    questions = _corpus(docs)
+    start = time.perf_counter()
+    fingerprint = corpus_fingerprint(questions)
+    if mode == "refit":
+        vectorizer = _make_vectorizer()
+        matrix = vectorizer.fit_transform(questions)
+        index = IVFIndex.build(matrix, fingerprint=fingerprint).attach_postings(matrix)
+    else:
+        artifacts = load_tfidf_artifacts(artifact_dir, fingerprint)
+        vectorizer, matrix = artifacts.vectorizer, artifacts.matrix
+        index = IVFIndex.load(artifact_dir, fingerprint).attach_postings(artifacts.postings)
+    # Serve a few queries so mapped pages are actually touched
+    for q in questions[:: max(1, len(questions) // 50)]:
+        index.search(vectorizer.transform([q]), matrix, 5)
+    startup = time.perf_counter() - start
+
+    print(json.dumps({"startup_s": startup}), flush=True)
+    sys.stdin.readline()  # stay alive until the parent has measured memory
+
+
+def _memory_kb(pid: int) -> dict:
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            key, _, rest = line.partition(":")
+            if key in ("Rss", "Pss"):
+                values[key.lower()] = int(rest.split()[0])
+    return values
+
+
+def _run(mode: str, workers: int, artifact_dir: str, docs: int) -> list[dict]:
+    procs = [
+        subprocess.Popen(
+            [sys.executable, __file__, "--worker", mode, "--artifact-dir", artifact_dir, "--docs", str(docs)],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True,
+        )
+        for _ in range(workers)
+    ]
+    results = []
+    for p in procs:
+        result = json.loads(p.stdout.readline())
+        results.append(result)
+    for p, result in zip(procs, results):
+        result.update(_memory_kb(p.pid))
+    for p in procs:
+        p.communicate("\n")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--docs", type=int, default=50000)
+    parser.add_argument("--worker", choices=("refit", "mmap"))
+    parser.add_argument("--artifact-dir")
+    args = parser.parse_args()
+
+    if args.worker:
+        _worker(args.worker, args.artifact_dir, args.docs)
+        return
+
+    from backend.app.ml_models.ann_index import IVFIndex, corpus_fingerprint
+    from backend.app.ml_models.medquad_engine import _make_vectorizer
+    from backend.app.ml_models.tfidf_artifacts import save_tfidf_artifacts
+
+    with tempfile.TemporaryDirectory() as tmp:
+        artifact_dir = os.path.join(tmp, "medquad")
+        questions = _corpus(args.docs)
+        fingerprint = corpus_fingerprint(questions)
+
+        start = time.perf_counter()
+        vectorizer = _make_vectorizer()
+        matrix = vectorizer.fit_transform(questions)
+        save_tfidf_artifacts(artifact_dir, vectorizer, matrix, fingerprint)
+        IVFIndex.build(matrix, fingerprint=fingerprint).save(artifact_dir)
+        build_s = time.perf_counter() - start
+        size_mb = sum(f.stat().st_size for f in Path(artifact_dir).iterdir()) / 1024 ** 2
+
+        print(f"Retrieval startup — {len(questions)} questions, {args.workers} concurrent workers")
+        print(f"offline build: {build_s:.2f}s, artifacts {size_mb:.1f} MB")
+        print("-" * 72)
+        for mode in ("refit", "mmap"):
+            results = _run(mode, args.workers, artifact_dir, args.docs)
+            startup = sum(r["startup_s"] for r in results) / len(results)
+            rss = sum(r["rss"] for r in results) / len(results) / 1024
+            pss = sum(r["pss"] for r in results) / len(results) / 1024
+            print(f"{mode:>6}: startup {startup:6.2f}s/worker   RSS {rss:7.1f} MB/worker   "
+                  f"PSS {pss:7.1f} MB/worker")
+
+
+if __name__ == "__main__":
+    main()
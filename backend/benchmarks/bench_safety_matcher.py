@@ -0,0 +1,175 @@
+"""
+Benchmark: compiled safety keyword matcher vs per-keyword substring loops.
+
+Runs detect_emergency over a corpus of chat-style messages (most benign,
+some with emergency keywords, red flags, punctuation and mixed case) and
+reports messages/sec for
+
+  loops    — the previous detect_emergency: one ``keyword in text`` test per
+             keyword of every EMERGENCY_PATTERNS / RED_FLAGS entry
+  compiled — detect_emergency with the single-scan KeywordMatcher
+             (pyahocorasick when installed, else one trie regex)
+
+and checks that both return identical results.
+
+Run from the repository root:
+    python backend/benchmarks/bench_safety_matcher.py --messages 20000 [--backend regex]
+"""
+
+import argparse
+import logging
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from backend.app.services import safety_system  # noqa: E402
+from backend.app.services.aho_corasick import KeywordMatcher  # noqa: E402
+from backend.app.services.safety_system import (  # noqa: E402
+    EMERGENCY_PATTERNS,
+    RED_FLAGS,
+    _get_relevant_hotlines,
+    detect_emergency,
+)
+
+BENIGN = [
+    "I have been feeling tired lately", "my head hurts a little since yesterday",
+    "some nausea after dinner", "my stomach is upset", "what should I eat for breakfast",
+    "I slept badly last night", "can you explain my blood test results", "my back aches",
+    "is it ok to exercise with a cold", "I have a runny nose and sneezing",
+    "how much water should I drink", "my knee is stiff in the morning",
+]
+
+
+def legacy_detect_emergency(text, age=None, gender=None):
+    """The previous detect_emergency, for comparison."""
+    text_lower = text.lower()
+    text_normalized = re.sub(r'[^\w\s]', '', text_lower)
+    detected_emergencies = []
+    detected_red_flags = []
+    for emergency_type, pattern in EMERGENCY_PATTERNS.items():
+        for keyword in pattern["keywords"]:
+            if keyword in text_normalized:
+                detected_emergencies.append({
+                    "type": emergency_type,
+                    "level": pattern["level"],
+                    "message": pattern["message"],
+                    "action": pattern["action"],
+                    "keyword_match": keyword,
+                })
+                break
+    for flag_type, pattern in RED_FLAGS.items():
+        for keyword in pattern["keywords"]:
+            if keyword in text_normalized:
+                detected_red_flags.append({
+                    "type": flag_type,
+                    "reason": pattern["reason"],
+                    "keyword_match": keyword,
+                })
+    if age is not None and age < 3:
+        if any(keyword in text_normalized for keyword in ["fever", "high temperature"]):
+            detected_emergencies.append({
+                "type": "infant_fever",
+                "level": "CRITICAL",
+                "message": "FEVER IN INFANTS UNDER 3 MONTHS IS A MEDICAL EMERGENCY. SEEK IMMEDIATE CARE.",
+                "action": "CALL_EMERGENCY",
+                "keyword_match": "infant_fever_rule",
+            })
+    if detected_emergencies:
+        priority_order = {"CRITICAL": 0, "URGENT": 1, "NORMAL": 2}
+        highest = min(detected_emergencies, key=lambda x: priority_order.get(x["level"], 3))
+        return {
+            "is_emergency": True,
+            "level": highest["level"],
+            "type": highest["type"],
+            "message": highest["message"],
+            "action": highest["action"],
+            "red_flags": detected_red_flags,
+            "hotlines": _get_relevant_hotlines(highest["type"]),
+            "all_detections": detected_emergencies,
+        }
+    if detected_red_flags:
+        return {
+            "is_emergency": False,
+            "level": "URGENT",
+            "type": None,
+            "message": f"Red flags detected: {', '.join([f['type'] for f in detected_red_flags])}",
+            "action": "ELEVATED_TRIAGE",
+            "red_flags": detected_red_flags,
+            "hotlines": {},
+            "all_detections": [],
+        }
+    return {
+        "is_emergency": False,
+        "level": "NORMAL",
+        "type": None,
+        "message": None,
+        "action": None,
+        "red_flags": [],
+        "hotlines": {},
+        "all_detections": [],
+    }
+
+
+def synthetic_messages(n: int, seed: int, keyword_rate: float = 0.15) -> list[tuple[str, int]]:
+    """(message, age) pairs; ``keyword_rate`` of sentences carry a safety keyword."""
+    rng = random.Random(seed)
+    keywords = [k for p in list(EMERGENCY_PATTERNS.values()) + list(RED_FLAGS.values()) for k in p["keywords"]]
+    keywords += ["fever", "high temperature"]
+    messages = []
+    for _ in range(n):
+        parts = []
+        for _ in range(rng.randint(1, 8)):
+            if rng.random() < keyword_rate:
+                k = rng.choice(keywords)
+                parts.append(k.upper() if rng.random() < 0.2 else k)
+            else:
+                parts.append(rng.choice(BENIGN))
+        text = rng.choice([". ", ", ", "! ", " and "]).join(parts) + rng.choice(["", ".", "?!", "..."])
+        messages.append((text, rng.choice([None, None, 1, 2, 3, 35, 70])))
+    return messages
+
+
+def _throughput(fn, messages) -> float:
+    start = time.perf_counter()
+    for text, age in messages:
+        fn(text, age=age)
+    return len(messages) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=20000)
+    parser.add_argument("--keyword-rate", type=float, default=0.15)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--backend", choices=("auto", "regex"), default="auto")
+    args = parser.parse_args()
+
+    if args.backend != "auto":
+        safety_system._KEYWORD_MATCHER = KeywordMatcher(
+            safety_system._KEYWORD_MATCHER.keywords, backend=args.backend
+        )
+
+    logging.disable(logging.WARNING)  # detection logs would dominate the timings
+    messages = synthetic_messages(args.messages, args.seed, args.keyword_rate)
+    avg_len = sum(len(t) for t, _ in messages) / len(messages)
+
+    mismatches = sum(
+        detect_emergency(t, age=a) != legacy_detect_emergency(t, age=a) for t, a in messages
+    )
+    assert mismatches == 0, f"{mismatches} messages detected differently"
+
+    print(f"Safety detection — {len(messages)} messages, avg {avg_len:.0f} chars, "
+          f"matcher backend: {safety_system._KEYWORD_MATCHER.backend}")
+    print("-" * 72)
+    loops = _throughput(legacy_detect_emergency, messages)
+    compiled = _throughput(detect_emergency, messages)
+    print(f"{'loops':>9}: {loops:10.0f} messages/s")
+    print(f"{'compiled':>9}: {compiled:10.0f} messages/s   ({compiled / loops:.1f}x)   identical detections")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""
+Benchmark: concurrent chat writes on file SQLite.
+
+Simulates ``--users`` chat users, one thread each, spread over
+``--workers`` processes (as under ``uvicorn --workers``), sending
+``--messages`` messages: every message reads the session's recent history,
+inserts the user/assistant pair and bumps the daily rollup, in one
+transaction, the way ``chat_service.save_chat_exchange`` does. Runs it
+against
+
+  default — the previous engine: rollback journal, default pragmas, a
+            connection per thread, SQLite's 5 s lock timeout
+  profile — ``database.create_sqlite_engine``: WAL, synchronous=NORMAL,
+            busy_timeout, one writer connection plus a reader pool,
+            sessions routed by ``RoutingSession``
+
+and reports failed transactions ("database is locked" and other errors),
+throughput, and p50/p99 transaction latency. The writer queue serialises
+writes within a process; across processes, writers take the lock with
+BEGIN IMMEDIATE and wait out busy_timeout.
+
+Run from the repository root:
+    python backend/benchmarks/bench_sqlite_writes.py --users 200 --messages 10 --workers 4
+"""
+
+import argparse
+import multiprocessing
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from sqlalchemy import (  # noqa: E402
+    Column, Date, DateTime, Index, Integer, MetaData, String, Table, Text, UniqueConstraint,
+    create_engine, insert, select,
+)
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert  # noqa: E402
+from sqlalchemy.exc import OperationalError  # noqa: E402
+from sqlalchemy.orm import Session, sessionmaker  # noqa: E402
+
+from backend.app.database import RoutingSession, create_sqlite_engine  # noqa: E402
+
+metadata = MetaData()
+chat_history = Table(
+    "chat_history", metadata, Column("id", Integer, primary_key=True), Column("user_id", Integer, index=True),
+    Column("role", String(20)), Column("content", Text), Column("session_id", String(64)),
+    Column("created_at", DateTime),
+    Index("ix_chat_history_user_id_session_id_created_at", "user_id", "session_id", "created_at"),
+)
+daily_rollups = Table(
+    "daily_rollups", metadata, Column("id", Integer, primary_key=True), Column("user_id", Integer),
+    Column("day", Date), Column("chat_messages", Integer, server_default="0"),
+    UniqueConstraint("user_id", "day"),
+)
+REPLY = "Stay hydrated and rest; see a doctor if the fever lasts more than three days. " * 4
+
+
+def _chat_message(db: Session, user_id: int, n: int) -> None:
+    session_id = f"{user_id}-s"
+    db.execute(
+        select(chat_history.c.role, chat_history.c.content)
+        .where(chat_history.c.user_id == user_id, chat_history.c.session_id == session_id)
+        .order_by(chat_history.c.created_at.desc()).limit(10)
+    ).all()
+    now = datetime.now()
+    db.execute(insert(chat_history), [
+        {"user_id": user_id, "role": "user", "content": f"message {n}", "session_id": session_id, "created_at": now},
+        {"user_id": user_id, "role": "assistant", "content": REPLY, "session_id": session_id, "created_at": now},
+    ])
+    stmt = sqlite_insert(daily_rollups).values(user_id=user_id, day=date.today(), chat_messages=2)
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=["user_id", "day"],
+        set_={"chat_messages": daily_rollups.c.chat_messages + 2},
+    ))
+    db.commit()
+
+
+def _worker(factory, url: str, user_ids, messages: int, start_at: float, results) -> None:
+    """One server process: a thread per chat user, all sharing the process's engine(s)."""
+    make_session = factory(url)
+    latencies, errors = [], {}
+    lock = threading.Lock()
+
+    def chat_user(user_id):
+        time.sleep(max(0.0, start_at - time.time()))
+        for n in range(messages):
+            start = time.perf_counter()
+            try:
+                with make_session() as db:
+                    _chat_message(db, user_id, n)
+            except OperationalError as exc:
+                key = "locked" if "locked" in str(exc) else type(exc.orig).__name__
+            except Exception as exc:
+                key = type(exc).__name__
+            else:
+                key = None
+            with lock:
+                if key:
+                    errors[key] = errors.get(key, 0) + 1
+                else:
+                    latencies.append((time.perf_counter() - start) * 1000)
+
+    threads = [threading.Thread(target=chat_user, args=(u,)) for u in user_ids]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    results.put((latencies, errors))
+
+
+def _run(factory, url: str, users: int, messages: int, workers: int) -> dict:
+    factory(url)  # create the schema before the workers start
+    results = multiprocessing.Queue()
+    start_at = time.time() + 1.0
+    procs = [
+        multiprocessing.Process(target=_worker, args=(factory, url, range(w + 1, users + 1, workers),
+                                                      messages, start_at, results))
+        for w in range(workers)
+    ]
+    for p in procs:
+        p.start()
+    latencies, errors = [], {}
+    for _ in procs:
+        worker_latencies, worker_errors = results.get()
+        latencies.extend(worker_latencies)
+        for key, n in worker_errors.items():
+            errors[key] = errors.get(key, 0) + n
+    for p in procs:
+        p.join()
+    elapsed = time.time() - start_at
+    latencies.sort()
+    return {
+        "ok": len(latencies),
+        "errors": errors,
+        "tps": len(latencies) / elapsed,
+        "p50": statistics.median(latencies) if latencies else float("nan"),
+        "p99": latencies[int(len(latencies) * 0.99) - 1] if latencies else float("nan"),
+    }
+
+
+def _default(url: str):
+    engine = create_engine(url, connect_args={"check_same_thread": False})
+    metadata.create_all(engine)
+    return sessionmaker(bind=engine)
+
+
+def _profile(url: str):
+    writer = create_sqlite_engine(url, read_only=False)
+    metadata.create_all(writer)
+    return sessionmaker(class_=RoutingSession, bind=writer, reader=create_sqlite_engine(url, read_only=True))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=200, help="concurrent chat users (threads)")
+    parser.add_argument("--messages", type=int, default=10, help="messages per user")
+    parser.add_argument("--workers", type=int, default=4, help="server processes sharing the database file")
+    args = parser.parse_args()
+
+    total = args.users * args.messages
+    print(f"Concurrent chat writes: {args.users} users x {args.messages} messages = {total:,} transactions "
+          f"over {args.workers} processes")
+    print("-" * 84)
+    for name, factory in (("default", _default), ("profile", _profile)):
+        url = f"sqlite:///{Path(tempfile.mkdtemp()) / 'writes.db'}"
+        r = _run(factory, url, args.users, args.messages, args.workers)
+        failed = sum(r["errors"].values())
+        detail = ", ".join(f"{k} {v}" for k, v in sorted(r["errors"].items())) or "-"
+        print(f"{name:<8} ok {r['ok']:>6,}   failed {failed:>5,} ({detail:<12})   "
+              f"{r['tps']:7.0f} tx/s   p50 {r['p50']:7.1f} ms   p99 {r['p99']:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
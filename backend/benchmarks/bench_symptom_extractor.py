@@ -0,0 +1,165 @@
+"""
+Benchmark: Aho–Corasick symptom extraction vs the per-column substring scan.
+
+Extracts symptoms from a corpus of long, chat-style messages (symptom
+mentions mixed with filler, punctuation, underscores, odd spacing and Hindi
+phrases) with
+
+  scan      — the previous chat_service._extract_symptoms: one substring
+              search per triage column over the normalised message
+  automaton — SymptomExtractor: one pass over the message's words
+
+and checks that the automaton's output with ``synonyms=True`` starts with
+exactly the scan's result (synonym-only matches are appended after it).
+Uses Training.csv's columns when present, otherwise the standard 132-column
+symptom/disease dataset header below.
+
+Run from the repository root:
+    python backend/benchmarks/bench_symptom_extractor.py --messages 2000
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+TRIAGE_COLUMNS = [
+    "itching", "skin_rash", "nodal_skin_eruptions", "continuous_sneezing", "shivering", "chills",
+    "joint_pain", "stomach_pain", "acidity", "ulcers_on_tongue", "muscle_wasting", "vomiting",
+    "burning_micturition", "spotting_ urination", "fatigue", "weight_gain", "anxiety",
+    "cold_hands_and_feets", "mood_swings", "weight_loss", "restlessness", "lethargy",
+    "patches_in_throat", "irregular_sugar_level", "cough", "high_fever", "sunken_eyes",
+    "breathlessness", "sweating", "dehydration", "indigestion", "headache", "yellowish_skin",
+    "dark_urine", "nausea", "loss_of_appetite", "pain_behind_the_eyes", "back_pain", "constipation",
+    "abdominal_pain", "diarrhoea", "mild_fever", "yellow_urine", "yellowing_of_eyes",
+    "acute_liver_failure", "fluid_overload", "swelling_of_stomach", "swelled_lymph_nodes", "malaise",
+    "blurred_and_distorted_vision", "phlegm", "throat_irritation", "redness_of_eyes",
+    "sinus_pressure", "runny_nose", "congestion", "chest_pain", "weakness_in_limbs",
+    "fast_heart_rate", "pain_during_bowel_movements", "pain_in_anal_region", "bloody_stool",
+    "irritation_in_anus", "neck_pain", "dizziness", "cramps", "bruising", "obesity", "swollen_legs",
+    "swollen_blood_vessels", "puffy_face_and_eyes", "enlarged_thyroid", "brittle_nails",
+    "swollen_extremeties", "excessive_hunger", "extra_marital_contacts", "drying_and_tingling_lips",
+    "slurred_speech", "knee_pain", "hip_joint_pain", "muscle_weakness", "stiff_neck",
+    "swelling_joints", "movement_stiffness", "spinning_movements", "loss_of_balance", "unsteadiness",
+    "weakness_of_one_body_side", "loss_of_smell", "bladder_discomfort", "foul_smell_of urine",
+    "continuous_feel_of_urine", "passage_of_gases", "internal_itching", "toxic_look_(typhos)",
+    "depression", "irritability", "muscle_pain", "altered_sensorium", "red_spots_over_body",
+    "belly_pain", "abnormal_menstruation", "dischromic _patches", "watering_from_eyes",
+    "increased_appetite", "polyuria", "family_history", "mucoid_sputum", "rusty_sputum",
+    "lack_of_concentration", "visual_disturbances", "receiving_blood_transfusion",
+    "receiving_unsterile_injections", "coma", "stomach_bleeding", "distention_of_abdomen",
+    "history_of_alcohol_consumption", "fluid_overload.1", "blood_in_sputum",
+    "prominent_veins_on_calf", "palpitations", "painful_walking", "pus_filled_pimples", "blackheads",
+    "scurring", "skin_peeling", "silver_like_dusting", "small_dents_in_nails", "inflammatory_nails",
+    "blister", "red_sore_around_nose", "yellow_crust_ooze",
+]
+
+FILLER = [
+    "I have been feeling unwell since last {day}", "my doctor said to keep track",
+    "it gets worse at night", "and honestly I am a bit worried", "after lunch today",
+    "I took paracetamol but it did not help much", "my mother has similar problems",
+    "for about {n} days now", "sometimes it comes and goes", "also", "plus", "and",
+    "I can't sleep properly", "is this serious?", "what should I do?", "please advise...",
+]
+DAYS = ["monday", "tuesday", "week", "weekend", "month"]
+HINDI = ["सीने में दर्द", "सिरदर्द", "बुखार", "खांसी", "मतली", "थकान"]
+ENGLISH_SYNONYMS = ["shortness of breath", "body aches", "sore throat", "heartburn", "chest pain"]
+
+
+def scan_extract(message: str, columns) -> list[str]:
+    """The previous chat_service._extract_symptoms, for comparison."""
+    if not columns:
+        return []
+    normalized = re.sub(r"[^a-z0-9_ ]+", " ", message.lower()).strip()
+    normalized_msg = f" {normalized.replace('_', ' ')} "
+    found = []
+    for symptom in columns:
+        normalized_symptom = symptom.lower().replace("_", " ")
+        if f" {normalized_symptom} " in normalized_msg:
+            found.append(symptom)
+    return found
+
+
+def _mention(rng: random.Random, column: str) -> str:
+    text = column if rng.random() < 0.3 else column.replace("_", " ")
+    if rng.random() < 0.2:
+        text = text.upper()
+    if rng.random() < 0.1:
+        text = text.replace(" ", ", ", 1)  # punctuation inside a phrase: must NOT match
+    return text
+
+
+def synthetic_messages(n: int, columns, seed: int, sentences: int = 12) -> list[str]:
+    rng = random.Random(seed)
+    messages = []
+    for _ in range(n):
+        parts = []
+        for _ in range(rng.randint(sentences // 2, sentences)):
+            roll = rng.random()
+            if roll < 0.35:
+                parts.append(_mention(rng, rng.choice(columns)))
+            elif roll < 0.45:
+                parts.append(rng.choice(ENGLISH_SYNONYMS))
+            elif roll < 0.5:
+                parts.append(rng.choice(HINDI))
+            else:
+                parts.append(rng.choice(FILLER).format(day=rng.choice(DAYS), n=rng.randint(2, 14)))
+        sep = rng.choice([", ", ". ", " and ", "; ", "  ", " - "])
+        messages.append(sep.join(parts) + rng.choice(["", ".", "!!", " :("]))
+    return messages
+
+
+def _columns() -> tuple[list[str], str]:
+    from backend.app.ml_models import triage_infer
+    if triage_infer._load_resources():
+        return triage_infer._symptom_columns, "Training.csv"
+    return TRIAGE_COLUMNS, "built-in header"
+
+
+def main():
+    from backend.app.services.symptom_extractor import (
+        SymptomExtractor, _hindi_synonyms, _synonym_vocabulary,
+    )
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--sentences", type=int, default=12)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    columns, source = _columns()
+    messages = synthetic_messages(args.messages, columns, args.seed, args.sentences)
+    avg_len = sum(map(len, messages)) / len(messages)
+
+    synonyms, hindi = _synonym_vocabulary(), _hindi_synonyms()
+    start = time.perf_counter()
+    extractor = SymptomExtractor(columns, synonyms, hindi)
+    build_ms = (time.perf_counter() - start) * 1e3
+
+    start = time.perf_counter()
+    scanned = [scan_extract(m, columns) for m in messages]
+    scan_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    extracted = [extractor.extract(m, synonyms=True) for m in messages]
+    auto_s = time.perf_counter() - start
+
+    assert all(e[: len(s)] == s for e, s in zip(extracted, scanned)), \
+        "automaton disagrees with the column scan"
+    extra = sum(len(e) - len(s) for e, s in zip(extracted, scanned))
+
+    print(f"Symptom extraction — {len(columns)} columns ({source}), {len(messages)} messages, "
+          f"avg {avg_len:.0f} chars")
+    print(f"automaton build: {build_ms:.1f} ms, {len(extractor._english)} states")
+    print("-" * 72)
+    print(f"{'scan':>10}: {scan_s * 1e6 / len(messages):8.1f} us/message")
+    print(f"{'automaton':>10}: {auto_s * 1e6 / len(messages):8.1f} us/message   "
+          f"({scan_s / auto_s:.1f}x)   identical columns, +{extra} synonym matches")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+Benchmark: health timeline latency against history size.
+
+Seeds a SQLite file with users whose histories hold ``--sizes`` events each,
+spread over the four log tables (with the ``(user_id, timestamp)`` indexes
+of migration add_timeline_indexes), then times a 50-event page via
+
+  orm   — the previous implementation: load all four tables for the user
+          as ORM objects, build dicts, sort in Python, slice
+  first — timeline_page, first page
+  deep  — timeline_page, a cursor from the middle of the history
+
+and reports the median of ``--repeat`` runs.
+
+Run from the repository root:
+    python backend/benchmarks/bench_timeline.py --sizes 1000 10000 100000
+"""
+
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from sqlalchemy import JSON, Column, DateTime, Float, Index, Integer, String, create_engine, insert  # noqa: E402
+from sqlalchemy.orm import Session, declarative_base  # noqa: E402
+
+from backend.app.services.analytics_queries import encode_cursor, timeline_page  # noqa: E402
+
+# Same columns as the app models, without the users FK
+Base = declarative_base()
+
+
+class SymptomLog(Base):
+    __tablename__ = "symptom_logs"
+    __table_args__ = (Index("ix_symptom_logs_user_id_timestamp", "user_id", "timestamp"),)
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, nullable=False, index=True)
+    symptoms = Column(JSON, nullable=False)
+    predicted_disease = Column(String(255))
+    timestamp = Column(DateTime, index=True)
+
+
+class NutritionLog(Base):
+    __tablename__ = "nutrition_logs"
+    __table_args__ = (Index("ix_nutrition_logs_user_id_timestamp", "user_id", "timestamp"),)
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, nullable=False, index=True)
+    food_name = Column(String(255))
+    calories = Column(Float)
+    timestamp = Column(DateTime, index=True)
+
+
+class MedicationLog(Base):
+    __tablename__ = "medication_logs"
+    __table_args__ = (Index("ix_medication_logs_user_id_timestamp", "user_id", "timestamp"),)
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, nullable=False, index=True)
+    medication_name = Column(String(255))
+    timestamp = Column(DateTime, index=True)
+
+
+class LabReport(Base):
+    __tablename__ = "lab_reports"
+    __table_args__ = (Index("ix_lab_reports_user_id_timestamp", "user_id", "timestamp"),)
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, nullable=False, index=True)
+    report_name = Column(String(255))
+    abnormal_values = Column(JSON)
+    timestamp = Column(DateTime, index=True)
+
+
+SOURCES = [
+    ("symptom", SymptomLog, lambda i: {"symptoms": ["fever", "cough"], "predicted_disease": "Flu"}),
+    ("nutrition", NutritionLog, lambda i: {"food_name": f"meal {i}", "calories": 420.0}),
+    ("medication", MedicationLog, lambda i: {"medication_name": "Metformin"}),
+    ("lab_report", LabReport, lambda i: {"report_name": "CBC", "abnormal_values": {"hb": 10.2}}),
+]
+BASE = datetime(2026, 10, 1)
+
+
+def _seed(path: str, sizes):
+    """One user per size; returns the engine and {user_id: cursor at the middle of their history}."""
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    next_id = {kind: 1 for kind, _, _ in SOURCES}
+    users = {}
+    for user_id, size in enumerate(sizes, start=1):
+        rows = {kind: [] for kind, _, _ in SOURCES}
+        middle = None
+        for i in range(size):
+            kind, _, make = SOURCES[i % len(SOURCES)]
+            timestamp = BASE - timedelta(minutes=i)
+            rows[kind].append({"id": next_id[kind], "user_id": user_id, "timestamp": timestamp, **make(i)})
+            if i == size // 2:
+                middle = encode_cursor((timestamp, kind, next_id[kind]))
+            next_id[kind] += 1
+        with engine.begin() as conn:
+            for kind, model, _ in SOURCES:
+                conn.execute(insert(model.__table__), rows[kind])
+        users[user_id] = middle
+    return engine, users
+
+
+def _orm_timeline(db: Session, user_id: int, limit: int):
+    events = []
+    for log in db.query(SymptomLog).filter(SymptomLog.user_id == user_id).all():
+        events.append({"type": "symptom", "description": log.symptoms, "detail": log.predicted_disease,
+                       "timestamp": log.timestamp.isoformat() if log.timestamp else None})
+    for log in db.query(NutritionLog).filter(NutritionLog.user_id == user_id).all():
+        events.append({"type": "nutrition", "description": log.food_name, "detail": f"{log.calories or 0} kcal",
+                       "timestamp": log.timestamp.isoformat() if log.timestamp else None})
+    for log in db.query(MedicationLog).filter(MedicationLog.user_id == user_id).all():
+        events.append({"type": "medication", "description": log.medication_name, "detail": None,
+                       "timestamp": log.timestamp.isoformat() if log.timestamp else None})
+    for log in db.query(LabReport).filter(LabReport.user_id == user_id).all():
+        events.append({"type": "lab_report", "description": log.report_name, "detail": log.abnormal_values,
+                       "timestamp": log.timestamp.isoformat() if log.timestamp else None})
+    events.sort(key=lambda e: e["timestamp"] or "", reverse=True)
+    return events[:limit]
+
+
+def _median_ms(engine, fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        with Session(engine) as db:
+            start = time.perf_counter()
+            fn(db)
+            samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000],
+                        help="events per user history")
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=7)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    engine, middles = _seed(str(Path(tempfile.mkdtemp()) / "timeline.db"), args.sizes)
+    print(f"Health timeline — {args.limit}-event pages (seeded {sum(args.sizes):,} events in "
+          f"{time.perf_counter() - start:.1f}s)")
+    print("-" * 72)
+
+    for user_id, size in enumerate(args.sizes, start=1):
+        middle = middles[user_id]
+        with Session(engine) as db:
+            first, _ = timeline_page(db, user_id, args.limit)
+            assert [e["timestamp"] for e in first] == \
+                   [e["timestamp"] for e in _orm_timeline(db, user_id, args.limit)]
+        orm_ms = _median_ms(engine, lambda db: _orm_timeline(db, user_id, args.limit), args.repeat)
+        first_ms = _median_ms(engine, lambda db: timeline_page(db, user_id, args.limit), args.repeat)
+        deep_ms = _median_ms(engine, lambda db: timeline_page(db, user_id, args.limit, middle), args.repeat)
+        print(f"{size:>8,} events   orm {orm_ms:8.1f} ms   first {first_ms:5.2f} ms   deep {deep_ms:5.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Benchmark: batched triage prediction vs one predict_proba per intake form.
+
+Compares, at several batch sizes,
+
+  legacy — the old list-scan symptom vectoriser + one predict_proba call per row
+  single — predict_disease_safe per row (dict vectoriser, still one call per row)
+  batch  — predict_disease_safe_batch (one predict_proba over the whole batch)
+
+and checks that all three return the same predictions. Uses the trained
+triage model and Training.csv when present, otherwise a RandomForest fitted
+on a synthetic symptom/disease table of the same shape (132 symptoms, 41
+diseases).
+
+Run from the repository root:
+    python backend/benchmarks/bench_triage_batch.py --sizes 1 100 10000
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from backend.app.ml_models import triage_infer  # noqa: E402
+
+
+def _synthetic_model(n_symptoms: int, n_diseases: int, seed: int) -> str:
+    import numpy as np
+    from sklearn.ensemble import RandomForestClassifier
+
+    rng = np.random.default_rng(seed)
+    columns = [f"symptom_{i}" for i in range(n_symptoms)]
+    profiles = [rng.choice(n_symptoms, size=rng.integers(4, 12), replace=False) for _ in range(n_diseases)]
+    X, y = [], []
+    for disease, profile in enumerate(profiles):
+        for _ in range(120):
+            row = np.zeros(n_symptoms, dtype=np.float32)
+            row[rng.choice(profile, size=rng.integers(2, len(profile) + 1), replace=False)] = 1
+            X.append(row)
+            y.append(f"Disease {disease}")
+    model = RandomForestClassifier(n_estimators=100, random_state=seed).fit(np.array(X), y)
+
+    triage_infer._model = model
+    triage_infer._symptom_columns = columns
+    triage_infer._symptom_index = triage_infer._compile_symptom_index(columns)
+    return "synthetic"
+
+
+def _legacy_predict(user_symptoms):
+    """The pre-batching path: list scans plus a single-row predict_proba."""
+    columns = triage_infer._symptom_columns
+    vector = [0] * len(columns)
+    for symptom in user_symptoms:
+        symptom = symptom.strip().lower()
+        if symptom in columns:
+            vector[columns.index(symptom)] = 1
+        symptom_alt = symptom.replace(" ", "_")
+        if symptom_alt in columns:
+            vector[columns.index(symptom_alt)] = 1
+    probabilities = triage_infer._model.predict_proba([vector])[0]
+    return str(triage_infer._model.classes_[probabilities.argsort()[::-1][0]])
+
+
+def _forms(n: int, seed: int) -> list[list[str]]:
+    rng = random.Random(seed)
+    columns = triage_infer._symptom_columns
+    return [
+        [rng.choice([c, c.replace("_", " ")]) for c in rng.sample(columns, rng.randint(2, 6))]
+        for _ in range(n)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 100, 10000])
+    parser.add_argument("--per-row-max", type=int, default=1000,
+                        help="rows timed for the per-row paths; larger sizes are extrapolated")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    source = "trained" if triage_infer._load_resources() else _synthetic_model(132, 41, args.seed)
+    triage_infer.predict_disease_safe_batch(_forms(2, args.seed))  # warm-up
+
+    print(f"Triage prediction — {source} model, {len(triage_infer._symptom_columns)} symptoms")
+    print("-" * 72)
+    for n in args.sizes:
+        forms = _forms(n, args.seed)
+        timed = forms[: args.per_row_max]
+        scale = n / len(timed)
+
+        start = time.perf_counter()
+        legacy = [_legacy_predict(f) for f in timed]
+        legacy_s = (time.perf_counter() - start) * scale
+
+        start = time.perf_counter()
+        single = [triage_infer.predict_disease_safe(f) for f in timed]
+        single_s = (time.perf_counter() - start) * scale
+
+        start = time.perf_counter()
+        batch = triage_infer.predict_disease_safe_batch(forms)
+        batch_s = time.perf_counter() - start
+
+        assert single == batch[: len(timed)], "batch results differ from per-row results"
+        assert all(
+            b["top_predictions"][0]["name"] == name
+            for b, name in zip(batch, legacy) if b["top_predictions"]
+        ), "batch predictions differ from the legacy path"
+        note = "" if scale == 1 else f"  (per-row paths extrapolated from {len(timed)} rows)"
+        print(f"n={n:>6}: legacy {legacy_s:8.3f}s   single {single_s:8.3f}s   batch {batch_s:8.3f}s   "
+              f"{n / batch_s:9.0f} rows/s{note}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Benchmark: per-request cost of plan-limit enforcement.
+
+Metered requests for ``--users`` users hit one of
+
+  db    — read today's count and upsert it back on every request (what a
+          straightforward DB-backed check_rate_limit would do)
+  meter — UsageMeter.consume: in-memory check and increment; the
+          background flusher writes batches every --flush-interval seconds
+
+against a throwaway SQLite file, from ``--threads`` threads. Reports the
+per-request overhead (p50/p99 µs), plus flush count and latency.
+
+Run from the repository root:
+    python backend/benchmarks/bench_usage_meter.py --requests 20000
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from sqlalchemy import (  # noqa: E402
+    Column, Date, DateTime, Integer, MetaData, String, Table, UniqueConstraint, create_engine,
+)
+
+from backend.app.services.subscription_service import check_rate_limit  # noqa: E402
+from backend.app.services.usage_meter import SQLUsageStore, UsageMeter, _utc_today  # noqa: E402
+
+
+def _store() -> SQLUsageStore:
+    # Same shape as models.feature_usage
+    metadata = MetaData()
+    table = Table(
+        "feature_usage", metadata,
+        Column("id", Integer, primary_key=True),
+        Column("user_id", Integer, nullable=False),
+        Column("limit_key", String(50), nullable=False),
+        Column("day", Date, nullable=False),
+        Column("count", Integer, nullable=False, default=0),
+        Column("updated_at", DateTime),
+        UniqueConstraint("user_id", "limit_key", "day"),
+    )
+    engine = create_engine(
+        f"sqlite:///{Path(tempfile.mkdtemp()) / 'bench_usage.db'}",
+        connect_args={"check_same_thread": False},
+    )
+    metadata.create_all(engine)
+    return SQLUsageStore(engine, table)
+
+
+def _db_consume(store: SQLUsageStore, user_id: int) -> bool:
+    day = _utc_today()
+    used = store.load(user_id, day).get("chat_messages_per_day", 0)
+    allowed = check_rate_limit("pro", "basic_chat", used)["allowed"]
+    if allowed:
+        store.add({(user_id, "chat_messages_per_day", day): 1})
+    return allowed
+
+
+def _run(consume, args) -> list:
+    latencies = []
+    lock = threading.Lock()
+
+    def worker(seed: int):
+        rng = random.Random(seed)
+        local = []
+        for _ in range(args.requests // args.threads):
+            user_id = rng.randrange(args.users)
+            start = time.perf_counter()
+            consume(user_id)
+            local.append((time.perf_counter() - start) * 1e6)
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(args.threads)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    latencies.sort()
+    return latencies
+
+
+def _report(name: str, latencies: list, extra: str = "") -> None:
+    p99 = latencies[max(0, int(len(latencies) * 0.99) - 1)]
+    print(f"{name:>6}: p50 {statistics.median(latencies):8.1f} µs   p99 {p99:8.1f} µs   {extra}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--flush-interval", type=float, default=1.0)
+    args = parser.parse_args()
+
+    print(f"Plan-limit enforcement — {args.requests} requests, {args.users} users, {args.threads} threads")
+    print("-" * 78)
+    store = _store()
+    _report("db", _run(lambda user_id: _db_consume(store, user_id), args))
+
+    meter = UsageMeter(_store(), flush_interval=args.flush_interval)
+    meter.start()
+    latencies = _run(lambda user_id: meter.consume(user_id, "pro", "basic_chat"), args)
+    meter.shutdown()
+    stats = meter.stats()
+    _report("meter", latencies, f"({stats['loads']} loads, {stats['flushes']} flushes, "
+                                f"{stats['rows_flushed']} rows, avg flush {stats['avg_flush_ms']} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Shared pytest setup.
+
+Puts the repository root (for ``backend.*`` imports) and ``benchmarks/``
+(reference implementations some tests compare against) on ``sys.path``,
+and provides the history schema as fixtures:
+
+- ``tables``: the app's Core tables by name (``tables.symptom_logs``, ...).
+- ``db_engine``: a file SQLite database under ``tmp_path`` with that schema.
+
+The log and chat tables mirror the app models, with the single-column
+indexes of the initial migration (the models package cannot be imported
+without every model). feature_usage, daily_rollups and the composite
+history indexes are not written out here: they come from running the
+``upgrade()`` of the migrations in ``MIGRATIONS`` against a recording
+``op``, so tests run against exactly what those migrations declare.
+"""
+import importlib.util
+import sys
+from pathlib import Path
+from types import ModuleType, SimpleNamespace
+from unittest import mock
+
+BACKEND = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND.parent))
+sys.path.insert(0, str(BACKEND / "benchmarks"))
+
+import pytest  # noqa: E402
+from sqlalchemy import (  # noqa: E402
+    JSON, Column, DateTime, Float, Index, Integer, MetaData, String, Table, Text, create_engine,
+)
+
+MIGRATIONS = ("0003_add_feature_usage", "0004_add_timeline_indexes", "0005_add_daily_rollups",
+              "0006_add_history_indexes")
+
+metadata = MetaData()
+
+
+def _log_table(name, *columns):
+    return Table(
+        name, metadata,
+        Column("id", Integer, primary_key=True),
+        Column("user_id", Integer, nullable=False, index=True),
+        *columns,
+        Column("timestamp", DateTime, index=True),
+    )
+
+
+Table("users", metadata, Column("id", Integer, primary_key=True), Column("email", String(255)))
+_log_table("symptom_logs", Column("symptoms", JSON, nullable=False), Column("predicted_disease", String(255)),
+           Column("triage_level", String(50)))
+_log_table("nutrition_logs", Column("food_name", String(255)), Column("calories", Float), Column("protein", Float),
+           Column("carbs", Float), Column("fats", Float))
+_log_table("medication_logs", Column("medication_name", String(255)))
+_log_table("lab_reports", Column("report_name", String(255)), Column("abnormal_values", JSON),
+           Column("analysis_result", JSON))
+_log_table("image_analyses", Column("image_type", String(50)), Column("prediction", String(255)))
+Table(
+    "chat_history", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("user_id", Integer, nullable=False, index=True),
+    Column("role", String(20)),
+    Column("content", Text),
+    Column("session_id", String(64), index=True),
+    Column("created_at", DateTime, index=True),
+)
+
+
+class _MigrationOp:
+    """The part of ``alembic.op`` the migrations use, applied to ``metadata`` and a live connection."""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.indexes = []  # (name, table, columns), in creation order
+
+    def get_bind(self):
+        return self.conn
+
+    @staticmethod
+    def f(name):
+        return name
+
+    def create_table(self, name, *elements, **kwargs):
+        Table(name, metadata, *elements, **kwargs).create(self.conn)
+
+    def create_index(self, name, table_name, columns, unique=False, **kwargs):
+        table = metadata.tables[table_name]
+        Index(name, *(table.c[column] for column in columns), unique=unique).create(self.conn)
+        self.indexes.append((name, table_name, tuple(columns)))
+
+
+def _load_migration(name: str, op: _MigrationOp) -> ModuleType:
+    # The module binds ``op`` at import; alembic itself need not be installed
+    alembic = ModuleType("alembic")
+    alembic.op = op
+    spec = importlib.util.spec_from_file_location(f"migration_{name}", BACKEND / "alembic" / "versions" / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    with mock.patch.dict(sys.modules, {"alembic": alembic}):
+        spec.loader.exec_module(module)
+    return module
+
+
+def _apply_migrations():
+    with create_engine("sqlite://").begin() as conn:
+        metadata.create_all(conn)
+        op = _MigrationOp(conn)
+        for name in MIGRATIONS:
+            _load_migration(name, op).upgrade()
+    return op.indexes
+
+
+MIGRATION_INDEXES = _apply_migrations()
+
+
+@pytest.fixture
+def tables():
+    return SimpleNamespace(**metadata.tables)
+
+
+@pytest.fixture
+def migration_indexes():
+    """``(name, table, columns)`` of every index the migrations in ``MIGRATIONS`` created."""
+    return list(MIGRATION_INDEXES)
+
+
+@pytest.fixture
+def db_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    metadata.create_all(engine)
+    yield engine
+    engine.dispose()
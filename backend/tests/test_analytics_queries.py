@@ -0,0 +1,82 @@
+"""
+Equivalence tests: SQL-side symptom frequency and nutrition totals must
+match the Python aggregation over the same rows (SQLite dialect).
+"""
+import random
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from backend.app.services.analytics_queries import nutrition_totals, symptom_frequency
+
+SYMPTOMS = ["Fever", "cough", "Headache", "sore throat", "fatigue", "nausea", "Chest Pain", "dizziness"]
+NOW = datetime.now(timezone.utc)
+
+
+def _spelling(rng: random.Random, symptom: str) -> str:
+    form = rng.random()
+    if form < 0.2:
+        return symptom.upper()
+    if form < 0.35:
+        return f"  {symptom} "
+    if form < 0.4:
+        return ""
+    return symptom
+
+
+def _seed(engine, tables, rng: random.Random, users=3, rows=400):
+    symptoms, nutrition = [], []
+    for _ in range(rows):
+        user_id = rng.randint(1, users)
+        picked = [_spelling(rng, s) for s in rng.sample(SYMPTOMS, rng.randint(1, 4))]
+        value = ",".join(picked) if rng.random() < 0.1 else picked  # legacy comma-separated rows
+        symptoms.append({"user_id": user_id, "symptoms": value, "timestamp": NOW})
+        nutrition.append({
+            "user_id": user_id,
+            "food_name": "meal",
+            "calories": rng.choice([None, rng.randint(50, 900) / 2]),
+            "protein": rng.choice([None, rng.randint(0, 80) / 2]),
+            "carbs": rng.randint(0, 200) / 2,
+            "fats": rng.choice([None, rng.randint(0, 60) / 2]),
+            "timestamp": NOW - timedelta(hours=rng.randint(0, 24 * 30)),
+        })
+    with engine.begin() as conn:
+        conn.execute(insert(tables.symptom_logs), symptoms)
+        conn.execute(insert(tables.nutrition_logs), nutrition)
+    return symptoms, nutrition
+
+
+def _expected_frequency(rows, user_id):
+    counter = Counter()
+    for row in rows:
+        if row["user_id"] != user_id:
+            continue
+        values = row["symptoms"] if isinstance(row["symptoms"], list) else row["symptoms"].split(",")
+        for symptom in values:
+            cleaned = symptom.strip().lower()
+            if cleaned:
+                counter[cleaned] += 1
+    return [{"symptom": s, "count": n} for s, n in sorted(counter.items(), key=lambda i: (-i[1], i[0]))]
+
+
+def test_symptom_frequency_matches_python(db_engine, tables):
+    symptoms, _ = _seed(db_engine, tables, random.Random(11))
+    with Session(db_engine) as db:
+        for user_id in (1, 2, 3, 99):
+            assert symptom_frequency(db, user_id) == _expected_frequency(symptoms, user_id)
+
+
+def test_nutrition_totals_match_python(db_engine, tables):
+    _, nutrition = _seed(db_engine, tables, random.Random(5))
+    with Session(db_engine) as db:
+        for user_id in (1, 2, 99):
+            for days in (1, 7, 30):
+                cutoff = NOW - timedelta(days=days)
+                rows = [r for r in nutrition if r["user_id"] == user_id and r["timestamp"] >= cutoff]
+                totals = nutrition_totals(db, user_id, cutoff)
+                assert totals["entries"] == len(rows)
+                for field in ("calories", "protein", "carbs", "fats"):
+                    assert totals[field] == sum(r[field] or 0 for r in rows)
+
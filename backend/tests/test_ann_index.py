@@ -0,0 +1,55 @@
+"""
+IVF index tests: recall against the brute-force cosine search on a
+MedQuAD-shaped corpus, returned scores equal to the exact TF-IDF cosines,
+and a saved index reused only for the corpus it was built from.
+"""
+import numpy as np
+import pytest
+from bench_medquad_ann import _queries, _recall, _synthetic_questions
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from backend.app.ml_models.ann_index import IVFIndex, corpus_fingerprint, exact_search
+
+
+@pytest.fixture(scope="module")
+def corpus():
+    questions = _synthetic_questions(3000, seed=7)
+    vectorizer = TfidfVectorizer(stop_words="english")
+    matrix = vectorizer.fit_transform(questions)
+    queries = [vectorizer.transform([q]) for q in _queries(questions, 200, seed=7)]
+    index = IVFIndex.build(matrix, fingerprint=corpus_fingerprint(questions)).attach_postings(matrix)
+    return questions, matrix, queries, index
+
+
+@pytest.mark.parametrize("n_probe", [1, 4, 8])
+def test_recall_against_brute_force(corpus, n_probe):
+    _, matrix, queries, index = corpus
+    exact = [exact_search(q, matrix, 5)[1] for q in queries]
+    approx = [index.search(q, matrix, 5, n_probe=n_probe)[1] for q in queries]
+    assert _recall(approx, exact, 1) >= 0.98
+    assert _recall(approx, exact, 5) >= 0.97
+
+
+def test_scores_are_exact_cosines(corpus):
+    _, matrix, queries, index = corpus
+    for q in queries[:50]:
+        ids, scores = index.search(q, matrix, 5)
+        expected = np.asarray((matrix[ids] @ q.T).todense()).ravel()
+        assert np.allclose(scores, expected)
+        assert list(scores) == sorted(scores, reverse=True)
+
+
+def test_saved_index_is_reused_only_for_its_corpus(corpus, tmp_path):
+    questions, matrix, queries, index = corpus
+    index.save(str(tmp_path))
+
+    loaded = IVFIndex.load(str(tmp_path), fingerprint=corpus_fingerprint(questions))
+    assert loaded is not None and isinstance(loaded.list_vectors, np.memmap)
+    loaded.attach_postings(matrix)
+    for q in queries[:20]:
+        ids, scores = loaded.search(q, matrix, 5)
+        expected_ids, expected_scores = index.search(q, matrix, 5)
+        assert np.array_equal(ids, expected_ids) and np.allclose(scores, expected_scores)
+
+    assert IVFIndex.load(str(tmp_path), fingerprint=corpus_fingerprint(questions[1:])) is None
+    assert IVFIndex.load(str(tmp_path / "missing")) is None
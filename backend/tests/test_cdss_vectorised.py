@@ -0,0 +1,78 @@
+"""
+Equivalence tests: the compiled CDSS scorer must return exactly what the
+per-disease Python loop returns.
+"""
+import random
+from types import SimpleNamespace
+
+from backend.app.services.cdss_engine import (
+    DISEASE_SYMPTOM_MATRIX,
+    _rank_differential_diagnosis_loop,
+    rank_differential_diagnosis,
+    rank_differential_diagnosis_batch,
+    rank_symptom_logs,
+)
+
+SYMPTOMS = sorted({s for weights in DISEASE_SYMPTOM_MATRIX.values() for s in weights})
+FAMILY = ["heart disease", "cardiac arrest", "diabetes", "asthma", "migraine", "hypertension crisis", "Stroke"]
+CONDITIONS = ["hypertension", "diabetes", "Hypertension", "asthma"]
+GENDERS = [None, "", "male", "Female ", "FEMALE", "other"]
+
+
+def _random_case(rng: random.Random) -> dict:
+    symptoms = []
+    for s in rng.sample(SYMPTOMS, rng.randint(1, 8)):
+        form = rng.random()
+        if form < 0.3:
+            s = s.replace("_", " ")
+        elif form < 0.4:
+            s = f"  {s.replace('_', ' ').title()} "
+        symptoms.append(s)
+    if rng.random() < 0.1:
+        symptoms.append("not a symptom")
+    return {
+        "symptoms": symptoms,
+        "age": rng.choice([None, 0, 8, 19, 30, 40, 52, 58, 70]),
+        "gender": rng.choice(GENDERS),
+        "existing_conditions": rng.sample(CONDITIONS, rng.randint(0, 2)) or rng.choice([None, []]),
+        "family_history": rng.sample(FAMILY, rng.randint(0, 2)) or rng.choice([None, []]),
+    }
+
+
+def test_random_cases_identical():
+    rng = random.Random(1234)
+    cases = [_random_case(rng) for _ in range(3000)]
+    expected = [_rank_differential_diagnosis_loop(**c) for c in cases]
+    assert rank_differential_diagnosis_batch(cases) == expected
+    for case, exp in zip(cases[:300], expected):
+        assert rank_differential_diagnosis(**case) == exp
+
+
+def test_edge_cases_identical():
+    cases = [
+        {"symptoms": []},
+        {"symptoms": ["unknown symptom"]},
+        {"symptoms": ["chest pain", "chest_pain", "CHEST PAIN"]},
+        {"symptoms": ["chest_pain", "sweating"], "age": 60, "gender": "male",
+         "existing_conditions": ["hypertension", "diabetes"], "family_history": ["heart disease"]},
+        {"symptoms": ["increased_thirst", "frequent_urination"], "family_history": ["Diabetes"]},
+    ]
+    for case in cases:
+        args = {"symptoms": case["symptoms"], **{k: v for k, v in case.items() if k != "symptoms"}}
+        assert rank_differential_diagnosis(**args) == _rank_differential_diagnosis_loop(**args)
+    assert rank_differential_diagnosis_batch([]) == []
+
+
+def test_symptom_logs_use_user_modifiers():
+    user = SimpleNamespace(age=62, gender="male", existing_conditions=["hypertension"])
+    logs = [
+        SimpleNamespace(id=1, user_id=7, symptoms=["chest_pain", "sweating"]),
+        SimpleNamespace(id=2, user_id=8, symptoms=["cough", "fever"]),
+        SimpleNamespace(id=3, user_id=7, symptoms=[]),
+    ]
+    rankings = rank_symptom_logs(logs, {7: user})
+    assert rankings[1] == _rank_differential_diagnosis_loop(
+        ["chest_pain", "sweating"], age=62, gender="male", existing_conditions=["hypertension"]
+    )
+    assert rankings[2] == _rank_differential_diagnosis_loop(["cough", "fever"])
+    assert rankings[3] == []
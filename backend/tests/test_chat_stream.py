@@ -0,0 +1,31 @@
+"""
+/chat/stream pipeline: event order, the local answer when OpenRouter is not
+configured, and the emergency short-circuit.
+"""
+import asyncio
+
+from backend.app.services.chat_stream import stream_chat
+
+
+def _events(message: str, **kwargs) -> list:
+    async def collect():
+        return [e async for e in stream_chat(None, message, profile={}, persist=False, **kwargs)]
+    return asyncio.run(collect())
+
+
+def test_health_stream_falls_back_to_local_answer():
+    events = _events("I have a headache, sore throat and a cough", session_id="s-1")
+    assert [name for name, _ in events] == ["triage", "differential", "token", "done"]
+    triage, differential, token, done = (data for _, data in events)
+    assert triage["session_id"] == "s-1" and not triage["is_emergency"]
+    assert {"headache", "sore_throat", "cough"} <= set(differential["symptoms"])
+    assert differential["differential"]
+    assert token["text"] == done["response"]
+    assert done["model_used"] == "chikitsak_v1_engine" and done["session_id"] == "s-1"
+    assert done["causes"][0]["name"] == differential["differential"][0]["condition"]
+
+
+def test_emergency_skips_clinical_stages():
+    events = _events("crushing chest pain spreading to my left arm")
+    assert [name for name, _ in events] == ["triage", "token", "done"]
+    assert events[0][1]["is_emergency"] and events[-1][1]["triage"] == "Emergency"
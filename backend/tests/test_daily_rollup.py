@@ -0,0 +1,155 @@
+"""
+Daily rollup tests: rollups maintained on write must agree with the raw
+logs (per the consistency checker), the dashboard totals must match a
+direct aggregation, and backfill must repair drift.
+"""
+import random
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import insert, text, update
+from sqlalchemy.orm import Session
+
+from backend.app.services import daily_rollup
+
+TODAY = date(2026, 10, 18)
+TRIAGE = ["Emergency", "Urgent", "Routine", "Self-care", "Unknown", None]
+
+
+def _log_events(db: Session, tables, rng: random.Random, events: int = 400) -> None:
+    """Write raw logs the way the logging endpoints do, rollup bump in the same transaction."""
+    sessions = {1: [], 2: []}
+    for _ in range(events):
+        user_id = rng.choice((1, 1, 2))
+        at = datetime.combine(TODAY, datetime.min.time()) - timedelta(minutes=rng.randint(0, 60 * 24 * 10))
+        kind = rng.choice(("symptom", "meal", "lab", "chat"))
+        if kind == "symptom":
+            triage = rng.choice(TRIAGE)
+            db.execute(insert(tables.symptom_logs).values(user_id=user_id, symptoms=["cough"], triage_level=triage,
+                                                          timestamp=at))
+            daily_rollup.record_symptom(db, user_id, triage, at)
+        elif kind == "meal":
+            calories = rng.choice([None, rng.randint(100, 900) / 4])
+            db.execute(insert(tables.nutrition_logs).values(user_id=user_id, food_name="meal", calories=calories,
+                                                            timestamp=at))
+            daily_rollup.record_meal(db, user_id, calories, at)
+        elif kind == "lab":
+            continue  # labs are written in order below, as they arrive in production
+        else:
+            if sessions[user_id] and rng.random() < 0.6:
+                session_id = rng.choice(sessions[user_id])
+            else:
+                session_id = f"s{user_id}-{len(sessions[user_id])}"
+                sessions[user_id].append(session_id)
+            # Messages arrive in time order; a session's first message must be its earliest
+            at = datetime.combine(TODAY, datetime.min.time()) + timedelta(seconds=rng.randint(0, 3600))
+            daily_rollup.record_chat_session(db, user_id, session_id, at)
+            db.execute(insert(tables.chat_history), [
+                {"user_id": user_id, "role": role, "session_id": session_id, "created_at": at}
+                for role in ("user", "assistant")
+            ])
+        db.commit()
+
+    start = datetime.combine(TODAY - timedelta(days=20), datetime.min.time())
+    for n in range(12):
+        at = start + timedelta(hours=n * 13)
+        summary = rng.choice(["All values normal", "Some abnormalities detected", None])
+        db.execute(insert(tables.lab_reports).values(user_id=1, report_name=f"lab-{n}",
+                                                     analysis_result={"summary": summary}, timestamp=at))
+        daily_rollup.record_lab_report(db, 1, f"lab-{n}", summary, at)
+        db.commit()
+
+
+def test_rollups_maintained_on_write_match_raw_logs(db_engine, tables):
+    with Session(db_engine) as db:
+        _log_events(db, tables, random.Random(3))
+        assert daily_rollup.check(db) == []
+        assert daily_rollup.check(db, user_id=2) == []
+
+
+def test_dashboard_totals_match_raw_aggregation(db_engine, tables):
+    nutrition, symptom_logs, chat = tables.nutrition_logs, tables.symptom_logs, tables.chat_history
+    with Session(db_engine) as db:
+        _log_events(db, tables, random.Random(8))
+        week_start = datetime.combine(TODAY - timedelta(days=6), datetime.min.time())
+        today_start = datetime.combine(TODAY, datetime.min.time())
+        for user_id in (1, 2):
+            totals = daily_rollup.dashboard_totals(db, user_id, TODAY)
+            meals = db.execute(
+                nutrition.select().where(nutrition.c.user_id == user_id, nutrition.c.timestamp >= today_start)
+            ).all()
+            assert totals["meals_today"] == len(meals)
+            assert abs(totals["calories_today"] - sum(m.calories or 0 for m in meals)) < 1e-9
+
+            symptoms = db.execute(
+                symptom_logs.select().where(symptom_logs.c.user_id == user_id, symptom_logs.c.timestamp >= week_start)
+            ).all()
+            expected = {name[len("symptoms_"):]: 0 for name in daily_rollup.SYMPTOM_COLUMNS}
+            for s in symptoms:
+                expected[daily_rollup.triage_column(s.triage_level)[len("symptoms_"):]] += 1
+            assert totals["symptoms"] == expected
+
+            chats = db.execute(chat.select().where(chat.c.user_id == user_id)).all()
+            assert totals["chat_sessions"] == len({c.session_id for c in chats})
+
+        # The latest lab is found even though it is older than the week window
+        lab = daily_rollup.dashboard_totals(db, 1, TODAY)["lab"]
+        assert lab["report_name"] == "lab-11" and lab["at"] < week_start
+        assert daily_rollup.dashboard_totals(db, 2, TODAY)["lab"] is None
+        assert daily_rollup.dashboard_totals(db, 99, TODAY)["meals_today"] == 0
+
+
+def test_backfill_repairs_drift(db_engine, tables):
+    rollups = tables.daily_rollups
+    with Session(db_engine) as db:
+        _log_events(db, tables, random.Random(5))
+        expected = daily_rollup.compute_rollups(db)
+
+        db.execute(update(rollups).where(rollups.c.user_id == 1).values(meals=rollups.c.meals + 1))
+        db.execute(rollups.delete().where(rollups.c.user_id == 2))
+        db.commit()
+        drift = daily_rollup.check(db)
+        assert {m["user_id"] for m in drift} == {1, 2}
+        assert all(m["actual"] == m["expected"] + 1 for m in drift if m["field"] == "meals" and m["user_id"] == 1)
+
+        assert daily_rollup.backfill(db, user_id=2) == sum(1 for uid, _ in expected if uid == 2)
+        assert {m["user_id"] for m in daily_rollup.check(db)} == {1}
+        assert daily_rollup.backfill(db) == len(expected)
+        assert daily_rollup.check(db) == []
+
+
+
+def test_chat_session_counted_once_without_a_read(db_engine, tables):
+    at = datetime.combine(TODAY, datetime.min.time())
+    with Session(db_engine) as db:
+        for session_id, new in (("a", True), ("b", False)):
+            for _ in range(3):
+                daily_rollup.record_chat_session(db, 1, session_id, at, new=new)
+                db.execute(insert(tables.chat_history).values(user_id=1, role="user", session_id=session_id,
+                                                              created_at=at))
+                db.commit()
+                new = False
+        assert daily_rollup.dashboard_totals(db, 1, TODAY)["chat_sessions"] == 2
+        assert daily_rollup.check(db) == []
+
+
+def test_backfill_if_empty_only_fills_an_empty_table(db_engine, tables):
+    with Session(db_engine) as db:
+        _log_events(db, tables, random.Random(4))
+        expected = daily_rollup.compute_rollups(db)
+        assert daily_rollup.backfill_if_empty(db) == 0
+
+        db.execute(tables.daily_rollups.delete())
+        db.commit()
+        assert daily_rollup.backfill_if_empty(db) == len(expected)
+        assert daily_rollup.check(db) == []
+
+
+def test_backfill_reads_the_initial_migration_chat_column(db_engine, tables):
+    # Databases built by the initial migration name chat_history's time column "timestamp"
+    with Session(db_engine) as db:
+        _log_events(db, tables, random.Random(6))
+        expected = daily_rollup.compute_rollups(db)
+        db.execute(text("ALTER TABLE chat_history RENAME COLUMN created_at TO timestamp"))
+        db.commit()
+        assert daily_rollup.compute_rollups(db) == expected
+        assert daily_rollup.backfill(db) == len(expected)
@@ -0,0 +1,142 @@
+"""
+Equivalence tests: the compiled drug interaction pair index must return
+exactly what the per-pair DataFrame scan returns, and its persisted form
+must be reused only for the CSV it was built from.
+"""
+import csv
+import os
+import pickle
+import random
+
+from bench_drug_interactions import scan_check_drug_interactions
+
+from backend.app.ml_models import drug_engine
+
+DRUGS = [
+    "Warfarin", "Aspirin", "Metoprolol", "Lisinopril", "Amlodipine", "Atorvastatin", "Metformin",
+    "Omeprazole", "Levothyroxine", "Furosemide", "Clopidogrel", "Digoxin", "Simvastatin",
+    "Gabapentin", "Donepezil", "Sertraline", "Tamsulosin", "Hydrochlorothiazide", "Potassium Chloride",
+    "Insulin Glargine", "Prednisone", "Allopurinol", "Tramadol", "Alendronate", "Citalopram",
+]
+SEVERITIES = ["Minor", "Moderate", "Major"]
+
+
+def _write_csv(path: str, rng: random.Random, rows: int = 400, severity: bool = True) -> None:
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow([" Drug1", "Drug2 ", "Interaction"] + (["Severity"] if severity else []))
+        for n in range(rows):
+            d1, d2 = rng.sample(DRUGS, 2)
+            if rng.random() < 0.3:
+                d1 = d1.upper()
+            if rng.random() < 0.3:
+                d2 = d2.lower()
+            writer.writerow([d1, d2, f"interaction #{n}"] + ([rng.choice(SEVERITIES)] if severity else []))
+        writer.writerow(["Aspirin", "aspirin", "self-pair"] + (["Minor"] if severity else []))
+        writer.writerow(["", "Warfarin", "missing name"] + (["Major"] if severity else []))
+
+
+class _Dataset:
+    """Point drug_engine at a throwaway CSV and artifact path in ``directory`` for one test."""
+
+    def __init__(self, directory, **csv_kwargs):
+        self.dir = str(directory)
+        self.csv_kwargs = csv_kwargs
+
+    def __enter__(self):
+        os.makedirs(self.dir, exist_ok=True)
+        self.saved = (drug_engine.DRUG_PATH, drug_engine.DRUG_ARTIFACT_PATH)
+        drug_engine.DRUG_PATH = os.path.join(self.dir, "db_drug_interactions.csv")
+        drug_engine.DRUG_ARTIFACT_PATH = os.path.join(self.dir, "artifacts", "drug_interactions.pkl")
+        _write_csv(drug_engine.DRUG_PATH, random.Random(7), **self.csv_kwargs)
+        drug_engine._index = None
+        return self
+
+    def __exit__(self, *exc):
+        drug_engine.DRUG_PATH, drug_engine.DRUG_ARTIFACT_PATH = self.saved
+        drug_engine._index = None
+
+
+def _scan(meds):
+    return scan_check_drug_interactions(drug_engine._read_drug_df(), meds)
+
+
+def _random_lists(rng: random.Random, n: int):
+    for _ in range(n):
+        meds = rng.sample(DRUGS, rng.randint(0, 15))
+        meds = [m.upper() if rng.random() < 0.2 else m for m in meds]
+        if meds and rng.random() < 0.2:
+            meds.append(rng.choice(meds))  # duplicate entry
+        if rng.random() < 0.1:
+            meds.append("Not A Drug")
+        yield meds
+
+
+def test_index_matches_scan(tmp_path):
+    with _Dataset(tmp_path):
+        rng = random.Random(42)
+        for meds in _random_lists(rng, 60):
+            assert drug_engine.check_drug_interactions(meds) == _scan(meds)
+        assert drug_engine.check_drug_interactions(["aspirin", "ASPIRIN"])["details"][0]["interaction"] == "self-pair"
+
+
+def test_index_matches_scan_without_severity_column(tmp_path):
+    with _Dataset(tmp_path, severity=False):
+        for meds in _random_lists(random.Random(3), 15):
+            expected = _scan(meds)
+            assert drug_engine.check_drug_interactions(meds) == expected
+        details = drug_engine.check_drug_interactions(DRUGS)["details"]
+        assert details and all(d["severity"] == "Unknown" for d in details)
+
+
+def test_whitespace_is_normalised_and_missing_data_reported(tmp_path):
+    with _Dataset(tmp_path / "present"):
+        clean = drug_engine.check_drug_interactions(DRUGS)
+        padded = drug_engine.check_drug_interactions([f"  {d.replace(' ', '  ')} " for d in DRUGS])
+        assert [(d["interaction"], d["severity"]) for d in padded["details"]] == \
+               [(d["interaction"], d["severity"]) for d in clean["details"]]
+
+    with _Dataset(tmp_path / "missing"):
+        os.remove(drug_engine.DRUG_PATH)
+        assert drug_engine.check_drug_interactions(["Warfarin", "Aspirin"])["details"] == []
+
+
+def test_persisted_index_is_reused_and_rebuilt_on_change(tmp_path):
+    with _Dataset(tmp_path):
+        expected = drug_engine.check_drug_interactions(DRUGS)
+        assert os.path.exists(drug_engine.DRUG_ARTIFACT_PATH)
+
+        # A fresh process loads the artifact without reading the CSV through pandas
+        drug_engine._index = None
+        read = drug_engine._read_drug_df
+        drug_engine._read_drug_df = lambda: (_ for _ in ()).throw(AssertionError("CSV re-parsed"))
+        try:
+            assert drug_engine.check_drug_interactions(DRUGS) == expected
+        finally:
+            drug_engine._read_drug_df = read
+
+        # A changed CSV invalidates the artifact
+        with open(drug_engine.DRUG_PATH, "a", newline="", encoding="utf-8") as f:
+            csv.writer(f).writerow(["Zolpidem", "Tramadol", "new row", "Major"])
+        drug_engine._index = None
+        details = drug_engine.check_drug_interactions(["Zolpidem", "Tramadol"])["details"]
+        assert details and details[0]["interaction"] == "new row"
+
+
+def test_unreadable_artifact_is_rebuilt(tmp_path):
+    corrupt = [
+        b"",                                       # truncated
+        b"not a pickle",
+        pickle.dumps(["a", "list"]),               # no .get
+        pickle.dumps({"version": drug_engine.INDEX_VERSION}),  # no fingerprint/index
+        b"cno_such_module\nThing\n.",              # class from a module that is gone
+    ]
+    with _Dataset(tmp_path):
+        expected = drug_engine.check_drug_interactions(DRUGS)
+        for payload in corrupt:
+            with open(drug_engine.DRUG_ARTIFACT_PATH, "wb") as f:
+                f.write(payload)
+            drug_engine._index = None
+            assert drug_engine.check_drug_interactions(DRUGS) == expected
+            with open(drug_engine.DRUG_ARTIFACT_PATH, "rb") as f:
+                assert pickle.load(f)["index"]  # rewritten
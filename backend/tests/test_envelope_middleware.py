@@ -0,0 +1,134 @@
+"""
+Envelope middleware tests: every JSON response leaves the app wrapped
+exactly once — EnvelopeResponse bodies and bodies that already follow the
+envelope contract pass through untouched — with the same JSON the previous
+BaseHTTPMiddleware wrapper produced, while non-JSON responses and event
+streams are forwarded chunk by chunk.
+"""
+import asyncio
+import json
+
+import pytest
+from bench_envelope_middleware import LegacyResponseWrapperMiddleware
+from fastapi import APIRouter, FastAPI, HTTPException
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from backend.app import middleware
+from backend.app.exception_handlers import register_exception_handlers
+from backend.app.responses import ENVELOPE_HEADER, EnvelopeResponse, envelope
+
+PAYLOAD = {"health_score": 78, "confidence": 0.9, "recent": [{"symptoms": ["cough"], "at": None}]}
+WRAPPED = {"status": "success", "data": [1, 2], "message": "already wrapped"}
+
+
+def _json_chunks(*chunks: bytes) -> StreamingResponse:
+    return StreamingResponse(iter(chunks), media_type="application/json")
+
+
+def _app(wrapper=middleware.ResponseWrapperMiddleware) -> FastAPI:
+    plain = APIRouter()
+    enveloped = APIRouter(prefix="/v2", default_response_class=EnvelopeResponse)
+
+    @plain.get("/summary")
+    @enveloped.get("/summary")
+    def summary():
+        return PAYLOAD
+
+    @plain.get("/wrapped")
+    def wrapped():
+        return WRAPPED
+
+    @plain.get("/missing")
+    @enveloped.get("/missing")
+    def missing():
+        raise HTTPException(status_code=404, detail="No report found")
+
+    @plain.get("/chunked")
+    def chunked():
+        body = json.dumps(PAYLOAD).encode()
+        return _json_chunks(body[:10], body[10:30], body[30:])
+
+    @plain.get("/invalid")
+    def invalid():
+        return _json_chunks(b"{not json")
+
+    @plain.get("/text")
+    def text():
+        return PlainTextResponse("ok")
+
+    app = FastAPI()
+    app.include_router(plain)
+    app.include_router(enveloped)
+    register_exception_handlers(app)
+    app.add_middleware(wrapper)
+    return app
+
+
+@pytest.fixture
+def client():
+    return TestClient(_app())
+
+
+def test_envelope_responses_are_forwarded_untouched(client, monkeypatch):
+    def reparsed(*args):
+        raise AssertionError("EnvelopeResponse body was re-parsed")
+
+    monkeypatch.setattr(middleware, "_wrap_body", reparsed)
+    response = client.get("/v2/summary")
+    assert response.json() == envelope(PAYLOAD, 200)
+    assert ENVELOPE_HEADER not in response.headers
+    assert int(response.headers["content-length"]) == len(response.content)
+
+
+def test_plain_json_is_wrapped_once(client):
+    response = client.get("/summary")
+    assert response.json() == {"status": "success", "data": PAYLOAD, "message": "OK", "confidence": 0.9}
+    assert int(response.headers["content-length"]) == len(response.content)
+    assert client.get("/chunked").json() == response.json()
+
+
+def test_already_wrapped_and_invalid_bodies_pass_through(client):
+    assert client.get("/wrapped").json() == WRAPPED
+    assert client.get("/invalid").content == b"{not json"
+
+
+@pytest.mark.parametrize("path", ["/missing", "/v2/missing"])
+def test_errors_are_wrapped_once(client, path):
+    response = client.get(path)
+    assert response.status_code == 404
+    assert response.json() == {"status": "error", "data": None, "message": "No report found"}
+
+
+def test_docs_and_non_json_are_not_wrapped(client):
+    assert client.get("/text").text == "ok"
+    assert "openapi" in client.get("/openapi.json").json()
+
+
+def test_event_stream_is_forwarded_chunk_by_chunk():
+    chunks = [b"event: token\ndata: {}\n\n"] * 3
+    sent = []
+
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200,
+                    "headers": [(b"content-type", b"text/event-stream")]})
+        for chunk in chunks:
+            await send({"type": "http.response.body", "body": chunk, "more_body": True})
+            assert sent[-1]["body"] == chunk  # reached the client before the next one is produced
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "path": "/chat/stream", "method": "POST", "headers": []}
+    asyncio.run(middleware.ResponseWrapperMiddleware(app)(scope, None, send))
+    assert [m.get("body") for m in sent[1:]] == chunks + [b""]
+
+
+# Not "/invalid": the old wrapper drained the stream and then returned it empty
+@pytest.mark.parametrize("path", ["/summary", "/wrapped", "/missing", "/chunked", "/text"])
+def test_matches_previous_middleware(client, path):
+    legacy = TestClient(_app(LegacyResponseWrapperMiddleware)).get(path)
+    response = client.get(path)
+    assert response.status_code == legacy.status_code
+    assert response.content == legacy.content
@@ -0,0 +1,137 @@
+"""
+Concurrent full-health orchestrator: a stage that overruns its timeout or
+raises is left out of the result and reported under ``stage_errors``
+without holding up the others, the safety stage runs on a session of its
+own, and translation happens off the event loop.
+"""
+import asyncio
+import threading
+import time
+
+import pytest
+
+from backend.app import database
+from backend.app.services import health_orchestrator
+
+
+def _sleep_then(value, seconds):
+    def fn(*_):
+        time.sleep(seconds)
+        return value
+    return fn
+
+
+@pytest.fixture
+def engines(monkeypatch):
+    """Replace every engine with a fast stub; tests slow down or break the ones they need."""
+    stubs = {
+        "run_health_engine": lambda symptoms, query: {"predicted_disease": "Migraine"},
+        "calculate_severity": lambda symptoms: {"total_severity_score": 9, "triage_level": "Routine"},
+        "analyze_lab_report": lambda values: {"summary": "All values normal"},
+        "check_drug_interactions": lambda meds: {"details": []},
+        "run_safety_check": lambda db, user_id, meds: {"flags": [], "summary": "ok"},
+        "analyze_mental_state": lambda text: {"emotion": "neutral"},
+        "analyze_food": lambda food: {"calories": 120},
+        "get_region_alerts": lambda location: [],
+    }
+    for name, stub in stubs.items():
+        monkeypatch.setattr(health_orchestrator, name, stub)
+    return stubs
+
+
+PAYLOAD = {"symptoms": ["headache", "nausea"], "lab_values": {"hb": 13.5}, "food": "apple", "language": "en"}
+
+
+def test_timed_out_stage_is_reported_and_skipped(engines, monkeypatch):
+    monkeypatch.setattr(health_orchestrator, "calculate_severity", _sleep_then({"triage_level": "Urgent"}, 0.5))
+    start = time.perf_counter()
+    result = asyncio.run(health_orchestrator.run_full_health_analysis_async(
+        1, dict(PAYLOAD), timeout=0.1, include_timings=True
+    ))
+    assert time.perf_counter() - start < 0.4
+    assert result["stage_errors"] == {"severity": "timeout"}
+    assert result["health_triage"]["disease_prediction"] == "Migraine"
+    assert result["health_triage"]["triage_level"] is None
+    assert result["lab_analysis"] == {"summary": "All values normal"}
+    assert result["timings"]["stages"]["severity"] == {"status": "timeout"}
+    assert result["timings"]["stages"]["lab"]["status"] == "ok"
+
+
+def test_failed_stage_is_reported_and_skipped(engines, monkeypatch):
+    def broken(values):
+        raise ValueError("unreadable report")
+
+    monkeypatch.setattr(health_orchestrator, "analyze_lab_report", broken)
+    result = asyncio.run(health_orchestrator.run_full_health_analysis_async(1, dict(PAYLOAD)))
+    assert result["stage_errors"] == {"lab": "error: unreadable report"}
+    assert "lab_analysis" not in result
+    assert result["nutrition_analysis"] == {"calories": 120}
+
+
+def test_no_stage_errors_when_all_stages_finish(engines):
+    result = asyncio.run(health_orchestrator.run_full_health_analysis_async(1, dict(PAYLOAD)))
+    expected = health_orchestrator.run_full_health_analysis(None, 1, dict(PAYLOAD))
+    assert result == expected and "stage_errors" not in result
+
+
+def test_safety_stage_opens_and_closes_its_own_session(engines, monkeypatch):
+    sessions = []
+
+    class FakeSession:
+        closed = False
+
+        def close(self):
+            self.closed = True
+
+    def session_local():
+        sessions.append(FakeSession())
+        return sessions[-1]
+
+    seen = []
+    finished = threading.Event()
+
+    def slow_safety_check(db, user_id, meds):
+        time.sleep(0.3)
+        seen.append((db, db.closed))
+        finished.set()
+        return {"flags": ["late"]}
+
+    monkeypatch.setattr(database, "SessionLocal", session_local)
+    monkeypatch.setattr(health_orchestrator, "run_safety_check", slow_safety_check)
+    result = asyncio.run(health_orchestrator.run_full_health_analysis_async(
+        7, {"medications": ["Warfarin", "Aspirin"]}, timeout=0.05
+    ))
+    assert result["stage_errors"] == {"safety": "timeout"}
+    assert result["medication_analysis"]["safety_flags"] == []
+
+    # The timed-out stage kept running on a session nobody else had closed, then closed it
+    assert finished.wait(5)
+    _wait_for(lambda: sessions and sessions[0].closed)
+    assert seen == [(sessions[0], False)]
+
+
+def test_translation_runs_off_the_event_loop(engines, monkeypatch):
+    threads = []
+
+    def translate(text, language):
+        threads.append(threading.current_thread())
+        return f"[{language}] {text}"
+
+    monkeypatch.setattr(health_orchestrator, "translate_to_english", translate)
+    monkeypatch.setattr(health_orchestrator, "translate_from_english", translate)
+
+    async def analyze():
+        return threading.current_thread(), await health_orchestrator.run_full_health_analysis_async(
+            1, {"food": "seb", "language": "hi"}
+        )
+
+    loop_thread, result = asyncio.run(analyze())
+    assert threads and loop_thread not in threads
+    assert result["nutrition_analysis"] == {"calories": 120}
+
+
+def _wait_for(predicate, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.01)
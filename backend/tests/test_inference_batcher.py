@@ -0,0 +1,90 @@
+"""
+Micro-batcher: concurrent requests share one forward pass and each gets its
+own softmax row, a failed pass reaches every waiter, and a request that
+times out while queued is cancelled before it reaches the model.
+"""
+import threading
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from types import SimpleNamespace
+
+import pytest
+import torch
+
+from backend.app.services.inference_batcher import MicroBatcher
+
+
+def _model():
+    torch.manual_seed(0)
+    return torch.nn.Sequential(torch.nn.Flatten(), torch.nn.Linear(12, 4)).eval()
+
+
+def _images(n: int):
+    return [torch.rand(3, 2, 2) for _ in range(n)]
+
+
+def _hold_first_batch(batcher: MicroBatcher):
+    """Record each batch size; keep the first batch in the model until ``release`` is set."""
+    gate = SimpleNamespace(started=threading.Event(), release=threading.Event(), sizes=[])
+    forward = batcher._forward
+
+    def held(tensors):
+        gate.sizes.append(len(tensors))
+        if len(gate.sizes) == 1:
+            gate.started.set()
+            gate.release.wait(5)
+        return forward(tensors)
+
+    batcher._forward = held
+    return gate
+
+
+def test_queued_requests_share_a_forward_pass():
+    model = _model()
+    batcher = MicroBatcher("test", lambda: model, max_batch_size=8, max_wait_ms=50)
+    gate = _hold_first_batch(batcher)
+    images = _images(9)
+
+    first = batcher.submit(images[0])
+    assert gate.started.wait(5)
+    rest = [batcher.submit(image) for image in images[1:]]  # queue up behind the busy worker
+    gate.release.set()
+
+    rows = [future.result(timeout=5) for future in [first] + rest]
+    with torch.no_grad():
+        for image, row in zip(images, rows):
+            assert torch.allclose(row, torch.softmax(model(image.unsqueeze(0)), dim=1)[0], atol=1e-6)
+    assert gate.sizes == [1, 8]
+    stats = batcher.stats()
+    assert stats["requests"] == 9 and stats["batch_size_histogram"] == {1: 1, 8: 1}
+
+
+def test_failed_pass_reaches_every_waiter():
+    def missing_weights():
+        raise RuntimeError("weights missing")
+
+    batcher = MicroBatcher("broken", missing_weights, max_batch_size=4, max_wait_ms=20)
+    futures = [batcher.submit(image) for image in _images(3)]
+    for future in futures:
+        with pytest.raises(RuntimeError, match="weights missing"):
+            future.result(timeout=5)
+    assert batcher.stats()["errors"] == 3
+
+
+def test_timed_out_request_never_reaches_the_model():
+    model = _model()
+    batcher = MicroBatcher("test", lambda: model, max_batch_size=8, max_wait_ms=20)
+    gate = _hold_first_batch(batcher)
+    first_image, late_image, next_image = _images(3)
+
+    first = batcher.submit(first_image)
+    assert gate.started.wait(5)
+    with pytest.raises(FutureTimeoutError):
+        batcher.infer(late_image, timeout=0.05)
+    following = batcher.submit(next_image)
+    gate.release.set()
+
+    first.result(timeout=5)
+    following.result(timeout=5)
+    assert gate.sizes == [1, 1]  # the second batch held only the request still waiting
+    stats = batcher.stats()
+    assert stats["timeouts"] == 1 and stats["requests"] == 2
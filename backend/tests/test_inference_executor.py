@@ -0,0 +1,103 @@
+"""
+Inference executor: blocking calls run on the pool rather than the event
+loop, admission stops at workers + queue with InferenceQueueFull, and a
+route that maps it to 503 sends Retry-After through the app's exception
+handler and response envelope.
+"""
+import asyncio
+import threading
+import time
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from backend.app.exception_handlers import register_exception_handlers
+from backend.app.middleware import ResponseWrapperMiddleware
+from backend.app.services.inference_executor import InferenceExecutor, InferenceQueueFull
+
+
+@pytest.fixture
+def executor():
+    executor = InferenceExecutor(max_workers=1, max_queue=1, retry_after=7)
+    yield executor
+    executor.shutdown()
+
+
+def _fill(executor: InferenceExecutor, loop: asyncio.AbstractEventLoop, release: threading.Event):
+    """Occupy the worker and the one queue slot with calls blocked on ``release``."""
+    return [asyncio.run_coroutine_threadsafe(executor.run(release.wait, 5), loop) for _ in range(2)]
+
+
+@pytest.fixture
+def loop():
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    yield loop
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(5)
+    loop.close()
+
+
+def _wait_for(predicate, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.01)
+
+
+def test_runs_off_the_event_loop(executor):
+    async def call():
+        return await executor.run(lambda: threading.current_thread().name), threading.current_thread().name
+
+    worker, caller = asyncio.run(call())
+    assert worker.startswith("inference") and worker != caller
+    assert executor.stats()["completed"] == 1 and executor.stats()["in_flight"] == 0
+
+
+def test_admission_stops_at_workers_plus_queue(executor, loop):
+    release = threading.Event()
+    blocked = _fill(executor, loop, release)
+    try:
+        _wait_for(lambda: executor.stats()["in_flight"] == 2)
+        with pytest.raises(InferenceQueueFull) as rejected:
+            asyncio.run(executor.run(lambda: "never runs"))
+        assert rejected.value.retry_after == 7
+        stats = executor.stats()
+        assert stats["queued"] == 1 and stats["rejected"] == 1
+    finally:
+        release.set()
+    assert [future.result(5) for future in blocked] == [True, True]
+    _wait_for(lambda: executor.stats()["in_flight"] == 0)
+    assert asyncio.run(executor.run(lambda: "admitted")) == "admitted"  # capacity freed
+
+
+def test_full_queue_answers_503_with_retry_after(executor, loop):
+    app = FastAPI()
+    register_exception_handlers(app)
+    app.add_middleware(ResponseWrapperMiddleware)
+
+    @app.post("/predict/xray")
+    async def predict():
+        # The shape of the /predict and /image-analysis handlers
+        try:
+            return await executor.run(lambda: {"prediction": "Normal"})
+        except InferenceQueueFull as e:
+            raise HTTPException(status_code=503, detail="Prediction service is busy. Please retry shortly.",
+                                headers={"Retry-After": str(e.retry_after)})
+
+    client = TestClient(app)
+    assert client.post("/predict/xray").json()["data"] == {"prediction": "Normal"}
+
+    release = threading.Event()
+    blocked = _fill(executor, loop, release)
+    try:
+        _wait_for(lambda: executor.stats()["in_flight"] == 2)
+        busy = client.post("/predict/xray")
+        assert busy.status_code == 503 and busy.headers["Retry-After"] == "7"
+        assert busy.json()["status"] == "error" and "busy" in busy.json()["message"]
+    finally:
+        release.set()
+    for future in blocked:
+        future.result(5)
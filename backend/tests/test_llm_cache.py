@@ -0,0 +1,172 @@
+"""
+LLM response cache: LRU bound, TTL, single-flight across threads and
+coroutines, and the shared SQLite store.
+"""
+import asyncio
+import threading
+import time
+
+from backend.app.services import openrouter_service
+from backend.app.services import llm_cache
+from backend.app.services.llm_cache import LLMResponseCache, SQLiteCacheStore
+
+
+def test_lru_eviction_and_ttl():
+    cache = LLMResponseCache(max_entries=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1          # "a" is now most recently used
+    cache.set("c", 3)                   # evicts "b"
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+
+    cache.ttl = 0.05
+    cache.set("d", 4)
+    time.sleep(0.1)
+    assert cache.get("d") is None
+    stats = cache.stats()
+    assert stats["evictions"] == 2 and stats["expirations"] == 1 and stats["size"] <= 2
+
+
+def test_errors_are_not_cached():
+    cache = LLMResponseCache()
+    calls = []
+
+    def call():
+        calls.append(1)
+        return {"status": "error"}
+
+    for _ in range(3):
+        cache.get_or_call("k", call, lambda r: r["status"] == "success")
+    assert len(calls) == 3
+
+
+def test_single_flight_threads():
+    cache = LLMResponseCache()
+    calls = []
+    release = threading.Event()
+
+    def slow_call():
+        calls.append(1)
+        release.wait(5)
+        return {"status": "success", "n": len(calls)}
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_call("k", slow_call))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    time.sleep(0.2)
+    release.set()
+    for t in threads:
+        t.join()
+    assert len(calls) == 1
+    assert results == [{"status": "success", "n": 1}] * 8
+    stats = cache.stats()
+    assert stats["misses"] == 1 and stats["coalesced"] + stats["hits"] == 7
+
+
+def test_single_flight_async():
+    cache = LLMResponseCache()
+    calls = []
+
+    async def slow_call():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {"status": "success"}
+
+    async def main():
+        return await asyncio.gather(*(cache.aget_or_call("k", slow_call) for _ in range(20)))
+
+    results = asyncio.run(main())
+    assert len(calls) == 1 and len(results) == 20
+    assert cache.stats()["coalesced"] == 19
+
+
+def test_cancelled_leader_does_not_fail_waiters():
+    cache = LLMResponseCache()
+    calls = []
+
+    async def slow_call():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {"status": "success"}
+
+    async def main():
+        leader = asyncio.ensure_future(cache.aget_or_call("k", slow_call))
+        await asyncio.sleep(0.01)
+        follower = asyncio.ensure_future(cache.aget_or_call("k", slow_call))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        return await follower
+
+    assert asyncio.run(main()) == {"status": "success"}
+    assert len(calls) == 2
+
+
+def test_shared_sqlite_store(tmp_path):
+    path = str(tmp_path / "llm_cache.db")
+    worker_a = LLMResponseCache(store=SQLiteCacheStore(path, max_entries=10))
+    worker_b = LLMResponseCache(store=SQLiteCacheStore(path, max_entries=10))
+    worker_a.set("triage_fever", {"status": "success", "response": "rest"})
+    assert worker_b.get("triage_fever") == {"status": "success", "response": "rest"}
+    assert worker_b.stats()["shared_hits"] == 1
+    assert worker_b.get("triage_fever") is not None
+    assert worker_b.stats()["hits"] == 1  # second read served from the local LRU
+
+    store = worker_a.store
+    for i in range(20):
+        store.set(f"k{i}", time.time() + 60 + i, {"i": i})
+    store.sweep(time.time())
+    count = store._conn().execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+    assert count == 10
+
+
+def test_async_shared_store_io_runs_off_the_loop(tmp_path):
+    path = str(tmp_path / "llm_cache.db")
+    store = SQLiteCacheStore(path, max_entries=10)
+    threads = []
+
+    def recorded(method):
+        def wrapper(*args):
+            threads.append(threading.current_thread())
+            return method(*args)
+        return wrapper
+
+    store.get, store.set = recorded(store.get), recorded(store.set)
+
+    async def call():
+        return {"status": "success"}
+
+    async def main():
+        await LLMResponseCache(store=store).aget_or_call("k", call)
+        # Another worker: served from the shared store
+        other = LLMResponseCache(store=store)
+        return threading.current_thread(), await other.aget_or_call("k", call), other.stats()
+
+    loop_thread, value, stats = asyncio.run(main())
+    assert value == {"status": "success"} and stats["shared_hits"] == 1
+    assert len(threads) == 3 and loop_thread not in threads
+
+
+def test_openrouter_sync_uses_cache():
+    original_key = openrouter_service.settings.OPENROUTER_API_KEY
+    original_post = openrouter_service._post_openrouter_sync
+    original_cache = llm_cache._cache
+    calls = []
+
+    def fake_post(prompt, system_prompt, temperature, max_tokens):
+        calls.append(prompt)
+        return {"status": "success", "response": prompt, "model": "stub", "confidence": 0.8}
+
+    try:
+        openrouter_service.settings.OPENROUTER_API_KEY = "sk-or-v1-test"
+        openrouter_service._post_openrouter_sync = fake_post
+        llm_cache._cache = LLMResponseCache()
+        first = openrouter_service.call_openrouter_sync("fever", cache_key="triage_fever")
+        second = openrouter_service.call_openrouter_sync("fever", cache_key="triage_fever")
+        openrouter_service.call_openrouter_sync("fever")  # no key: never cached
+        assert first == second and calls == ["fever", "fever"]
+    finally:
+        openrouter_service.settings.OPENROUTER_API_KEY = original_key
+        openrouter_service._post_openrouter_sync = original_post
+        llm_cache._cache = original_cache
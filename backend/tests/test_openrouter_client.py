@@ -0,0 +1,236 @@
+"""
+Pooled OpenRouter client against a local stub server: connection reuse,
+jittered retries on 429/5xx, the circuit breaker, and the sync bridge onto
+the lifespan loop.
+"""
+import asyncio
+import threading
+from collections import deque
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+from aiohttp import web
+
+from backend.app.services import openrouter_client
+from backend.app.services.openrouter_client import (
+    CircuitBreaker,
+    CircuitOpenError,
+    OpenRouterClient,
+    UpstreamUnavailable,
+    backoff_delay,
+)
+
+COMPLETION = {"model": "stub/model", "choices": [{"message": {"content": "rest and fluids"}}], "usage": {}}
+
+
+class StubServer:
+    """Chat-completions stub on a background loop; replies follow ``script`` then 200."""
+
+    def __init__(self):
+        self.script = deque()
+        self.peers = []
+        self.requests = 0
+        self._loop = asyncio.new_event_loop()
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    async def _handle(self, request):
+        self.requests += 1
+        self.peers.append(request.transport.get_extra_info("peername")[1])
+        payload = await request.json()
+        if self.script:
+            status, headers = self.script.popleft()
+            return web.Response(status=status, text="upstream busy", headers=headers)
+        if payload.get("stream"):
+            response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+            await response.prepare(request)
+            await response.write(b": OPENROUTER PROCESSING\n\n")
+            for word in ("rest ", "and ", "fluids"):
+                await response.write(b'data: {"choices":[{"delta":{"content":"' + word.encode() + b'"}}]}\n\n')
+            await response.write(b"data: [DONE]\n\n")
+            return response
+        return web.json_response(COMPLETION)
+
+    def _run(self):
+        asyncio.set_event_loop(self._loop)
+        app = web.Application()
+        app.router.add_post("/api/v1/chat/completions", self._handle)
+        self._runner = web.AppRunner(app)
+        self._loop.run_until_complete(self._runner.setup())
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        self._loop.run_until_complete(site.start())
+        self.base_url = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}/api/v1"
+        self._ready.set()
+        self._loop.run_forever()
+
+    def __enter__(self):
+        self._thread.start()
+        self._ready.wait(5)
+        return self
+
+    def __exit__(self, *exc):
+        asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self._loop).result(5)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(5)
+
+
+def _client(server, **kwargs) -> OpenRouterClient:
+    kwargs.setdefault("backoff_base", 0.01)
+    return OpenRouterClient(server.base_url, "sk-test", timeout=5, **kwargs)
+
+
+def test_pooled_session_reuses_connections():
+    async def main(server):
+        client = _client(server)
+        await client.start()
+        try:
+            for _ in range(5):
+                status, body = await client.post_chat({"messages": []})
+                assert status == 200 and body == COMPLETION
+        finally:
+            await client.close()
+
+    with StubServer() as server:
+        asyncio.run(main(server))
+        assert server.requests == 5
+        assert len(set(server.peers)) == 1  # one keep-alive connection for all calls
+
+
+def test_retries_429_and_5xx_then_succeeds():
+    async def main(server):
+        client = _client(server, max_retries=3)
+        await client.start()
+        try:
+            return await client.post_chat({"messages": []}), client.stats()
+        finally:
+            await client.close()
+
+    with StubServer() as server:
+        server.script.extend([(503, {}), (429, {"Retry-After": "0"}), (502, {})])
+        (status, body), stats = asyncio.run(main(server))
+        assert status == 200 and body == COMPLETION
+        assert server.requests == 4 and stats["retries"] == 3
+        assert stats["breaker"]["state"] == "closed"
+
+
+def test_retries_exhausted_returns_last_error():
+    with StubServer() as server:
+        server.script.extend([(500, {})] * 3)
+        client = _client(server, max_retries=1)
+        status, body = client.post_chat_sync({"messages": []})  # requests fallback path
+        assert status == 500 and body == "upstream busy"
+        assert server.requests == 2
+
+
+def test_circuit_breaker_short_circuits():
+    async def main(server):
+        client = _client(server, max_retries=0, breaker=CircuitBreaker(failure_threshold=2, reset_timeout=0.2))
+        await client.start()
+        try:
+            for _ in range(2):
+                assert (await client.post_chat({}))[0] == 503
+            try:
+                await client.post_chat({})
+                raise AssertionError("expected CircuitOpenError")
+            except CircuitOpenError:
+                pass
+            assert server.requests == 2
+            await asyncio.sleep(0.25)   # half-open: one probe goes through and closes it
+            assert (await client.post_chat({}))[0] == 200
+            return client.breaker.stats()
+        finally:
+            await client.close()
+
+    with StubServer() as server:
+        server.script.extend([(503, {})] * 2)
+        stats = asyncio.run(main(server))
+        assert stats["state"] == "closed" and stats["trips"] == 1 and stats["rejected"] == 1
+
+
+def test_connection_errors_raise_upstream_unavailable():
+    client = OpenRouterClient("http://127.0.0.1:9/api/v1", "sk-test", timeout=1, max_retries=1, backoff_base=0.01)
+    try:
+        asyncio.run(client.post_chat({}))
+        raise AssertionError("expected UpstreamUnavailable")
+    except UpstreamUnavailable:
+        pass
+    assert client.breaker.stats()["consecutive_failures"] == 1
+
+
+def test_sync_calls_share_the_lifespan_pool():
+    with StubServer() as server:
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=loop.run_forever, daemon=True)
+        thread.start()
+        client = _client(server, max_concurrency=2)
+        asyncio.run_coroutine_threadsafe(client.start(), loop).result(5)
+        try:
+            results = []
+            workers = [
+                threading.Thread(target=lambda: results.append(client.post_chat_sync({})[0]))
+                for _ in range(6)
+            ]
+            for w in workers:
+                w.start()
+            for w in workers:
+                w.join(10)
+            assert results == [200] * 6
+            assert len(set(server.peers)) <= 2  # bounded by the per-host semaphore
+            assert client.stats()["pooled"]
+        finally:
+            asyncio.run_coroutine_threadsafe(client.close(), loop).result(5)
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(5)
+
+
+def test_sync_call_timeout_cancels_the_coroutine(monkeypatch):
+    monkeypatch.setattr(openrouter_client, "_MAX_BACKOFF_SECONDS", 0)
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    client = OpenRouterClient("http://127.0.0.1:9/api/v1", "sk-test", timeout=0.05, max_retries=0)
+    asyncio.run_coroutine_threadsafe(client.start(), loop).result(5)
+    cancelled = threading.Event()
+
+    async def hung(payload):
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    client.post_chat = hung
+    try:
+        try:
+            client.post_chat_sync({})
+            raise AssertionError("expected TimeoutError")
+        except FutureTimeoutError:
+            pass
+        assert cancelled.wait(2)
+    finally:
+        asyncio.run_coroutine_threadsafe(client.close(), loop).result(5)
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(5)
+
+
+def test_stream_chat_yields_deltas_after_retry():
+    async def main(server):
+        client = _client(server, max_retries=1)
+        await client.start()
+        try:
+            return [chunk async for chunk in client.stream_chat({"messages": []})], client.breaker.stats()
+        finally:
+            await client.close()
+
+    with StubServer() as server:
+        server.script.append((503, {}))
+        chunks, breaker = asyncio.run(main(server))
+        assert chunks == ["rest ", "and ", "fluids"]
+        assert server.requests == 2 and breaker["consecutive_failures"] == 0
+
+
+def test_backoff_is_jittered_and_capped():
+    delays = {backoff_delay(3, 0.5) for _ in range(50)}
+    assert len(delays) > 1 and all(0 <= d <= 4.0 for d in delays)
+    assert backoff_delay(0, 0.5, "2") == 2.0
+    assert backoff_delay(0, 0.5, "600") == 8.0
+    assert 0 <= backoff_delay(10, 0.5, "Wed, 21 Oct 2015 07:28:00 GMT") <= 8.0
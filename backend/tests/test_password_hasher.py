@@ -0,0 +1,58 @@
+"""
+bcrypt worker pool: hashing/verification off the caller's thread,
+admission control (PasswordHasherBusy before the queue overflows), and
+cost-factor detection for rehash-on-login.
+"""
+import asyncio
+import threading
+
+from backend.app.services.password_hasher import PasswordHasher, PasswordHasherBusy, hash_cost
+
+
+def test_hash_and_verify_on_pool():
+    hasher = PasswordHasher(max_workers=2, max_queue=2, rounds=4)
+    try:
+        hashed = hasher.hash("Secret#123")
+        assert hash_cost(hashed) == 4
+        assert hasher.verify("Secret#123", hashed)
+        assert not hasher.verify("wrong", hashed)
+        assert not hasher.verify("Secret#123", "not-a-bcrypt-hash")
+        assert asyncio.run(hasher.averify("Secret#123", asyncio.run(hasher.ahash("Secret#123"))))
+        stats = hasher.stats()
+        assert stats["completed"] == 6 and stats["in_flight"] == 0 and stats["rejected"] == 0
+    finally:
+        hasher.shutdown()
+
+
+def test_rejects_beyond_workers_plus_queue():
+    hasher = PasswordHasher(max_workers=1, max_queue=1, rounds=4, retry_after=3)
+    release = threading.Event()
+    try:
+        blocked = [hasher._submit(release.wait) for _ in range(2)]  # one running, one queued
+        try:
+            hasher.hash("Secret#123")
+            raise AssertionError("expected PasswordHasherBusy")
+        except PasswordHasherBusy as e:
+            assert e.retry_after == 3
+        assert hasher.stats()["queued"] == 1 and hasher.stats()["rejected"] == 1
+        release.set()
+        for future in blocked:
+            future.result(5)
+        assert hasher.verify("Secret#123", hasher.hash("Secret#123"))  # capacity freed
+    finally:
+        release.set()
+        hasher.shutdown()
+
+
+def test_needs_rehash_when_cost_changes():
+    old = PasswordHasher(max_workers=1, max_queue=0, rounds=4)
+    new = PasswordHasher(max_workers=1, max_queue=0, rounds=5)
+    try:
+        hashed = old.hash("Secret#123")
+        assert not old.needs_rehash(hashed)
+        assert new.needs_rehash(hashed)
+        assert new.verify("Secret#123", hashed)  # old-cost hashes still verify
+        assert not new.needs_rehash("legacy-sha256-digest")
+    finally:
+        old.shutdown()
+        new.shutdown()
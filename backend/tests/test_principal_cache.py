@@ -0,0 +1,57 @@
+"""
+Verified-principal cache behind get_current_principal: TTL bounded by the
+token's exp, per-user invalidation, and the generation guard against
+re-caching a principal whose verification raced an invalidation.
+"""
+import time
+
+from backend.app.services.principal_cache import Principal, PrincipalCache
+
+
+def _put(cache, user_id, iat, exp=None):
+    cache.put((user_id, iat), Principal(user_id, {"sub": str(user_id)}), exp, cache.generation(user_id))
+
+
+def test_hit_after_put_and_expiry_bounded_by_token_exp():
+    cache = PrincipalCache(ttl=60)
+    _put(cache, 1, 100)
+    assert cache.get((1, 100)) == Principal(1)
+    assert cache.get((1, 101)) is None  # another token of the same user
+
+    _put(cache, 2, 100, exp=time.time() + 0.05)
+    time.sleep(0.1)
+    assert cache.get((2, 100)) is None
+    assert cache.stats()["size"] == 1
+
+
+def test_invalidate_drops_all_tokens_of_user_only():
+    cache = PrincipalCache(ttl=60)
+    for iat in (1, 2, 3):
+        _put(cache, 7, iat)
+    _put(cache, 8, 1)
+    cache.invalidate_user(7)
+    assert all(cache.get((7, iat)) is None for iat in (1, 2, 3))
+    assert cache.get((8, 1)) is not None
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_inflight_verification_is_not_cached_after_invalidation():
+    cache = PrincipalCache(ttl=60)
+    generation = cache.generation(5)   # request starts verifying against the DB
+    cache.invalidate_user(5)           # meanwhile: lockout / password change
+    cache.put((5, 1), Principal(5), None, generation)
+    assert cache.get((5, 1)) is None
+
+    _put(cache, 5, 1)                  # a fresh verification is cached again
+    assert cache.get((5, 1)) is not None
+
+
+def test_disabled_and_bounded():
+    disabled = PrincipalCache(ttl=0)
+    _put(disabled, 1, 1)
+    assert disabled.get((1, 1)) is None
+
+    bounded = PrincipalCache(ttl=60, max_entries=2)
+    for user_id in (1, 2, 3):
+        _put(bounded, user_id, 1)
+    assert bounded.stats()["size"] == 2 and bounded.get((3, 1)) is not None
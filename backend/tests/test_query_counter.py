@@ -0,0 +1,105 @@
+"""
+SQL statement counter (engine listener + per-route middleware) and the
+per-process user profile cache.
+"""
+import time
+
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from backend.app.db_metrics import (
+    QueryCountMiddleware,
+    count_queries,
+    install_query_counter,
+    query_stats,
+    reset_query_stats,
+)
+from backend.app.services.user_profile_cache import UserProfileCache
+
+
+def _engine():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    install_query_counter(engine)
+    install_query_counter(engine)  # idempotent
+    return engine
+
+
+def test_count_queries_counts_statements_in_block():
+    engine = _engine()
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))  # outside any counter
+        with count_queries(keep_statements=True) as counter:
+            conn.execute(text("SELECT 1"))
+            conn.execute(text("SELECT 2"))
+    assert counter.count == 2
+    assert counter.statements == ["SELECT 1", "SELECT 2"]
+
+
+def test_middleware_attributes_statements_to_route_templates():
+    engine = _engine()
+    Session = sessionmaker(bind=engine)
+
+    def get_db():
+        db = Session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = FastAPI()
+    app.add_middleware(QueryCountMiddleware)
+
+    @app.get("/items/{item_id}")
+    def item(item_id: int, db=Depends(get_db)):  # sync: runs in the threadpool
+        for _ in range(item_id):
+            db.execute(text("SELECT 1"))
+        return {"id": item_id}
+
+    @app.get("/ping")
+    async def ping():
+        return {}
+
+    reset_query_stats()
+    with TestClient(app) as client:
+        for item_id in (1, 3):
+            assert client.get(f"/items/{item_id}").status_code == 200
+        client.get("/ping")
+        client.get("/missing")
+
+    stats = query_stats()
+    assert stats["GET /items/{item_id}"] == {"requests": 2, "statements": 4, "max": 3, "avg": 2.0}
+    assert stats["GET /ping"]["statements"] == 0
+    assert stats["GET <unmatched>"]["requests"] == 1
+
+
+def test_profile_cache_ttl_and_invalidation():
+    cache = UserProfileCache(ttl=0.1)
+    cache.set(1, {"age": 40})
+    profile = cache.get(1)
+    profile["age"] = 99  # callers get a copy
+    assert cache.get(1) == {"age": 40}
+
+    cache.invalidate(1)
+    assert cache.get(1) is None
+
+    cache.set(2, {"age": 30})
+    time.sleep(0.15)
+    assert cache.get(2) is None
+    stats = cache.stats()
+    assert stats["hits"] == 2 and stats["misses"] == 2 and stats["invalidations"] == 1
+
+
+def test_profile_cache_disabled_and_bounded():
+    disabled = UserProfileCache(ttl=0)
+    disabled.set(1, {"age": 40})
+    assert disabled.get(1) is None
+
+    bounded = UserProfileCache(ttl=60, max_entries=2)
+    for user_id in (1, 2, 3):
+        bounded.set(user_id, {})
+    assert bounded.get(1) is None and bounded.get(3) == {}
@@ -0,0 +1,154 @@
+"""
+Query plan regression suite: every hot user-scoped query must be served by
+an index. Each query is run against the shared test schema, whose
+composite indexes are the ones the migrations create (see conftest), its
+statements are captured as sent, and each SELECT's ``EXPLAIN QUERY PLAN``
+must not contain a full table scan (or a sort the index should have
+provided). A missing or wrong ``op.create_index`` fails here.
+
+Add new user-scoped reads to ``_hot_queries``. Service functions are
+called directly; ORM route queries are mirrored in Core, since the suite
+runs without the app models.
+"""
+import random
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from backend.app.query_plans import capture_statements, plan_problems
+from backend.app.services import analytics_queries, daily_rollup
+from backend.app.services.usage_meter import SQLUsageStore
+
+NOW = datetime(2026, 10, 18, 12, 0)
+USER = 7
+
+
+def _seed(engine, t):
+    """A few thousand rows over 50 users, ANALYZEd like a live database."""
+    rng = random.Random(0)
+
+    def at():
+        return NOW - timedelta(minutes=rng.randint(0, 60 * 24 * 90))
+
+    users = range(1, 51)
+    with engine.begin() as conn:
+        conn.execute(insert(t.symptom_logs), [
+            {"user_id": rng.choice(users), "symptoms": ["cough", "fever"], "predicted_disease": "Flu",
+             "triage_level": "Routine", "timestamp": at()} for _ in range(3000)])
+        conn.execute(insert(t.nutrition_logs), [
+            {"user_id": rng.choice(users), "food_name": "rice", "calories": 200.0, "timestamp": at()}
+            for _ in range(3000)])
+        conn.execute(insert(t.medication_logs), [
+            {"user_id": rng.choice(users), "medication_name": "Metformin", "timestamp": at()} for _ in range(2000)])
+        conn.execute(insert(t.lab_reports), [
+            {"user_id": rng.choice(users), "report_name": "CBC", "analysis_result": {"summary": "normal"},
+             "timestamp": at()} for _ in range(500)])
+        conn.execute(insert(t.image_analyses), [
+            {"user_id": rng.choice(users), "image_type": "skin", "prediction": "benign", "timestamp": at()}
+            for _ in range(500)])
+        conn.execute(insert(t.chat_history), [
+            {"user_id": rng.choice(users), "role": "user", "content": "hi", "session_id": f"s{n // 8}",
+             "created_at": at()} for n in range(4000)])
+        conn.execute(insert(t.daily_rollups), [
+            {"user_id": u, "day": NOW.date() - timedelta(days=d), "meals": 3} for u in users for d in range(60)])
+        conn.execute(insert(t.feature_usage), [
+            {"user_id": u, "limit_key": "chat_messages_per_day", "day": NOW.date() - timedelta(days=d), "count": 4}
+            for u in users for d in range(30)])
+        conn.exec_driver_sql("ANALYZE")
+
+
+def _latest(table, *where, at="timestamp", limit=None):
+    stmt = select(table).where(table.c.user_id == USER, *where).order_by(table.c[at].desc())
+    return lambda db: db.execute(stmt.limit(limit) if limit else stmt).all()
+
+
+WEEK_AGO, MONTH_AGO = NOW - timedelta(days=7), NOW - timedelta(days=30)
+CURSOR = analytics_queries.encode_cursor((NOW - timedelta(days=20), "nutrition", 1500))
+
+
+def _hot_queries(t):
+    """(name, run(db), sorts allowed in each statement's plan)"""
+    symptom_logs, nutrition_logs, medication_logs = t.symptom_logs, t.nutrition_logs, t.medication_logs
+    chat_history = t.chat_history
+    return [
+        # Mirrors of ORM queries in routes/ and services/
+        ("dashboard: recent symptoms", _latest(symptom_logs, symptom_logs.c.timestamp >= WEEK_AGO, limit=5), 0),
+        ("health summary: symptoms 30d", _latest(symptom_logs, symptom_logs.c.timestamp >= MONTH_AGO), 0),
+        ("nutrition history", _latest(nutrition_logs, nutrition_logs.c.timestamp >= WEEK_AGO), 0),
+        ("medications: last 7 days", _latest(medication_logs, medication_logs.c.timestamp >= WEEK_AGO), 0),
+        ("lab history", _latest(t.lab_reports, limit=20), 0),
+        ("image history", _latest(t.image_analyses, limit=20), 0),
+        ("chat history", _latest(chat_history, at="created_at", limit=50), 0),
+        ("chat history: session",
+         _latest(chat_history, chat_history.c.session_id == "s42", at="created_at", limit=50), 0),
+        # Service functions, as they run
+        ("analytics: symptom frequency", lambda db: analytics_queries.symptom_frequency(db, USER), 0),
+        ("analytics: nutrition totals", lambda db: analytics_queries.nutrition_totals(db, USER, WEEK_AGO), 0),
+        # Merging the four per-table branches sorts at most 4 x (limit + 1) rows, once per branch
+        ("timeline: first page", lambda db: analytics_queries.timeline_page(db, USER, 50), 4),
+        ("timeline: cursor page", lambda db: analytics_queries.timeline_page(db, USER, 50, CURSOR), 4),
+        ("dashboard: rollup totals", lambda db: daily_rollup.dashboard_totals(db, USER, NOW.date()), 0),
+        ("chat: first message upsert", lambda db: daily_rollup.record_chat_session(db, USER, "s42", NOW), 0),
+        ("usage meter: load", lambda db: SQLUsageStore(db.get_bind(), t.feature_usage).load(USER, NOW.date()), 0),
+    ]
+
+
+def _selects(statements):
+    # INSERT ... SELECT reads too (the chat session upsert checks chat_history in its WHERE)
+    return [(sql, params) for sql, params in statements
+            if sql.lstrip().upper().startswith(("SELECT", "WITH"))
+            or sql.lstrip().upper().startswith("INSERT") and " SELECT " in sql.upper()]
+
+
+def test_hot_queries_use_indexes(db_engine, tables):
+    _seed(db_engine, tables)
+    problems = {}
+    for name, run, allowed_sorts in _hot_queries(tables):
+        with capture_statements(db_engine) as statements:
+            with Session(db_engine) as db:
+                run(db)
+                db.rollback()
+        selects = _selects(statements)
+        assert selects, f"{name}: no SELECT captured"
+        with db_engine.connect() as conn:
+            for sql, params in selects:
+                found = plan_problems(conn, sql, params, allowed_sorts)
+                if found:
+                    problems.setdefault(name, []).extend(found)
+    assert not problems, "\n".join(f"{name}: {lines}" for name, lines in problems.items())
+
+
+def test_history_tables_have_migration_indexes(migration_indexes):
+    # Every history table read above has a (user_id, <time>) index declared by a migration
+    composite = {(table, columns[1]) for _, table, columns in migration_indexes
+                 if columns[0] == "user_id" and len(columns) > 1}
+    history = {(name, "timestamp") for name in ("symptom_logs", "nutrition_logs", "medication_logs", "lab_reports",
+                                                "image_analyses")} | {("chat_history", "created_at")}
+    assert history <= composite
+
+
+def test_checker_flags_scans_and_sorts(db_engine, tables):
+    _seed(db_engine, tables)
+    engine = db_engine
+    symptom_logs, nutrition_logs, chat_history = tables.symptom_logs, tables.nutrition_logs, tables.chat_history
+    regressions = [
+        ("unindexed filter", select(symptom_logs).where(symptom_logs.c.predicted_disease == "Flu")),
+        ("unindexed order", select(nutrition_logs).where(nutrition_logs.c.user_id == USER)
+         .order_by(nutrition_logs.c.calories.desc()).limit(5)),
+        ("no user filter", select(chat_history).order_by(chat_history.c.created_at.desc()).limit(50)),
+    ]
+    with engine.connect() as conn:
+        for name, stmt in regressions:
+            with capture_statements(engine) as statements:
+                conn.execute(stmt).all()
+            (sql, params), = statements
+            assert plan_problems(conn, sql, params), name
+
+        # The same reads are clean once they follow an index
+        with capture_statements(engine) as statements:
+            conn.execute(select(nutrition_logs).where(nutrition_logs.c.user_id == USER)
+                         .order_by(nutrition_logs.c.timestamp.desc()).limit(5)).all()
+        (sql, params), = statements
+        assert plan_problems(conn, sql, params) == []
+
@@ -0,0 +1,148 @@
+"""
+Rate limiter: sliding-window counts and Retry-After, idle-key eviction and
+the memory bound, the shared SQLite store, and the ASGI middleware.
+"""
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from jose import jwt
+
+from backend.app.config import get_settings
+from backend.app.rate_limit import (
+    PerClientRateLimiter,
+    RateLimitMiddleware,
+    ShardedMemoryStore,
+    SQLiteRateLimitStore,
+)
+from backend.app.responses import ENVELOPE_HEADER
+from backend.app.services.principal_cache import Principal, get_principal_cache
+
+settings = get_settings()
+
+
+def _token(user_id, plan=None, iat=None):
+    # Same claims as auth_service.create_access_token
+    claims = {"sub": str(user_id), "type": "access"}
+    if plan:
+        claims["plan"] = plan
+    if iat:
+        claims["iat"] = iat
+    return jwt.encode(claims, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+
+def _hits(store, key, limit, now, n):
+    return [store.hit(key, limit, 60.0, now) for _ in range(n)]
+
+
+def test_sliding_window_and_retry_after():
+    store = ShardedMemoryStore(shards=4)
+    decisions = _hits(store, "a", 10, 600.0, 11)
+    assert all(d.allowed for d in decisions[:10]) and decisions[9].remaining == 0
+    assert not decisions[10].allowed and decisions[10].retry_after == 66
+
+    # Next window: 10 requests 6s in weigh 10 * 54/60 = 9, leaving room for one
+    assert not store.hit("a", 10, 60.0, 665.0).allowed
+    assert store.hit("a", 10, 60.0, 666.0).allowed
+    assert not store.hit("a", 10, 60.0, 666.5).allowed
+
+    # Two idle windows later the client starts from zero
+    assert len([d for d in _hits(store, "a", 10, 800.0, 12) if d.allowed]) == 10
+
+
+def test_idle_keys_are_evicted_and_memory_is_bounded():
+    store = ShardedMemoryStore(shards=2, max_keys=1000)
+    for i in range(100):
+        store.hit(f"ip:{i}", 5, 60.0, 0.0)
+    assert store.stats()["keys"] == 100
+
+    # A window later the old keys still weigh on the sliding window
+    for i in range(20):
+        store.hit(f"late:{i}", 5, 60.0, 61.0)
+    assert store.stats()["idle_evictions"] == 0
+    # Two windows later they are idle and each shard sweeps them on its next touch
+    for i in range(20):
+        store.hit(f"new:{i}", 5, 60.0, 200.0)
+    stats = store.stats()
+    assert stats["keys"] == 20 and stats["idle_evictions"] == 120
+
+    bounded = ShardedMemoryStore(shards=1, max_keys=10)
+    for i in range(50):
+        bounded.hit(f"ip:{i}", 5, 60.0, 0.0)
+    assert bounded.stats()["keys"] == 10 and bounded.stats()["dropped"] == 40
+
+
+def test_sqlite_store_is_shared_across_limiters(tmp_path):
+    path = str(tmp_path / "rate_limit.db")
+    workers = [PerClientRateLimiter(store=SQLiteRateLimitStore(path)) for _ in range(2)]
+    for limiters in workers:
+        limiters.add_limiter("auth", 4)
+
+    allowed = [workers[i % 2].is_allowed("auth", "10.0.0.1")[0] for i in range(6)]
+    assert allowed == [True] * 4 + [False] * 2
+    assert workers[0].is_allowed("auth", "10.0.0.2") == (True, None)
+    assert workers[1].stats()["store"]["keys"] == 2
+
+
+def test_middleware_limits_by_ip_user_and_plan():
+    limiters = PerClientRateLimiter(store=ShardedMemoryStore())
+    limiters.add_limiter("global", 2)
+    limiters.add_limiter("auth", 1)
+
+    app = FastAPI()
+    app.add_middleware(RateLimitMiddleware, limiters=limiters)
+
+    @app.get("/ping")
+    def ping():
+        return {"ok": True}
+
+    @app.post("/auth/login")
+    def login():
+        return {"ok": True}
+
+    @app.get("/health/live")
+    def live():
+        return {"ok": True}
+
+    @app.get("/health-score")
+    def health_score():
+        return {"ok": True}
+
+    client = TestClient(app)
+    assert client.post("/auth/login").status_code == 200
+    denied = client.post("/auth/login")
+    assert denied.status_code == 429 and int(denied.headers["Retry-After"]) >= 1
+    assert denied.json()["status"] == "error"
+    assert ENVELOPE_HEADER not in denied.headers
+
+    first = client.get("/ping")
+    assert first.headers["X-RateLimit-Limit"] == "2" and first.headers["X-RateLimit-Remaining"] == "1"
+    assert client.get("/ping").status_code == 200
+    assert client.get("/ping").status_code == 429
+    assert all(client.get("/health/live").status_code == 200 for _ in range(5))
+    # Only /health and its subpaths are exempt, not routes that merely start with it
+    assert client.get("/health-score").status_code == 429
+
+    # Authenticated users get their own bucket, scaled by plan
+    free = {"Authorization": f"Bearer {_token(1)}"}
+    pro = {"Authorization": f"Bearer {_token(2, 'pro')}"}
+    assert [client.get("/ping", headers=free).status_code for _ in range(3)] == [200, 200, 429]
+    assert [client.get("/ping", headers=pro).status_code for _ in range(7)] == [200] * 6 + [429]
+
+
+def test_middleware_prefers_the_verified_plan_over_the_token_claim():
+    limiters = PerClientRateLimiter(store=ShardedMemoryStore())
+    limiters.add_limiter("global", 2)
+    app = FastAPI()
+    app.add_middleware(RateLimitMiddleware, limiters=limiters)
+
+    @app.get("/ping")
+    def ping():
+        return {"ok": True}
+
+    # A free-plan token of a user who has since upgraded; the DB tier was cached on verification
+    cache = get_principal_cache()
+    cache.put((3, 100), Principal(3, plan_tier="pro"), None, cache.generation(3))
+    try:
+        upgraded = {"Authorization": f"Bearer {_token(3, iat=100)}"}
+        assert [TestClient(app).get("/ping", headers=upgraded).status_code for _ in range(7)] == [200] * 6 + [429]
+    finally:
+        cache.invalidate_user(3)
@@ -0,0 +1,62 @@
+"""
+Regression suite: detect_emergency with the compiled keyword matcher must
+return exactly what the per-keyword loops returned.
+"""
+import random
+
+from bench_safety_matcher import legacy_detect_emergency, synthetic_messages
+
+from backend.app.services import safety_system
+from backend.app.services.aho_corasick import KeywordMatcher
+from backend.app.services.safety_system import detect_emergency
+
+EDGE_CASES = [
+    "",
+    "I feel fine today",
+    "Chest pain!!! and HIGH FEVER",
+    "high fever 103",                       # overlaps: sepsis, fever_high and the infant rule
+    "fever 102, fever 104",
+    "I can't breathe",                      # apostrophe is stripped, so "can't breathe" never matches
+    "self-harm thoughts",
+    "temperature is 139",
+    "I took an overdose myself",            # poisoning and suicidal_ideation
+    "my family has a mild migraine history",   # "mi" matches inside words
+    "baby fever and no urine, dry mouth, dizziness, confusion, lethargy",
+    "vomiting everything and can't keep anything down",
+    "Severe pain after a bad fall; possible fracture",
+    "I want to die",
+    "suicidal and severe depression",
+    "high temperature",
+]
+
+
+def _check(backend: str):
+    original = safety_system._KEYWORD_MATCHER
+    safety_system._KEYWORD_MATCHER = KeywordMatcher(original.keywords, backend=backend)
+    try:
+        cases = [(text, age) for text in EDGE_CASES for age in (None, 1, 2, 3, 40)]
+        cases += synthetic_messages(3000, seed=11, keyword_rate=0.3)
+        for text, age in cases:
+            assert detect_emergency(text, age=age) == legacy_detect_emergency(text, age=age), (text, age)
+    finally:
+        safety_system._KEYWORD_MATCHER = original
+
+
+def test_identical_detections_default_backend():
+    _check("auto")
+
+
+def test_identical_detections_regex_backend():
+    _check("regex")
+
+
+def test_keyword_matcher_matches_substring_search():
+    rng = random.Random(5)
+    for backend in ("auto", "regex"):
+        for _ in range(300):
+            keywords = {"".join(rng.choices("ab c", k=rng.randint(1, 5))) for _ in range(10)}
+            text = "".join(rng.choices("ab cd", k=80))
+            expected = {k for k in keywords if k and k in text}
+            assert KeywordMatcher(keywords, backend=backend).find(text) == expected
+    assert KeywordMatcher([]).find("anything") == set()
+    assert KeywordMatcher([], backend="regex").find("anything") == set()
@@ -0,0 +1,91 @@
+"""
+SQLite production profile tests: connections carry the WAL pragmas, the
+reader pool cannot write, a RoutingSession reads its own uncommitted
+writes, and concurrent writers queue instead of failing with "database is
+locked".
+"""
+import threading
+
+import pytest
+from sqlalchemy import func, insert, select, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from backend.app.database import RoutingSession, create_sqlite_engine
+
+
+@pytest.fixture
+def engines(tmp_path, tables):
+    url = f"sqlite:///{tmp_path / 'profile.db'}"
+    writer = create_sqlite_engine(url, read_only=False)
+    tables.chat_history.create(writer)
+    reader = create_sqlite_engine(url, read_only=True)
+    yield writer, reader
+    writer.dispose()
+    reader.dispose()
+
+
+def test_connections_use_production_pragmas(engines):
+    writer, reader = engines
+    for engine, query_only in ((writer, 0), (reader, 1)):
+        with engine.connect() as conn:
+            pragma = lambda name: conn.exec_driver_sql(f"PRAGMA {name}").scalar()  # noqa: E731
+            assert pragma("journal_mode") == "wal"
+            assert pragma("synchronous") == 1  # NORMAL
+            assert pragma("busy_timeout") > 0
+            assert pragma("cache_size") < 0  # sized in KiB
+            assert pragma("query_only") == query_only
+
+
+def test_reader_pool_rejects_writes(engines, tables):
+    _, reader = engines
+    with reader.connect() as conn:
+        with pytest.raises(OperationalError, match="readonly"):
+            conn.execute(insert(tables.chat_history).values(user_id=1, content="hi"))
+
+
+def test_routing_session_reads_its_own_writes(engines, tables):
+    writer, reader = engines
+    Session = sessionmaker(class_=RoutingSession, bind=writer, reader=reader)
+    count = select(func.count()).select_from(tables.chat_history)
+    with Session() as db:
+        assert db.get_bind(clause=count) is reader
+        db.execute(insert(tables.chat_history).values(user_id=1, content="hi"))
+        # Same transaction: the read goes to the writer and sees the uncommitted row
+        assert db.get_bind(clause=count) is writer
+        assert db.execute(count).scalar() == 1
+        with Session() as other:
+            assert other.execute(count).scalar() == 0
+        db.commit()
+        # A new transaction reads from the pool again, and sees the committed row
+        assert db.get_bind(clause=count) is reader
+        assert db.execute(count).scalar() == 1
+
+
+def test_concurrent_writers_queue_without_lock_errors(engines, tables):
+    writer, reader = engines
+    chat = tables.chat_history
+    Session = sessionmaker(class_=RoutingSession, bind=writer, reader=reader)
+    errors = []
+
+    def chat_user(user_id):
+        try:
+            for n in range(10):
+                with Session() as db:
+                    db.execute(select(chat.c.id).where(chat.c.user_id == user_id)).all()
+                    db.execute(insert(chat), [{"user_id": user_id, "role": role, "content": f"{role} {n}"}
+                                              for role in ("user", "assistant")])
+                    db.execute(text("UPDATE chat_history SET content = content WHERE user_id = :u"), {"u": user_id})
+                    db.commit()
+        except Exception as exc:  # pragma: no cover - reported below
+            errors.append(exc)
+
+    threads = [threading.Thread(target=chat_user, args=(u,)) for u in range(30)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+    with reader.connect() as conn:
+        assert conn.execute(select(func.count()).select_from(chat)).scalar() == 30 * 10 * 2
+
@@ -0,0 +1,100 @@
+"""
+Stage pipeline DAG runner and the ChikitsakEngine analysis built on it:
+concurrency of independent stages, dependency ordering, fallbacks on
+error and on budget overrun, and the trace's critical path.
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from backend.app.services import chikitsak_engine
+from backend.app.services.stage_pipeline import PipelineTrace, Stage, run_pipeline
+
+
+def _sleep_then(value, seconds):
+    def fn(**_):
+        time.sleep(seconds)
+        return value
+    return fn
+
+
+def test_independent_stages_run_concurrently():
+    with ThreadPoolExecutor(4) as pool:
+        start = time.perf_counter()
+        results = run_pipeline([Stage(n, _sleep_then(n, 0.2)) for n in "abc"], pool)
+        elapsed = time.perf_counter() - start
+    assert results == {"a": "a", "b": "b", "c": "c"}
+    assert elapsed < 0.35
+
+
+def test_dependencies_receive_results_and_define_critical_path():
+    trace = PipelineTrace()
+    with ThreadPoolExecutor(4) as pool:
+        results = run_pipeline([
+            Stage("fast", _sleep_then(1, 0.01)),
+            Stage("slow", _sleep_then(2, 0.15)),
+            Stage("sum", lambda fast, slow: fast + slow, deps=("fast", "slow")),
+        ], pool, trace)
+    assert results["sum"] == 3
+    report = trace.as_dict()
+    assert report["critical_path"] == ["slow", "sum"]
+    assert report["stages"]["sum"]["start_ms"] >= report["stages"]["slow"]["end_ms"]
+
+
+def test_failed_and_overdue_stages_use_fallbacks():
+    def boom():
+        raise RuntimeError("engine down")
+
+    trace = PipelineTrace()
+    with ThreadPoolExecutor(4) as pool:
+        start = time.perf_counter()
+        results = run_pipeline([
+            Stage("broken", boom, fallback=[]),
+            Stage("llm", _sleep_then("remote", 1.0), budget=0.1, fallback=lambda: "local"),
+            Stage("after", lambda llm: llm.upper(), deps=("llm",)),
+        ], pool, trace)
+        elapsed = time.perf_counter() - start
+    assert results == {"broken": [], "llm": "local", "after": "LOCAL"}
+    assert elapsed < 0.5  # did not wait for the abandoned stage
+    stages = trace.as_dict()["stages"]
+    assert stages["broken"]["status"] == "error" and stages["llm"]["status"] == "timeout"
+
+
+def test_unknown_dependency_is_rejected():
+    with ThreadPoolExecutor(1) as pool:
+        try:
+            run_pipeline([Stage("a", lambda b: b, deps=("b",))], pool)
+            raise AssertionError("expected ValueError")
+        except ValueError:
+            pass
+
+
+def test_engine_abandons_slow_llm_triage_for_local_result():
+    local = {"disease_prediction": "Common Cold", "confidence": 0.4, "triage_level": "Routine"}
+
+    def predict(symptoms, allow_llm=True):
+        if allow_llm:
+            time.sleep(2.0)  # LLM fallback stuck upstream
+            return {"disease_prediction": "Influenza", "confidence": 0.9}
+        return local
+
+    engine = chikitsak_engine.ChikitsakEngine
+    args = (1, "runny nose and sneezing", ["runny_nose", "sneezing", "cough"], {"age": 30})
+    engine.analyze_health_query(*args)  # warm-up: CDSS matrix, RAG index
+
+    settings = chikitsak_engine.settings
+    original = (chikitsak_engine.predict_disease_with_fallback, settings.CHIKITSAK_TRIAGE_BUDGET_SECONDS)
+    chikitsak_engine.predict_disease_with_fallback = predict
+    settings.CHIKITSAK_TRIAGE_BUDGET_SECONDS = 0.3
+    try:
+        start = time.perf_counter()
+        analysis = engine.analyze_health_query(*args)
+        elapsed = time.perf_counter() - start
+    finally:
+        chikitsak_engine.predict_disease_with_fallback, settings.CHIKITSAK_TRIAGE_BUDGET_SECONDS = original
+
+    assert elapsed < 1.0
+    assert analysis["triageLevel"] == "Routine"
+    stages = analysis["trace"]["stages"]
+    assert stages["triage"]["status"] == "timeout"
+    assert {"cdss", "risk", "rag_prefetch", "knowledge", "xai"} <= set(stages)
+    assert all(stages[n]["status"] == "ok" for n in ("cdss", "risk", "xai"))
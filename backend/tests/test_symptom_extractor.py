@@ -0,0 +1,89 @@
+"""
+Equality tests: the Aho–Corasick symptom extractor must return exactly the
+triage columns the old per-column scan found, and add synonym matches after
+them only when asked to.
+"""
+import random
+
+from bench_symptom_extractor import TRIAGE_COLUMNS, scan_extract, synthetic_messages
+
+from backend.app.services.aho_corasick import AhoCorasick
+from backend.app.services.symptom_extractor import (
+    SymptomExtractor,
+    _hindi_synonyms,
+    _synonym_vocabulary,
+)
+
+EXTRACTOR = SymptomExtractor(TRIAGE_COLUMNS, _synonym_vocabulary(), _hindi_synonyms())
+COLUMNS_ONLY = SymptomExtractor(TRIAGE_COLUMNS)
+
+
+def test_corpus_matches_scan():
+    for sentences in (4, 12, 40):
+        for message in synthetic_messages(1000, TRIAGE_COLUMNS, seed=sentences, sentences=sentences):
+            expected = scan_extract(message, TRIAGE_COLUMNS)
+            assert COLUMNS_ONLY.extract(message) == expected, message
+            assert EXTRACTOR.extract(message) == expected, message
+            assert EXTRACTOR.extract(message, synonyms=True)[: len(expected)] == expected, message
+
+
+def test_edge_cases_match_scan():
+    messages = [
+        "",
+        "   ",
+        "Chest pain",
+        "chest_pain and CHEST PAIN",
+        "chest, pain",                      # punctuation splits the phrase
+        "chestpain",
+        "spotting  urination",              # column with an embedded space
+        "spotting urination",
+        "dischromic  patches",
+        "foul smell of urine",
+        "toxic look (typhos)",              # parentheses are normalised away
+        "fluid overload",
+        "pain behind the eyes, pain behind the eyes",
+        "joint pain knee pain hip joint pain",
+        "itching internal itching",
+        "high fever mild fever fever",
+    ]
+    for message in messages:
+        expected = scan_extract(message, TRIAGE_COLUMNS)
+        assert COLUMNS_ONLY.extract(message) == expected, message
+        assert EXTRACTOR.extract(message) == expected, message
+        assert EXTRACTOR.extract(message, synonyms=True)[: len(expected)] == expected, message
+
+
+def test_synonyms_and_hindi_follow_columns():
+    message = "I have shortness of breath, cough and सीने में दर्द since morning"
+    assert EXTRACTOR.extract(message, synonyms=True) == ["cough", "shortness_of_breath", "chest_pain"]
+    assert EXTRACTOR.extract(message) == ["cough"]
+    # A Hindi term for a symptom already written out is not repeated
+    assert EXTRACTOR.extract("chest pain, सीने में दर्द", synonyms=True) == ["chest_pain"]
+    # Disease names and UI phrases from HINDI_TRANSLATIONS are not symptoms
+    assert EXTRACTOR.extract("मधुमेह", synonyms=True) == []
+
+
+def test_synonym_only_messages_stay_empty_by_default():
+    # As with the old scan, nothing a triage column doesn't cover reaches the minimum-symptom check
+    message = "shortness of breath and बुखार"
+    assert scan_extract(message, TRIAGE_COLUMNS) == [] == EXTRACTOR.extract(message)
+    assert EXTRACTOR.extract(message, synonyms=True) == ["shortness_of_breath", "fever"]
+
+    extractor = SymptomExtractor([], _synonym_vocabulary(), _hindi_synonyms())
+    assert extractor.extract("bad headache and बुखार") == []
+    assert extractor.extract("bad headache and बुखार", synonyms=True) == ["headache", "fever"]
+    assert SymptomExtractor([]).extract("bad headache", synonyms=True) == []
+
+
+def test_automaton_matches_naive_substring_search():
+    rng = random.Random(3)
+    for _ in range(200):
+        patterns = list({"".join(rng.choices("abc", k=rng.randint(1, 4))) for _ in range(8)})
+        text = "".join(rng.choices("abcd", k=60))
+        automaton = AhoCorasick((p, p) for p in patterns)
+        found = sorted((start, value) for start, _, value in automaton.find_all(text))
+        expected = sorted(
+            (i, p) for p in patterns for i in range(len(text) - len(p) + 1) if text.startswith(p, i)
+        )
+        assert found == expected
+        assert automaton.contains_any(text) == bool(expected)
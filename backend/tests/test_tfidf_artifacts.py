@@ -0,0 +1,68 @@
+"""
+TF-IDF artifact tests: a FrozenTfidfVectorizer loaded from disk must
+transform exactly like the fitted sklearn TfidfVectorizer it was saved
+from, across the params that affect transform(), and load_or_fit_tfidf
+must reuse artifacts only for the corpus they were built from.
+"""
+import numpy as np
+import pytest
+from bench_medquad_ann import _queries, _synthetic_questions
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from backend.app.ml_models.ann_index import corpus_fingerprint
+from backend.app.ml_models.tfidf_artifacts import (
+    FrozenTfidfVectorizer, load_or_fit_tfidf, load_tfidf_artifacts, save_tfidf_artifacts,
+)
+
+CORPUS = _synthetic_questions(600, seed=3)
+QUERIES = _queries(CORPUS, 100, seed=3) + [
+    "", "???", "Chest PAIN and chest pain again", "résumé of café symptoms", "unseenword only",
+]
+
+PARAMS = [
+    {"stop_words": "english"},                                  # medquad_engine
+    {"stop_words": "english", "max_features": 500, "ngram_range": (1, 2)},  # medical_rag
+    {"sublinear_tf": True, "norm": "l1"},
+    {"binary": True, "use_idf": False, "norm": None},
+    {"lowercase": False, "strip_accents": "unicode", "token_pattern": r"(?u)\b\w+\b"},
+    {"analyzer": "char_wb", "ngram_range": (2, 3)},
+]
+
+
+def _assert_same(actual, expected):
+    assert actual.shape == expected.shape
+    diff = abs(actual - expected)
+    assert (diff.max() if diff.nnz else 0.0) < 1e-12
+    assert np.array_equal(actual.indptr, expected.indptr)
+
+
+@pytest.mark.parametrize("params", PARAMS, ids=lambda p: ",".join(p))
+def test_frozen_vectorizer_matches_sklearn(params, tmp_path):
+    fitted = TfidfVectorizer(**params)
+    matrix = fitted.fit_transform(CORPUS)
+    save_tfidf_artifacts(str(tmp_path / "tfidf"), fitted, matrix, "fp")
+
+    artifacts = load_tfidf_artifacts(str(tmp_path / "tfidf"), "fp")
+    assert isinstance(artifacts.vectorizer, FrozenTfidfVectorizer)
+    _assert_same(artifacts.vectorizer.transform(QUERIES), fitted.transform(QUERIES))
+    _assert_same(artifacts.matrix, matrix)
+    _assert_same(artifacts.postings.tocsr(), matrix)
+
+
+def test_load_or_fit_reuses_artifacts_for_the_same_corpus(tmp_path):
+    directory = str(tmp_path / "tfidf")
+    fits = []
+
+    def make_vectorizer():
+        fits.append(1)
+        return TfidfVectorizer(stop_words="english")
+
+    first = load_or_fit_tfidf(directory, CORPUS, make_vectorizer, corpus_fingerprint(CORPUS))
+    again = load_or_fit_tfidf(directory, CORPUS, make_vectorizer, corpus_fingerprint(CORPUS))
+    assert len(fits) == 1
+    assert isinstance(again.vectorizer.idf_, np.memmap) and not again.matrix.data.flags.writeable  # mapped
+    _assert_same(again.vectorizer.transform(QUERIES), first.vectorizer.transform(QUERIES))
+
+    changed = CORPUS[:-1]
+    refit = load_or_fit_tfidf(directory, changed, make_vectorizer, corpus_fingerprint(changed))
+    assert len(fits) == 2 and refit.matrix.shape[0] == len(changed)
@@ -0,0 +1,97 @@
+"""
+Keyset pagination tests for the health timeline: walking every page must
+yield exactly the full feed in (timestamp, type, id) DESC order, with
+undated events last, for any page size.
+"""
+import random
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from backend.app.services.analytics_queries import decode_cursor, encode_cursor, timeline_page
+
+KINDS = {"symptom": "symptom_logs", "nutrition": "nutrition_logs", "medication": "medication_logs",
+         "lab_report": "lab_reports"}
+BASE = datetime(2026, 1, 1, 8, 0)
+
+
+def _row(kind: str, n: int) -> dict:
+    if kind == "symptom":
+        return {"symptoms": [f"s{n}", "cough"], "predicted_disease": "Flu"}
+    if kind == "nutrition":
+        return {"food_name": f"meal-{n}", "calories": 250.0}
+    if kind == "medication":
+        return {"medication_name": f"med-{n}"}
+    return {"report_name": f"lab-{n}", "abnormal_values": {"hb": 9.1}}
+
+
+def _description(kind: str, n: int) -> str:
+    return f"s{n}, cough" if kind == "symptom" else f"{'meal' if kind == 'nutrition' else kind[:3]}-{n}"
+
+
+def _seed(engine, tables, rng: random.Random, rows: int = 300):
+    expected = {1: [], 2: []}
+    with engine.begin() as conn:
+        for n in range(rows):
+            kind = rng.choice(list(KINDS))
+            user_id = rng.choice((1, 1, 2))
+            # Few distinct timestamps, so ties across and within tables are common
+            timestamp = None if rng.random() < 0.05 else BASE + timedelta(minutes=rng.randint(0, 40))
+            row_id = conn.execute(
+                insert(getattr(tables, KINDS[kind])).values(user_id=user_id, timestamp=timestamp, **_row(kind, n))
+            ).inserted_primary_key[0]
+            expected[user_id].append((timestamp, kind, row_id, _description(kind, n)))
+    for events in expected.values():
+        events.sort(key=lambda e: (e[0] is not None, e[0] or BASE, e[1], e[2]), reverse=True)
+    return expected
+
+
+def _walk(db: Session, user_id: int, limit: int):
+    events, cursor, pages = [], None, 0
+    while True:
+        page, cursor = timeline_page(db, user_id, limit, cursor)
+        assert len(page) <= limit
+        events += page
+        pages += 1
+        if cursor is None:
+            return events, pages
+        assert len(page) == limit
+
+
+def test_pages_cover_the_feed_in_order(db_engine, tables):
+    expected = _seed(db_engine, tables, random.Random(4))
+    with Session(db_engine) as db:
+        for user_id in (1, 2):
+            want = expected[user_id]
+            for limit in (1, 7, 50, 500):
+                events, pages = _walk(db, user_id, limit)
+                assert [e["description"] for e in events] == [e[3] for e in want]
+                assert [e["type"] for e in events] == [e[1] for e in want]
+                assert [e["timestamp"] for e in events] == [e[0].isoformat() if e[0] else None for e in want]
+                assert pages == max(1, -(-len(want) // limit))
+
+
+def test_event_rendering_and_empty_history(db_engine, tables):
+    _seed(db_engine, tables, random.Random(9), rows=40)
+    with Session(db_engine) as db:
+        events, _ = _walk(db, 1, 10)
+        by_type = {e["type"]: e for e in events}
+        assert by_type["nutrition"]["detail"] == "250.0 kcal"
+        assert by_type["lab_report"]["detail"] == "hb"
+        assert by_type["symptom"]["detail"] == "Flu"
+        assert by_type["medication"]["detail"] is None
+        assert timeline_page(db, 99, 10) == ([], None)
+
+
+def test_cursor_round_trip_and_rejection():
+    key = (datetime(2026, 3, 1, 12, 30, 5, 120), "nutrition", 42)
+    assert decode_cursor(encode_cursor(key)) == key
+    assert decode_cursor(encode_cursor((None, "lab_report", 3))) == (None, "lab_report", 3)
+    for bad in ("", "not-a-cursor", encode_cursor((None, "xray", 1)), "WyIyMDI2Il0"):
+        try:
+            decode_cursor(bad)
+        except ValueError:
+            continue
+        raise AssertionError(f"accepted {bad!r}")
+
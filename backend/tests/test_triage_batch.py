@@ -0,0 +1,72 @@
+"""
+Batch triage tests: predict_disease_safe_batch must return, row for row,
+what scoring each intake form on its own returns — including the rows
+that never reach the model (too few or unrecognised symptoms) mixed in
+between scored ones.
+"""
+import random
+
+import numpy as np
+import pytest
+from bench_triage_batch import _forms, _synthetic_model
+
+from backend.app.ml_models import triage_infer
+
+
+@pytest.fixture
+def model(monkeypatch):
+    for name in ("_model", "_symptom_columns", "_symptom_index"):
+        monkeypatch.setattr(triage_infer, name, None)
+    _synthetic_model(40, 12, seed=5)
+    return triage_infer._model
+
+
+def _one_at_a_time(user_symptoms):
+    """Reference: a single-row predict_proba on the list vector, as before batching."""
+    if not user_symptoms or len(user_symptoms) < 2:
+        return triage_infer._needs_more_symptoms(user_symptoms, len(user_symptoms or []))
+    vector = triage_infer.build_symptom_vector(user_symptoms)
+    if sum(vector) == 0:
+        return triage_infer._unrecognised_symptoms(user_symptoms, len(user_symptoms))
+    probabilities = triage_infer._model.predict_proba([vector])[0]
+    return triage_infer._format_probabilities(user_symptoms, len(user_symptoms), probabilities,
+                                              triage_infer._model.classes_)
+
+
+def _mixed_forms(n: int, seed: int):
+    rng = random.Random(seed)
+    forms = _forms(n, seed)
+    for row in rng.sample(range(n), n // 4):
+        forms[row] = rng.choice([[], None, ["symptom_1"], ["not a symptom", "nor this"],
+                                 [" SYMPTOM_2 ", "symptom 3", "symptom_3"]])
+    return forms
+
+
+def test_batch_matches_per_item_results(model):
+    forms = _mixed_forms(300, seed=11)
+    batch = triage_infer.predict_disease_safe_batch(forms)
+    assert len(batch) == len(forms)
+    assert batch == [_one_at_a_time(f) for f in forms]
+    assert batch == [triage_infer.predict_disease_safe(f) for f in forms]
+    assert {r["needs_more_info"] for r in batch} == {True, False}
+
+
+def test_rows_without_a_model_call_keep_their_place(model):
+    forms = [["symptom_1"], ["nope", "nada"], None]
+    assert triage_infer.predict_disease_safe_batch(forms) == [_one_at_a_time(f) for f in forms]
+    assert triage_infer.predict_disease_safe_batch([]) == []
+
+
+def test_predict_only_model_falls_back_per_row(model, monkeypatch):
+    class PredictOnly:
+        def predict(self, matrix):
+            return np.array([f"Disease {int(row.sum())}" for row in matrix])
+
+    monkeypatch.setattr(triage_infer, "_model", PredictOnly())
+    forms = _mixed_forms(40, seed=2)
+    for form, result in zip(forms, triage_infer.predict_disease_safe_batch(forms)):
+        if result["confidence"] == 0.75:
+            vector = triage_infer.build_symptom_vector(form)
+            assert result["disease_prediction"] == f"Disease {sum(vector)}"
+        else:
+            assert result == _one_at_a_time(form)
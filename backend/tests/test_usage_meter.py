@@ -0,0 +1,121 @@
+"""
+Usage meter: in-memory enforcement of plan limits, write-behind flushes,
+recovery from failed flushes, and counts surviving a worker restart.
+"""
+import sqlite3
+import time
+from datetime import date
+
+import pytest
+from sqlalchemy import create_engine, event
+
+from backend.app.services.usage_meter import SQLUsageStore, UsageMeter
+
+DAY = date(2026, 10, 18)
+
+
+@pytest.fixture
+def store(db_engine, tables) -> SQLUsageStore:
+    return SQLUsageStore(db_engine, tables.feature_usage)
+
+
+def _meter(store, **kwargs) -> UsageMeter:
+    return UsageMeter(store, today=lambda: DAY, **kwargs)
+
+
+def test_limits_are_enforced_in_memory(store):
+    meter = _meter(store)
+    results = [meter.consume(1, "free", "basic_chat") for _ in range(11)]
+    assert all(r["allowed"] for r in results[:10]) and results[9]["remaining"] == 0
+    assert not results[10]["allowed"] and "Upgrade" in results[10]["upgrade_message"]
+    assert meter.usage(1) == {"chat_messages_per_day": 10}
+
+    # Same limit key is shared; other plans and features are independent
+    assert not meter.check(1, "free", "basic_chat")["allowed"]
+    assert meter.consume(1, "pro", "basic_chat")["allowed"]
+    assert meter.consume(1, "medical_plus", "basic_chat")["remaining"] == -1
+    denied = meter.consume(1, "free", "image_analysis")
+    assert not denied["allowed"] and denied["required_plan"] == "pro"
+
+    # Not enforcing: still counted past the limit
+    assert not meter.consume(2, "free", "image_analysis", enforce=False)["allowed"]
+    assert meter.usage(2) == {"image_analyses_per_day": 1}
+    assert meter.stats()["flushes"] == 0
+
+
+def test_several_uses_fit_the_remaining_limit_or_count_none(store):
+    meter = _meter(store)
+    assert meter.consume(1, "free", "basic_symptom_checker", uses=2)["remaining"] == 1
+    denied = meter.consume(1, "free", "basic_symptom_checker", uses=2)
+    assert not denied["allowed"] and "needs 2" in denied["upgrade_message"]
+    assert meter.usage(1) == {"symptom_checks_per_day": 2}
+    assert meter.consume(1, "free", "basic_symptom_checker", uses=1)["remaining"] == 0
+    assert meter.consume(1, "medical_plus", "basic_symptom_checker", uses=500)["allowed"]
+
+
+def test_flush_persists_and_restart_reloads(store):
+    meter = _meter(store)
+    for _ in range(3):
+        meter.consume(7, "pro", "lab_reports")
+    meter.consume(7, "pro", "knowledge_search")
+    assert meter.flush() == 2
+    meter.consume(7, "pro", "lab_reports")
+    meter.shutdown()  # flushes the last increment
+    assert store.load(7, DAY) == {"lab_reports_per_day": 4, "knowledge_searches_per_day": 1}
+
+    restarted = _meter(store)
+    assert restarted.usage(7)["lab_reports_per_day"] == 4
+    assert restarted.consume(7, "pro", "lab_reports")["remaining"] == 0
+    assert not restarted.consume(7, "pro", "lab_reports")["allowed"]
+
+
+def test_flush_merges_other_workers_and_retries_failures(store):
+    a, b = _meter(store), _meter(store)
+    for _ in range(4):
+        a.consume(3, "free", "basic_chat")
+    b.consume(3, "free", "basic_chat")
+    a.flush()
+    b.flush()  # b now sees a's flushed counts
+    assert b.usage(3)["chat_messages_per_day"] == 5
+
+    add = store.add
+    store.add = lambda increments: (_ for _ in ()).throw(RuntimeError("db down"))
+    b.consume(3, "free", "basic_chat")
+    assert b.flush() == 0 and b.stats()["flush_errors"] == 1
+    assert b.usage(3)["chat_messages_per_day"] == 6
+    store.add = add
+    assert b.flush() == 1 and store.load(3, DAY)["chat_messages_per_day"] == 6
+
+
+def test_background_flush_on_pending_threshold(store):
+    meter = _meter(store, flush_interval=60, max_pending=5)
+    meter.start()
+    try:
+        for _ in range(5):
+            meter.consume(9, "pro", "basic_chat")
+        deadline = time.time() + 5
+        while not store.load(9, DAY) and time.time() < deadline:
+            time.sleep(0.02)
+        assert store.load(9, DAY) == {"chat_messages_per_day": 5}
+    finally:
+        meter.shutdown()
+
+
+
+def test_loads_use_the_read_engine_while_a_writer_holds_the_lock(db_engine, tables):
+    reader = create_engine(db_engine.url)
+    writer_connections = []
+    event.listen(db_engine, "engine_connect", lambda conn: writer_connections.append(conn))
+    split = SQLUsageStore(db_engine, tables.feature_usage, read_engine=reader)
+    split.add({(7, "lab_reports_per_day", DAY): 2})
+    assert len(writer_connections) == 1
+
+    lock = sqlite3.connect(db_engine.url.database, isolation_level=None)
+    lock.execute("BEGIN IMMEDIATE")  # what the SQLite profile's writer holds during a flush
+    try:
+        assert split.load(7, DAY) == {"lab_reports_per_day": 2}
+    finally:
+        lock.execute("ROLLBACK")
+        lock.close()
+        reader.dispose()
+    assert len(writer_connections) == 1